@@ -0,0 +1,163 @@
+"""Bulk process liveness checks for hook-registered sessions.
+
+``ait sessions prune`` used to fork ``ps -p <pid>`` once per active session.
+probe_processes() answers for every PID in one pass instead:
+
+- On Linux it reads /proc/<pid>/stat (no fork at all) and derives each
+  process's start time from its start tick and the boot time.
+- Elsewhere (macOS) it checks existence with ``os.kill(pid, 0)`` and gets
+  start times for all surviving PIDs from a single ``ps -o pid=,etime=``.
+
+A PID only counts as the session's process if that process started no
+later than the session itself (plus PID_START_SLACK for timestamp
+rounding); a newer process holding the PID means the PID was reused.
+"""
+
+import os
+import subprocess
+import time
+from typing import Dict, Iterable, Optional
+
+# Seconds a session's process may appear to start after the session did
+# (manifest times are rounded to seconds, /proc start times to clock ticks)
+PID_START_SLACK = 5.0
+
+_PROC = '/proc'
+
+
+def is_pid_alive(pid: int) -> bool:
+    """Check whether a process exists without forking.
+
+    Args:
+        pid: Process ID
+
+    Returns:
+        True if the process exists
+    """
+    if pid <= 0:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True  # Exists, owned by another user
+    except OSError:
+        return False
+    return True
+
+
+def _boot_time() -> Optional[float]:
+    """Read the boot time from /proc/stat (epoch seconds)."""
+    try:
+        with open(os.path.join(_PROC, 'stat')) as f:
+            for line in f:
+                if line.startswith('btime '):
+                    return float(line.split()[1])
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _probe_proc(pids: Iterable[int], boot_time: float) -> Dict[int, Optional[float]]:
+    """Read start times from /proc (zombies count as gone)."""
+    ticks = os.sysconf('SC_CLK_TCK')
+    live: Dict[int, Optional[float]] = {}
+    for pid in pids:
+        try:
+            with open(os.path.join(_PROC, str(pid), 'stat')) as f:
+                stat = f.read()
+        except OSError:
+            continue
+        # Fields after the parenthesised command name: state is field 3,
+        # starttime field 22
+        fields = stat[stat.rfind(')') + 2:].split()
+        if not fields or fields[0] in ('Z', 'X'):
+            continue
+        try:
+            live[pid] = boot_time + int(fields[19]) / ticks
+        except (IndexError, ValueError):
+            live[pid] = None
+    return live
+
+
+def _parse_etime(value: str) -> Optional[float]:
+    """Convert ps elapsed time ([[dd-]hh:]mm:ss) to seconds."""
+    days, _, clock = value.rpartition('-')
+    try:
+        seconds = 0.0
+        for part in clock.split(':'):
+            seconds = seconds * 60 + int(part)
+        return seconds + int(days or 0) * 86400
+    except ValueError:
+        return None
+
+
+def _probe_ps(pids: Iterable[int]) -> Dict[int, Optional[float]]:
+    """Check PIDs with os.kill and one ps call for start times."""
+    live: Dict[int, Optional[float]] = {pid: None for pid in pids if is_pid_alive(pid)}
+    if not live:
+        return live
+
+    now = time.time()
+    try:
+        result = subprocess.run(
+            ['ps', '-o', 'pid=,etime=', '-p', ','.join(str(pid) for pid in live)],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        )
+        output = result.stdout
+    except (OSError, subprocess.SubprocessError):
+        output = ''
+
+    for line in output.splitlines():
+        parts = line.split()
+        if len(parts) != 2:
+            continue
+        try:
+            pid = int(parts[0])
+        except ValueError:
+            continue
+        elapsed = _parse_etime(parts[1])
+        if pid in live and elapsed is not None:
+            live[pid] = now - elapsed
+    return live
+
+
+def probe_processes(pids: Iterable[int]) -> Dict[int, Optional[float]]:
+    """Find which PIDs are running, with their start times.
+
+    Args:
+        pids: Process IDs (non-positive IDs are never running)
+
+    Returns:
+        Start time (epoch seconds, None if unknown) by running PID
+    """
+    pids = sorted({pid for pid in pids if pid > 0})
+    if not pids:
+        return {}
+
+    boot_time = _boot_time()
+    if boot_time is not None:
+        return _probe_proc(pids, boot_time)
+    return _probe_ps(pids)
+
+
+def is_session_process(
+    pid: int, started: float, live: Dict[int, Optional[float]]
+) -> bool:
+    """Check whether a session's process is still the one running.
+
+    Args:
+        pid: PID recorded in the manifest
+        started: Session start (epoch seconds)
+        live: Result of probe_processes()
+
+    Returns:
+        True if the PID runs a process that predates the session
+    """
+    if pid not in live:
+        return False
+    process_start = live[pid]
+    return process_start is None or process_start <= started + PID_START_SLACK
@@ -0,0 +1,426 @@
+"""Indexed store of hook-registered Claude Code sessions.
+
+The session-register hook writes one JSON manifest per session to
+~/.claude/sessions/active/ and moves it to history/YYYY-MM-DD/ when the
+session ends. ``ait sessions`` used to glob and parse every manifest on each
+command and sort them in memory - after months of use, tens of thousands of
+files per command.
+
+SessionIndex mirrors the manifests into SQLite (~/.cache/aiterm/sessions.db)
+with indexes on project, path, date and status, and answers paginated
+queries from it. sync() imports incrementally:
+
+- Each directory's mtime is kept as a watermark. A history date directory
+  whose mtime is unchanged is skipped after one stat() (adding, removing or
+  renaming a manifest changes it). Archived manifests are written once.
+- active/ is listed on every sync because its manifests are rewritten in
+  place (``ait sessions task``); only manifests whose (mtime, size) changed
+  are parsed again.
+- Watermarks within RACY_WINDOW_NS of the sync are not kept, since a
+  second change in the same timestamp tick would not move them.
+
+The JSON files stay the source of truth: the database can be deleted at any
+time and is rebuilt by the next command.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from aiterm.utils.cache import get_cache_dir
+
+# Bump when the schema or the meaning of a column changes
+SCHEMA_VERSION = 2
+
+# Changes this close to a sync are re-checked on the next one
+RACY_WINDOW_NS = 2_000_000_000
+
+ACTIVE_DIR = 'active'
+HISTORY_DIR = 'history'
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS dirs (
+        dir TEXT PRIMARY KEY,         -- 'active' or 'history/YYYY-MM-DD'
+        mtime_ns INTEGER NOT NULL,    -- Watermark (0: list again)
+        files INTEGER NOT NULL        -- *.json manifests in the directory
+    ) WITHOUT ROWID
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS sessions (
+        file TEXT PRIMARY KEY,        -- Path relative to the sessions root
+        dir TEXT NOT NULL,
+        mtime_ns INTEGER NOT NULL,    -- -1: parse again on the next sync
+        size INTEGER NOT NULL,
+        session_id TEXT,              -- NULL if the manifest is invalid
+        archived INTEGER NOT NULL,
+        date TEXT,
+        project TEXT,
+        path TEXT,
+        status TEXT,
+        started REAL,
+        data TEXT
+    )
+    """,
+    'CREATE INDEX IF NOT EXISTS sessions_started ON sessions (archived, started DESC)',
+    'CREATE INDEX IF NOT EXISTS sessions_date ON sessions (archived, date, started DESC)',
+    'CREATE INDEX IF NOT EXISTS sessions_project ON sessions (project)',
+    'CREATE INDEX IF NOT EXISTS sessions_path ON sessions (path)',
+    'CREATE INDEX IF NOT EXISTS sessions_status ON sessions (status)',
+    'CREATE INDEX IF NOT EXISTS sessions_dir ON sessions (dir)',
+)
+
+_TABLES = ('meta', 'dirs', 'sessions')
+
+# Open indexes by (database, sessions root)
+_indexes: Dict[Tuple[Path, Path], 'SessionIndex'] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_sessions_root() -> Path:
+    """Get the hook sessions directory (~/.claude/sessions)."""
+    return Path.home() / '.claude' / 'sessions'
+
+
+def get_index(root: Optional[Path] = None) -> 'SessionIndex':
+    """Get the shared index for a sessions directory.
+
+    Args:
+        root: Sessions directory (default: ~/.claude/sessions)
+
+    Returns:
+        SessionIndex
+    """
+    root = root or get_sessions_root()
+    path = get_cache_dir() / 'sessions.db'
+    with _indexes_lock:
+        index = _indexes.get((path, root))
+        if index is None:
+            index = _indexes[(path, root)] = SessionIndex(root, path)
+        return index
+
+
+def _parse_timestamp(value: Any) -> Optional[float]:
+    """Convert a manifest's ISO timestamp to epoch seconds."""
+    if not isinstance(value, str):
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except ValueError:
+        return None
+
+
+class SessionIndex:
+    """SQLite index of session manifests."""
+
+    def __init__(self, root: Optional[Path] = None, path: Optional[Path] = None):
+        """Initialize index (the database is opened on first use).
+
+        Args:
+            root: Sessions directory (default: ~/.claude/sessions)
+            path: Database file (default: ~/.cache/aiterm/sessions.db)
+        """
+        self.root = root or get_sessions_root()
+        self.path = path or get_cache_dir() / 'sessions.db'
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path), timeout=5.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # Import
+
+    def sync(self) -> bool:
+        """Import new, changed and removed manifests.
+
+        Returns:
+            True if the index is up to date, False if it is unavailable
+        """
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute('BEGIN IMMEDIATE')
+                try:
+                    self._check_meta(conn)
+                    self._sync(conn, time.time_ns())
+                except BaseException:
+                    conn.execute('ROLLBACK')
+                    raise
+                conn.execute('COMMIT')
+        except (sqlite3.Error, OSError):
+            return False
+        return True
+
+    def _check_meta(self, conn: sqlite3.Connection) -> None:
+        """Start over if the schema or the sessions directory changed."""
+        meta = dict(conn.execute('SELECT key, value FROM meta'))
+        expected = {'version': str(SCHEMA_VERSION), 'root': str(self.root)}
+        if all(meta.get(key) == value for key, value in expected.items()):
+            return
+
+        if meta.get('version') != expected['version']:
+            for table in _TABLES:
+                conn.execute(f'DROP TABLE IF EXISTS {table}')
+            for statement in _SCHEMA:
+                conn.execute(statement)
+        else:
+            conn.execute('DELETE FROM dirs')
+            conn.execute('DELETE FROM sessions')
+        conn.executemany('INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)', expected.items())
+
+    def _sync(self, conn: sqlite3.Connection, now_ns: int) -> None:
+        watermarks = dict(conn.execute('SELECT dir, mtime_ns FROM dirs'))
+        present = set()
+
+        # active/ is always listed (manifests change in place)
+        active = self.root / ACTIVE_DIR
+        try:
+            mtime_ns = os.stat(active).st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns is not None:
+            present.add(ACTIVE_DIR)
+            self._scan(conn, ACTIVE_DIR, None, active, mtime_ns, now_ns)
+
+        # history/<date>/ is listed only when its mtime moved
+        try:
+            with os.scandir(self.root / HISTORY_DIR) as entries:
+                dates = [entry for entry in entries if entry.is_dir()]
+        except OSError:
+            dates = []
+        for entry in dates:
+            relative = f"{HISTORY_DIR}/{entry.name}"
+            try:
+                mtime_ns = entry.stat().st_mtime_ns
+            except OSError:
+                continue
+            present.add(relative)
+            if watermarks.get(relative) != mtime_ns:
+                self._scan(conn, relative, entry.name, Path(entry.path), mtime_ns, now_ns)
+
+        for relative in set(watermarks) - present:
+            conn.execute('DELETE FROM sessions WHERE dir = ?', (relative,))
+            conn.execute('DELETE FROM dirs WHERE dir = ?', (relative,))
+
+    def _scan(
+        self,
+        conn: sqlite3.Connection,
+        relative: str,
+        date: Optional[str],
+        directory: Path,
+        mtime_ns: int,
+        now_ns: int,
+    ) -> None:
+        """List one directory, importing manifests whose stamp changed."""
+        indexed = {
+            file: (file_mtime, size)
+            for file, file_mtime, size in conn.execute(
+                'SELECT file, mtime_ns, size FROM sessions WHERE dir = ?', (relative,)
+            )
+        }
+        found = set()
+
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.startswith('.') or not entry.name.endswith('.json'):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    st = entry.stat()
+                except OSError:
+                    continue
+                file = f"{relative}/{entry.name}"
+                found.add(file)
+                if indexed.get(file) != (st.st_mtime_ns, st.st_size):
+                    self._import(conn, file, relative, date, Path(entry.path), st, now_ns)
+
+        stale = [(file,) for file in set(indexed) - found]
+        conn.executemany('DELETE FROM sessions WHERE file = ?', stale)
+
+        watermark = mtime_ns if now_ns - mtime_ns >= RACY_WINDOW_NS else 0
+        conn.execute(
+            'INSERT OR REPLACE INTO dirs (dir, mtime_ns, files) VALUES (?, ?, ?)',
+            (relative, watermark, len(found)),
+        )
+
+    def _import(
+        self,
+        conn: sqlite3.Connection,
+        file: str,
+        relative: str,
+        date: Optional[str],
+        path: Path,
+        st: os.stat_result,
+        now_ns: int,
+    ) -> None:
+        """Parse one manifest into its row."""
+        try:
+            text = path.read_text()
+            data = json.loads(text)
+        except (OSError, ValueError):
+            data = None
+
+        # Same checks as LiveSession.from_dict, so every indexed row loads
+        # and pages come back full
+        session_id = started = None
+        if isinstance(data, dict) and isinstance(data.get('session_id'), str):
+            started = _parse_timestamp(data.get('started'))
+            ended = data.get('ended')
+            if started is not None and (not ended or _parse_timestamp(ended) is not None):
+                session_id = data['session_id']
+
+        valid = session_id is not None
+        mtime_ns = st.st_mtime_ns if now_ns - st.st_mtime_ns >= RACY_WINDOW_NS else -1
+        conn.execute(
+            'INSERT OR REPLACE INTO sessions (file, dir, mtime_ns, size, session_id, archived,'
+            ' date, project, path, status, started, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+            (
+                file, relative, mtime_ns, st.st_size, session_id,
+                int(relative != ACTIVE_DIR), date,
+                data.get('project', 'unknown') if valid else None,
+                data.get('path', '') if valid else None,
+                data.get('status', 'active') if valid else None,
+                started,
+                text if valid else None,
+            ),
+        )
+
+    # Queries
+
+    def _where(
+        self,
+        archived: bool,
+        date: Optional[str],
+        project: Optional[str],
+        path: Optional[str],
+        status: Optional[str],
+    ) -> Tuple[str, list]:
+        clauses = ['session_id IS NOT NULL', 'archived = ?']
+        params: list = [int(archived)]
+        if date:
+            clauses.append('date = ?')
+            params.append(date)
+        if project:
+            # Case-insensitive substring, as the CLI filters always did
+            clauses.append('instr(lower(project), ?) > 0')
+            params.append(project.lower())
+        if path:
+            clauses.append('instr(path, ?) > 0')
+            params.append(path)
+        if status:
+            clauses.append('status = ?')
+            params.append(status)
+        return ' AND '.join(clauses), params
+
+    def query(
+        self,
+        archived: bool = False,
+        date: Optional[str] = None,
+        project: Optional[str] = None,
+        path: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[dict]:
+        """Get manifests, most recently started first.
+
+        Args:
+            archived: Query history/ instead of active/
+            date: History date (YYYY-MM-DD)
+            project: Case-insensitive substring of the project name
+            path: Substring of the project path
+            status: Exact status (e.g. "completed")
+            limit: Page size (None: all)
+            offset: Manifests to skip
+
+        Returns:
+            Parsed manifests (empty if the index is unavailable)
+        """
+        where, params = self._where(archived, date, project, path, status)
+        sql = f'SELECT data FROM sessions WHERE {where} ORDER BY started DESC, file LIMIT ? OFFSET ?'
+        try:
+            with self._lock:
+                rows = self._connect().execute(
+                    sql, params + [-1 if limit is None else limit, max(offset, 0)]
+                ).fetchall()
+        except (sqlite3.Error, OSError):
+            return []
+
+        manifests = []
+        for (text,) in rows:
+            try:
+                manifests.append(json.loads(text))
+            except ValueError:
+                pass
+        return manifests
+
+    def count(
+        self,
+        archived: bool = False,
+        date: Optional[str] = None,
+        project: Optional[str] = None,
+        path: Optional[str] = None,
+        status: Optional[str] = None,
+    ) -> int:
+        """Count manifests matching the query() filters.
+
+        Returns:
+            Manifest count (0 if the index is unavailable)
+        """
+        where, params = self._where(archived, date, project, path, status)
+        try:
+            with self._lock:
+                return self._connect().execute(
+                    f'SELECT COUNT(*) FROM sessions WHERE {where}', params
+                ).fetchone()[0]
+        except (sqlite3.Error, OSError):
+            return 0
+
+    def dates(self, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """Get history dates, newest first.
+
+        Args:
+            limit: Maximum number of dates (None: all)
+
+        Returns:
+            List of (date, manifest count)
+        """
+        try:
+            with self._lock:
+                rows = self._connect().execute(
+                    'SELECT dir, files FROM dirs WHERE dir LIKE ? ORDER BY dir DESC LIMIT ?',
+                    (f"{HISTORY_DIR}/%", -1 if limit is None else limit),
+                ).fetchall()
+        except (sqlite3.Error, OSError):
+            return []
+        prefix = len(HISTORY_DIR) + 1
+        return [(relative[prefix:], files) for relative, files in rows]
@@ -3,6 +3,7 @@
 Handles reading, writing, and managing Claude Code settings.json files.
 """
 
+import copy
 import json
 import shutil
 from dataclasses import dataclass, field
@@ -10,6 +11,7 @@ from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
+from aiterm.claude.settings_cache import read_json_cached
 
 # Default settings file locations
 GLOBAL_SETTINGS = Path.home() / ".claude" / "settings.json"
@@ -79,20 +81,22 @@ def load_settings(path: Optional[Path] = None) -> Optional[ClaudeSettings]:
         ClaudeSettings object, or None if not found/invalid.
     """
     settings_path = path or find_settings_file()
-    if not settings_path or not settings_path.exists():
+    if not settings_path:
         return None
 
-    try:
-        data = json.loads(settings_path.read_text())
-        return ClaudeSettings(
-            path=settings_path,
-            permissions=data.get("permissions", {}),
-            hooks=data.get("hooks", {}),
-            raw=data,
-        )
-    except (json.JSONDecodeError, OSError):
+    cached = read_json_cached(settings_path)
+    if not isinstance(cached, dict):
         return None
 
+    # Callers edit and save the result; never hand out the shared copy
+    data = copy.deepcopy(cached)
+    return ClaudeSettings(
+        path=settings_path,
+        permissions=data.get("permissions", {}),
+        hooks=data.get("hooks", {}),
+        raw=data,
+    )
+
 
 def save_settings(settings: ClaudeSettings) -> bool:
     """Save settings to file.
@@ -0,0 +1,255 @@
+"""Process-wide cache of parsed settings files.
+
+~/.claude/settings.json is read by the statusLine's thinking indicator, the
+usage tracker's API key lookup, the statusbar and styles commands, and
+load_settings(). read_json_cached() parses each file once per process and
+reuses the result while the file's (st_mtime_ns, st_size) is unchanged, so
+a warm caller pays one stat() instead of an open and a parse.
+
+A file modified within RACY_WINDOW_NS of being read is re-read on the next
+call: a second edit inside the filesystem's timestamp granularity could
+leave both stamps unchanged.
+
+Long-running processes (the statusLine daemon) can call watch() to
+invalidate entries through inotify on Linux. Entries in watched directories
+are then returned without a stat() at all. Elsewhere watch() returns False
+and the stat check stays in place.
+
+Symlinked files (common with dotfile managers) keep the stat check even
+while watched: editing the link's target raises no event in the link's
+directory. A directory that cannot be watched yet (e.g. not created) is
+tried again on the next read rather than given up on.
+
+Cached values are shared: treat them as read-only and copy before
+modifying.
+"""
+
+import ctypes
+import ctypes.util
+import json
+import os
+import select
+import struct
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Set, Tuple
+
+# Edits this close to a read are not trusted to change the stat stamp
+RACY_WINDOW_NS = 2_000_000_000
+
+# inotify event masks (linux/inotify.h)
+_IN_MODIFY = 0x002
+_IN_ATTRIB = 0x004
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_FROM = 0x040
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+_IN_DELETE = 0x200
+_IN_Q_OVERFLOW = 0x4000
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_CLOSE_WRITE | _IN_MOVED_FROM
+    | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+)
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class _Entry(NamedTuple):
+    """One cached file."""
+
+    stamp: Optional[Tuple[int, int]]  # (mtime_ns, size), None if missing
+    data: Any
+    watched: bool  # Invalidated by the watcher (no stat needed)
+
+
+_cache: Dict[str, _Entry] = {}
+_lock = threading.Lock()
+_watcher: Optional['_Watcher'] = None
+
+# Bumped by every invalidation (a read racing an event is not trusted)
+_generation = 0
+
+
+def get_global_settings_path() -> Path:
+    """Get the global Claude Code settings path (~/.claude/settings.json)."""
+    return Path.home() / '.claude' / 'settings.json'
+
+
+def _stat_stamp(path: str) -> Tuple[Optional[Tuple[int, int]], int]:
+    """Get (stamp, mtime_ns) for a file (stamp None if missing)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None, 0
+    return (st.st_mtime_ns, st.st_size), st.st_mtime_ns
+
+
+def read_json_cached(path: Optional[Path] = None) -> Optional[Any]:
+    """Read a JSON settings file through the process-wide cache.
+
+    Args:
+        path: File to read (default: ~/.claude/settings.json)
+
+    Returns:
+        Parsed JSON (shared; do not modify), or None if missing or invalid
+    """
+    key = str(path or get_global_settings_path())
+
+    with _lock:
+        entry = _cache.get(key)
+        generation = _generation
+    if entry is not None and entry.watched and _watcher is not None and _watcher.alive:
+        return entry.data
+
+    watched = (
+        _watcher is not None
+        and not os.path.islink(key)
+        and _watcher.watch(os.path.dirname(key))
+    )
+    stamp, mtime_ns = _stat_stamp(key)
+    if entry is not None and entry.stamp == stamp:
+        return entry.data
+
+    data = None
+    if stamp is not None:
+        try:
+            with open(key, 'rb') as f:
+                data = json.loads(f.read())
+        except (OSError, ValueError):
+            data = None
+
+    # Keep the entry only once the file has settled
+    with _lock:
+        if stamp is None or time.time_ns() - mtime_ns >= RACY_WINDOW_NS:
+            _cache[key] = _Entry(stamp, data, watched and generation == _generation)
+        else:
+            _cache.pop(key, None)
+    return data
+
+
+def invalidate(path: Optional[Path] = None) -> None:
+    """Forget cached files.
+
+    Args:
+        path: File to forget (default: all files)
+    """
+    global _generation
+    with _lock:
+        _generation += 1
+        if path is None:
+            _cache.clear()
+        else:
+            _cache.pop(str(path), None)
+
+
+def watch() -> bool:
+    """Invalidate cached files through inotify (Linux only).
+
+    Meant for long-running processes such as the statusLine daemon.
+
+    Returns:
+        True if the watcher is running
+    """
+    global _watcher
+    if _watcher is not None and _watcher.alive:
+        return True
+    try:
+        _watcher = _Watcher()
+    except OSError:
+        _watcher = None
+        return False
+    invalidate()
+    return True
+
+
+def stop_watching() -> None:
+    """Stop the inotify watcher (cached files fall back to stat checks)."""
+    global _watcher
+    watcher, _watcher = _watcher, None
+    if watcher is not None:
+        watcher.close()
+    invalidate()
+
+
+class _Watcher:
+    """inotify watcher thread invalidating cache entries by directory."""
+
+    def __init__(self):
+        """Create the inotify instance and start the reader thread.
+
+        Raises:
+            OSError: If inotify is unavailable
+        """
+        name = ctypes.util.find_library('c')
+        try:
+            libc = ctypes.CDLL(name, use_errno=True)
+            self._init = libc.inotify_init1
+            self._add_watch = libc.inotify_add_watch
+        except (OSError, AttributeError, TypeError):
+            raise OSError("inotify not available")
+
+        fd = self._init(_IN_CLOEXEC)
+        if fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.fd = fd
+        self.alive = True
+        self._dirs: Dict[int, str] = {}
+        self._watched: Set[str] = set()
+        self._dirs_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='aiterm-settings-watch', daemon=True)
+        self._thread.start()
+
+    def watch(self, directory: str) -> bool:
+        """Watch a directory (once it succeeds; failures are retried).
+
+        Args:
+            directory: Directory containing cached files
+
+        Returns:
+            True if changes in the directory invalidate the cache
+        """
+        with self._dirs_lock:
+            if directory not in self._watched:
+                wd = self._add_watch(self.fd, os.fsencode(directory), _WATCH_MASK)
+                if wd < 0:
+                    return False
+                self._dirs[wd] = directory
+                self._watched.add(directory)
+            return self.alive
+
+    def _run(self) -> None:
+        try:
+            while self.alive:
+                # Wake up regularly so close() stops the thread
+                if not select.select([self.fd], [], [], 0.5)[0]:
+                    continue
+                buffer = os.read(self.fd, 64 * 1024)
+                offset = 0
+                while offset + _EVENT_HEADER.size <= len(buffer):
+                    wd, mask, _cookie, length = _EVENT_HEADER.unpack_from(buffer, offset)
+                    offset += _EVENT_HEADER.size
+                    name = buffer[offset:offset + length].rstrip(b'\0')
+                    offset += length
+
+                    if mask & _IN_Q_OVERFLOW:
+                        invalidate()
+                        continue
+                    directory = self._dirs.get(wd)
+                    if directory is not None and name:
+                        invalidate(Path(directory) / os.fsdecode(name))
+        except OSError:
+            pass
+        finally:
+            # Without events, entries must be stat-checked again
+            self.alive = False
+            invalidate()
+            try:
+                os.close(self.fd)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        """Stop watching (the reader thread closes the inotify fd)."""
+        self.alive = False
@@ -0,0 +1,117 @@
+"""Lazy sub-command loading for the ``ait`` CLI.
+
+Hooks and the statusLine run ``ait`` from scripts many times a day, so the
+root command must not import every CLI module up front. Sub-apps are
+registered by name in a ``LazySubcommand`` table and the module is only
+imported when its command is resolved.
+
+Root help and shell completion only need each command's name and help line,
+so they are served from the table without importing anything.
+"""
+
+import contextlib
+import importlib
+from difflib import get_close_matches
+from typing import Dict, Iterator, List, NamedTuple, Optional
+
+import typer
+from typer.core import TyperGroup
+
+
+class LazySubcommand(NamedTuple):
+    """A sub-app imported on first use."""
+
+    module: str
+    help: str
+    hidden: bool = False
+
+
+class LazyGroup(TyperGroup):
+    """TyperGroup that imports registered sub-apps on demand.
+
+    Set ``lazy_subcommands`` on a subclass (see ``make_lazy_group``); the
+    group is then passed as ``cls=`` to ``typer.Typer``.
+    """
+
+    lazy_subcommands: Dict[str, LazySubcommand] = {}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._placeholders_only = False
+
+    def list_commands(self, ctx) -> List[str]:
+        names = super().list_commands(ctx)
+        return names + [name for name in self.lazy_subcommands if name not in names]
+
+    def get_command(self, ctx, cmd_name: str):
+        command = super().get_command(ctx, cmd_name)
+        if command is not None:
+            return command
+
+        spec = self.lazy_subcommands.get(cmd_name)
+        if spec is None:
+            return None
+        if self._placeholders_only:
+            return self._placeholder(cmd_name, spec)
+        return self._load(cmd_name, spec)
+
+    def resolve_command(self, ctx, args):
+        # TyperGroup only suggests from loaded commands; include lazy names
+        name = args[0] if args else None
+        if (
+            name
+            and self.suggest_commands
+            and not ctx.resilient_parsing
+            and not name.startswith('-')
+            and self.get_command(ctx, name) is None
+        ):
+            matches = get_close_matches(name, self.list_commands(ctx))
+            if matches:
+                suggestions = ", ".join(f"{m!r}" for m in matches)
+                ctx.fail(f"No such command {name!r}. Did you mean {suggestions}?")
+        return super().resolve_command(ctx, args)
+
+    def format_help(self, ctx, formatter) -> None:
+        with self._listing():
+            super().format_help(ctx, formatter)
+
+    def shell_complete(self, ctx, incomplete: str):
+        with self._listing():
+            return super().shell_complete(ctx, incomplete)
+
+    @contextlib.contextmanager
+    def _listing(self) -> Iterator[None]:
+        """Serve unloaded sub-apps as placeholders (help/completion only)."""
+        self._placeholders_only = True
+        try:
+            yield
+        finally:
+            self._placeholders_only = False
+
+    def _placeholder(self, name: str, spec: LazySubcommand) -> TyperGroup:
+        """Build a command carrying only the name and help line."""
+        return TyperGroup(name=name, help=spec.help, hidden=spec.hidden)
+
+    def _load(self, name: str, spec: LazySubcommand):
+        """Import a sub-app and cache its click command."""
+        module = importlib.import_module(spec.module)
+        # Nested groups inherit the root markup mode, as with add_typer()
+        module.app.rich_markup_mode = self.rich_markup_mode
+        command = typer.main.get_group(module.app)
+        command.name = name
+        command.hidden = spec.hidden
+        self.commands[name] = command
+        return command
+
+
+def make_lazy_group(subcommands: Dict[str, LazySubcommand], name: Optional[str] = None) -> type:
+    """Create a LazyGroup class bound to a sub-command table.
+
+    Args:
+        subcommands: Command name -> LazySubcommand
+        name: Class name (default: 'LazyGroup')
+
+    Returns:
+        LazyGroup subclass for ``typer.Typer(cls=...)``
+    """
+    return type(name or 'LazyGroup', (LazyGroup,), {'lazy_subcommands': dict(subcommands)})
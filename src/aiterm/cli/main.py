@@ -7,10 +7,39 @@ from typing import Optional
 
 import typer
 from rich.console import Console
-from rich.panel import Panel
-from rich.table import Table
 
 from aiterm import __app_name__, __version__
+from aiterm.cli.lazy import LazySubcommand, make_lazy_group
+
+# ─── Sub-command modules (imported only when their command runs) ─────────────
+LAZY_SUBCOMMANDS = {
+    "hooks": LazySubcommand("aiterm.cli.hooks", "Manage Claude Code hooks"),
+    "commands": LazySubcommand("aiterm.cli.commands", "Manage Claude Code command templates"),
+    "mcp": LazySubcommand("aiterm.cli.mcp", "Manage MCP servers for Claude Code"),
+    "docs": LazySubcommand("aiterm.cli.docs", "Documentation validation and testing"),
+    "opencode": LazySubcommand("aiterm.cli.opencode", "OpenCode CLI configuration and management."),
+    "ide": LazySubcommand("aiterm.cli.ide", "Manage IDE integrations."),
+    "ghostty": LazySubcommand("aiterm.cli.ghostty", "Ghostty terminal management commands."),
+    "config": LazySubcommand("aiterm.cli.config", "Configuration management commands."),
+    "feature": LazySubcommand("aiterm.cli.feature", "Feature branch workflow commands."),
+    # Phase 2.5-4: Advanced CLI modules
+    "agents": LazySubcommand("aiterm.cli.agents", "Manage Claude Code subagents."),
+    "memory": LazySubcommand("aiterm.cli.memory", "Manage Claude Code memory system (CLAUDE.md files)."),
+    "styles": LazySubcommand("aiterm.cli.styles", "Manage Claude Code output styles."),
+    "plugins": LazySubcommand("aiterm.cli.plugins", "Manage Claude Code plugins."),
+    "gemini": LazySubcommand("aiterm.cli.gemini", "Manage Gemini CLI integration."),
+    "statusbar": LazySubcommand("aiterm.cli.statusbar", "Build and customize status bars."),
+    "statusline": LazySubcommand("aiterm.cli.statusline", "Manage statusLine configuration for Claude Code."),
+    "terminals": LazySubcommand("aiterm.cli.terminals", "Manage terminal emulator integrations."),
+    "workflows": LazySubcommand("aiterm.cli.workflows", "Manage workflow templates for different contexts."),
+    "recipes": LazySubcommand(  # Alias for workflows
+        "aiterm.cli.workflows", "Manage workflow templates for different contexts.", hidden=True
+    ),
+    "sessions": LazySubcommand("aiterm.cli.sessions", "Manage development sessions."),
+    "craft": LazySubcommand("aiterm.cli.craft", "Craft plugin management for Claude Code."),
+    "release": LazySubcommand("aiterm.cli.release", "Release management commands for PyPI and Homebrew."),
+    "learn": LazySubcommand("aiterm.cli.learn", "Interactive tutorials for learning aiterm."),
+}
 
 # Initialize Typer app
 app = typer.Typer(
@@ -18,6 +47,7 @@ app = typer.Typer(
     help="Terminal optimizer CLI for AI-assisted development.",
     add_completion=True,
     rich_markup_mode="rich",
+    cls=make_lazy_group(LAZY_SUBCOMMANDS, "AitermGroup"),
 )
 
 console = Console()
@@ -37,6 +67,8 @@ def get_platform_info() -> str:
 def version_callback(value: bool) -> None:
     """Print version and exit."""
     if value:
+        from rich.panel import Panel
+
         python_version = f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}"
         install_path = get_install_path()
         platform_info = get_platform_info()
@@ -181,6 +213,9 @@ def info(
     import os
     import shutil
 
+    from rich.panel import Panel
+    from rich.table import Table
+
     # Gather all system info
     info_data = {
         "aiterm": {
@@ -307,10 +342,13 @@ def info(
 # ─── Context detection implementation ────────────────────────────────────────
 
 
-def _context_detect_impl(path: Optional[Path], apply: bool, force_terminal: Optional[str] = None) -> None:
+def _context_detect_impl(
+    path: Optional[Path], apply: bool, force_terminal: Optional[str] = None, force: bool = False
+) -> None:
     """Shared implementation for context detection commands."""
     from aiterm.context.detector import detect_context
     from aiterm.terminal import detect_terminal, apply_context as terminal_apply_context, TerminalType
+    from rich.table import Table
 
     target = path or Path.cwd()
     context = detect_context(target)
@@ -335,7 +373,7 @@ def _context_detect_impl(path: Optional[Path], apply: bool, force_terminal: Opti
 
     # Apply to terminal if requested
     if apply:
-        if terminal_apply_context(context):
+        if terminal_apply_context(context, force=force):
             terminal_name = terminal.value.replace("-", " ").title()
             console.print(f"\n[green]✓[/] Context applied to {terminal_name}")
         else:
@@ -358,6 +396,7 @@ def ghost_callback(ctx: typer.Context) -> None:
     if ctx.invoked_subcommand is None:
         # Default: show ghostty status
         from aiterm.terminal import ghostty, detect_terminal, TerminalType
+        from rich.table import Table
 
         terminal = detect_terminal()
         is_ghostty = terminal == TerminalType.GHOSTTY
@@ -503,13 +542,17 @@ def detect(
   ait switch              # Apply context for current dir
   ait switch ~/my-project # Apply context for path
   cd ~/project && ait switch  # Common workflow
+  ait switch --force      # Resend profile and title
 """
 )
 def switch(
     path: Optional[Path] = typer.Argument(None, help="Directory to analyze."),
+    force: bool = typer.Option(
+        False, "--force", "-f", help="Resend everything, even if unchanged since the last switch."
+    ),
 ) -> None:
     """Detect and apply context to terminal (shortcut for 'context apply')."""
-    _context_detect_impl(path, apply=True)
+    _context_detect_impl(path, apply=True, force=force)
 
 
 # ─── Sub-command groups ──────────────────────────────────────────────────────
@@ -553,9 +596,12 @@ def context_apply(
         None,
         help="Directory to analyze. Defaults to current directory.",
     ),
+    force: bool = typer.Option(
+        False, "--force", "-f", help="Resend everything, even if unchanged since the last switch."
+    ),
 ) -> None:
     """Detect and apply context to terminal."""
-    context_detect(path=path, apply=True)
+    _context_detect_impl(path, apply=True, force=force)
 
 
 @profile_app.command("list")
@@ -582,6 +628,7 @@ def profile_list() -> None:
 def claude_settings_show() -> None:
     """Display current Claude Code settings."""
     from aiterm.claude.settings import load_settings, find_settings_file
+    from rich.table import Table
 
     settings = load_settings()
     if not settings:
@@ -681,6 +728,7 @@ def approvals_list() -> None:
 def approvals_presets() -> None:
     """List available approval presets."""
     from aiterm.claude.settings import list_presets
+    from rich.table import Table
 
     presets = list_presets()
 
@@ -758,57 +806,5 @@ def approvals_add(
         raise typer.Exit(1)
 
 
-# ─── Register hooks, commands, MCP, docs, and opencode CLIs (must be after app is fully defined) ───
-from aiterm.cli import hooks as hooks_cli
-from aiterm.cli import commands as commands_cli
-from aiterm.cli import mcp as mcp_cli
-from aiterm.cli import docs as docs_cli
-from aiterm.cli import opencode as opencode_cli
-from aiterm.cli import ide as ide_cli
-from aiterm.cli import ghostty as ghostty_cli
-from aiterm.cli import config as config_cli
-from aiterm.cli import feature as feature_cli
-
-app.add_typer(hooks_cli.app, name="hooks")
-app.add_typer(commands_cli.app, name="commands")
-app.add_typer(mcp_cli.app, name="mcp")
-app.add_typer(docs_cli.app, name="docs")
-app.add_typer(opencode_cli.app, name="opencode")
-app.add_typer(ide_cli.app, name="ide")
-app.add_typer(ghostty_cli.app, name="ghostty")
-app.add_typer(config_cli.app, name="config")
-app.add_typer(feature_cli.app, name="feature")
-
-# ─── Phase 2.5-4: Advanced CLI modules ──────────────────────────────────────────
-from aiterm.cli import agents as agents_cli
-from aiterm.cli import memory as memory_cli
-from aiterm.cli import styles as styles_cli
-from aiterm.cli import plugins as plugins_cli
-from aiterm.cli import gemini as gemini_cli
-from aiterm.cli import statusbar as statusbar_cli
-from aiterm.cli import statusline as statusline_cli
-from aiterm.cli import terminals as terminals_cli
-from aiterm.cli import workflows as workflows_cli
-from aiterm.cli import sessions as sessions_cli
-from aiterm.cli import craft as craft_cli
-from aiterm.cli import release as release_cli
-from aiterm.cli import learn as learn_cli
-
-app.add_typer(agents_cli.app, name="agents")
-app.add_typer(memory_cli.app, name="memory")
-app.add_typer(styles_cli.app, name="styles")
-app.add_typer(plugins_cli.app, name="plugins")
-app.add_typer(gemini_cli.app, name="gemini")
-app.add_typer(statusbar_cli.app, name="statusbar")
-app.add_typer(statusline_cli.app, name="statusline")
-app.add_typer(terminals_cli.app, name="terminals")
-app.add_typer(workflows_cli.app, name="workflows")
-app.add_typer(workflows_cli.app, name="recipes", hidden=True)  # Alias for workflows
-app.add_typer(sessions_cli.app, name="sessions")
-app.add_typer(craft_cli.app, name="craft")
-app.add_typer(release_cli.app, name="release")
-app.add_typer(learn_cli.app, name="learn")
-
-
 if __name__ == "__main__":
     app()
@@ -7,6 +7,9 @@ Supports two session systems:
    - Active sessions in ~/.claude/sessions/active/
    - Archived sessions in ~/.claude/sessions/history/YYYY-MM-DD/
 2. Manual session tracking (start/end commands with centralized history)
+
+Hook manifests are queried through an SQLite index that imports new and
+changed files incrementally (see aiterm.claude.session_index).
 """
 
 from __future__ import annotations
@@ -221,10 +224,9 @@ class LiveSession:
         return f"{minutes}m"
 
     @classmethod
-    def from_file(cls, filepath: Path) -> LiveSession | None:
-        """Load session from JSON file."""
+    def from_dict(cls, data: dict[str, Any]) -> LiveSession | None:
+        """Create from a parsed session manifest."""
         try:
-            data = json.loads(filepath.read_text())
             started = datetime.fromisoformat(data["started"].replace("Z", "+00:00"))
             ended = None
             if data.get("ended"):
@@ -241,8 +243,19 @@ class LiveSession:
                 ended=ended,
                 status=data.get("status", "active"),
             )
-        except (json.JSONDecodeError, OSError, KeyError):
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+
+    @classmethod
+    def from_file(cls, filepath: Path) -> LiveSession | None:
+        """Load session from JSON file."""
+        try:
+            data = json.loads(filepath.read_text())
+        except (json.JSONDecodeError, OSError):
+            return None
+        if not isinstance(data, dict):
             return None
+        return cls.from_dict(data)
 
 
 def get_live_sessions_dir() -> Path:
@@ -250,46 +263,140 @@ def get_live_sessions_dir() -> Path:
     return Path.home() / ".claude" / "sessions"
 
 
-def load_live_sessions() -> list[LiveSession]:
-    """Load all active sessions from hook-created files."""
+def _synced_index():
+    """Get the session index, up to date with the manifests.
+
+    Returns:
+        SessionIndex, or None if it is unavailable (callers then scan files)
+    """
+    from aiterm.claude.session_index import get_index
+
+    index = get_index(get_live_sessions_dir())
+    return index if index.sync() else None
+
+
+def _from_manifests(manifests: list[dict[str, Any]]) -> list[LiveSession]:
+    """Convert parsed manifests, skipping invalid ones."""
+    sessions = (LiveSession.from_dict(data) for data in manifests)
+    return [session for session in sessions if session]
+
+
+def _scan_sessions(
+    directories: list[Path],
+    project: str | None,
+    path: str | None,
+    limit: int | None,
+    offset: int,
+) -> list[LiveSession]:
+    """Load sessions by parsing every manifest (used without the index)."""
+    sessions = []
+    for directory in directories:
+        for session_file in directory.glob("*.json"):
+            session = LiveSession.from_file(session_file)
+            if session:
+                sessions.append(session)
+
+    if project:
+        sessions = [s for s in sessions if project.lower() in s.project.lower()]
+    if path:
+        sessions = [s for s in sessions if path in s.path]
+
+    sessions = sorted(sessions, key=lambda s: s.started, reverse=True)[offset:]
+    return sessions if limit is None else sessions[:limit]
+
+
+def load_live_sessions(
+    project: str | None = None,
+    path: str | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+) -> list[LiveSession]:
+    """Load active sessions from hook-created files, most recent first.
+
+    Args:
+        project: Case-insensitive substring of the project name.
+        path: Substring of the project path.
+        limit: Page size (None for all).
+        offset: Sessions to skip.
+    """
     active_dir = get_live_sessions_dir() / "active"
     if not active_dir.exists():
         return []
 
-    sessions = []
-    for session_file in active_dir.glob("*.json"):
-        session = LiveSession.from_file(session_file)
-        if session:
-            sessions.append(session)
+    index = _synced_index()
+    if index is not None:
+        return _from_manifests(
+            index.query(archived=False, project=project, path=path, limit=limit, offset=offset)
+        )
+    return _scan_sessions([active_dir], project, path, limit, offset)
 
-    return sorted(sessions, key=lambda s: s.started, reverse=True)
 
+def count_live_sessions(project: str | None = None, path: str | None = None) -> int:
+    """Count active sessions matching the load_live_sessions() filters.
 
-def load_archived_sessions(date: str | None = None) -> list[LiveSession]:
-    """Load archived sessions from history directory."""
+    Args:
+        project: Case-insensitive substring of the project name.
+        path: Substring of the project path.
+    """
+    active_dir = get_live_sessions_dir() / "active"
+    if not active_dir.exists():
+        return 0
+
+    index = _synced_index()
+    if index is not None:
+        return index.count(archived=False, project=project, path=path)
+    return len(_scan_sessions([active_dir], project, path, None, 0))
+
+
+def load_archived_sessions(
+    date: str | None = None,
+    project: str | None = None,
+    limit: int | None = None,
+    offset: int = 0,
+) -> list[LiveSession]:
+    """Load archived sessions from history directory, most recent first.
+
+    Args:
+        date: Date to load (YYYY-MM-DD); None for all dates.
+        project: Case-insensitive substring of the project name.
+        limit: Page size (None for all).
+        offset: Sessions to skip.
+    """
     history_dir = get_live_sessions_dir() / "history"
     if not history_dir.exists():
         return []
 
-    sessions = []
+    index = _synced_index()
+    if index is not None:
+        return _from_manifests(
+            index.query(archived=True, date=date, project=project, limit=limit, offset=offset)
+        )
+
     if date:
-        # Load specific date
-        date_dir = history_dir / date
-        if date_dir.exists():
-            for session_file in date_dir.glob("*.json"):
-                session = LiveSession.from_file(session_file)
-                if session:
-                    sessions.append(session)
+        directories = [history_dir / date] if (history_dir / date).exists() else []
     else:
-        # Load all dates
-        for date_dir in sorted(history_dir.iterdir(), reverse=True):
-            if date_dir.is_dir():
-                for session_file in date_dir.glob("*.json"):
-                    session = LiveSession.from_file(session_file)
-                    if session:
-                        sessions.append(session)
+        directories = [d for d in history_dir.iterdir() if d.is_dir()]
+    return _scan_sessions(directories, project, None, limit, offset)
+
+
+def load_archive_dates(limit: int | None = None) -> list[tuple[str, int]]:
+    """List history dates with their session counts, newest first.
+
+    Args:
+        limit: Maximum number of dates (None for all).
+    """
+    history_dir = get_live_sessions_dir() / "history"
+    if not history_dir.exists():
+        return []
+
+    index = _synced_index()
+    if index is not None:
+        return index.dates(limit)
 
-    return sorted(sessions, key=lambda s: s.started, reverse=True)
+    dates = sorted([d.name for d in history_dir.iterdir() if d.is_dir()], reverse=True)
+    if limit is not None:
+        dates = dates[:limit]
+    return [(d, len(list((history_dir / d).glob("*.json")))) for d in dates]
 
 
 def find_conflicts() -> dict[str, list[LiveSession]]:
@@ -306,6 +413,18 @@ def find_conflicts() -> dict[str, list[LiveSession]]:
     return {path: slist for path, slist in by_path.items() if len(slist) > 1}
 
 
+def _page_bounds(limit: int, page: int) -> tuple[int, int]:
+    """Get (limit, offset) for a 1-based page."""
+    limit = max(limit, 1)
+    return limit, (max(page, 1) - 1) * limit
+
+
+def _print_more(has_more: bool, page: int) -> None:
+    """Point to the next page if there is one."""
+    if has_more:
+        console.print(f"[dim]More sessions: --page {max(page, 1) + 1}[/]")
+
+
 # =============================================================================
 # Hook-Based Session Commands
 # =============================================================================
@@ -315,18 +434,18 @@ def find_conflicts() -> dict[str, list[LiveSession]]:
 def sessions_live(
     project: str = typer.Option(None, "--project", "-p", help="Filter by project name."),
     path: str = typer.Option(None, "--path", help="Filter by path."),
+    limit: int = typer.Option(50, "--limit", "-l", help="Sessions per page."),
+    page: int = typer.Option(1, "--page", help="Page to show."),
 ) -> None:
     """Show active Claude Code sessions (hook-based).
 
     Displays sessions registered by the session-register.sh hook.
     These are live Claude Code sessions currently running.
     """
-    sessions = load_live_sessions()
-
-    if project:
-        sessions = [s for s in sessions if project.lower() in s.project.lower()]
-    if path:
-        sessions = [s for s in sessions if path in s.path]
+    limit, offset = _page_bounds(limit, page)
+    sessions = load_live_sessions(project=project, path=path, limit=limit + 1, offset=offset)
+    has_more = len(sessions) > limit
+    sessions = sessions[:limit]
 
     if not sessions:
         console.print("[dim]No active Claude Code sessions.[/]")
@@ -355,8 +474,12 @@ def sessions_live(
             task,
         )
 
+    total = count_live_sessions(project=project, path=path) if has_more or offset else len(sessions)
+    shown = f"{len(sessions)} of " if total > len(sessions) else ""
+
     console.print(table)
-    console.print(f"\n[dim]{len(sessions)} active session(s)[/]")
+    console.print(f"\n[dim]{shown}{total} active session(s)[/]")
+    _print_more(has_more, page)
 
 
 @app.command("conflicts")
@@ -391,6 +514,7 @@ def sessions_history(
     date: str = typer.Option(None, "--date", "-d", help="Show specific date (YYYY-MM-DD)."),
     limit: int = typer.Option(20, "--limit", "-l", help="Number of sessions to show."),
     project: str = typer.Option(None, "--project", "-p", help="Filter by project."),
+    page: int = typer.Option(1, "--page", help="Page to show."),
 ) -> None:
     """Browse archived sessions from hook history.
 
@@ -398,30 +522,21 @@ def sessions_history(
     """
     if date is None:
         # Show available dates
-        history_dir = get_live_sessions_dir() / "history"
-        if not history_dir.exists():
-            console.print("[dim]No archived sessions yet.[/]")
-            return
-
-        dates = sorted([d.name for d in history_dir.iterdir() if d.is_dir()], reverse=True)
+        dates = load_archive_dates(limit=10)
         if not dates:
             console.print("[dim]No archived sessions yet.[/]")
             return
 
         console.print("[bold cyan]Archived Session Dates[/]\n")
-        for d in dates[:10]:
-            date_dir = history_dir / d
-            count = len(list(date_dir.glob("*.json")))
+        for d, count in dates:
             console.print(f"  {d}  ({count} sessions)")
 
         console.print(f"\n[dim]Use --date YYYY-MM-DD to view specific date[/]")
         return
 
-    sessions = load_archived_sessions(date)
-
-    if project:
-        sessions = [s for s in sessions if project.lower() in s.project.lower()]
-
+    limit, offset = _page_bounds(limit, page)
+    sessions = load_archived_sessions(date, project=project, limit=limit + 1, offset=offset)
+    has_more = len(sessions) > limit
     sessions = sessions[:limit]
 
     if not sessions:
@@ -448,6 +563,7 @@ def sessions_history(
         )
 
     console.print(table)
+    _print_more(has_more, page)
 
 
 @app.command("task")
@@ -508,54 +624,101 @@ def sessions_task(
         console.print("[red]Session file not found.[/]")
 
 
-@app.command("prune")
-def sessions_prune(
-    dry_run: bool = typer.Option(False, "--dry-run", "-n", help="Show what would be archived."),
-) -> None:
-    """Archive stale sessions whose processes are no longer running.
-
-    Checks each active session's PID and moves stale ones to history.
-    Useful when Claude Code exits without triggering the cleanup hook
-    (crash, force quit, terminal close).
-    """
-    import subprocess
-    from datetime import date
-
-    active_dir = get_live_sessions_dir() / "active"
-    if not active_dir.exists():
-        console.print("[dim]No active sessions directory.[/]")
-        return
+def find_stale_sessions(active_dir: Path) -> tuple[list[tuple[LiveSession, Path]], int]:
+    """Find active sessions whose process is gone.
 
-    session_files = list(active_dir.glob("*.json"))
-    if not session_files:
-        console.print("[green]✓ No active sessions to check.[/]")
-        return
+    All PIDs are checked in one pass (see aiterm.claude.liveness). A PID
+    now held by a process newer than the session counts as gone.
 
-    stale = []
-    alive = []
+    Returns:
+        Tuple of ((session, manifest) pairs that are stale, live session count).
+    """
+    from aiterm.claude.liveness import is_session_process, probe_processes
 
-    for session_file in session_files:
+    sessions = []
+    for session_file in active_dir.glob("*.json"):
         session = LiveSession.from_file(session_file)
-        if not session:
-            continue
+        if session:
+            sessions.append((session, session_file))
+
+    live = probe_processes(session.pid for session, _ in sessions)
+    stale = [
+        (session, session_file)
+        for session, session_file in sessions
+        if not is_session_process(session.pid, session.started.timestamp(), live)
+    ]
+    return stale, len(sessions) - len(stale)
+
+
+def archive_manifests(
+    manifests: list[Path], history_dir: Path, status: str = "pruned"
+) -> tuple[list[Path], list[tuple[Path, Exception]]]:
+    """Move session manifests to a history directory, marking them ended.
+
+    Each manifest is rewritten to a temporary file next to it and renamed
+    into history/ in one step, so history never holds a partial manifest;
+    the active file is removed afterwards. Repeating an interrupted move
+    replaces the history copy.
+
+    Args:
+        manifests: Active manifests to archive.
+        history_dir: Destination (history/YYYY-MM-DD), created if needed.
+        status: Status recorded in the archived manifests.
+
+    Returns:
+        Tuple of (archived manifests, (manifest, error) failures).
+    """
+    ended = datetime.now().astimezone().isoformat()
+    archived: list[Path] = []
+    failed: list[tuple[Path, Exception]] = []
+
+    try:
+        history_dir.mkdir(parents=True, exist_ok=True)
+    except OSError as e:
+        return archived, [(manifest, e) for manifest in manifests]
 
-        # Check if PID is still running
+    for manifest in manifests:
+        temp = manifest.with_name(f".{manifest.name}.tmp")
         try:
-            result = subprocess.run(
-                ["ps", "-p", str(session.pid)],
-                capture_output=True,
-            )
-            if result.returncode == 0:
-                alive.append((session, session_file))
-            else:
-                stale.append((session, session_file))
-        except Exception:
-            # Can't check, assume stale
-            stale.append((session, session_file))
+            data = json.loads(manifest.read_text())
+            data["ended"] = ended
+            data["status"] = status
+            temp.write_text(json.dumps(data, indent=2))
+            os.replace(temp, history_dir / manifest.name)
+            manifest.unlink()
+            archived.append(manifest)
+        except (OSError, ValueError) as e:
+            failed.append((manifest, e))
+            try:
+                temp.unlink()
+            except OSError:
+                pass
+
+    return archived, failed
+
+
+def _prune_once(active_dir: Path, dry_run: bool, quiet: bool = False) -> int:
+    """Run one prune pass.
+
+    Args:
+        active_dir: Active sessions directory.
+        dry_run: Only report stale sessions.
+        quiet: Print nothing unless sessions are archived (watch mode).
+
+    Returns:
+        Number of archived sessions.
+    """
+    from datetime import date
+
+    stale, alive = find_stale_sessions(active_dir)
 
     if not stale:
-        console.print(f"[green]✓ All {len(alive)} session(s) are active.[/]")
-        return
+        if not quiet:
+            if alive:
+                console.print(f"[green]✓ All {alive} session(s) are active.[/]")
+            else:
+                console.print("[green]✓ No active sessions to check.[/]")
+        return 0
 
     console.print(f"Found [yellow]{len(stale)}[/] stale session(s):\n")
 
@@ -564,34 +727,54 @@ def sessions_prune(
 
     if dry_run:
         console.print(f"\n[dim]Use without --dry-run to archive these.[/]")
-        return
+        return 0
 
     # Archive stale sessions
     today = date.today().isoformat()
     history_dir = get_live_sessions_dir() / "history" / today
-    history_dir.mkdir(parents=True, exist_ok=True)
+    archived, failed = archive_manifests([session_file for _, session_file in stale], history_dir)
 
-    archived = 0
-    for session, session_file in stale:
-        try:
-            # Update session with ended time
-            data = json.loads(session_file.read_text())
-            data["ended"] = datetime.now().astimezone().isoformat()
-            data["status"] = "pruned"
-
-            # Write to history
-            dest = history_dir / session_file.name
-            dest.write_text(json.dumps(data, indent=2))
-
-            # Remove from active
-            session_file.unlink()
-            archived += 1
-        except OSError as e:
-            console.print(f"[red]Failed to archive {session.session_id}: {e}[/]")
-
-    console.print(f"\n[green]✓ Archived {archived} stale session(s) to history/{today}/[/]")
-    if alive:
-        console.print(f"[dim]{len(alive)} session(s) still active.[/]")
+    sessions_by_file = {session_file: session for session, session_file in stale}
+    for session_file, e in failed:
+        console.print(f"[red]Failed to archive {sessions_by_file[session_file].session_id}: {e}[/]")
+
+    console.print(f"\n[green]✓ Archived {len(archived)} stale session(s) to history/{today}/[/]")
+    if alive and not quiet:
+        console.print(f"[dim]{alive} session(s) still active.[/]")
+    return len(archived)
+
+
+@app.command("prune")
+def sessions_prune(
+    dry_run: bool = typer.Option(False, "--dry-run", "-n", help="Show what would be archived."),
+    watch: bool = typer.Option(False, "--watch", "-w", help="Keep running and prune periodically."),
+    interval: float = typer.Option(60.0, "--interval", "-i", help="Seconds between prunes with --watch."),
+) -> None:
+    """Archive stale sessions whose processes are no longer running.
+
+    Checks each active session's PID and moves stale ones to history.
+    Useful when Claude Code exits without triggering the cleanup hook
+    (crash, force quit, terminal close).
+    """
+    import time
+
+    active_dir = get_live_sessions_dir() / "active"
+
+    if not watch:
+        if not active_dir.exists():
+            console.print("[dim]No active sessions directory.[/]")
+            return
+        _prune_once(active_dir, dry_run)
+        return
+
+    console.print(f"[dim]Pruning stale sessions every {interval:g}s (Ctrl+C to stop)...[/]")
+    try:
+        while True:
+            if active_dir.exists():
+                _prune_once(active_dir, dry_run, quiet=True)
+            time.sleep(max(interval, 1.0))
+    except KeyboardInterrupt:
+        console.print("\n[dim]Stopped.[/]")
 
 
 @app.command("current")
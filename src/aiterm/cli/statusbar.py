@@ -17,6 +17,8 @@ from rich.panel import Panel
 from rich.table import Table
 from rich.syntax import Syntax
 
+from aiterm.claude.settings_cache import read_json_cached
+
 app = typer.Typer(
     help="Build and customize status bars.",
     no_args_is_help=True,
@@ -122,15 +124,10 @@ def get_claude_settings_path() -> Path:
 
 def load_current_statusbar() -> dict[str, Any] | None:
     """Load current status bar config from Claude Code settings."""
-    settings_path = get_claude_settings_path()
-    if not settings_path.exists():
-        return None
-
-    try:
-        data = json.loads(settings_path.read_text())
-        return data.get("statusLine")
-    except (json.JSONDecodeError, OSError):
+    data = read_json_cached(get_claude_settings_path())
+    if not isinstance(data, dict):
         return None
+    return data.get("statusLine")
 
 
 def save_statusbar_to_settings(config: StatusBarConfig) -> bool:
@@ -23,6 +23,9 @@ app = typer.Typer(
 )
 console = Console()
 
+# statusLine.command values that run aiterm's renderer
+STATUSLINE_COMMANDS = ('ait statusline render', 'ait-statusline')
+
 # Config subcommand group
 config_app = typer.Typer(name="config", help="Manage statusLine configuration")
 app.add_typer(config_app, name="config")
@@ -35,6 +38,18 @@ app.add_typer(theme_app, name="theme")
 hooks_app = typer.Typer(name="hooks", help="Manage statusLine hooks (Claude Code v2.1+)")
 app.add_typer(hooks_app, name="hooks")
 
+# Daemon subcommand group
+daemon_app = typer.Typer(name="daemon", help="Manage the statusLine render daemon")
+app.add_typer(daemon_app, name="daemon")
+
+# Cache subcommand group
+cache_app = typer.Typer(name="cache", help="Inspect and clear statusLine caches")
+app.add_typer(cache_app, name="cache")
+
+# Background agent registry subcommand group
+agents_app = typer.Typer(name="agents", help="Manage the background agent registry")
+app.add_typer(agents_app, name="agents")
+
 
 # =============================================================================
 # Config Commands
@@ -74,7 +89,7 @@ def config_list(
     category: Optional[str] = typer.Option(
         None,
         "--category", "-c",
-        help="Filter by category (display, git, project, usage, theme, time)"
+        help="Filter by category (display, git, project, usage, theme, time, performance)"
     ),
     format: str = typer.Option(
         "table",
@@ -249,6 +264,9 @@ def config_set(
         except ValueError:
             console.print(f"[red]Invalid integer: {value}[/]")
             raise typer.Exit(1)
+    elif schema_def['type'] == 'list' and isinstance(value, str):
+        # Comma-separated, e.g. "model,time,lines"
+        value = [item.strip() for item in value.split(',') if item.strip()]
 
     # Validate and set
     try:
@@ -457,19 +475,21 @@ def config_validate():
 \b
 Examples:
   ait statusline config preset minimal    # Minimal statusLine (no bloat)
+  ait statusline config preset fast       # Skip segments that read files or fork
   ait statusline config preset default    # Restore default settings
 """
 )
 def config_preset(
     preset_name: str = typer.Argument(
         ...,
-        help="Preset name (minimal, default)"
+        help="Preset name (minimal, fast, default)"
     )
 ):
     """Apply configuration preset.
 
     Presets:
       minimal - Clean statusLine without time-tracking bloat
+      fast    - Only segments built from the payload and cached files
       default - Restore all default settings
     """
     config = StatusLineConfig()
@@ -483,6 +503,9 @@ def config_preset(
             'display.show_weekly_usage': False,
             'usage.show_reset_timer': False,
         },
+        'fast': {
+            'performance.max_cost': 'cached',
+        },
         'default': {}  # Will trigger full reset
     }
 
@@ -1074,24 +1097,430 @@ def statusline_render():
     """Render statusLine output (called by Claude Code).
 
     This command reads JSON from stdin and outputs formatted statusLine.
+    Uses the render daemon when it is running, otherwise renders in-process.
     """
-    from aiterm.statusline.renderer import StatusLineRenderer
+    import sys
+    from aiterm.statusline.client import render_in_process, request_render, write_stdout
+
+    payload = sys.stdin.buffer.read()
+
+    # Escapes and both lines in one write (no Rich formatting)
+    data = request_render(payload)  # Fast path: warm daemon
+    if data is None:
+        # Render in-process (errors become a minimal statusLine); late
+        # segments may finish after the write
+        render_in_process(payload, write_stdout)
+    else:
+        write_stdout(data)
+
+
+# =============================================================================
+# Daemon Commands
+# =============================================================================
+
+
+@daemon_app.command(
+    "start",
+    epilog="""
+\b
+Examples:
+  ait statusline daemon start               # Start in the background
+  ait statusline daemon start --foreground  # Run in this terminal
+"""
+)
+def daemon_start(
+    foreground: bool = typer.Option(
+        False,
+        "--foreground", "-f",
+        help="Run in the foreground (Ctrl+C to stop)"
+    )
+):
+    """Start the render daemon (keeps renderer, config and caches warm)."""
+    from aiterm.statusline import daemon
+
+    if foreground:
+        console.print(f"[dim]Listening on {daemon.get_socket_path()}[/]")
+        daemon.serve()
+        return
+
+    pid = daemon.start_daemon()
+    if pid is None:
+        console.print("[red]✗[/] Daemon did not start")
+        console.print(f"[dim]See log: {daemon.get_log_path()}[/]")
+        raise typer.Exit(1)
+
+    console.print(f"[green]✓[/] StatusLine daemon running (pid {pid})")
+    console.print(f"[dim]Socket: {daemon.get_socket_path()}[/]")
+
+
+@daemon_app.command("stop")
+def daemon_stop():
+    """Stop the render daemon."""
+    from aiterm.statusline import daemon
+
+    if daemon.stop_daemon():
+        console.print("[green]✓[/] StatusLine daemon stopped")
+    else:
+        console.print("[yellow]StatusLine daemon is not running[/]")
+
+
+@daemon_app.command("status")
+def daemon_status():
+    """Show render daemon status."""
+    from aiterm.statusline import daemon
+
+    status = daemon.ping()
+    if status is None:
+        console.print("[yellow]StatusLine daemon is not running[/]")
+        console.print("[dim]Renders fall back to in-process. Start with 'ait statusline daemon start'[/]")
+        return
+
+    table = Table(title="StatusLine Daemon", show_header=False)
+    table.add_column("Field", style="cyan")
+    table.add_column("Value", style="green")
+    table.add_row("PID", str(status['pid']))
+    table.add_row("Socket", str(daemon.get_socket_path()))
+    table.add_row("Uptime", f"{status['uptime']}s")
+    table.add_row("Requests", str(status['requests']))
+    table.add_row("Errors", str(status['errors']))
+    console.print(table)
+
+
+# =============================================================================
+# Cache Commands
+# =============================================================================
+
+
+@cache_app.command(
+    "stats",
+    epilog="""
+\b
+Examples:
+  ait statusline cache stats  # Show cache sizes and hit rates
+"""
+)
+def cache_stats():
+    """Show statusLine cache statistics."""
+    from datetime import datetime
+    from aiterm.statusline.budget import SegmentRunner
+    from aiterm.statusline.gitstatus import GitSnapshotCache
+
+    config = StatusLineConfig()
+    stats = GitSnapshotCache.from_config(config).stats()
+
+    lookups = stats['hits'] + stats['misses']
+    hit_rate = f"{stats['hits'] / lookups:.0%}" if lookups else "-"
+
+    table = Table(title="StatusLine Caches")
+    table.add_column("Cache", style="cyan")
+    table.add_column("Entries", justify="right")
+    table.add_column("Hits", justify="right")
+    table.add_column("Misses", justify="right")
+    table.add_column("Hit Rate", justify="right", style="green")
+    table.add_column("Size", justify="right")
+    table.add_column("Path", style="dim")
+
+    table.add_row(
+        f"git status (ttl {stats['ttl']}s, max {stats['max_repos']})",
+        str(stats['entries']),
+        str(stats['hits']),
+        str(stats['misses']),
+        hit_rate,
+        f"{stats['size']} B",
+        stats['path'],
+    )
+
+    segments = SegmentRunner.from_config(config).stats()
+    table.add_row(
+        f"segment outputs (budget {segments['budget_ms']}ms)",
+        str(segments['entries']),
+        "-",
+        str(segments['misses']),
+        "-",
+        f"{segments['size']} B",
+        segments['path'],
+    )
+
+    console.print(table)
+
+    if segments['by_segment']:
+        misses = Table(title="Segment Budget Misses")
+        misses.add_column("Segment", style="cyan")
+        misses.add_column("Misses", justify="right")
+        misses.add_column("Last Reason")
+        misses.add_column("Last", style="dim")
+        for name, entry in sorted(segments['by_segment'].items()):
+            last = datetime.fromtimestamp(entry.get('last', 0)).strftime('%Y-%m-%d %H:%M:%S')
+            misses.add_row(name, str(entry.get('count', 0)), entry.get('reason', '-'), last)
+        console.print(misses)
+
+
+@cache_app.command(
+    "clear",
+    epilog="""
+\b
+Examples:
+  ait statusline cache clear  # Remove all statusLine caches
+"""
+)
+def cache_clear():
+    """Clear statusLine caches."""
+    from aiterm.statusline.budget import SegmentRunner
+    from aiterm.statusline.gitstatus import GitSnapshotCache
 
-    # Create renderer
-    renderer = StatusLineRenderer()
+    config = StatusLineConfig()
+    cleared = False
+    if GitSnapshotCache.from_config(config).clear():
+        console.print("[green]✓[/] Cleared git status cache")
+        cleared = True
+    if SegmentRunner.from_config(config).clear():
+        console.print("[green]✓[/] Cleared segment output cache")
+        cleared = True
+    if not cleared:
+        console.print("[dim]No cache to clear[/]")
+
+
+# =============================================================================
+# Agent Registry Commands
+# =============================================================================
+
+
+@agents_app.command(
+    "list",
+    epilog="""
+\b
+Examples:
+  ait statusline agents list              # All sessions
+  ait statusline agents list -s SESSION   # One session
+"""
+)
+def agents_list(
+    session_id: Optional[str] = typer.Option(
+        None,
+        "--session", "-s",
+        help="Only show this session"
+    )
+):
+    """List running background agents from the registry."""
+    from datetime import datetime
+    from aiterm.statusline.agents import AgentRegistry
+
+    registry = AgentRegistry()
+    sessions = {sid: agents for sid, agents in registry.agents(session_id).items() if agents}
+    if not sessions:
+        console.print("[dim]No running agents registered[/]")
+        return
+
+    table = Table(title="Background Agents")
+    table.add_column("Session", style="cyan")
+    table.add_column("Agent")
+    table.add_column("Name")
+    table.add_column("PID", justify="right")
+    table.add_column("Started", style="dim")
+    for sid, agents in sorted(sessions.items()):
+        for agent_id, entry in sorted(agents.items(), key=lambda item: item[1].get('started', 0)):
+            started = datetime.fromtimestamp(entry.get('started', 0)).strftime('%Y-%m-%d %H:%M:%S')
+            pid = entry.get('pid')
+            table.add_row(sid, agent_id, entry.get('name') or "-", str(pid) if pid else "-", started)
+    console.print(table)
+    console.print(f"[dim]Registry: {registry.path}[/]")
+
+
+@agents_app.command(
+    "register",
+    epilog="""
+\b
+Examples:
+  ait statusline agents register SESSION build-1 --pid 4242
+"""
+)
+def agents_register(
+    session_id: str = typer.Argument(..., help="Claude Code session ID"),
+    agent_id: str = typer.Argument(..., help="Agent ID (unique within the session)"),
+    pid: Optional[int] = typer.Option(None, "--pid", help="Agent process ID (enables liveness checks)"),
+    name: Optional[str] = typer.Option(None, "--name", help="Agent type or description"),
+):
+    """Record a started background agent."""
+    from aiterm.statusline.agents import AgentRegistry
+
+    AgentRegistry().register(session_id, agent_id, pid=pid, name=name)
+    console.print(f"[green]✓[/] Registered agent {agent_id}")
+
+
+@agents_app.command("unregister")
+def agents_unregister(
+    session_id: str = typer.Argument(..., help="Claude Code session ID"),
+    agent_id: Optional[str] = typer.Argument(None, help="Agent ID (default: oldest agent)"),
+):
+    """Remove a stopped background agent."""
+    from aiterm.statusline.agents import AgentRegistry
+
+    if AgentRegistry().unregister(session_id, agent_id):
+        console.print("[green]✓[/] Agent removed")
+    else:
+        console.print("[yellow]No matching agent registered[/]")
+
+
+@agents_app.command(
+    "hook",
+    epilog="""
+\b
+Use as the command of SubagentStart, SubagentStop and SessionEnd hooks
+in ~/.claude/settings.json:
+  {"type": "command", "command": "ait statusline agents hook"}
+"""
+)
+def agents_hook():
+    """Update the registry from a Claude Code hook event (JSON on stdin)."""
+    import json
+    import sys
+    from aiterm.statusline.agents import AgentRegistry, find_hook_owner
 
-    # Render (reads from stdin)
     try:
-        output = renderer.render()
-        # Print directly to stdout (no Rich formatting)
-        import sys
-        sys.stdout.write(output)
-        sys.stdout.flush()
-    except Exception as e:
-        # On error, output minimal statusLine
-        import sys
-        sys.stdout.write(f"╭─ ⚠️  StatusLine Error\n╰─ {str(e)[:50]}")
-        sys.stdout.flush()
+        event = json.loads(sys.stdin.read() or '{}')
+    except ValueError:
+        raise typer.Exit(0)  # Never fail the hook
+    if not isinstance(event, dict) or not event.get('session_id'):
+        raise typer.Exit(0)
+
+    registry = AgentRegistry()
+    session_id = event['session_id']
+    hook_event = event.get('hook_event_name')
+    agent_id = event.get('agent_id')
+
+    if hook_event == 'SubagentStart':
+        registry.register(
+            session_id,
+            agent_id or f"agent-{os.getpid()}",
+            name=event.get('agent_type'),
+            owner=find_hook_owner(),
+        )
+    elif hook_event == 'SubagentStop':
+        registry.unregister(session_id, agent_id)
+    elif hook_event == 'SessionEnd':
+        registry.clear_session(session_id)
+
+
+@app.command(
+    "bench",
+    epilog="""
+\b
+Examples:
+  ait statusline bench                          # Full benchmark suite
+  ait statusline bench -n 50 -o bench.json      # More samples, save JSON
+  ait statusline bench --transcript-sizes 1,10  # Skip the 100MB transcript
+  ait statusline bench --compare bench.json     # Compare against a baseline
+"""
+)
+def statusline_bench(
+    iterations: int = typer.Option(
+        20,
+        "--iterations", "-n",
+        min=1,
+        help="Timed renders per segment and scenario"
+    ),
+    output: Optional[Path] = typer.Option(
+        None,
+        "--output", "-o",
+        help="Write results as JSON"
+    ),
+    transcript_sizes: str = typer.Option(
+        "1,10,100",
+        "--transcript-sizes",
+        help="Comma-separated transcript sizes in MB"
+    ),
+    untracked: int = typer.Option(
+        10_000,
+        "--untracked",
+        min=0,
+        help="Untracked files in the 'untracked' repo (0 to skip)"
+    ),
+    worktrees: int = typer.Option(
+        20,
+        "--worktrees",
+        min=0,
+        help="Linked worktrees in the 'worktrees' repo (0 to skip)"
+    ),
+    stashes: int = typer.Option(
+        50,
+        "--stashes",
+        min=0,
+        help="Stash entries in the 'stashes' repo (0 to skip)"
+    ),
+    cold: bool = typer.Option(
+        False,
+        "--cold",
+        help="Clear caches before every sample (first-render latency)"
+    ),
+    baseline: Optional[Path] = typer.Option(
+        None,
+        "--compare",
+        exists=True,
+        dir_okay=False,
+        help="Baseline JSON from an earlier run"
+    ),
+):
+    """Benchmark statusLine render latency.
+
+    Builds synthetic repositories (clean, dirty, many untracked files,
+    many worktrees, many stashes) and transcripts, then reports
+    p50/p95/p99 latency per segment and for the full render.
+    """
+    import json
+    from aiterm.statusline import bench
+
+    try:
+        sizes = [float(size) for size in transcript_sizes.split(',') if size.strip()]
+    except ValueError:
+        console.print(f"[red]Invalid --transcript-sizes: {transcript_sizes}[/]")
+        raise typer.Exit(1)
+
+    baseline_results = None
+    if baseline:
+        try:
+            baseline_results = json.loads(baseline.read_text())
+        except (OSError, json.JSONDecodeError) as e:
+            console.print(f"[red]Cannot read baseline: {e}[/]")
+            raise typer.Exit(1)
+
+    results = bench.run_benchmarks(
+        iterations=iterations,
+        transcript_sizes_mb=sizes,
+        untracked_files=untracked,
+        worktrees=worktrees,
+        stashes=stashes,
+        cold=cold,
+        progress=lambda message: console.print(f"[dim]{message}[/]"),
+    )
+    diff = bench.compare(results, baseline_results) if baseline_results else {}
+
+    table = Table(title=f"StatusLine Render Latency (ms, n={iterations})")
+    table.add_column("Scenario", style="cyan")
+    table.add_column("Segment")
+    table.add_column("p50", justify="right", style="green")
+    table.add_column("p95", justify="right")
+    table.add_column("p99", justify="right")
+    if diff:
+        table.add_column("vs baseline", justify="right")
+
+    for scenario, segments in results['scenarios'].items():
+        for segment, stats in segments.items():
+            row = [scenario, segment, f"{stats['p50']:.2f}", f"{stats['p95']:.2f}", f"{stats['p99']:.2f}"]
+            if diff:
+                ratio = diff.get(scenario, {}).get(segment, {}).get('ratio')
+                if ratio is None:
+                    row.append("-")
+                else:
+                    color = "red" if ratio > 1.1 else "green" if ratio < 0.9 else "dim"
+                    row.append(f"[{color}]{ratio:.2f}x[/]")
+            table.add_row(*row)
+            scenario = ""
+
+    console.print(table)
+
+    if output:
+        bench.write_results(results, output)
+        console.print(f"[green]✓[/] Results written to {output}")
 
 
 @app.command(
@@ -1099,16 +1528,24 @@ def statusline_render():
     epilog="""
 \b
 Examples:
-  ait statusline install  # Update Claude Code settings
+  ait statusline install           # Update Claude Code settings
+  ait statusline install --client  # Use the lightweight daemon client
 """
 )
-def statusline_install():
+def statusline_install(
+    client: bool = typer.Option(
+        False,
+        "--client",
+        help="Use the lightweight 'ait-statusline' client (pair with 'ait statusline daemon start')"
+    )
+):
     """Update Claude Code settings.json to use aiterm statusLine.
 
     This command will:
     1. Locate Claude Code settings.json
     2. Backup existing settings
     3. Update statusLine.command to use 'ait statusline render'
+       (or 'ait-statusline' with --client)
     4. Verify the installation
     """
     import json
@@ -1140,7 +1577,9 @@ def statusline_install():
     # Check current statusLine config
     current_statusline = settings.get('statusLine', {})
 
-    if current_statusline.get('command') == 'ait statusline render':
+    command = 'ait-statusline' if client else 'ait statusline render'
+
+    if current_statusline.get('command') == command:
         console.print("[yellow]StatusLine already installed![/]")
         console.print("\n[dim]Current configuration:[/]")
         console.print(json.dumps(current_statusline, indent=2))
@@ -1149,7 +1588,7 @@ def statusline_install():
     # Update settings
     settings['statusLine'] = {
         "type": "command",
-        "command": "ait statusline render"
+        "command": command
     }
 
     # Save updated settings
@@ -1169,6 +1608,8 @@ def statusline_install():
     console.print("  1. Restart Claude Code to see the new statusLine")
     console.print("  2. Run 'ait statusline config' to customize display")
     console.print("  3. Run 'ait statusline theme list' to see available themes")
+    if client:
+        console.print("  4. Run 'ait statusline daemon start' for the fastest renders")
 
 
 @app.command(
@@ -1287,7 +1728,7 @@ def statusline_doctor():
             if not statusline_config:
                 console.print("   [yellow]⚠[/] No statusLine configuration")
                 warnings.append("StatusLine not configured (run 'ait statusline install')")
-            elif statusline_config.get('command') == 'ait statusline render':
+            elif statusline_config.get('command') in STATUSLINE_COMMANDS:
                 console.print("   [green]✓[/] StatusLine configured correctly")
             else:
                 console.print("   [yellow]⚠[/] StatusLine using different command")
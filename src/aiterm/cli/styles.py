@@ -15,6 +15,8 @@ from rich.console import Console
 from rich.panel import Panel
 from rich.table import Table
 
+from aiterm.claude.settings_cache import read_json_cached
+
 app = typer.Typer(
     help="Manage Claude Code output styles.",
     no_args_is_help=True,
@@ -164,13 +166,9 @@ def list_all_styles() -> list[OutputStyle]:
 
 def get_current_style() -> str | None:
     """Get the currently active style from settings."""
-    settings_file = Path.home() / ".claude" / "settings.json"
-    if settings_file.exists():
-        try:
-            data = json.loads(settings_file.read_text())
-            return data.get("outputStyle")
-        except (json.JSONDecodeError, OSError):
-            pass
+    data = read_json_cached(Path.home() / ".claude" / "settings.json")
+    if isinstance(data, dict):
+        return data.get("outputStyle")
     return None
 
 
@@ -7,13 +7,19 @@ from __future__ import annotations
 
 import json
 import os
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 import typer
 from rich.console import Console
+from rich.markup import escape
 from rich.panel import Panel
 from rich.table import Table
 from rich.tree import Tree
@@ -822,6 +828,7 @@ def load_custom_workflow(name: str) -> dict | None:
             "description": data.get("description", "Custom workflow"),
             "steps": data.get("steps", []),
             "requires_session": data.get("requires_session", False),
+            "max_parallel": data.get("max_parallel", 1),
             "source": str(target),
         }
     except Exception:
@@ -854,6 +861,484 @@ def get_all_workflows() -> dict[str, dict]:
     return all_wf
 
 
+# =============================================================================
+# Workflow Execution
+# =============================================================================
+#
+# A run is a graph of steps. A step may declare an ``id`` and the ids it
+# ``needs``; a workflow whose steps declare no needs runs them in order, as
+# before. Workflows chained with + are separate graphs, so given more than
+# one job they run side by side.
+#
+# run_step_graph() starts every step whose needs have succeeded, at most
+# ``jobs`` at a time. Each command runs in its own process group and its
+# output is streamed line by line while it runs. The first failure stops
+# the run: waiting steps are not started and running ones are terminated.
+# The report keeps each step's timing for the critical-path summary.
+
+STEP_OK = "ok"
+STEP_FAILED = "failed"
+STEP_CANCELLED = "cancelled"
+
+# Seconds a terminated step may take to exit before it is killed
+STEP_KILL_TIMEOUT = 3.0
+
+
+@dataclass
+class WorkflowStep:
+    """A step in a run's dependency graph."""
+
+    key: str
+    workflow: str
+    index: int
+    task: str
+    command: str | None = None
+    needs: list[str] = field(default_factory=list)
+
+
+@dataclass
+class StepResult:
+    """Outcome and timing of a step (monotonic clock)."""
+
+    status: str
+    returncode: int | None = None
+    started: float = 0.0
+    finished: float = 0.0
+    error: str | None = None
+
+    @property
+    def duration(self) -> float:
+        """Seconds the step ran."""
+        return max(self.finished - self.started, 0.0)
+
+
+@dataclass
+class RunReport:
+    """Results of running a step graph."""
+
+    steps: dict[str, WorkflowStep]
+    results: dict[str, StepResult] = field(default_factory=dict)
+    jobs: int = 1
+    wall_time: float = 0.0
+
+    @property
+    def success(self) -> bool:
+        """Whether every step ran and succeeded."""
+        return all(
+            key in self.results and self.results[key].status == STEP_OK
+            for key in self.steps
+        )
+
+    @property
+    def failed(self) -> list[str]:
+        """Keys of failed steps, in graph order."""
+        return [
+            key for key in self.steps
+            if key in self.results and self.results[key].status == STEP_FAILED
+        ]
+
+    @property
+    def step_time(self) -> float:
+        """Total seconds spent in steps."""
+        return sum(result.duration for result in self.results.values())
+
+    def critical_path(self) -> tuple[list[str], float]:
+        """Find the chain of dependent steps that took longest.
+
+        Returns:
+            (step keys in run order, seconds along the path)
+        """
+        finish: dict[str, float] = {}
+        previous: dict[str, str | None] = {}
+        for key, step in self.steps.items():
+            result = self.results.get(key)
+            if result is None or not result.started:
+                continue
+            longest, via = 0.0, None
+            for need in step.needs:
+                if finish.get(need, 0.0) > longest:
+                    longest, via = finish[need], need
+            finish[key] = longest + result.duration
+            previous[key] = via
+
+        if not finish:
+            return [], 0.0
+
+        end = max(finish, key=finish.get)
+        path = []
+        key: str | None = end
+        while key is not None:
+            path.append(key)
+            key = previous[key]
+        return path[::-1], finish[end]
+
+
+def _step_needs(step: dict) -> list[str]:
+    """Read a step's ``needs`` (one id or a list of ids)."""
+    needs = step.get("needs") or []
+    if isinstance(needs, (str, int)):
+        needs = [needs]
+    return [str(need) for need in needs]
+
+
+def build_step_graph(workflows: list[tuple[str, dict]]) -> dict[str, WorkflowStep]:
+    """Build the dependency graph for a run.
+
+    Args:
+        workflows: (name, workflow) pairs in chain order
+
+    Returns:
+        Steps by key ("<workflow>:<id>"), ordered so that every step
+        comes after the steps it needs
+
+    Raises:
+        ValueError: If a workflow repeats, a step id repeats, a step needs
+            an unknown step, or the needs form a cycle
+    """
+    steps: dict[str, WorkflowStep] = {}
+    seen: set[str] = set()
+
+    for wf_name, wf in workflows:
+        if wf_name in seen:
+            raise ValueError(f"Workflow '{wf_name}' appears more than once")
+        seen.add(wf_name)
+
+        wf_steps = wf.get("steps", [])
+        linear = not any("needs" in step for step in wf_steps)
+        previous: str | None = None
+
+        for i, step in enumerate(wf_steps, 1):
+            step_id = str(step.get("id", i))
+            key = f"{wf_name}:{step_id}"
+            if key in steps:
+                raise ValueError(f"Duplicate step id '{step_id}' in workflow '{wf_name}'")
+
+            if linear:
+                needs = [previous] if previous else []
+            else:
+                needs = [f"{wf_name}:{need}" for need in _step_needs(step)]
+
+            steps[key] = WorkflowStep(
+                key=key,
+                workflow=wf_name,
+                index=i,
+                task=step.get("task", f"Step {i}"),
+                command=step.get("command"),
+                needs=needs,
+            )
+            previous = key
+
+    for step in steps.values():
+        for need in step.needs:
+            if need not in steps:
+                raise ValueError(
+                    f"Step '{step.key}' needs unknown step '{need.split(':', 1)[1]}'"
+                )
+
+    # Order by dependency depth, keeping declaration order within a level
+    ordered: dict[str, WorkflowStep] = {}
+    pending = list(steps)
+    while pending:
+        ready = [key for key in pending if all(need in ordered for need in steps[key].needs)]
+        if not ready:
+            raise ValueError(f"Dependency cycle between steps: {', '.join(pending)}")
+        for key in ready:
+            ordered[key] = steps[key]
+        pending = [key for key in pending if key not in ordered]
+
+    return ordered
+
+
+def get_max_parallel(workflows: list[tuple[str, dict]]) -> int:
+    """Get the largest ``max_parallel`` declared by the workflows (at least 1)."""
+    jobs = 1
+    for _, wf in workflows:
+        try:
+            jobs = max(jobs, int(wf.get("max_parallel", 1)))
+        except (TypeError, ValueError):
+            pass
+    return jobs
+
+
+def _stop_process(process: subprocess.Popen) -> None:
+    """Terminate a step's process group, killing it if it lingers."""
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+    except (AttributeError, OSError):
+        process.terminate()
+
+    try:
+        process.wait(timeout=STEP_KILL_TIMEOUT)
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except (AttributeError, OSError):
+            process.kill()
+
+
+class StepRunner:
+    """Run step commands, streaming their output, until stopped."""
+
+    def __init__(self, on_output: Callable[[WorkflowStep, str], None] | None = None):
+        self.on_output = on_output
+        self.stopping = threading.Event()
+        self._lock = threading.Lock()
+        self._processes: dict[str, subprocess.Popen] = {}
+
+    def run(self, step: WorkflowStep) -> StepResult:
+        """Run a step's command (called from pool threads).
+
+        Args:
+            step: Step to run
+
+        Returns:
+            The step's result; a step whose command exits non-zero after
+            stop() was called counts as cancelled rather than failed
+        """
+        result = StepResult(STEP_OK, started=time.monotonic())
+        if not step.command:
+            result.finished = time.monotonic()
+            return result
+
+        try:
+            process = subprocess.Popen(
+                step.command,
+                shell=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+                start_new_session=True,
+            )
+        except OSError as e:
+            result.status = STEP_FAILED
+            result.error = str(e)
+            result.finished = time.monotonic()
+            return result
+
+        with self._lock:
+            self._processes[step.key] = process
+        # stop() may have run before the process was registered
+        if self.stopping.is_set():
+            _stop_process(process)
+
+        try:
+            for line in process.stdout:
+                if self.on_output:
+                    self.on_output(step, line.rstrip("\n"))
+            result.returncode = process.wait()
+        finally:
+            process.stdout.close()
+            with self._lock:
+                self._processes.pop(step.key, None)
+
+        result.finished = time.monotonic()
+        if result.returncode != 0:
+            result.status = STEP_CANCELLED if self.stopping.is_set() else STEP_FAILED
+        return result
+
+    def stop(self) -> None:
+        """Terminate running commands and refuse to start new ones."""
+        self.stopping.set()
+        with self._lock:
+            processes = list(self._processes.values())
+        for process in processes:
+            _stop_process(process)
+
+
+def run_step_graph(
+    steps: dict[str, WorkflowStep],
+    jobs: int = 1,
+    on_start: Callable[[WorkflowStep], None] | None = None,
+    on_output: Callable[[WorkflowStep, str], None] | None = None,
+    on_finish: Callable[[WorkflowStep, StepResult], None] | None = None,
+) -> RunReport:
+    """Run a step graph, starting steps as soon as their needs succeed.
+
+    Ready steps start in graph order, so with one job the steps run
+    exactly in sequence. Callbacks run in the calling thread, except
+    on_output, which is called from the thread running the step.
+
+    Args:
+        steps: Graph from build_step_graph()
+        jobs: Maximum number of steps running at once
+        on_start: Called before a step starts
+        on_output: Called with each line a step's command prints
+        on_finish: Called when a step finishes
+
+    Returns:
+        Report with a result for every step (never-started steps are
+        cancelled)
+    """
+    report = RunReport(steps=steps, jobs=max(1, jobs))
+    runner = StepRunner(on_output)
+
+    position = {key: i for i, key in enumerate(steps)}
+    waiting = {key: set(step.needs) for key, step in steps.items()}
+    dependents: dict[str, list[str]] = {key: [] for key in steps}
+    for key, step in steps.items():
+        for need in step.needs:
+            dependents[need].append(key)
+
+    ready = [key for key, needs in waiting.items() if not needs]
+    running: dict[Future, str] = {}
+    started = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=report.jobs) as pool:
+        try:
+            while ready or running:
+                while ready and len(running) < report.jobs and not runner.stopping.is_set():
+                    key = ready.pop(0)
+                    if on_start:
+                        on_start(steps[key])
+                    running[pool.submit(runner.run, steps[key])] = key
+
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda f: position[running[f]]):
+                    key = running.pop(future)
+                    result = future.result()
+                    report.results[key] = result
+                    if on_finish:
+                        on_finish(steps[key], result)
+
+                    if result.status == STEP_FAILED:
+                        runner.stop()
+                    elif result.status == STEP_OK:
+                        for dependent in dependents[key]:
+                            waiting[dependent].discard(key)
+                            if not waiting[dependent]:
+                                ready.append(dependent)
+                ready.sort(key=position.get)
+        except KeyboardInterrupt:
+            runner.stop()
+            raise
+
+    report.wall_time = time.monotonic() - started
+    for key in steps:
+        report.results.setdefault(key, StepResult(STEP_CANCELLED))
+    return report
+
+
+def _format_seconds(seconds: float) -> str:
+    """Format a duration like 4.2s or 3m05s."""
+    if seconds < 60:
+        return f"{seconds:.1f}s"
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    return f"{minutes}m{seconds:02d}s"
+
+
+def print_step_plan(
+    steps: dict[str, WorkflowStep],
+    chained: bool,
+    descriptions: dict[str, str] | None = None,
+) -> None:
+    """Print what a dry run would do, with non-sequential needs."""
+    workflows = list(dict.fromkeys(step.workflow for step in steps.values()))
+    previous: dict[str, str] = {}
+    for step in sorted(steps.values(), key=lambda s: (workflows.index(s.workflow), s.index)):
+        if chained and step.workflow not in previous:
+            description = (descriptions or {}).get(step.workflow, "")
+            console.print(f"\n[bold cyan]▸ {step.workflow}[/] - {description}")
+        prefix = f"[{step.workflow}] " if chained else ""
+        console.print(f"[cyan]{escape(prefix)}Step {step.index}:[/] {step.task}")
+        if step.command:
+            console.print(f"  [dim]Would run: {escape(step.command)}[/]")
+        if step.needs and step.needs != [previous.get(step.workflow)]:
+            after = ", ".join(steps[need].task for need in step.needs)
+            console.print(f"  [dim]After: {escape(after)}[/]")
+        previous[step.workflow] = step.key
+
+
+def print_timing_summary(report: RunReport, chained: bool) -> None:
+    """Print wall time, step time and the critical path of a run."""
+    def label(key: str) -> str:
+        step = report.steps[key]
+        return f"{step.workflow} › {step.task}" if chained else step.task
+
+    jobs = f", {report.jobs} jobs" if report.jobs > 1 else ""
+    console.print(
+        f"\n[dim]Timing: {_format_seconds(report.wall_time)} wall, "
+        f"{_format_seconds(report.step_time)} in steps{jobs}[/]"
+    )
+
+    path, length = report.critical_path()
+    if len(path) > 1:
+        chain = " → ".join(
+            f"{escape(label(key))} ({_format_seconds(report.results[key].duration)})"
+            for key in path
+        )
+        console.print(f"[dim]Critical path ({_format_seconds(length)}): {chain}[/]")
+
+
+def execute_step_graph(
+    steps: dict[str, WorkflowStep],
+    jobs: int,
+    use_session: bool,
+    chained: bool,
+    descriptions: dict[str, str] | None = None,
+) -> RunReport:
+    """Run a step graph, printing progress and streaming output.
+
+    Args:
+        steps: Graph from build_step_graph()
+        jobs: Maximum number of steps running at once
+        use_session: Update the session task as steps start and fail
+        chained: Prefix steps with their workflow name
+        descriptions: Workflow descriptions, printed when a chained
+            workflow starts
+
+    Returns:
+        Report of the run
+    """
+    print_lock = threading.Lock()
+    headers: set[str] = set()
+
+    def prefix(step: WorkflowStep) -> str:
+        return f"[{step.workflow}] " if chained else ""
+
+    def on_start(step: WorkflowStep) -> None:
+        with print_lock:
+            if chained and step.workflow not in headers:
+                headers.add(step.workflow)
+                description = (descriptions or {}).get(step.workflow, "")
+                console.print(f"\n[bold cyan]▸ {step.workflow}[/] - {description}")
+            console.print(f"[cyan]{escape(prefix(step))}Step {step.index}:[/] {step.task}")
+        if use_session:
+            update_session_task(f"{prefix(step)}{step.task}")
+
+    def on_output(step: WorkflowStep, line: str) -> None:
+        # With several steps running, tag each line with its step
+        tag = f"{escape(prefix(step))}{step.index} │ " if jobs > 1 else "  "
+        with print_lock:
+            console.print(f"  [dim]{tag}[/]{escape(line)}", highlight=False)
+
+    def on_finish(step: WorkflowStep, result: StepResult) -> None:
+        name = f"{escape(prefix(step))}{step.task}"
+        took = _format_seconds(result.duration)
+        with print_lock:
+            if result.status == STEP_OK:
+                console.print(f"  [green]✓ {name} ({took})[/]")
+            elif result.status == STEP_CANCELLED:
+                console.print(f"  [yellow]○ {name} stopped[/]")
+            elif result.error:
+                console.print(f"  [red]✗ {name}: {escape(result.error)}[/]")
+            else:
+                console.print(f"  [red]✗ {name} failed (exit {result.returncode}, {took})[/]")
+        if use_session and result.status == STEP_FAILED:
+            update_session_task(f"{prefix(step)}FAILED: {step.task}")
+
+    return run_step_graph(
+        steps,
+        jobs=jobs,
+        on_start=on_start,
+        on_output=on_output,
+        on_finish=on_finish,
+    )
+
+
 @app.command("status")
 def workflows_status() -> None:
     """Check workflow readiness and session status.
@@ -899,59 +1384,27 @@ def run_single_workflow(
     use_session: bool,
     session: any,
     chain_context: str = "",
+    jobs: int | None = None,
 ) -> bool:
     """Run a single workflow. Returns True on success, False on failure."""
-    import subprocess
-
-    prefix = f"[{chain_context}] " if chain_context else ""
-    steps = wf.get("steps", [])
-
-    for i, step in enumerate(steps, 1):
-        task = step.get("task", f"Step {i}")
-
-        if dry_run:
-            console.print(f"[cyan]{prefix}Step {i}:[/] {task}")
-            if "command" in step:
-                console.print(f"  [dim]Would run: {step['command']}[/]")
-            continue
-
-        # Update session task
-        if use_session:
-            update_session_task(f"{prefix}{task}")
+    try:
+        steps = build_step_graph([(name, wf)])
+    except ValueError as e:
+        console.print(f"[red]{escape(str(e))}[/]")
+        return False
 
-        console.print(f"[cyan]{prefix}Step {i}:[/] {task}")
+    chained = bool(chain_context)
+    if dry_run:
+        print_step_plan(steps, chained)
+        return True
 
-        if "command" in step:
-            try:
-                result = subprocess.run(
-                    step["command"],
-                    shell=True,
-                    capture_output=True,
-                    text=True,
-                )
-                if result.returncode == 0:
-                    console.print(f"  [green]✓ Success[/]")
-                    if result.stdout.strip():
-                        lines = result.stdout.strip().split("\n")
-                        if len(lines) <= 5:
-                            for line in lines:
-                                console.print(f"    [dim]{line}[/]")
-                        else:
-                            console.print(f"    [dim]({len(lines)} lines of output)[/]")
-                else:
-                    console.print(f"  [red]✗ Failed (exit {result.returncode})[/]")
-                    if result.stderr.strip():
-                        console.print(f"    [red]{result.stderr.strip()[:200]}[/]")
-
-                    if use_session:
-                        update_session_task(f"{prefix}FAILED: {task}")
-                    return False
-
-            except Exception as e:
-                console.print(f"  [red]✗ Error: {e}[/]")
-                return False
-
-    return True
+    report = execute_step_graph(
+        steps,
+        jobs=jobs or get_max_parallel([(name, wf)]),
+        use_session=use_session,
+        chained=chained,
+    )
+    return report.success
 
 
 @app.command("run")
@@ -960,17 +1413,29 @@ def workflows_run(
     dry_run: bool = typer.Option(False, "--dry-run", "-n", help="Show what would be done."),
     no_session: bool = typer.Option(False, "--no-session", help="Run without session integration."),
     require_session: bool = typer.Option(False, "--require-session", help="Require active session."),
+    jobs: int = typer.Option(
+        None,
+        "--jobs",
+        "-j",
+        min=1,
+        help="Steps to run at once (default: the workflows' max_parallel, else 1).",
+    ),
 ) -> None:
     """Run a workflow with session awareness.
 
     Workflows can update the session task as they progress,
     giving visibility into what's happening.
 
-    Supports chaining multiple workflows with + separator.
+    Supports chaining multiple workflows with + separator. Steps
+    wait for the steps they list under ``needs`` (or, without any
+    needs, for the step before them); with --jobs above 1, steps
+    and chained workflows that do not depend on each other run
+    at the same time. The first failure stops the whole run.
 
     Examples:
         ait workflows run test
         ait workflows run lint+test+build
+        ait workflows run lint+test+build -j 3
         ait workflows run release --require-session
         ait workflows run lint --dry-run
     """
@@ -998,6 +1463,14 @@ def workflows_run(
             raise typer.Exit(1)
         workflows_to_run.append((wf_name, wf))
 
+    try:
+        steps = build_step_graph(workflows_to_run)
+    except ValueError as e:
+        console.print(f"[red]{escape(str(e))}[/]")
+        raise typer.Exit(1)
+
+    jobs = jobs or get_max_parallel(workflows_to_run)
+
     # Check session requirements
     session = get_current_live_session()
     session_available = session is not None
@@ -1020,6 +1493,8 @@ def workflows_run(
     is_chain = len(workflows_to_run) > 1
     if is_chain:
         chain_desc = " → ".join(wf_name for wf_name, _ in workflows_to_run)
+        if jobs > 1:
+            chain_desc += f"\n[dim]Up to {jobs} steps at once[/]"
         console.print(Panel(
             f"[bold]Workflow Chain[/]\n{chain_desc}",
             title=f"Running: {name}",
@@ -1040,33 +1515,36 @@ def workflows_run(
 
     console.print()
 
-    # Run each workflow in chain
-    completed = 0
-    for wf_name, wf in workflows_to_run:
-        if is_chain:
-            console.print(f"\n[bold cyan]▸ {wf_name}[/] - {wf['description']}")
-
-        chain_context = wf_name if is_chain else ""
-        success = run_single_workflow(
-            name=wf_name,
-            wf=wf,
-            dry_run=dry_run,
-            use_session=use_session,
-            session=session,
-            chain_context=chain_context,
+    descriptions = {wf_name: wf["description"] for wf_name, wf in workflows_to_run}
+    if dry_run:
+        print_step_plan(steps, is_chain, descriptions)
+        console.print("\n[dim]Dry run complete. No changes made.[/]")
+        return
+
+    report = execute_step_graph(
+        steps,
+        jobs=jobs,
+        use_session=use_session,
+        chained=is_chain,
+        descriptions=descriptions,
+    )
+    print_timing_summary(report, is_chain)
+
+    completed = sum(
+        1 for wf_name, _ in workflows_to_run
+        if all(
+            report.results[key].status == STEP_OK
+            for key, step in steps.items() if step.workflow == wf_name
         )
+    )
 
-        if not success:
-            console.print(f"\n[red]✗ Workflow chain failed at '{wf_name}'[/]")
+    if not report.success:
+        if is_chain:
+            failed_at = steps[report.failed[0]].workflow
+            console.print(f"\n[red]✗ Workflow chain failed at '{failed_at}'[/]")
             if completed > 0:
                 console.print(f"[dim]Completed {completed}/{len(workflows_to_run)} workflows[/]")
-            raise typer.Exit(1)
-
-        completed += 1
-
-    if dry_run:
-        console.print("\n[dim]Dry run complete. No changes made.[/]")
-        return
+        raise typer.Exit(1)
 
     # Clear session task on completion
     if use_session:
@@ -1166,6 +1644,7 @@ steps:
             f"[bold]Source:[/] {wf.get('source', 'N/A')}\n\n"
             f"[bold]Steps:[/]\n" +
             "\n".join(f"  {i}. {s.get('task', 'Step')}: {s.get('command', 'N/A')}"
+                       + (f" [dim](needs: {', '.join(_step_needs(s))})[/]" if s.get('needs') else "")
                      for i, s in enumerate(wf.get('steps', []), 1)),
             title=f"Custom Workflow: {name}",
             border_style="cyan",
@@ -1203,6 +1682,13 @@ steps:
 # Tips:
 # - Use requires_session: true for workflows that need Claude Code
 # - Steps run sequentially, chain fails on first error
+# - To run steps in parallel, give them an id and list the ids each
+#   step needs (steps with no needs start right away), e.g.
+#     - id: build
+#       task: Build
+#       command: make
+#       needs: [lint, test]
+#   and set max_parallel: 4 (or pass --jobs)
 # - Use 'ait workflows run {name}' to execute
 """
         yaml_file.write_text(template)
@@ -2,13 +2,24 @@
 
 Detects the type of project in a directory based on files and paths.
 Ported from zsh/iterm2-integration.zsh.
+
+``ait switch`` and ``ait detect`` run in a fresh process each time, so
+detection results are cached on disk (~/.cache/aiterm/contexts.json) and
+revalidated with a couple of stat() calls; git branch and dirty state
+come from the statusLine's GitSnapshotCache.
 """
 
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
-import subprocess
+from typing import Any, Dict, List, Optional, Tuple
+import os
+import time
+
+from aiterm.context.fingerprint import RACY_WINDOW_NS, ProjectFingerprint, get_fingerprint
+
+# Directories kept in the on-disk detection cache
+MAX_CACHED_CONTEXTS = 64
 
 
 class ContextType(Enum):
@@ -68,118 +79,75 @@ CONTEXT_CONFIG: Dict[ContextType, Dict[str, str]] = {
 def get_git_info(path: Path) -> tuple[Optional[str], bool]:
     """Get git branch name and dirty status.
 
+    Shares the statusLine's GitSnapshotCache: a fresh statusLine snapshot
+    of the repository is used as is, otherwise the dirty check stops at the
+    first change instead of listing every changed and untracked path.
+
     Returns:
         Tuple of (branch_name, is_dirty). branch_name is None if not a git repo.
     """
-    git_dir = path / ".git"
-    if not git_dir.exists():
-        # Check if we're in a subdirectory of a git repo
-        try:
-            result = subprocess.run(
-                ["git", "rev-parse", "--git-dir"],
-                cwd=path,
-                capture_output=True,
-                text=True,
-                timeout=2,
-            )
-            if result.returncode != 0:
-                return None, False
-        except (subprocess.TimeoutExpired, FileNotFoundError):
-            return None, False
-
-    # Get branch name
-    try:
-        result = subprocess.run(
-            ["git", "branch", "--show-current"],
-            cwd=path,
-            capture_output=True,
-            text=True,
-            timeout=2,
-        )
-        branch: Optional[str] = result.stdout.strip()
-
-        # If no branch (detached HEAD), try to get tag or show "detached"
-        if not branch:
-            result = subprocess.run(
-                ["git", "describe", "--tags", "--exact-match"],
-                cwd=path,
-                capture_output=True,
-                text=True,
-                timeout=2,
-            )
-            branch = result.stdout.strip() if result.returncode == 0 else "detached"
-
-        # Truncate long branch names
-        if branch and len(branch) > 20:
-            branch = f"{branch[:8]}…{branch[-8:]}"
-
-        # Check for uncommitted changes
-        result = subprocess.run(
-            ["git", "status", "--porcelain"],
-            cwd=path,
-            capture_output=True,
-            text=True,
-            timeout=2,
-        )
-        is_dirty: bool = bool(result.stdout.strip())
-
-        return branch, is_dirty
-
-    except (subprocess.TimeoutExpired, FileNotFoundError):
+    from aiterm.statusline.config import StatusLineConfig
+    from aiterm.statusline.gitstatus import GitSnapshotCache
+
+    status = GitSnapshotCache.from_config(StatusLineConfig()).get_branch_status(str(path))
+    if status is None:
         return None, False
 
+    # Truncate long branch names
+    branch: str = status.branch
+    if len(branch) > 20:
+        branch = f"{branch[:8]}…{branch[-8:]}"
+
+    return branch, status.dirty
+
 
 def _read_file_field(
-    path: Path, pattern: str, delimiter: str = " ", field: int = 1
+    fingerprint: ProjectFingerprint, name: str, pattern: str, delimiter: str = " ", field: int = 1
 ) -> Optional[str]:
-    """Read a field from a file matching a pattern."""
-    try:
-        content: str = path.read_text()
-        for line in content.splitlines():
-            if line.startswith(pattern):
-                parts: list[str] = line.split(delimiter, field + 1)
-                if len(parts) > field:
-                    return parts[field].strip().strip('"').strip("'")
-    except (OSError, UnicodeDecodeError):
-        pass
+    """Read a field from a marker file matching a pattern."""
+    content: Optional[str] = fingerprint.read_text(name)
+    if content is None:
+        return None
+    for line in content.splitlines():
+        if line.startswith(pattern):
+            parts: list[str] = line.split(delimiter, field + 1)
+            if len(parts) > field:
+                return parts[field].strip().strip('"').strip("'")
     return None
 
 
-def _get_json_field(path: Path, field: str) -> Optional[str]:
-    """Get a field from a JSON file."""
+def _get_json_field(fingerprint: ProjectFingerprint, name: str, field: str) -> Optional[str]:
+    """Get a field from a JSON marker file."""
+    import json
+
+    text: Optional[str] = fingerprint.read_text(name)
+    if text is None:
+        return None
     try:
-        import json
-
-        content: Any = json.loads(path.read_text())
-        if not isinstance(content, dict):
-            return None
-        value = content.get(field)
-        if isinstance(value, str):
-            return value
+        content: Any = json.loads(text)
+    except json.JSONDecodeError:
         return None
-    except (OSError, json.JSONDecodeError, UnicodeDecodeError):
+    if not isinstance(content, dict):
         return None
+    value = content.get(field)
+    if isinstance(value, str):
+        return value
+    return None
 
 
-def detect_context(path: Optional[Path] = None) -> ContextInfo:
-    """Detect the context/project type for a directory.
-
-    Args:
-        path: Directory to analyze. Defaults to current working directory.
+def _detect_project(current_path: Path) -> Tuple[ContextType, str, Optional[str]]:
+    """Detect the project type and name of a directory.
 
     Returns:
-        ContextInfo with detected type, name, icon, and profile.
+        Tuple of (type, name, marker file read for the name or None)
     """
-    current_path: Path = (path or Path.cwd()).resolve()
-
     # Default name is directory name
     name: str = current_path.name
     context_type: ContextType = ContextType.DEFAULT
+    marker: Optional[str] = None
 
-    # Get git info first (used for all types)
-    branch: Optional[str]
-    is_dirty: bool
-    branch, is_dirty = get_git_info(current_path)
+    # One directory scan answers every marker check below
+    fp: ProjectFingerprint = get_fingerprint(current_path)
 
     # Priority 1: Safety checks (production paths)
     path_str: str = str(current_path).lower()
@@ -191,60 +159,143 @@ def detect_context(path: Optional[Path] = None) -> ContextInfo:
         context_type = ContextType.AI_SESSION
 
     # Priority 3: MCP server detection
-    elif (current_path / "mcp-server").is_dir() or (
-        "mcp" in path_str and (current_path / "package.json").exists()
+    elif fp.has_dir("mcp-server") or (
+        "mcp" in path_str and fp.exists("package.json")
     ):
         context_type = ContextType.MCP_SERVER
 
     # Priority 4: Specific project types
-    elif (current_path / "DESCRIPTION").exists():
+    elif fp.exists("DESCRIPTION"):
         # R package
         context_type = ContextType.R_PACKAGE
-        pkg_name: Optional[str] = _read_file_field(
-            current_path / "DESCRIPTION", "Package:", ":", 1
-        )
+        marker = "DESCRIPTION"
+        pkg_name: Optional[str] = _read_file_field(fp, "DESCRIPTION", "Package:", ":", 1)
         if pkg_name:
             name = pkg_name
 
-    elif (current_path / "pyproject.toml").exists():
+    elif fp.exists("pyproject.toml"):
         # Python project
         context_type = ContextType.PYTHON
+        marker = "pyproject.toml"
         # Try to get project name from pyproject.toml
-        proj_name: Optional[str] = _read_file_field(
-            current_path / "pyproject.toml", "name", "=", 1
-        )
+        proj_name: Optional[str] = _read_file_field(fp, "pyproject.toml", "name", "=", 1)
         if proj_name:
             name = proj_name
 
-    elif (current_path / "package.json").exists():
+    elif fp.exists("package.json"):
         # Node.js project
         context_type = ContextType.NODE
-        pkg_name = _get_json_field(current_path / "package.json", "name")
+        marker = "package.json"
+        pkg_name = _get_json_field(fp, "package.json", "name")
         if pkg_name:
             name = pkg_name
 
-    elif (current_path / "_quarto.yml").exists():
+    elif fp.exists("_quarto.yml"):
         # Quarto project
         context_type = ContextType.QUARTO
-        title: Optional[str] = _read_file_field(
-            current_path / "_quarto.yml", "title:", ":", 1
-        )
+        marker = "_quarto.yml"
+        title: Optional[str] = _read_file_field(fp, "_quarto.yml", "title:", ":", 1)
         if title:
             name = title
 
-    elif any(
-        (current_path / f).exists()
-        for f in ["Cask", ".dir-locals.el", "init.el", "early-init.el"]
-    ):
+    elif any(fp.exists(f) for f in ["Cask", ".dir-locals.el", "init.el", "early-init.el"]):
         # Emacs project
         context_type = ContextType.EMACS
 
-    elif (current_path / ".git").is_dir() and any(
-        (current_path / d).is_dir() for d in ["commands", "scripts"]
-    ) or ((current_path / "bin").is_dir() and (current_path / "Makefile").exists()):
+    elif fp.has_dir(".git") and any(
+        fp.has_dir(d) for d in ["commands", "scripts"]
+    ) or (fp.has_dir("bin") and fp.exists("Makefile")):
         # Dev tools project
         context_type = ContextType.DEV_TOOLS
 
+    return context_type, name, marker
+
+
+def _stat_stamp(path: str) -> Optional[List[int]]:
+    """Get [mtime_ns, size, inode] for a path (None if missing)."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size, st.st_ino]
+
+
+def _cached_project(current_path: Path) -> Tuple[ContextType, str]:
+    """Detect the project type and name through the on-disk cache.
+
+    Entries are keyed by directory and reused while the stat results of the
+    directory (entries added, removed or renamed) and of the marker file
+    the name came from are unchanged. Results from within RACY_WINDOW_NS of
+    a change are not stored, so a second edit in the same timestamp tick
+    cannot be missed.
+
+    Returns:
+        Tuple of (type, name)
+    """
+    from aiterm.utils.cache import atomic_write_json, get_cache_dir, read_json
+
+    key = str(current_path)
+    cache_file = get_cache_dir() / "contexts.json"
+    data = read_json(cache_file)
+    if not isinstance(data, dict):
+        data = {}
+
+    dir_stamp = _stat_stamp(key)
+    entry = data.get(key)
+    if isinstance(entry, dict) and dir_stamp is not None and entry.get("dir") == dir_stamp:
+        marker = entry.get("marker")
+        marker_stamp = _stat_stamp(os.path.join(key, marker)) if marker else None
+        if entry.get("marker_stamp") == marker_stamp:
+            try:
+                return ContextType(entry["type"]), str(entry["name"])
+            except (KeyError, ValueError):
+                pass
+
+    context_type, name, marker = _detect_project(current_path)
+
+    marker_stamp = _stat_stamp(os.path.join(key, marker)) if marker else None
+    now_ns = time.time_ns()
+    settled = dir_stamp is not None and all(
+        now_ns - stamp[0] >= RACY_WINDOW_NS for stamp in (dir_stamp, marker_stamp) if stamp
+    )
+    if settled:
+        data.pop(key, None)
+        data[key] = {
+            "dir": dir_stamp,
+            "marker": marker,
+            "marker_stamp": marker_stamp,
+            "type": context_type.value,
+            "name": name,
+        }
+        # Oldest entries first (insertion order)
+        for old_key in list(data)[:max(len(data) - MAX_CACHED_CONTEXTS, 0)]:
+            del data[old_key]
+        atomic_write_json(cache_file, data)
+
+    return context_type, name
+
+
+def detect_context(path: Optional[Path] = None) -> ContextInfo:
+    """Detect the context/project type for a directory.
+
+    The project type and name are cached on disk per directory (see
+    _cached_project()); git info comes from the shared git snapshot cache.
+
+    Args:
+        path: Directory to analyze. Defaults to current working directory.
+
+    Returns:
+        ContextInfo with detected type, name, icon, and profile.
+    """
+    current_path: Path = (path or Path.cwd()).resolve()
+
+    # Get git info first (used for all types)
+    branch: Optional[str]
+    is_dirty: bool
+    branch, is_dirty = get_git_info(current_path)
+
+    context_type, name = _cached_project(current_path)
+
     # Get config for this type
     config: Dict[str, str] = CONTEXT_CONFIG[context_type]
 
@@ -0,0 +1,189 @@
+"""Project fingerprints from a single directory scan.
+
+Project detection asks the same questions over and over: does DESCRIPTION
+exist, is there a pyproject.toml, a .git directory, any *.Rcheck folders?
+Each ``Path.exists()`` is a separate stat, and the statusLine, window title
+and context detector all used to repeat them for the same directory.
+
+A ``ProjectFingerprint`` records the names and types of a directory's
+entries from one ``os.scandir`` call. Fingerprints are cached per directory
+and reused until the directory's mtime changes (which happens whenever an
+entry is added, removed or renamed). Small marker files such as DESCRIPTION
+are read through a second cache keyed by the file's own mtime and size, so
+in-place edits are still picked up.
+"""
+
+import os
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
+
+# Directories remembered per process
+MAX_CACHED_DIRS = 64
+
+# Marker files larger than this are not read
+MAX_READ_BYTES = 256 * 1024
+
+# Entries changed this close to the scan are rescanned next time, since a
+# second change within the filesystem's timestamp granularity would not
+# move the mtime (the same "racy" rule git uses for its index)
+RACY_WINDOW_NS = 2_000_000_000
+
+_fingerprints: Dict[str, Tuple[int, "ProjectFingerprint"]] = {}
+_file_texts: Dict[str, Tuple[int, int, int, Optional[str]]] = {}
+
+
+def _is_racy(mtime_ns: int, scanned_ns: int) -> bool:
+    """Check whether a cached scan may have missed a same-mtime change."""
+    return scanned_ns - mtime_ns < RACY_WINDOW_NS
+
+
+def read_text_cached(path: str) -> Optional[str]:
+    """Read a small text file, cached by (mtime, size).
+
+    Args:
+        path: File path
+
+    Returns:
+        File contents, or None if missing, too large or unreadable
+    """
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+
+    cached = _file_texts.get(path)
+    if cached and cached[:2] == (st.st_mtime_ns, st.st_size) and not _is_racy(st.st_mtime_ns, cached[2]):
+        return cached[3]
+
+    scanned_ns = time.time_ns()
+
+    text = None
+    if st.st_size <= MAX_READ_BYTES:
+        try:
+            with open(path, encoding='utf-8') as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError):
+            text = None
+
+    if path not in _file_texts and len(_file_texts) >= MAX_CACHED_DIRS:
+        _file_texts.pop(next(iter(_file_texts)))
+    _file_texts[path] = (st.st_mtime_ns, st.st_size, scanned_ns, text)
+    return text
+
+
+@dataclass(frozen=True)
+class ProjectFingerprint:
+    """Entries of one project directory."""
+
+    path: str
+    mtime_ns: int
+    files: FrozenSet[str]
+    dirs: FrozenSet[str]
+
+    def exists(self, name: str) -> bool:
+        """Check whether an entry (file or directory) exists."""
+        return name in self.files or name in self.dirs
+
+    def has_file(self, name: str) -> bool:
+        """Check whether a file (or symlink to one) exists."""
+        return name in self.files
+
+    def has_dir(self, name: str) -> bool:
+        """Check whether a directory exists."""
+        return name in self.dirs
+
+    def dirs_with_suffix(self, suffix: str) -> List[str]:
+        """Get directory names ending with a suffix (e.g. '.Rcheck')."""
+        return sorted(name for name in self.dirs if name.endswith(suffix))
+
+    def read_text(self, name: str) -> Optional[str]:
+        """Read a marker file in this directory (cached).
+
+        Args:
+            name: File name
+
+        Returns:
+            File contents, or None if it is not a readable file
+        """
+        if name not in self.files:
+            return None
+        return read_text_cached(os.path.join(self.path, name))
+
+    @property
+    def is_r_package(self) -> bool:
+        """Whether DESCRIPTION declares an R package."""
+        return 'Package:' in (self.read_text('DESCRIPTION') or '')
+
+    @property
+    def project_type(self) -> str:
+        """Get the statusLine project type (r-package/python/node/default)."""
+        if self.is_r_package:
+            return 'r-package'
+        if self.exists('pyproject.toml') or self.exists('setup.py'):
+            return 'python'
+        if self.exists('package.json'):
+            return 'node'
+        return 'default'
+
+
+def scan_directory(path: str) -> ProjectFingerprint:
+    """Fingerprint a directory with one scandir (no cache).
+
+    Args:
+        path: Directory path
+
+    Returns:
+        ProjectFingerprint (empty if the directory cannot be read)
+    """
+    files = set()
+    dirs = set()
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    continue
+                (dirs if is_dir else files).add(entry.name)
+    except OSError:
+        mtime_ns = 0
+
+    return ProjectFingerprint(path, mtime_ns, frozenset(files), frozenset(dirs))
+
+
+def get_fingerprint(path: Union[str, Path]) -> ProjectFingerprint:
+    """Get a directory fingerprint, rescanning only when its mtime changed.
+
+    Args:
+        path: Directory path
+
+    Returns:
+        ProjectFingerprint
+    """
+    path = str(path)
+    try:
+        mtime_ns = os.stat(path).st_mtime_ns
+    except OSError:
+        return ProjectFingerprint(path, 0, frozenset(), frozenset())
+
+    cached = _fingerprints.get(path)
+    if cached is not None:
+        scanned_ns, fingerprint = cached
+        if fingerprint.mtime_ns == mtime_ns and not _is_racy(mtime_ns, scanned_ns):
+            return fingerprint
+
+    scanned_ns = time.time_ns()
+    fingerprint = scan_directory(path)
+    if path not in _fingerprints and len(_fingerprints) >= MAX_CACHED_DIRS:
+        _fingerprints.pop(next(iter(_fingerprints)))
+    _fingerprints[path] = (scanned_ns, fingerprint)
+    return fingerprint
+
+
+def clear_cache() -> None:
+    """Forget all cached fingerprints and file contents."""
+    _fingerprints.clear()
+    _file_texts.clear()
@@ -2,19 +2,39 @@
 
 This module provides statusLine functionality for Claude Code,
 including rendering, configuration, and theme management.
+
+Exports are resolved lazily so that lightweight entry points (such as the
+render client in ``aiterm.statusline.client``) can import submodules without
+paying for the full renderer import.
 """
 
-from aiterm.statusline.config import StatusLineConfig
-from aiterm.statusline.renderer import StatusLineRenderer
-from aiterm.statusline.segments import (
-    ProjectSegment,
-    GitSegment,
-    ModelSegment,
-    TimeSegment,
-    ThinkingSegment,
-    LinesSegment,
-    UsageSegment,
-)
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from aiterm.statusline.config import StatusLineConfig
+    from aiterm.statusline.renderer import StatusLineRenderer
+    from aiterm.statusline.segments import (
+        ProjectSegment,
+        GitSegment,
+        ModelSegment,
+        TimeSegment,
+        ThinkingSegment,
+        LinesSegment,
+        UsageSegment,
+    )
+
+# Public name -> defining submodule
+_EXPORTS = {
+    'StatusLineConfig': 'aiterm.statusline.config',
+    'StatusLineRenderer': 'aiterm.statusline.renderer',
+    'ProjectSegment': 'aiterm.statusline.segments',
+    'GitSegment': 'aiterm.statusline.segments',
+    'ModelSegment': 'aiterm.statusline.segments',
+    'TimeSegment': 'aiterm.statusline.segments',
+    'ThinkingSegment': 'aiterm.statusline.segments',
+    'LinesSegment': 'aiterm.statusline.segments',
+    'UsageSegment': 'aiterm.statusline.segments',
+}
 
 __all__ = [
     'StatusLineConfig',
@@ -27,3 +47,16 @@ __all__ = [
     'LinesSegment',
     'UsageSegment',
 ]
+
+
+def __getattr__(name: str):
+    """Import exported names on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    import importlib
+
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
@@ -2,22 +2,270 @@
 
 This module detects running Task agents launched via run_in_background.
 
-Current implementation uses process detection as a placeholder.
-Future improvements could parse transcript files or use Claude Code's internal API.
+Agents are tracked in a registry (~/.cache/aiterm/agents.json) that Claude
+Code hooks update when a subagent starts or stops::
+
+    "hooks": {
+      "SubagentStart": [{"hooks": [{"type": "command", "command": "ait statusline agents hook"}]}],
+      "SubagentStop":  [{"hooks": [{"type": "command", "command": "ait statusline agents hook"}]}]
+    }
+
+so a render reads one small file instead of globbing directories and
+forking ``kill`` per PID file. Liveness of registered PIDs is checked with
+``os.kill(pid, 0)``, and counts are cached per session until the registry
+changes or AGENT_COUNT_TTL passes. Sessions the registry does not know fall
+back to the older PID-file directories.
+
+Hook events carry no agent PID, so the hook records the Claude Code process
+that ran it as the entry's owner. An entry dies with its owner, and entries
+without an owner expire after UNOWNED_AGENT_AGE in case a stop hook is
+missed.
 """
 
+import os
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterator, Optional, Tuple
 import subprocess
 import re
 
+from aiterm.claude.liveness import is_pid_alive
+from aiterm.statusline.cache import atomic_write_json, get_cache_dir, read_json
+
+# Seconds a session's agent count is reused (bounds how long a crashed agent
+# keeps being counted; registry writes invalidate the count immediately)
+AGENT_COUNT_TTL = 2.0
+
+# Entries without a PID are dropped after this many seconds (missed stop hook)
+MAX_AGENT_AGE = 6 * 3600
+
+# Entries with neither a PID nor an owner are dropped sooner (the session
+# idle window of the time segment)
+UNOWNED_AGENT_AGE = 15 * 60
+
+# Shells that may sit between Claude Code and a hook command
+_SHELLS = {'sh', 'bash', 'zsh', 'dash', 'fish', 'ksh'}
+
+# session_id -> (expires, registry (mtime_ns, size), count)
+_counts: Dict[str, Tuple[float, Tuple[int, int], int]] = {}
+
+
+def _parent_process(pid: int) -> Optional[Tuple[int, str]]:
+    """Get the parent PID and command name of a process.
+
+    Args:
+        pid: Process ID
+
+    Returns:
+        Tuple of (parent PID, command name of the parent) or None
+    """
+    try:
+        status = Path(f'/proc/{pid}/status').read_text()
+        ppid = int(re.search(r'^PPid:\s*(\d+)', status, re.MULTILINE).group(1))
+        name = Path(f'/proc/{ppid}/comm').read_text().strip()
+        return ppid, name
+    except (OSError, AttributeError, ValueError):
+        pass
+
+    try:
+        # No /proc (macOS): ask ps, which is fine outside the render path
+        result = subprocess.run(
+            ['ps', '-o', 'ppid=', '-p', str(pid)],
+            capture_output=True, text=True, timeout=1
+        )
+        ppid = int(result.stdout.strip())
+        result = subprocess.run(
+            ['ps', '-o', 'comm=', '-p', str(ppid)],
+            capture_output=True, text=True, timeout=1
+        )
+        return ppid, os.path.basename(result.stdout.strip())
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+
+def find_hook_owner() -> Optional[int]:
+    """Find the Claude Code process that ran the current hook command.
+
+    Walks up past the shell Claude Code runs hook commands with.
+
+    Returns:
+        PID of the owning process, or None if it cannot be determined
+    """
+    pid = os.getpid()
+    for _ in range(4):
+        parent = _parent_process(pid)
+        if parent is None or parent[0] <= 1:
+            return None
+        pid, name = parent
+        if name.lstrip('-') not in _SHELLS:
+            return pid
+    return None
+
+
+class AgentRegistry:
+    """Registry of background agents per session, updated by hooks."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """Initialize registry.
+
+        Args:
+            path: Registry file (default: ~/.cache/aiterm/agents.json)
+        """
+        self.path = path or get_cache_dir() / 'agents.json'
+
+    def _load(self) -> Dict[str, Dict[str, dict]]:
+        data = read_json(self.path)
+        if not isinstance(data, dict) or not isinstance(data.get('sessions'), dict):
+            return {}
+        return data['sessions']
+
+    @contextmanager
+    def _update(self) -> Iterator[Dict[str, Dict[str, dict]]]:
+        """Read-modify-write the registry under an exclusive lock."""
+        lock = None
+        try:
+            import fcntl
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            lock = open(self.path.with_name(self.path.name + '.lock'), 'w')
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        except (ImportError, OSError):
+            pass  # Unlocked update (Windows or unwritable cache dir)
+
+        try:
+            sessions = self._load()
+            yield sessions
+            for session_id in [s for s, agents in sessions.items() if not agents]:
+                del sessions[session_id]
+            atomic_write_json(self.path, {'sessions': sessions})
+        finally:
+            if lock is not None:
+                lock.close()
+
+    @staticmethod
+    def _is_live(entry: dict, now: float) -> bool:
+        pid = entry.get('pid')
+        if pid:
+            return is_pid_alive(pid)
+        age = now - entry.get('started', 0)
+        owner = entry.get('owner')
+        if owner:
+            return age < MAX_AGENT_AGE and is_pid_alive(owner)
+        return age < UNOWNED_AGENT_AGE
+
+    def register(
+        self,
+        session_id: str,
+        agent_id: str,
+        pid: Optional[int] = None,
+        name: Optional[str] = None,
+        owner: Optional[int] = None
+    ) -> None:
+        """Record a started agent (dead entries of the session are dropped).
+
+        Args:
+            session_id: Claude Code session ID
+            agent_id: Agent ID (unique within the session)
+            pid: Agent process ID, if known
+            name: Agent type or description
+            owner: Claude Code process ID, used when pid is unknown
+        """
+        now = time.time()
+        with self._update() as sessions:
+            agents = sessions.setdefault(session_id, {})
+            for other in [a for a, entry in agents.items() if not self._is_live(entry, now)]:
+                del agents[other]
+            agents[agent_id] = {'pid': pid, 'name': name, 'started': now}
+            if owner:
+                agents[agent_id]['owner'] = owner
+
+    def unregister(self, session_id: str, agent_id: Optional[str] = None) -> bool:
+        """Remove a stopped agent.
+
+        Args:
+            session_id: Claude Code session ID
+            agent_id: Agent ID (default: the oldest agent of the session)
+
+        Returns:
+            True if an entry was removed
+        """
+        with self._update() as sessions:
+            agents = sessions.get(session_id, {})
+            if agent_id is None and agents:
+                agent_id = min(agents, key=lambda a: agents[a].get('started', 0))
+            return agents.pop(agent_id, None) is not None
+
+    def clear_session(self, session_id: str) -> int:
+        """Remove all agents of a session.
+
+        Args:
+            session_id: Claude Code session ID
+
+        Returns:
+            Number of entries removed
+        """
+        with self._update() as sessions:
+            return len(sessions.pop(session_id, {}))
+
+    def agents(self, session_id: Optional[str] = None) -> Dict[str, Dict[str, dict]]:
+        """Get live registered agents.
+
+        Args:
+            session_id: Only this session (default: all sessions)
+
+        Returns:
+            Dict of session_id -> {agent_id: entry}
+        """
+        now = time.time()
+        sessions = self._load()
+        if session_id is not None:
+            sessions = {session_id: sessions.get(session_id, {})}
+        return {
+            sid: {a: entry for a, entry in agents.items() if self._is_live(entry, now)}
+            for sid, agents in sessions.items()
+        }
+
+    def running_count(self, session_id: str) -> Optional[int]:
+        """Count live agents of a session (cached for AGENT_COUNT_TTL).
+
+        Args:
+            session_id: Claude Code session ID
+
+        Returns:
+            Number of live agents, or None if the registry has no entries
+            for the session
+        """
+        try:
+            st = self.path.stat()
+        except OSError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+
+        now = time.monotonic()
+        cached = _counts.get(session_id)
+        if cached and cached[0] > now and cached[1] == stamp:
+            return cached[2]
+
+        agents = self._load().get(session_id)
+        if not agents:
+            return None
+
+        wall = time.time()
+        count = sum(1 for entry in agents.values() if self._is_live(entry, wall))
+        _counts[session_id] = (now + AGENT_COUNT_TTL, stamp, count)
+        return count
+
 
 class AgentDetector:
     """Detects running background agents in Claude Code sessions."""
 
-    def __init__(self):
-        """Initialize agent detector."""
-        pass
+    def __init__(self, registry: Optional[AgentRegistry] = None):
+        """Initialize agent detector.
+
+        Args:
+            registry: AgentRegistry (default: ~/.cache/aiterm/agents.json)
+        """
+        self.registry = registry or AgentRegistry()
 
     def get_running_count(self, session_id: Optional[str] = None) -> int:
         """Get count of running background agents.
@@ -28,14 +276,20 @@ class AgentDetector:
         Returns:
             Number of running agents (0 if detection unavailable)
         """
-        # PLACEHOLDER: Multiple detection strategies
+        if not session_id:
+            return 0
+
+        # Strategy 1: Hook-maintained registry
+        count = self.registry.running_count(session_id)
+        if count is not None:
+            return count
 
-        # Strategy 1: Check for agent tracking files
+        # Strategy 2: Check for agent tracking files
         count = self._check_agent_files(session_id)
         if count > 0:
             return count
 
-        # Strategy 2: Check process tree (less reliable)
+        # Strategy 3: Check process tree (less reliable)
         # Disabled for now as it may count unrelated processes
         # count = self._check_processes()
         # if count > 0:
@@ -92,15 +346,9 @@ class AgentDetector:
         if agent_file.suffix == '.pid':
             try:
                 pid = int(agent_file.read_text().strip())
-                # Check if process exists (works on Unix-like systems)
-                subprocess.run(
-                    ['kill', '-0', str(pid)],
-                    capture_output=True,
-                    check=True
-                )
-                return True
-            except (ValueError, subprocess.CalledProcessError, FileNotFoundError):
+            except (ValueError, OSError):
                 return False
+            return is_pid_alive(pid)
 
         # For other files, assume they exist = agent running
         # (Future: parse file content for status)
@@ -0,0 +1,417 @@
+"""Render latency benchmarks for the statusLine.
+
+Builds synthetic fixtures (git repositories in several states and JSONL
+transcripts of increasing size), times each segment class and the full
+StatusLineRenderer against them, and reports p50/p95/p99 latencies. Full
+renders are timed twice: with segments evaluated serially ('end_to_end') and
+concurrently ('end_to_end_parallel', see performance.parallel_segments).
+Results are plain JSON so runs from different versions can be compared.
+
+Usage:
+    ait statusline bench                         # Default fixtures
+    ait statusline bench --output bench.json     # Save results
+    ait statusline bench --compare old.json      # Compare against a baseline
+
+Fixtures and caches live in a temporary directory (AITERM_CACHE_DIR points
+there while the benchmark runs) so the user's caches are left untouched.
+"""
+
+import json
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional
+
+from aiterm.statusline.cache import CACHE_DIR_ENV
+
+# Segment classes timed individually
+SEGMENTS = ('ProjectSegment', 'GitSegment', 'TimeSegment', 'UsageSegment', 'AgentDetector')
+
+# Full renders: segments evaluated serially and concurrently
+END_TO_END = ('end_to_end', 'end_to_end_parallel')
+
+# Default fixture sizes
+DEFAULT_TRANSCRIPT_SIZES_MB = (1, 10, 100)
+DEFAULT_UNTRACKED_FILES = 10_000
+DEFAULT_WORKTREES = 20
+DEFAULT_STASHES = 50
+
+SESSION_ID = 'aiterm-bench'
+
+# Identity for fixture commits (independent of the user's git config)
+_GIT = ['git', '-c', 'user.name=aiterm-bench', '-c', 'user.email=bench@aiterm.invalid',
+        '-c', 'init.defaultBranch=main', '-c', 'commit.gpgsign=false']
+
+
+@dataclass
+class Scenario:
+    """One benchmark fixture."""
+
+    name: str
+    cwd: str
+    transcript_path: Optional[str] = None
+
+
+# ─── Statistics ──────────────────────────────────────────────────────────────
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Get a percentile using the nearest-rank method.
+
+    Args:
+        samples: Measurements
+        pct: Percentile (0-100)
+
+    Returns:
+        Percentile value (0.0 for no samples)
+    """
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil(n * pct / 100)
+    return ordered[int(rank) - 1]
+
+
+def summarize(samples_ms: List[float]) -> Dict[str, float]:
+    """Summarize latency samples (milliseconds).
+
+    Returns:
+        Dict with n, mean, min, p50, p95, p99, max
+    """
+    return {
+        'n': len(samples_ms),
+        'mean': round(sum(samples_ms) / len(samples_ms), 3) if samples_ms else 0.0,
+        'min': round(min(samples_ms), 3) if samples_ms else 0.0,
+        'p50': round(percentile(samples_ms, 50), 3),
+        'p95': round(percentile(samples_ms, 95), 3),
+        'p99': round(percentile(samples_ms, 99), 3),
+        'max': round(max(samples_ms), 3) if samples_ms else 0.0,
+    }
+
+
+# ─── Fixtures ────────────────────────────────────────────────────────────────
+
+
+def _git(cwd: Path, *args: str) -> None:
+    subprocess.run([*_GIT, '-C', str(cwd), *args], check=True, capture_output=True)
+
+
+def _init_repo(path: Path) -> Path:
+    """Create a repository with a small committed project."""
+    path.mkdir(parents=True)
+    (path / 'pyproject.toml').write_text('[project]\nname = "bench"\n')
+    (path / 'README.md').write_text('bench\n')
+    src = path / 'src'
+    src.mkdir()
+    for i in range(20):
+        (src / f'module_{i}.py').write_text(f'VALUE = {i}\n')
+    _git(path, 'init', '-q')
+    _git(path, 'add', '-A')
+    _git(path, 'commit', '-q', '-m', 'initial')
+    return path
+
+
+def build_repos(
+    root: Path,
+    untracked_files: int = DEFAULT_UNTRACKED_FILES,
+    worktrees: int = DEFAULT_WORKTREES,
+    stashes: int = DEFAULT_STASHES,
+) -> Dict[str, Path]:
+    """Build synthetic repositories.
+
+    Args:
+        root: Directory to build in
+        untracked_files: Untracked files in the 'untracked' repo
+        worktrees: Linked worktrees of the 'worktrees' repo
+        stashes: Stash entries in the 'stashes' repo
+
+    Returns:
+        Scenario name -> repository path
+    """
+    repos = {}
+
+    repos['repo-clean'] = _init_repo(root / 'clean')
+
+    dirty = _init_repo(root / 'dirty')
+    for i in range(10):
+        (dirty / 'src' / f'module_{i}.py').write_text(f'VALUE = {i + 100}\n')
+    (dirty / 'staged.py').write_text('STAGED = True\n')
+    _git(dirty, 'add', 'staged.py')
+    repos['repo-dirty'] = dirty
+
+    if untracked_files:
+        untracked = _init_repo(root / 'untracked')
+        per_dir = 500
+        for i in range(untracked_files):
+            subdir = untracked / 'data' / f'd{i // per_dir:03d}'
+            if i % per_dir == 0:
+                subdir.mkdir(parents=True)
+            (subdir / f'f{i}.txt').write_text('x')
+        repos['repo-untracked'] = untracked
+
+    if worktrees:
+        main = _init_repo(root / 'worktrees')
+        for i in range(worktrees):
+            _git(main, 'worktree', 'add', '-q', '-b', f'wt-{i}', str(root / f'worktree-{i}'))
+        repos['repo-worktrees'] = main
+
+    if stashes:
+        stashed = _init_repo(root / 'stashes')
+        for i in range(stashes):
+            (stashed / 'README.md').write_text(f'stash {i}\n')
+            _git(stashed, 'stash', '-q')
+        repos['repo-stashes'] = stashed
+
+    return repos
+
+
+def build_transcript(path: Path, size_bytes: int) -> Path:
+    """Write a synthetic JSONL transcript of roughly the given size.
+
+    Args:
+        path: Output path
+        size_bytes: Target size
+
+    Returns:
+        Path to the transcript
+    """
+    now = time.time()
+    text = 'lorem ipsum dolor sit amet ' * 40
+    with open(path, 'w') as f:
+        written = 0
+        i = 0
+        while written < size_bytes:
+            record = json.dumps({
+                'type': 'assistant' if i % 2 else 'user',
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S.000Z', time.gmtime(now - 3600 + i % 3600)),
+                'message': {'role': 'assistant', 'content': text},
+            })
+            f.write(record + '\n')
+            written += len(record) + 1
+            i += 1
+    return path
+
+
+def build_scenarios(
+    root: Path,
+    transcript_sizes_mb: Iterable[float] = DEFAULT_TRANSCRIPT_SIZES_MB,
+    untracked_files: int = DEFAULT_UNTRACKED_FILES,
+    worktrees: int = DEFAULT_WORKTREES,
+    stashes: int = DEFAULT_STASHES,
+) -> List[Scenario]:
+    """Build all fixtures and describe them as scenarios.
+
+    Transcript scenarios run in the clean repository.
+    """
+    repos = build_repos(root, untracked_files, worktrees, stashes)
+    scenarios = [Scenario(name, str(path)) for name, path in repos.items()]
+
+    for size_mb in transcript_sizes_mb:
+        transcript = build_transcript(root / f'transcript-{size_mb:g}mb.jsonl', int(size_mb * 1024 * 1024))
+        scenarios.append(Scenario(f'transcript-{size_mb:g}mb', str(repos['repo-clean']), str(transcript)))
+
+    return scenarios
+
+
+# ─── Timing ──────────────────────────────────────────────────────────────────
+
+
+def _bench_config():
+    """Get the user's config with every timed feature switched on (in memory only)."""
+    from aiterm.statusline.config import StatusLineConfig
+
+    config = StatusLineConfig()
+    config.override('time.show_productivity_indicator', True)
+    config.override('display.show_session_duration', True)
+    config.override('display.show_background_agents', True)
+    config.override('git.show_worktrees', True)
+    # Outdated-dependency probes hit the network from a background process
+    config.override('project.show_dependency_warnings', False)
+    return config
+
+
+def _reset_caches() -> None:
+    """Forget in-process and git snapshot caches (simulates a first render)."""
+    from aiterm.context import fingerprint
+    from aiterm.statusline import transcript
+    from aiterm.statusline.gitstatus import GitSnapshotCache
+
+    fingerprint.clear_cache()
+    transcript.clear_cache()
+    GitSnapshotCache().clear()
+
+
+def time_samples(fn: Callable[[], object], iterations: int, warmup: int = 1, cold: bool = False) -> List[float]:
+    """Time repeated calls.
+
+    Args:
+        fn: Callable to time
+        iterations: Timed calls
+        warmup: Untimed calls first
+        cold: Clear caches before every call
+
+    Returns:
+        Latencies in milliseconds
+    """
+    for _ in range(warmup):
+        fn()
+
+    samples = []
+    for _ in range(iterations):
+        if cold:
+            _reset_caches()
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def _payload(scenario: Scenario) -> str:
+    return json.dumps({
+        'workspace': {'current_dir': scenario.cwd, 'project_dir': scenario.cwd},
+        'model': {'display_name': 'Claude Sonnet 4.5'},
+        'output_style': {'name': 'default'},
+        'session_id': SESSION_ID,
+        'transcript_path': scenario.transcript_path,
+        'cost': {'total_lines_added': 120, 'total_lines_removed': 30},
+    })
+
+
+def _render(config, theme, payload: str, parallel: bool) -> bytes:
+    """Render once with segments evaluated serially or concurrently."""
+    from aiterm.statusline.renderer import StatusLineRenderer
+
+    config.override('performance.parallel_segments', parallel)
+    return StatusLineRenderer(config, theme).render_output(payload)
+
+
+def bench_scenario(scenario: Scenario, config, iterations: int, cold: bool = False) -> Dict[str, dict]:
+    """Time every segment class and the full render for one scenario.
+
+    Returns:
+        Segment name (or an END_TO_END mode) -> latency summary
+    """
+    from aiterm.statusline.agents import AgentDetector
+    from aiterm.statusline.segments import GitSegment, ProjectSegment, TimeSegment, UsageSegment
+    from aiterm.statusline.themes import get_theme
+
+    theme = get_theme(config.get('theme.name', 'purple-charcoal'))
+    cwd = scenario.cwd
+    payload = _payload(scenario)
+
+    targets = {
+        'ProjectSegment': lambda: ProjectSegment(config, theme).render(cwd, cwd),
+        'GitSegment': lambda: GitSegment(config, theme).render(cwd),
+        'TimeSegment': lambda: TimeSegment(config, theme).render(SESSION_ID, scenario.transcript_path),
+        'UsageSegment': lambda: UsageSegment(config, theme).render(),
+        'AgentDetector': lambda: AgentDetector().get_running_count(SESSION_ID),
+        'end_to_end': lambda: _render(config, theme, payload, parallel=False),
+        'end_to_end_parallel': lambda: _render(config, theme, payload, parallel=True),
+    }
+
+    results = {}
+    for name, fn in targets.items():
+        results[name] = summarize(time_samples(fn, iterations, cold=cold))
+    return results
+
+
+def run_benchmarks(
+    iterations: int = 20,
+    transcript_sizes_mb: Iterable[float] = DEFAULT_TRANSCRIPT_SIZES_MB,
+    untracked_files: int = DEFAULT_UNTRACKED_FILES,
+    worktrees: int = DEFAULT_WORKTREES,
+    stashes: int = DEFAULT_STASHES,
+    cold: bool = False,
+    root: Optional[Path] = None,
+    progress: Optional[Callable[[str], None]] = None,
+) -> dict:
+    """Build fixtures and run every scenario.
+
+    Args:
+        iterations: Timed renders per segment and scenario
+        transcript_sizes_mb: Transcript sizes to generate
+        untracked_files: Untracked files in the 'untracked' repo
+        worktrees: Linked worktrees in the 'worktrees' repo
+        stashes: Stash entries in the 'stashes' repo
+        cold: Clear caches before every sample
+        root: Fixture directory (temporary and removed if None)
+        progress: Optional callback for status messages
+
+    Returns:
+        JSON-serializable results
+    """
+    from aiterm import __version__
+
+    notify = progress or (lambda message: None)
+    tmp = None
+    if root is None:
+        tmp = tempfile.mkdtemp(prefix='aiterm-bench-')
+        root = Path(tmp)
+
+    saved_cache_dir = os.environ.get(CACHE_DIR_ENV)
+    os.environ[CACHE_DIR_ENV] = str(root / 'cache')
+    try:
+        notify('Building fixtures...')
+        scenarios = build_scenarios(root, transcript_sizes_mb, untracked_files, worktrees, stashes)
+        config = _bench_config()
+
+        results = {}
+        for scenario in scenarios:
+            notify(f'Running {scenario.name}...')
+            results[scenario.name] = bench_scenario(scenario, config, iterations, cold=cold)
+    finally:
+        if saved_cache_dir is None:
+            os.environ.pop(CACHE_DIR_ENV, None)
+        else:
+            os.environ[CACHE_DIR_ENV] = saved_cache_dir
+        if tmp:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    return {
+        'aiterm_version': __version__,
+        'python': platform.python_version(),
+        'platform': f"{platform.system()} {platform.release()} ({platform.machine()})",
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'iterations': iterations,
+        'cold': cold,
+        'scenarios': results,
+    }
+
+
+def compare(results: dict, baseline: dict, metric: str = 'p50') -> Dict[str, Dict[str, dict]]:
+    """Compare two benchmark runs.
+
+    Args:
+        results: Current run
+        baseline: Earlier run
+        metric: Statistic to compare (p50/p95/p99/mean)
+
+    Returns:
+        Scenario -> segment -> {'baseline', 'current', 'ratio'} for pairs
+        present in both runs
+    """
+    diff: Dict[str, Dict[str, dict]] = {}
+    for scenario, segments in results.get('scenarios', {}).items():
+        old_segments = baseline.get('scenarios', {}).get(scenario, {})
+        for segment, stats in segments.items():
+            if segment not in old_segments:
+                continue
+            old = old_segments[segment].get(metric, 0.0)
+            new = stats.get(metric, 0.0)
+            diff.setdefault(scenario, {})[segment] = {
+                'baseline': old,
+                'current': new,
+                'ratio': round(new / old, 3) if old else None,
+            }
+    return diff
+
+
+def write_results(results: dict, path: Path) -> None:
+    """Write benchmark results as JSON."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2) + '\n')
@@ -0,0 +1,382 @@
+"""Time budgets for statusLine segments.
+
+A statusLine render must come back quickly even when one segment hangs
+(git on a network filesystem, a slow venv python, an unreachable settings
+file on NFS home). Each segment is therefore run through a SegmentRunner:
+
+- The segment runs in a daemon thread and gets ``performance.segment_budget_ms``
+  to finish, capped by what is left of ``performance.render_deadline_ms``.
+- A segment that misses its budget is replaced by its last successful output
+  (persisted across renders) or omitted, and the miss is recorded.
+- A segment still running from an earlier render (only possible in the
+  daemon) is not started again; its fallback is used until it finishes.
+
+Budgets apply in the render daemon, whose late segment threads keep running
+and fill their caches for the next render. When such a thread finishes, its
+output is recorded as the segment's fallback (merged into the next runner's
+state and persisted by its save()), so a segment that is always slower than
+its budget still shows its latest output rather than nothing. A one-shot ``ait statusline
+render`` would abandon such threads when it exits, so a segment slower than
+its budget (git status in a huge repo) would never get its cache filled and
+would disappear for good. One-shot renders therefore run segments without
+budgets unless ``performance.one_shot_budgets`` is set; when it is, the
+process calls finish_late() after writing its output, giving late segments
+``performance.late_grace_ms`` to finish and be remembered.
+
+With ``performance.parallel_segments`` the renderer submits every segment
+first and collects the outputs in display order afterwards, so the
+subprocess waits in git, worktree and agent lookups overlap instead of
+adding up. Budgets then count from each segment's start.
+
+Last outputs and miss counts are stored in ~/.cache/aiterm/segments.json and
+shown by ``ait statusline cache stats``.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aiterm.statusline.cache import atomic_write_json, get_cache_dir, read_json
+
+# Defaults (overridable via performance.* config keys)
+DEFAULT_SEGMENT_BUDGET_MS = 200
+DEFAULT_RENDER_DEADLINE_MS = 500
+DEFAULT_LATE_GRACE_MS = 2000
+
+# Last outputs remembered (oldest dropped first)
+MAX_CACHED_OUTPUTS = 64
+
+# Segment threads still running from an earlier render, by key
+_running: Dict[str, threading.Thread] = {}
+_running_lock = threading.Lock()
+
+# Outputs of late segments that finished after their render, by cache file
+# and key (merged into the next runner's state)
+_late_outputs: Dict[str, Dict[str, Any]] = {}
+
+
+class _SegmentThread(threading.Thread):
+    """Daemon thread holding one segment's result."""
+
+    def __init__(self, key: str, fn: Callable[..., Any], args: tuple):
+        super().__init__(name=f"aiterm-segment-{key}", daemon=True)
+        self.key = key
+        self.fn = fn
+        self.args = args
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        # Set under _running_lock once the result is final
+        self.finished = False
+        # Called (under _running_lock) with (key, result) on success, if set
+        # before the thread finished
+        self.on_done: Optional[Callable[[str, Any], None]] = None
+
+    def run(self) -> None:
+        try:
+            self.result = self.fn(*self.args)
+        except BaseException as e:
+            self.error = e
+        finally:
+            with _running_lock:
+                self.finished = True
+                if _running.get(self.key) is self:
+                    del _running[self.key]
+                if self.on_done is not None and self.error is None:
+                    self.on_done(self.key, self.result)
+
+
+class PendingSegment:
+    """A segment started by SegmentRunner.submit()."""
+
+    __slots__ = ('name', 'key', 'thread', 'started', 'done', 'value', 'error')
+
+    def __init__(self, name: str, key: str):
+        self.name = name
+        self.key = key
+        self.thread: Optional[_SegmentThread] = None
+        self.started = 0.0
+        self.done = False
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SegmentRunner:
+    """Run segments under per-segment budgets and a render deadline."""
+
+    def __init__(
+        self,
+        segment_budget_ms: int = DEFAULT_SEGMENT_BUDGET_MS,
+        render_deadline_ms: int = DEFAULT_RENDER_DEADLINE_MS,
+        enabled: bool = True,
+        use_fallback: bool = True,
+        parallel: bool = False,
+        cache_file: Optional[Path] = None,
+    ):
+        """Initialize runner (the render deadline starts now).
+
+        Args:
+            segment_budget_ms: Milliseconds each segment may take
+            render_deadline_ms: Milliseconds for all budgeted segments together
+            enabled: Run segments inline without budgets when False
+            use_fallback: Replace late segments with their last output
+            parallel: Let submitted segments run concurrently
+            cache_file: Last-output file (default: ~/.cache/aiterm/segments.json)
+        """
+        self.segment_budget = segment_budget_ms / 1000
+        self.deadline = time.monotonic() + render_deadline_ms / 1000
+        self.enabled = enabled
+        self.use_fallback = use_fallback
+        self.parallel = parallel
+        self.cache_file = cache_file or get_cache_dir() / 'segments.json'
+        self.misses: Dict[str, str] = {}
+        # Segments that missed their budget but are still running
+        self.late: List[PendingSegment] = []
+        self._state: Optional[dict] = None
+        self._dirty = False
+
+    @classmethod
+    def from_config(cls, config, daemon: bool = False) -> 'SegmentRunner':
+        """Create a runner using performance.* settings.
+
+        Args:
+            config: StatusLineConfig instance
+            daemon: Whether the runner serves the render daemon (budgets
+                apply to one-shot renders only with performance.one_shot_budgets)
+
+        Returns:
+            SegmentRunner
+        """
+        enabled = config.get('performance.segment_budgets', True) and (
+            daemon or config.get('performance.one_shot_budgets', False)
+        )
+        return cls(
+            segment_budget_ms=config.get('performance.segment_budget_ms', DEFAULT_SEGMENT_BUDGET_MS),
+            render_deadline_ms=config.get('performance.render_deadline_ms', DEFAULT_RENDER_DEADLINE_MS),
+            enabled=enabled,
+            use_fallback=config.get('performance.fallback_to_cached', True),
+            parallel=config.get('performance.parallel_segments', False),
+        )
+
+    def _load_state(self) -> dict:
+        if self._state is None:
+            state = read_json(self.cache_file)
+            if not isinstance(state, dict):
+                state = {}
+            state.setdefault('outputs', {})
+            state.setdefault('misses', {})
+            self._state = state
+            self._merge_late()
+        return self._state
+
+    def _record_late(self, key: str, output: Any) -> None:
+        """Keep the output of a late segment that has now finished.
+
+        Runs in the segment thread with _running_lock held.
+        """
+        _late_outputs.setdefault(str(self.cache_file), {})[key] = output
+
+    def _merge_late(self) -> None:
+        """Remember outputs of late segments that finished since."""
+        with _running_lock:
+            late = _late_outputs.pop(str(self.cache_file), None)
+        for key, output in (late or {}).items():
+            self._remember(key, output)
+
+    def submit(self, name: str, fn: Callable[..., Any], *args: Any, key: Optional[str] = None) -> PendingSegment:
+        """Start a segment.
+
+        In serial mode this waits for the segment (within its budget) before
+        returning; in parallel mode the segment keeps running until result().
+
+        Args:
+            name: Segment name (used for miss statistics)
+            fn: Callable producing the segment output (JSON-serializable)
+            *args: Arguments for fn
+            key: Fallback key, e.g. including the directory (default: name)
+
+        Returns:
+            PendingSegment to pass to result()
+        """
+        pending = PendingSegment(name, key or name)
+
+        if not self.enabled and not self.parallel:
+            pending.value = fn(*args)
+            pending.done = True
+            return pending
+
+        pending.started = time.monotonic()
+        if self.enabled and self.deadline <= pending.started:
+            pending.value = self._miss(name, pending.key, 'deadline', 0.0)
+            pending.done = True
+            return pending
+
+        with _running_lock:
+            previous = _running.get(pending.key)
+            if previous is None or not previous.is_alive():
+                pending.thread = _SegmentThread(pending.key, fn, args)
+                _running[pending.key] = pending.thread
+        if pending.thread is None:
+            pending.value = self._miss(name, pending.key, 'busy', 0.0)
+            pending.done = True
+            return pending
+
+        pending.thread.start()
+        if not self.parallel:
+            self._wait(pending)
+        return pending
+
+    def _wait(self, pending: PendingSegment) -> None:
+        """Wait for a started segment until its budget or the deadline."""
+        thread = pending.thread
+        timeout = None
+        if self.enabled:
+            timeout = max(0.0, min(pending.started + self.segment_budget, self.deadline) - time.monotonic())
+        thread.join(timeout)
+        pending.done = True
+
+        with _running_lock:
+            late = not thread.finished
+            if late:
+                thread.on_done = self._record_late
+        if late:
+            elapsed_ms = (time.monotonic() - pending.started) * 1000
+            pending.value = self._miss(pending.name, pending.key, 'timeout', elapsed_ms)
+            self.late.append(pending)
+            return
+        if thread.error is not None:
+            pending.error = thread.error
+            return
+
+        pending.value = thread.result
+        self._remember(pending.key, thread.result)
+
+    def _remember(self, key: str, output: Any) -> None:
+        """Store a segment's latest output as its fallback."""
+        outputs = self._load_state()['outputs']
+        if key not in outputs or outputs[key] != output:
+            outputs.pop(key, None)
+            while len(outputs) >= MAX_CACHED_OUTPUTS:
+                outputs.pop(next(iter(outputs)))
+            outputs[key] = output
+            self._dirty = True
+
+    def result(self, pending: PendingSegment) -> Any:
+        """Get a submitted segment's output.
+
+        Args:
+            pending: Value returned by submit()
+
+        Returns:
+            Segment output, its last cached output if late, or "" if none
+
+        Raises:
+            Exception: Whatever the segment raised
+        """
+        if not pending.done:
+            self._wait(pending)
+        if pending.error is not None:
+            raise pending.error
+        return pending.value
+
+    def run(self, name: str, fn: Callable[..., Any], *args: Any, key: Optional[str] = None) -> Any:
+        """Run a segment within its budget and return its output.
+
+        Args:
+            name: Segment name (used for miss statistics)
+            fn: Callable producing the segment output (JSON-serializable)
+            *args: Arguments for fn
+            key: Fallback key, e.g. including the directory (default: name)
+
+        Returns:
+            Segment output, its last cached output if late, or "" if none
+        """
+        return self.result(self.submit(name, fn, *args, key=key))
+
+    def _miss(self, name: str, key: str, reason: str, elapsed_ms: float) -> Any:
+        """Record a missed budget and return the fallback output."""
+        self.misses[name] = reason
+
+        state = self._load_state()
+        entry = state['misses'].setdefault(name, {'count': 0})
+        entry['count'] += 1
+        entry['reason'] = reason
+        entry['elapsed_ms'] = round(elapsed_ms, 1)
+        entry['last'] = time.time()
+        self._dirty = True
+
+        if self.use_fallback:
+            return state['outputs'].get(key, "")
+        return ""
+
+    def finish_late(self, grace_ms: int = DEFAULT_LATE_GRACE_MS) -> int:
+        """Give segments that missed their budget time to finish.
+
+        Called by one-shot renders after writing their output, so a slow
+        segment still fills its own caches and leaves its output as the
+        fallback for the next render instead of being abandoned at exit.
+
+        Args:
+            grace_ms: Milliseconds to wait for all late segments together
+
+        Returns:
+            Number of late segments that finished
+        """
+        deadline = time.monotonic() + grace_ms / 1000
+        finished = 0
+        for pending in self.late:
+            pending.thread.join(max(0.0, deadline - time.monotonic()))
+            if not pending.thread.is_alive():
+                finished += 1
+        self.late = []
+        self.save()  # Remembers the finished outputs
+        return finished
+
+    def save(self) -> bool:
+        """Persist last outputs and misses if anything changed.
+
+        Returns:
+            True if the cache file was written
+        """
+        if self._state is not None:
+            self._merge_late()
+        if not self._dirty:
+            return False
+        self._dirty = False
+        return atomic_write_json(self.cache_file, self._load_state())
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cached output and miss statistics.
+
+        Returns:
+            Dict with entries, misses (total), by_segment, size, path
+        """
+        state = self._load_state()
+        try:
+            size = self.cache_file.stat().st_size
+        except OSError:
+            size = 0
+        return {
+            'entries': len(state['outputs']),
+            'misses': sum(entry.get('count', 0) for entry in state['misses'].values()),
+            'by_segment': dict(state['misses']),
+            'budget_ms': int(self.segment_budget * 1000),
+            'size': size,
+            'path': str(self.cache_file),
+        }
+
+    def clear(self) -> bool:
+        """Delete cached outputs and miss statistics.
+
+        Returns:
+            True if a cache file was removed
+        """
+        self._state = None
+        self._dirty = False
+        with _running_lock:
+            _late_outputs.pop(str(self.cache_file), None)
+        try:
+            self.cache_file.unlink()
+            return True
+        except OSError:
+            return False
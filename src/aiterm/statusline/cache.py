@@ -0,0 +1,16 @@
+"""On-disk cache helpers for the statusLine.
+
+StatusLine renders run as short-lived processes, so anything worth caching
+between renders has to live on disk. The helpers are shared with the rest of
+aiterm and live in aiterm.utils.cache; they are re-exported here for the
+statusLine modules.
+"""
+
+from aiterm.utils.cache import CACHE_DIR_ENV, atomic_write_json, get_cache_dir, read_json
+
+__all__ = [
+    'CACHE_DIR_ENV',
+    'atomic_write_json',
+    'get_cache_dir',
+    'read_json',
+]
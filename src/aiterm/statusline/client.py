@@ -0,0 +1,236 @@
+"""Thin statusLine client for the render daemon.
+
+Claude Code runs the statusLine command on every prompt tick. This module is
+the fast path for that command: it forwards the stdin JSON to the render
+daemon (see ``aiterm.statusline.daemon``) over a Unix domain socket and
+writes the reply. When the daemon is not running it falls back to rendering
+in-process, so the command always works.
+
+Only the standard library is imported at module level; the renderer is
+imported on the fallback path.
+
+Wire protocol (one request per connection):
+- Request: one header line (JSON with the forwarded environment), then the
+  raw Claude Code JSON payload. The client shuts down its write side when
+  done.
+- Response: one status byte (``b"0"`` ok, ``b"1"`` error) followed by the
+  exact bytes to write to the terminal.
+
+Either way the statusLine (escapes and both lines) reaches the terminal in
+a single write().
+"""
+
+import io
+import json
+import os
+import socket
+import sys
+from typing import Callable, Dict, Optional
+
+SOCKET_ENV = 'AITERM_STATUSLINE_SOCKET'
+
+STATUS_OK = b'0'
+STATUS_ERROR = b'1'
+
+# Seconds to wait for the daemon before rendering in-process
+RENDER_TIMEOUT = 2.0
+
+# Environment that influences rendering and differs between sessions
+FORWARDED_ENV = (
+    'COLUMNS',
+    'TERM_PROGRAM',
+    'KITTY_WINDOW_ID',
+    'WEZTERM_PANE',
+    'CONDA_DEFAULT_ENV',
+)
+
+
+def get_socket_path() -> str:
+    """Get the daemon socket path.
+
+    Returns:
+        AITERM_STATUSLINE_SOCKET if set, else ~/.cache/aiterm/statusline.sock
+    """
+    env_path = os.environ.get(SOCKET_ENV)
+    if env_path:
+        return os.path.expanduser(env_path)
+    return os.path.join(os.path.expanduser('~'), '.cache', 'aiterm', 'statusline.sock')
+
+
+def _collect_env() -> Dict[str, str]:
+    """Collect environment to forward to the daemon.
+
+    Returns:
+        Dict of forwarded variables (COLUMNS filled from the tty if unset)
+    """
+    env = {key: os.environ[key] for key in FORWARDED_ENV if key in os.environ}
+
+    if 'COLUMNS' not in env:
+        try:
+            env['COLUMNS'] = str(os.get_terminal_size(sys.__stdout__.fileno()).columns)
+        except (AttributeError, ValueError, OSError):
+            pass
+
+    return env
+
+
+def send_request(
+    header: dict,
+    payload: bytes = b'',
+    socket_path: Optional[str] = None,
+    timeout: float = RENDER_TIMEOUT,
+) -> Optional[bytes]:
+    """Send one request to the daemon.
+
+    Args:
+        header: Request header (serialized as the first line)
+        payload: Request body
+        socket_path: Socket to connect to (default: get_socket_path())
+        timeout: Socket timeout in seconds
+
+    Returns:
+        Response body, or None if the daemon is unavailable or failed
+    """
+    request = json.dumps(header).encode('utf-8') + b'\n' + payload
+    chunks = []
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(timeout)
+            sock.connect(socket_path or get_socket_path())
+            sock.sendall(request)
+            sock.shutdown(socket.SHUT_WR)
+
+            while True:
+                chunk = sock.recv(65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+    except OSError:
+        # No socket, stale socket, or timeout - caller falls back
+        return None
+
+    response = b''.join(chunks)
+    if not response.startswith(STATUS_OK):
+        return None
+    return response[len(STATUS_OK):]
+
+
+def request_render(
+    payload: bytes,
+    socket_path: Optional[str] = None,
+    timeout: float = RENDER_TIMEOUT,
+) -> Optional[bytes]:
+    """Ask the daemon to render a statusLine.
+
+    Args:
+        payload: JSON from Claude Code
+        socket_path: Socket to connect to (default: get_socket_path())
+        timeout: Socket timeout in seconds
+
+    Returns:
+        Bytes to write to the terminal, or None if the daemon is unavailable
+    """
+    header = {'op': 'render', 'env': _collect_env()}
+    return send_request(header, payload, socket_path, timeout)
+
+
+def format_error(error: Exception) -> str:
+    """Format a minimal statusLine for a render error.
+
+    Args:
+        error: Exception raised while rendering
+
+    Returns:
+        Two-line error statusLine
+    """
+    return f"╭─ ⚠️  StatusLine Error\n╰─ {str(error)[:50]}"
+
+
+def render_in_process(
+    payload: bytes, write: Optional[Callable[[bytes], None]] = None
+) -> bytes:
+    """Render without the daemon.
+
+    Args:
+        payload: JSON from Claude Code
+        write: Writes the output; when given, segments that missed their
+            budget get time to finish after the write (see
+            StatusLineRenderer.finish_late_segments)
+
+    Returns:
+        Bytes to write to the terminal (or an error statusLine)
+    """
+    from aiterm.statusline.renderer import StatusLineRenderer
+
+    renderer = None
+    try:
+        renderer = StatusLineRenderer()
+        data = renderer.render_output(payload.decode('utf-8', errors='replace'))
+    except Exception as e:
+        data = format_error(e).encode('utf-8')
+
+    if write is not None:
+        write(data)
+        if renderer is not None:
+            try:
+                renderer.finish_late_segments()
+            except Exception:
+                pass
+    return data
+
+
+def write_all(fd: int, data: bytes) -> None:
+    """Write bytes to a file descriptor, handling short writes.
+
+    Args:
+        fd: File descriptor
+        data: Bytes to write
+    """
+    view = memoryview(data)
+    while view:
+        written = os.write(fd, view)
+        view = view[written:]
+
+
+def write_stdout(data: bytes) -> None:
+    """Write bytes to stdout, in one write() when it is a real file.
+
+    Streams without a file descriptor (e.g. captured by typer's CliRunner)
+    get the bytes through their binary buffer, or decoded for text-only
+    streams.
+
+    Args:
+        data: Bytes to write
+    """
+    sys.stdout.flush()
+    try:
+        fd = sys.stdout.fileno()
+    except (AttributeError, io.UnsupportedOperation):
+        fd = None
+
+    if fd is not None:
+        write_all(fd, data)
+        return
+
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is not None:
+        buffer.write(data)
+    else:
+        sys.stdout.write(data.decode('utf-8', errors='replace'))
+    sys.stdout.flush()
+
+
+def main() -> None:
+    """Entry point for ``ait-statusline`` (reads JSON from stdin)."""
+    payload = sys.stdin.buffer.read()
+
+    data = request_render(payload)
+    if data is None:
+        render_in_process(payload, write_stdout)
+    else:
+        write_stdout(data)
+
+
+if __name__ == '__main__':
+    main()
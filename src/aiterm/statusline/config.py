@@ -2,24 +2,84 @@
 
 This module handles loading, saving, and validating statusLine configuration.
 Configuration is stored at ~/.config/aiterm/statusline.json in XDG-compliant location.
+
+Renders only read settings, so ``get()`` is served from a compiled snapshot:
+an immutable flat mapping of dotted keys to values, built once from the
+schema defaults merged with the user JSON. The snapshot is stored in
+~/.cache/aiterm/config-compiled.json keyed on the config file's mtime/size
+and the aiterm version, so a render normally skips building the schema,
+the defaults and the deep merge entirely.
 """
 
 from pathlib import Path
-from typing import Any, Optional
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
 import json
+import os
+import time
+
+from aiterm import __version__
+from aiterm.statusline.cache import atomic_write_json, get_cache_dir, read_json
+from aiterm.statusline.pipeline import COST_CLASSES, COST_PROCESS, DEFAULT_LAYOUT
+
+# A snapshot compiled this close to the config file's mtime is rebuilt, since
+# a second edit within the filesystem's timestamp granularity would keep the
+# same mtime
+RACY_WINDOW_NS = 2_000_000_000
+
+
+def get_compiled_path() -> Path:
+    """Get the compiled config snapshot path."""
+    return get_cache_dir() / 'config-compiled.json'
+
+
+def flatten(config: dict, prefix: str = '') -> dict:
+    """Flatten nested settings into dotted keys.
+
+    Args:
+        config: Nested config dict
+        prefix: Key prefix (used for recursion)
+
+    Returns:
+        Dict mapping "section.setting" keys to values
+    """
+    flat = {}
+    for key, value in config.items():
+        dotted = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, f"{dotted}."))
+        else:
+            flat[dotted] = value
+    return flat
 
 
 class StatusLineConfig:
     """Manages statusLine configuration."""
 
+    # Built lazily (see get()/snapshot()); class defaults keep instances
+    # created without __init__ working
+    _flat: Optional[Mapping[str, Any]] = None
+    _schema_data: Optional[dict] = None
+    _overridden = False
+
     def __init__(self):
         """Initialize config manager."""
         # XDG-compliant config path
         config_dir = Path.home() / ".config" / "aiterm"
         self.config_path = config_dir / "statusline.json"
-        self._schema = self._load_schema()
         self._config = None
 
+    @property
+    def _schema(self) -> dict:
+        """Setting definitions (built on first use)."""
+        if self._schema_data is None:
+            self._schema_data = self._load_schema()
+        return self._schema_data
+
+    @_schema.setter
+    def _schema(self, schema: dict) -> None:
+        self._schema_data = schema
+
     def load(self) -> dict:
         """Load config with defaults.
 
@@ -47,6 +107,78 @@ class StatusLineConfig:
             # Caller can check validate() to see the error
             return self._get_defaults()
 
+    def _file_stamp(self) -> tuple:
+        """Get (mtime_ns, size) of the config file ((0, 0) if missing)."""
+        try:
+            st = os.stat(self.config_path)
+        except OSError:
+            return (0, 0)
+        return (st.st_mtime_ns, st.st_size)
+
+    def snapshot(self) -> Mapping[str, Any]:
+        """Get the compiled, read-only settings snapshot.
+
+        Loaded from the on-disk snapshot when it matches the config file and
+        aiterm version, otherwise compiled from defaults + user JSON and
+        stored for the next process.
+
+        Returns:
+            Read-only mapping of dotted keys to values
+        """
+        if self._flat is not None:
+            return self._flat
+
+        mtime_ns, size = self._file_stamp()
+        compiled_path = get_compiled_path()
+
+        if self._config is None:
+            entry = read_json(compiled_path)
+            if (
+                isinstance(entry, dict)
+                and entry.get('version') == __version__
+                and entry.get('path') == str(self.config_path)
+                and entry.get('mtime_ns') == mtime_ns
+                and entry.get('size') == size
+                and entry.get('compiled_ns', 0) - mtime_ns >= RACY_WINDOW_NS
+                and isinstance(entry.get('settings'), dict)
+            ):
+                self._flat = MappingProxyType(entry['settings'])
+                return self._flat
+
+        compiled_ns = time.time_ns()
+        settings = flatten(self.load())
+        self._flat = MappingProxyType(settings)
+
+        # In-memory overrides are never written to the shared snapshot
+        if not self._overridden:
+            atomic_write_json(compiled_path, {
+                'version': __version__,
+                'path': str(self.config_path),
+                'mtime_ns': mtime_ns,
+                'size': size,
+                'compiled_ns': compiled_ns,
+                'settings': settings,
+            })
+        return self._flat
+
+    def override(self, key: str, value: Any) -> None:
+        """Change a setting for this instance only (not saved).
+
+        Used by benchmarks and tests to try settings without touching the
+        user's config file.
+
+        Args:
+            key: Setting key with dot notation
+            value: New value
+        """
+        keys = key.split('.')
+        target = self.load()
+        for k in keys[:-1]:
+            target = target.setdefault(k, {})
+        target[keys[-1]] = value
+        self._overridden = True
+        self._flat = None
+
     def save(self, config: dict) -> None:
         """Save config to disk.
 
@@ -59,6 +191,7 @@ class StatusLineConfig:
             json.dump(config, f, indent=2)
 
         self._config = config
+        self._flat = None
 
     def get(self, key: str, default: Any = None) -> Any:
         """Get config value with dot notation.
@@ -74,11 +207,13 @@ class StatusLineConfig:
             >>> config.get("display.show_git")  # Returns bool
             True
         """
-        config = self.load()
-        keys = key.split('.')
+        flat = self.snapshot()
+        if key in flat:
+            return flat[key]
 
-        value = config
-        for k in keys:
+        # Whole sections (or keys missing from the snapshot)
+        value = self.load()
+        for k in key.split('.'):
             if isinstance(value, dict) and k in value:
                 value = value[k]
             else:
@@ -175,6 +310,15 @@ class StatusLineConfig:
                     f"{key}: expected {expected_type}, got {actual_type} ({value})"
                 )
 
+        # Layout entries must name known segment providers
+        from aiterm.statusline.pipeline import PROVIDERS
+        for key in DEFAULT_LAYOUT:
+            names = self.get(key)
+            if isinstance(names, list):
+                unknown = [name for name in names if name not in PROVIDERS]
+                if unknown:
+                    errors.append(f"{key}: unknown segments {', '.join(map(str, unknown))}")
+
         return (len(errors) == 0, errors)
 
     def get_schema(self) -> dict:
@@ -185,7 +329,7 @@ class StatusLineConfig:
             - type: str, bool, int, list
             - default: default value
             - description: human-readable description
-            - category: grouping (display, git, project, usage, theme, time)
+            - category: grouping (display, git, project, usage, theme, time, performance)
             - choices: valid choices (if applicable)
         """
         return self._schema
@@ -357,6 +501,12 @@ class StatusLineConfig:
                 'description': 'Use compact usage display',
                 'category': 'usage'
             },
+            'usage.stale_while_refresh': {
+                'type': 'bool',
+                'default': True,
+                'description': 'Show cached usage while another statusLine refreshes it',
+                'category': 'usage'
+            },
             'theme.name': {
                 'type': 'str',
                 'default': 'purple-charcoal',
@@ -400,6 +550,24 @@ class StatusLineConfig:
                 'description': 'Show worktree count and indicator',
                 'category': 'git'
             },
+            'git.cache_ttl': {
+                'type': 'int',
+                'default': 5,
+                'description': 'Seconds to reuse cached git status (0 = no cache)',
+                'category': 'git'
+            },
+            'git.cache_max_repos': {
+                'type': 'int',
+                'default': 32,
+                'description': 'Max repositories kept in the git status cache',
+                'category': 'git'
+            },
+            'git.timeout_ms': {
+                'type': 'int',
+                'default': 2000,
+                'description': 'Milliseconds a git command may run before it is killed',
+                'category': 'git'
+            },
             'project.detect_python_env': {
                 'type': 'bool',
                 'default': False,
@@ -424,6 +592,30 @@ class StatusLineConfig:
                 'description': 'Show outdated dependency warnings',
                 'category': 'project'
             },
+            'project.background_probes': {
+                'type': 'bool',
+                'default': True,
+                'description': 'Refresh slow probes (versions, outdated deps) in the background',
+                'category': 'project'
+            },
+            'project.python_version_interval': {
+                'type': 'int',
+                'default': 3600,
+                'description': 'Seconds between venv Python version refreshes',
+                'category': 'project'
+            },
+            'project.node_version_interval': {
+                'type': 'int',
+                'default': 600,
+                'description': 'Seconds between Node.js version refreshes',
+                'category': 'project'
+            },
+            'project.dependency_check_interval': {
+                'type': 'int',
+                'default': 21600,
+                'description': 'Seconds between outdated dependency checks',
+                'category': 'project'
+            },
             'time.session_duration_format': {
                 'type': 'str',
                 'default': 'compact',
@@ -449,6 +641,79 @@ class StatusLineConfig:
                 'choices': ['24h', '12h'],
                 'description': 'Time format',
                 'category': 'time'
+            },
+            'performance.segment_budgets': {
+                'type': 'bool',
+                'default': True,
+                'description': 'Run segments under time budgets in the render daemon (late segments use their last output)',
+                'category': 'performance'
+            },
+            'performance.one_shot_budgets': {
+                'type': 'bool',
+                'default': False,
+                'description': 'Also apply segment budgets when rendering without the daemon',
+                'category': 'performance'
+            },
+            'performance.late_grace_ms': {
+                'type': 'int',
+                'default': 2000,
+                'description': 'Milliseconds a render without the daemon waits, after writing, for late segments to finish',
+                'category': 'performance'
+            },
+            'performance.segment_budget_ms': {
+                'type': 'int',
+                'default': 200,
+                'description': 'Milliseconds each segment may take',
+                'category': 'performance'
+            },
+            'performance.render_deadline_ms': {
+                'type': 'int',
+                'default': 500,
+                'description': 'Milliseconds all segments together may take',
+                'category': 'performance'
+            },
+            'performance.parallel_segments': {
+                'type': 'bool',
+                'default': False,
+                'description': 'Evaluate independent segments concurrently',
+                'category': 'performance'
+            },
+            'performance.fallback_to_cached': {
+                'type': 'bool',
+                'default': True,
+                'description': 'Show a late segment\'s last output instead of omitting it',
+                'category': 'performance'
+            },
+            'performance.max_cost': {
+                'type': 'str',
+                'default': COST_PROCESS,
+                'choices': list(COST_CLASSES),
+                'description': 'Most expensive segments to run (free < cached < io < process)',
+                'category': 'performance'
+            },
+            'layout.line1': {
+                'type': 'list',
+                'default': list(DEFAULT_LAYOUT['layout.line1']),
+                'description': 'Segments on the left of line 1, in order',
+                'category': 'display'
+            },
+            'layout.line1_right': {
+                'type': 'list',
+                'default': list(DEFAULT_LAYOUT['layout.line1_right']),
+                'description': 'Segments on the right of line 1, in order',
+                'category': 'display'
+            },
+            'layout.line2': {
+                'type': 'list',
+                'default': list(DEFAULT_LAYOUT['layout.line2']),
+                'description': 'Segments on the left of line 2, in order',
+                'category': 'display'
+            },
+            'layout.line2_right': {
+                'type': 'list',
+                'default': list(DEFAULT_LAYOUT['layout.line2_right']),
+                'description': 'Segments on the right of line 2, in order',
+                'category': 'display'
             }
         }
 
@@ -0,0 +1,340 @@
+"""Persistent render daemon for the statusLine.
+
+Each statusLine tick normally starts a fresh interpreter, imports the CLI,
+and rebuilds config, theme, and segment state before rendering. The daemon
+keeps a warm StatusLineRenderer behind a Unix domain socket so that the thin
+client in ``aiterm.statusline.client`` only pays for a socket round-trip.
+
+Usage:
+    ait statusline daemon start     # Start in the background
+    ait statusline daemon status    # Show pid, uptime, request count
+    ait statusline daemon stop      # Stop the daemon
+
+The config file is re-read whenever its mtime changes, so config and theme
+edits apply without restarting the daemon. Claude Code settings files are
+cached process-wide and invalidated through inotify where available (see
+``aiterm.claude.settings_cache``).
+"""
+
+import contextlib
+import json
+import os
+import signal
+import socketserver
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from aiterm.statusline.client import (
+    STATUS_ERROR,
+    STATUS_OK,
+    FORWARDED_ENV,
+    get_socket_path,
+    send_request,
+)
+
+# Seconds a client may take to send its request
+REQUEST_TIMEOUT = 5.0
+
+
+def get_pid_path() -> Path:
+    """Get path of the daemon pid file (next to the socket)."""
+    return Path(get_socket_path()).with_suffix('.pid')
+
+
+def get_log_path() -> Path:
+    """Get path of the daemon log file (next to the socket)."""
+    return Path(get_socket_path()).with_suffix('.log')
+
+
+@contextlib.contextmanager
+def _forwarded_environ(env: Dict[str, str]):
+    """Temporarily apply a client's forwarded environment.
+
+    Args:
+        env: Forwarded variables (keys outside FORWARDED_ENV are ignored)
+    """
+    saved = {key: os.environ.get(key) for key in FORWARDED_ENV}
+    try:
+        for key in FORWARDED_ENV:
+            if key in env:
+                os.environ[key] = str(env[key])
+            else:
+                os.environ.pop(key, None)
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+class RenderService:
+    """Warm renderer state shared across daemon requests."""
+
+    def __init__(self):
+        """Initialize service (renderer is built on first request)."""
+        self._renderer = None
+        self._config_stamp = None
+        self.started_at = time.time()
+        self.requests = 0
+        self.errors = 0
+
+    def _config_file_stamp(self, config_path: Path) -> Optional[int]:
+        """Get config file mtime (None if missing)."""
+        try:
+            return config_path.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    def get_renderer(self):
+        """Get the warm renderer, rebuilding it if the config file changed.
+
+        Returns:
+            StatusLineRenderer instance
+        """
+        from aiterm.statusline.config import StatusLineConfig
+        from aiterm.statusline.renderer import StatusLineRenderer
+
+        if self._renderer is not None:
+            stamp = self._config_file_stamp(self._renderer.config.config_path)
+            if stamp == self._config_stamp:
+                return self._renderer
+
+        config = StatusLineConfig()
+        self._config_stamp = self._config_file_stamp(config.config_path)
+        self._renderer = StatusLineRenderer(config, daemon=True)
+        return self._renderer
+
+    def render(self, payload: bytes, env: Dict[str, str]) -> bytes:
+        """Render a statusLine for one client.
+
+        Side-channel escapes (window title, progress bar) are returned ahead
+        of the two lines, matching what ``ait statusline render`` writes.
+
+        Args:
+            payload: JSON from Claude Code
+            env: Client environment (see FORWARDED_ENV)
+
+        Returns:
+            Bytes to write to the client's terminal
+        """
+        self.requests += 1
+
+        with _forwarded_environ(env):
+            return self.get_renderer().render_output(payload.decode('utf-8', errors='replace'))
+
+    def status(self) -> dict:
+        """Get daemon statistics.
+
+        Returns:
+            Dict with pid, uptime, request and error counts
+        """
+        return {
+            'pid': os.getpid(),
+            'uptime': int(time.time() - self.started_at),
+            'requests': self.requests,
+            'errors': self.errors,
+        }
+
+    def handle(self, request: bytes) -> bytes:
+        """Dispatch one raw request.
+
+        Args:
+            request: Header line followed by the payload
+
+        Returns:
+            Response body (without status byte)
+
+        Raises:
+            ValueError: If the request header is invalid
+        """
+        header_line, _, payload = request.partition(b'\n')
+        header = json.loads(header_line or b'{}')
+        op = header.get('op', 'render')
+
+        if op == 'render':
+            return self.render(payload, header.get('env') or {})
+        if op == 'ping':
+            return json.dumps(self.status()).encode('utf-8')
+
+        raise ValueError(f"Unknown op: {op}")
+
+
+class _RenderHandler(socketserver.StreamRequestHandler):
+    """Handles a single client connection."""
+
+    def handle(self) -> None:
+        self.connection.settimeout(REQUEST_TIMEOUT)
+        service = self.server.service
+
+        try:
+            response = STATUS_OK + service.handle(self.rfile.read())
+        except Exception as e:
+            service.errors += 1
+            sys.stderr.write(f"render failed: {e}\n")
+            response = STATUS_ERROR
+
+        try:
+            self.wfile.write(response)
+        except OSError:
+            # Client gave up (timeout) - it has already rendered in-process
+            pass
+
+
+class RenderServer(socketserver.UnixStreamServer):
+    """Unix socket server holding a warm RenderService.
+
+    Requests are handled one at a time: renders apply the client's
+    environment, which is process-global, and are short enough that queueing
+    is cheaper than locking.
+    """
+
+    def __init__(self, socket_path: str, service: Optional[RenderService] = None):
+        """Bind the server socket.
+
+        Args:
+            socket_path: Filesystem path for the socket
+            service: RenderService (creates new if None)
+        """
+        self.service = service or RenderService()
+        Path(socket_path).parent.mkdir(parents=True, exist_ok=True)
+        _remove_stale_socket(socket_path)
+        super().__init__(socket_path, _RenderHandler)
+        os.chmod(socket_path, 0o600)
+
+    def server_close(self) -> None:
+        super().server_close()
+        with contextlib.suppress(OSError):
+            os.unlink(self.server_address)
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """Remove a socket file left behind by a dead daemon.
+
+    Raises:
+        RuntimeError: If another daemon is answering on the socket
+    """
+    if not os.path.exists(socket_path):
+        return
+    if send_request({'op': 'ping'}, socket_path=socket_path, timeout=0.5) is not None:
+        raise RuntimeError(f"StatusLine daemon already running on {socket_path}")
+    os.unlink(socket_path)
+
+
+def ping(socket_path: Optional[str] = None) -> Optional[dict]:
+    """Query a running daemon.
+
+    Args:
+        socket_path: Socket to connect to (default: get_socket_path())
+
+    Returns:
+        Daemon status dict, or None if no daemon is answering
+    """
+    response = send_request({'op': 'ping'}, socket_path=socket_path, timeout=0.5)
+    if response is None:
+        return None
+    try:
+        return json.loads(response)
+    except json.JSONDecodeError:
+        return None
+
+
+def serve(socket_path: Optional[str] = None) -> None:
+    """Run the daemon in the foreground until SIGTERM/SIGINT.
+
+    Args:
+        socket_path: Socket to listen on (default: get_socket_path())
+    """
+    from aiterm.claude import settings_cache
+
+    socket_path = socket_path or get_socket_path()
+    server = RenderServer(socket_path)
+    settings_cache.watch()
+    pid_path = get_pid_path()
+    pid_path.write_text(str(os.getpid()))
+
+    def _terminate(signum, frame):
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, _terminate)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        settings_cache.stop_watching()
+        with contextlib.suppress(OSError):
+            pid_path.unlink()
+
+
+def start_daemon(wait: float = 3.0) -> Optional[int]:
+    """Start the daemon in the background.
+
+    Args:
+        wait: Seconds to wait for the socket to come up
+
+    Returns:
+        Daemon pid, or None if it did not start
+    """
+    status = ping()
+    if status:
+        return status['pid']
+
+    log_path = get_log_path()
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with open(log_path, 'ab') as log:
+        subprocess.Popen(
+            [sys.executable, '-m', 'aiterm.statusline.daemon'],
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+            close_fds=True,
+        )
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        status = ping()
+        if status:
+            return status['pid']
+        time.sleep(0.05)
+
+    return None
+
+
+def stop_daemon(wait: float = 3.0) -> bool:
+    """Stop a running daemon.
+
+    Args:
+        wait: Seconds to wait for it to exit
+
+    Returns:
+        True if a daemon was stopped, False if none was running
+    """
+    status = ping()
+    if not status:
+        return False
+
+    try:
+        os.kill(status['pid'], signal.SIGTERM)
+    except ProcessLookupError:
+        return False
+
+    deadline = time.monotonic() + wait
+    while time.monotonic() < deadline:
+        if ping() is None:
+            return True
+        time.sleep(0.05)
+
+    return ping() is None
+
+
+if __name__ == '__main__':
+    serve()
@@ -0,0 +1,786 @@
+"""Single-pass git status probe for the statusLine.
+
+Collects everything the git-related segments display from at most two git
+invocations:
+
+1. ``git rev-parse --absolute-git-dir --git-common-dir --show-toplevel``
+   (repository check, worktree detection)
+2. ``git status --porcelain=v2 --branch`` (branch, upstream, ahead/behind,
+   staged/unstaged/untracked counts)
+
+Stash and worktree counts are read from the git directory instead of
+forking ``git stash list`` / ``git worktree list``. A detached HEAD costs one
+extra ``git describe`` to find an exact tag, as before.
+
+GitSnapshotCache keeps snapshots on disk between renders. An entry is reused
+while the stat results of HEAD, the index, the refs, and the stash reflog are
+unchanged and it is younger than the TTL (the TTL bounds how long working
+tree edits that have not reached the index can go unnoticed).
+
+Callers that only need the branch and a dirty flag (``ait switch`` and
+``ait detect`` through ``aiterm.context.detector``) use
+GitSnapshotCache.get_branch_status(): a fresh statusLine snapshot answers
+it directly, otherwise probe_dirty() stops at the first change instead of
+listing every changed and untracked path.
+
+Every git invocation is limited to ``git.timeout_ms`` (GIT_TIMEOUT by
+default): a git stuck on a network filesystem, a held index.lock or a
+credential prompt counts as a failed probe instead of hanging the
+statusLine or the ``cd`` hook running ``ait switch``.
+"""
+
+import os
+import subprocess
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from aiterm.statusline.cache import atomic_write_json, get_cache_dir, read_json
+
+# Seconds a git command may run before it is killed
+GIT_TIMEOUT = 2.0
+
+# Cache hits not yet written, by cache file: hit count and last use by repo
+_pending_hits: Dict[str, int] = {}
+_pending_used: Dict[str, Dict[str, float]] = {}
+
+
+@dataclass(frozen=True)
+class GitSnapshot:
+    """Point-in-time view of a git working tree.
+
+    Attributes:
+        git_dir: Absolute git dir (``.git/worktrees/<name>`` in a linked worktree)
+        common_dir: Absolute common git dir (shared by all worktrees)
+        toplevel: Absolute path of the working tree root
+        branch: Branch name, exact tag, or "detached"
+        detached: True if HEAD is detached
+        upstream: Upstream branch (e.g. "origin/main") or None
+        ahead: Commits ahead of upstream
+        behind: Commits behind upstream
+        staged: Paths with staged changes
+        unstaged: Paths with unstaged changes
+        untracked: Untracked files
+        conflicted: Unmerged paths
+        stash_count: Stash entries
+        worktree_count: Worktrees including the main one
+    """
+
+    git_dir: str
+    common_dir: str
+    toplevel: str
+    branch: str
+    detached: bool = False
+    upstream: Optional[str] = None
+    ahead: int = 0
+    behind: int = 0
+    staged: int = 0
+    unstaged: int = 0
+    untracked: int = 0
+    conflicted: int = 0
+    stash_count: int = 0
+    worktree_count: int = 1
+
+    @property
+    def has_changes(self) -> bool:
+        """True if there are staged, unstaged, or conflicted changes."""
+        return bool(self.staged or self.unstaged or self.conflicted)
+
+    @property
+    def is_worktree(self) -> bool:
+        """True if this is a linked worktree (not the main working tree)."""
+        # Worktrees have .git/worktrees/<name> as git-dir
+        return '/worktrees/' in self.git_dir
+
+    @property
+    def worktree_name(self) -> Optional[str]:
+        """Name of the linked worktree, or None for the main working tree."""
+        if self.is_worktree:
+            return Path(self.git_dir).name
+        return None
+
+
+def _run_git(cwd: str, *args: str, timeout: float = GIT_TIMEOUT) -> Optional[str]:
+    """Run a git command without taking optional locks.
+
+    Args:
+        cwd: Directory to run in
+        *args: git arguments
+        timeout: Seconds before git is killed
+
+    Returns:
+        stdout, or None if git failed, timed out or is unavailable
+    """
+    try:
+        result = subprocess.run(
+            ['git', '--no-optional-locks', '-C', cwd, *args],
+            capture_output=True,
+            text=True,
+            errors='replace',
+            timeout=timeout,
+        )
+    except (OSError, ValueError, subprocess.TimeoutExpired):
+        return None
+
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def _git_returncode(cwd: str, *args: str, timeout: float = GIT_TIMEOUT) -> Optional[int]:
+    """Run a quiet git command for its exit status.
+
+    Args:
+        cwd: Directory to run in
+        *args: git arguments
+        timeout: Seconds before git is killed
+
+    Returns:
+        Exit status, or None if git timed out or is unavailable
+    """
+    try:
+        return subprocess.run(
+            ['git', '--no-optional-locks', '-C', cwd, *args],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=timeout,
+        ).returncode
+    except (OSError, ValueError, subprocess.TimeoutExpired):
+        return None
+
+
+def _has_untracked(cwd: str, timeout: float = GIT_TIMEOUT) -> Optional[bool]:
+    """Check for untracked files, reading at most one byte of the listing.
+
+    Untracked directories are reported as one entry (like ``git status``)
+    rather than walked.
+
+    Args:
+        cwd: Directory inside a working tree
+        timeout: Seconds to wait for the first entry before git is killed
+
+    Returns:
+        True if any untracked file exists, None if git failed or timed out
+    """
+    try:
+        process = subprocess.Popen(
+            ['git', '--no-optional-locks', '-C', cwd, 'ls-files', '--others',
+             '--exclude-standard', '--directory', '--no-empty-directory', '-z'],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+    except (OSError, ValueError):
+        return None
+
+    # A blocking read could wait forever on a stuck git; kill it instead
+    timer = threading.Timer(timeout, process.kill)
+    timer.start()
+    try:
+        first = process.stdout.read(1)
+    finally:
+        timer.cancel()
+        if process.poll() is None:
+            # Listing not finished - one entry is enough
+            process.kill()
+        process.stdout.close()
+        process.wait()
+
+    if first:
+        return True
+    return False if process.returncode == 0 else None
+
+
+def probe_dirty(cwd: str, timeout: float = GIT_TIMEOUT) -> Optional[bool]:
+    """Check a working tree for uncommitted changes, stopping at the first.
+
+    Tracked changes come from ``git diff --quiet HEAD`` (which stops diffing
+    at the first difference); untracked files are only looked for in a
+    clean tree.
+
+    Args:
+        cwd: Directory inside a working tree
+        timeout: Seconds each git command may run
+
+    Returns:
+        True if dirty, False if clean, None if git failed
+    """
+    code = _git_returncode(cwd, 'diff', '--quiet', 'HEAD', '--', timeout=timeout)
+    if code == 1:
+        return True
+    if code is None:
+        return None
+    if code != 0:
+        # No commit yet: compare the index (against the empty tree) and the
+        # working tree separately
+        staged = _git_returncode(cwd, 'diff', '--cached', '--quiet', timeout=timeout)
+        unstaged = _git_returncode(cwd, 'diff', '--quiet', timeout=timeout)
+        if staged not in (0, 1) or unstaged not in (0, 1):
+            return None
+        if staged == 1 or unstaged == 1:
+            return True
+
+    return _has_untracked(cwd, timeout)
+
+
+def read_branch(cwd: str, git_dir: str, timeout: float = GIT_TIMEOUT) -> Optional[str]:
+    """Get the current branch from HEAD without forking when possible.
+
+    Args:
+        cwd: Directory inside a working tree
+        git_dir: Absolute git dir
+        timeout: Seconds each git command may run
+
+    Returns:
+        Branch name, exact tag, or "detached" (None if git failed)
+    """
+    head = _read_head(git_dir)
+    if head and head.startswith('ref: refs/heads/'):
+        return head[len('ref: refs/heads/'):]
+
+    if head is None or head.startswith('ref: '):
+        # Unusual ref storage - ask git
+        output = _run_git(cwd, 'branch', '--show-current', timeout=timeout)
+        if output is None:
+            return None
+        if output.strip():
+            return output.strip()
+
+    tag = _run_git(cwd, 'describe', '--tags', '--exact-match', timeout=timeout)
+    return (tag or '').strip() or 'detached'
+
+
+class BranchStatus(NamedTuple):
+    """Branch and dirty flag of a working tree."""
+
+    branch: str
+    dirty: bool
+
+
+def probe_branch_status(
+    cwd: str,
+    repo: Optional[Tuple[str, str, str]] = None,
+    timeout: float = GIT_TIMEOUT,
+) -> Optional[BranchStatus]:
+    """Probe a directory's branch and dirty flag.
+
+    Args:
+        cwd: Directory inside a working tree
+        repo: Result of find_repo() if already known
+        timeout: Seconds each git command may run
+
+    Returns:
+        BranchStatus, or None if cwd is not in a git working tree
+    """
+    if repo is None:
+        output = _run_git(cwd, 'rev-parse', '--absolute-git-dir', '--is-inside-work-tree', timeout=timeout)
+        lines = (output or '').splitlines()
+        if len(lines) < 2 or lines[1] != 'true':
+            return None
+        git_dir = lines[0]
+    else:
+        git_dir = repo[1]
+
+    branch = read_branch(cwd, git_dir, timeout)
+    if branch is None:
+        return None
+    dirty = probe_dirty(cwd, timeout)
+    if dirty is None:
+        return None
+    return BranchStatus(branch, dirty)
+
+
+def _count_stashes(common_dir: str) -> int:
+    """Count stash entries from the stash reflog.
+
+    Args:
+        common_dir: Absolute common git dir
+
+    Returns:
+        Number of stash entries
+    """
+    try:
+        with open(os.path.join(common_dir, 'logs', 'refs', 'stash'), 'rb') as f:
+            return sum(1 for line in f if line.strip())
+    except OSError:
+        return 0
+
+
+def _count_worktrees(common_dir: str) -> int:
+    """Count worktrees from the common git dir.
+
+    Args:
+        common_dir: Absolute common git dir
+
+    Returns:
+        Number of worktrees including the main one
+    """
+    try:
+        with os.scandir(os.path.join(common_dir, 'worktrees')) as entries:
+            return 1 + sum(1 for entry in entries if entry.is_dir())
+    except OSError:
+        return 1
+
+
+def parse_porcelain_v2(output: str) -> dict:
+    """Parse ``git status --porcelain=v2 --branch`` output.
+
+    Args:
+        output: Command stdout
+
+    Returns:
+        Dict of GitSnapshot fields found in the output (branch, detached,
+        upstream, ahead, behind, staged, unstaged, untracked, conflicted)
+    """
+    info = {
+        'branch': '',
+        'detached': False,
+        'upstream': None,
+        'ahead': 0,
+        'behind': 0,
+        'staged': 0,
+        'unstaged': 0,
+        'untracked': 0,
+        'conflicted': 0,
+    }
+
+    for line in output.splitlines():
+        if not line:
+            continue
+
+        kind = line[0]
+
+        if kind == '#':
+            # Header: "# branch.<key> <value>"
+            parts = line.split(' ', 2)
+            if len(parts) < 3:
+                continue
+            key, value = parts[1], parts[2]
+
+            if key == 'branch.head':
+                if value == '(detached)':
+                    info['detached'] = True
+                else:
+                    info['branch'] = value
+            elif key == 'branch.upstream':
+                info['upstream'] = value
+            elif key == 'branch.ab':
+                # "+<ahead> -<behind>"
+                ahead, _, behind = value.partition(' ')
+                try:
+                    info['ahead'] = int(ahead.lstrip('+'))
+                    info['behind'] = int(behind.lstrip('-'))
+                except ValueError:
+                    pass
+
+        elif kind in ('1', '2'):
+            # Changed entry: "<kind> <XY> ..."
+            xy = line[2:4]
+            if xy[:1] not in ('.', ''):
+                info['staged'] += 1
+            if xy[1:2] not in ('.', ''):
+                info['unstaged'] += 1
+
+        elif kind == 'u':
+            info['conflicted'] += 1
+
+        elif kind == '?':
+            info['untracked'] += 1
+
+    return info
+
+
+def probe_git(cwd: str, timeout: float = GIT_TIMEOUT) -> Optional[GitSnapshot]:
+    """Probe a directory's git state.
+
+    Args:
+        cwd: Directory inside a working tree
+        timeout: Seconds each git command may run
+
+    Returns:
+        GitSnapshot, or None if cwd is not in a git working tree
+    """
+    output = _run_git(cwd, 'rev-parse', '--absolute-git-dir', '--git-common-dir', '--show-toplevel',
+                      timeout=timeout)
+    if output is None:
+        return None
+
+    lines: List[str] = output.splitlines()
+    if len(lines) < 3:
+        # Bare repository or .git dir itself - no working tree
+        return None
+
+    git_dir = lines[0]
+    common_dir = lines[1]
+    if not os.path.isabs(common_dir):
+        common_dir = os.path.normpath(os.path.join(cwd, common_dir))
+    toplevel = lines[2]
+
+    status = _run_git(cwd, 'status', '--porcelain=v2', '--branch', '--untracked-files=all',
+                      timeout=timeout)
+    if status is None:
+        return None
+
+    info = parse_porcelain_v2(status)
+
+    if info['detached']:
+        # Try tag, else show "detached"
+        tag = _run_git(cwd, 'describe', '--tags', '--exact-match', timeout=timeout)
+        info['branch'] = (tag or '').strip() or 'detached'
+
+    return GitSnapshot(
+        git_dir=git_dir,
+        common_dir=common_dir,
+        toplevel=toplevel,
+        stash_count=_count_stashes(common_dir),
+        worktree_count=_count_worktrees(common_dir),
+        **info,
+    )
+
+
+# =============================================================================
+# Snapshot Cache
+# =============================================================================
+
+
+def find_repo(cwd: str) -> Optional[Tuple[str, str, str]]:
+    """Locate the working tree root and git dirs without running git.
+
+    Args:
+        cwd: Directory inside a working tree
+
+    Returns:
+        Tuple of (toplevel, git_dir, common_dir), or None if not found
+    """
+    path = os.path.abspath(cwd)
+
+    while True:
+        dotgit = os.path.join(path, '.git')
+
+        if os.path.isdir(dotgit):
+            return path, dotgit, dotgit
+
+        if os.path.isfile(dotgit):
+            # Linked worktree or submodule: ".git" file with "gitdir: <path>"
+            try:
+                with open(dotgit) as f:
+                    content = f.read().strip()
+            except OSError:
+                return None
+            if not content.startswith('gitdir:'):
+                return None
+
+            git_dir = os.path.normpath(os.path.join(path, content[len('gitdir:'):].strip()))
+            common_dir = git_dir
+            try:
+                with open(os.path.join(git_dir, 'commondir')) as f:
+                    common_dir = os.path.normpath(os.path.join(git_dir, f.read().strip()))
+            except OSError:
+                pass
+            return path, git_dir, common_dir
+
+        parent = os.path.dirname(path)
+        if parent == path:
+            return None
+        path = parent
+
+
+def _read_head(git_dir: str) -> Optional[str]:
+    """Read HEAD contents (symbolic ref or commit id)."""
+    try:
+        with open(os.path.join(git_dir, 'HEAD')) as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _stamp_paths(git_dir: str, common_dir: str, head: Optional[str], upstream: Optional[str]) -> List[str]:
+    """Get files whose stat results invalidate a cached snapshot.
+
+    Args:
+        git_dir: Absolute git dir
+        common_dir: Absolute common git dir
+        head: HEAD contents
+        upstream: Upstream branch from the cached snapshot
+
+    Returns:
+        List of paths to stat
+    """
+    paths = [
+        os.path.join(git_dir, 'HEAD'),
+        os.path.join(git_dir, 'index'),
+        os.path.join(common_dir, 'packed-refs'),
+        os.path.join(common_dir, 'FETCH_HEAD'),
+        os.path.join(common_dir, 'refs', 'heads'),
+        os.path.join(common_dir, 'refs', 'tags'),
+        os.path.join(common_dir, 'logs', 'refs', 'stash'),
+        os.path.join(common_dir, 'worktrees'),
+    ]
+
+    # Current branch ref (commits update it in place)
+    if head and head.startswith('ref: '):
+        paths.append(os.path.join(common_dir, head[len('ref: '):]))
+
+    # Upstream ref (push/fetch update it)
+    if upstream:
+        paths.append(os.path.join(common_dir, 'refs', 'remotes', upstream))
+
+    return paths
+
+
+def _stamp(paths: List[str]) -> List[Optional[List[int]]]:
+    """Stat each path.
+
+    Returns:
+        List of [mtime_ns, size, inode] (None for missing paths)
+    """
+    stamp = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamp.append([st.st_mtime_ns, st.st_size, st.st_ino])
+        except OSError:
+            stamp.append(None)
+    return stamp
+
+
+class GitSnapshotCache:
+    """On-disk GitSnapshot cache keyed by repository path.
+
+    Entries are validated against git metadata stat results and expire
+    after ``ttl`` seconds. The least recently used repositories are evicted
+    beyond ``max_repos``.
+
+    A hit never writes the cache file: the hit count and the entry's last
+    use are kept in memory and merged into the file with the next write (a
+    miss). Counters and use times are therefore best effort - hits in a
+    process that never misses are not persisted, and concurrent renders may
+    overwrite each other's counts.
+    """
+
+    CACHE_VERSION = 1
+
+    def __init__(
+        self,
+        ttl: int = 5,
+        max_repos: int = 32,
+        cache_file: Optional[Path] = None,
+        timeout: float = GIT_TIMEOUT,
+    ):
+        """Initialize cache.
+
+        Args:
+            ttl: Seconds an entry may be served (0 disables caching)
+            max_repos: Maximum number of repositories kept
+            cache_file: Cache file (default: ~/.cache/aiterm/git-status.json)
+            timeout: Seconds each git command may run
+        """
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_repos = max_repos
+        self.cache_file = cache_file or get_cache_dir() / 'git-status.json'
+
+    @classmethod
+    def from_config(cls, config) -> 'GitSnapshotCache':
+        """Create a cache using git.cache_* and git.timeout_ms settings.
+
+        Args:
+            config: StatusLineConfig instance
+
+        Returns:
+            GitSnapshotCache instance
+        """
+        return cls(
+            ttl=config.get('git.cache_ttl', 5),
+            max_repos=config.get('git.cache_max_repos', 32),
+            timeout=config.get('git.timeout_ms', int(GIT_TIMEOUT * 1000)) / 1000,
+        )
+
+    def _load(self) -> dict:
+        """Load cache data (empty structure if missing or incompatible)."""
+        data = read_json(self.cache_file)
+        if not isinstance(data, dict) or data.get('version') != self.CACHE_VERSION:
+            return {'version': self.CACHE_VERSION, 'hits': 0, 'misses': 0, 'repos': {}, 'branches': {}}
+        data.setdefault('repos', {})
+        data.setdefault('branches', {})
+        return data
+
+    def _lookup(self, data: dict, repo: Tuple[str, str, str], now: float) -> Optional[GitSnapshot]:
+        """Return a cached snapshot if still valid."""
+        toplevel, git_dir, common_dir = repo
+        entry = data['repos'].get(toplevel)
+        if not entry:
+            return None
+
+        if now - entry.get('checked', 0) >= self.ttl:
+            return None
+
+        head = _read_head(git_dir)
+        if head != entry.get('head'):
+            return None
+
+        snapshot_data = entry.get('snapshot') or {}
+        paths = _stamp_paths(git_dir, common_dir, head, snapshot_data.get('upstream'))
+        if _stamp(paths) != entry.get('stamp'):
+            return None
+
+        try:
+            return GitSnapshot(**snapshot_data)
+        except TypeError:
+            return None
+
+    def get(self, cwd: str) -> Optional[GitSnapshot]:
+        """Get a snapshot, probing git only if the cached one is stale.
+
+        Args:
+            cwd: Directory inside a working tree
+
+        Returns:
+            GitSnapshot or None if not in a git repo
+        """
+        if self.ttl <= 0:
+            return probe_git(cwd, self.timeout)
+
+        repo = find_repo(cwd)
+        if repo is None:
+            # Not a repo, or one we can't locate ourselves (GIT_DIR, etc.)
+            return probe_git(cwd, self.timeout)
+
+        now = time.time()
+        data = self._load()
+        snapshot = self._lookup(data, repo, now)
+
+        if snapshot is not None:
+            key = str(self.cache_file)
+            _pending_hits[key] = _pending_hits.get(key, 0) + 1
+            _pending_used.setdefault(key, {})[repo[0]] = now
+            return snapshot
+
+        snapshot = probe_git(cwd, self.timeout)
+        data['misses'] = data.get('misses', 0) + 1
+        self._merge_pending(data)
+
+        if snapshot is None:
+            data['repos'].pop(repo[0], None)
+        else:
+            toplevel, git_dir, common_dir = repo
+            head = _read_head(git_dir)
+            data['repos'][toplevel] = {
+                'checked': now,
+                'used': now,
+                'head': head,
+                'stamp': _stamp(_stamp_paths(git_dir, common_dir, head, snapshot.upstream)),
+                'snapshot': asdict(snapshot),
+            }
+            self._evict(data)
+
+        atomic_write_json(self.cache_file, data)
+        return snapshot
+
+    def get_branch_status(self, cwd: str) -> Optional[BranchStatus]:
+        """Get the branch and dirty flag, probing git only if stale.
+
+        A valid full snapshot (from the statusLine) answers directly.
+        Otherwise a cached quick probe is reused under the same stat and
+        TTL checks, or probe_branch_status() runs and is stored.
+
+        Args:
+            cwd: Directory inside a working tree
+
+        Returns:
+            BranchStatus or None if not in a git repo
+        """
+        repo = find_repo(cwd)
+        if self.ttl <= 0 or repo is None:
+            return probe_branch_status(cwd, repo, self.timeout)
+
+        now = time.time()
+        data = self._load()
+        snapshot = self._lookup(data, repo, now)
+        if snapshot is not None:
+            return BranchStatus(snapshot.branch, snapshot.has_changes or snapshot.untracked > 0)
+
+        toplevel, git_dir, common_dir = repo
+        head = _read_head(git_dir)
+        entry = data['branches'].get(toplevel)
+        if (entry and now - entry.get('checked', 0) < self.ttl and head == entry.get('head')
+                and _stamp(_stamp_paths(git_dir, common_dir, head, None)) == entry.get('stamp')):
+            try:
+                return BranchStatus(str(entry['branch']), bool(entry['dirty']))
+            except KeyError:
+                pass
+
+        status = probe_branch_status(cwd, repo, self.timeout)
+        if status is None:
+            data['branches'].pop(toplevel, None)
+        else:
+            data['branches'][toplevel] = {
+                'checked': now,
+                'used': now,
+                'head': head,
+                'stamp': _stamp(_stamp_paths(git_dir, common_dir, head, None)),
+                'branch': status.branch,
+                'dirty': status.dirty,
+            }
+            self._evict(data, 'branches')
+
+        self._merge_pending(data)
+        atomic_write_json(self.cache_file, data)
+        return status
+
+    def _merge_pending(self, data: dict) -> None:
+        """Add this process's unwritten hits and last-use times to data."""
+        key = str(self.cache_file)
+        data['hits'] = data.get('hits', 0) + _pending_hits.pop(key, 0)
+        for toplevel, used in _pending_used.pop(key, {}).items():
+            entry = data['repos'].get(toplevel)
+            if entry is not None and used > entry.get('used', 0):
+                entry['used'] = used
+
+    def _evict(self, data: dict, section: str = 'repos') -> None:
+        """Drop least recently used repositories beyond max_repos."""
+        repos = data[section]
+        excess = len(repos) - max(self.max_repos, 1)
+        if excess <= 0:
+            return
+
+        by_use = sorted(repos, key=lambda key: repos[key].get('used', 0))
+        for key in by_use[:excess]:
+            del repos[key]
+
+    def stats(self) -> dict:
+        """Get cache statistics.
+
+        Returns:
+            Dict with path, size, entries, hits, misses, ttl, max_repos
+        """
+        data = self._load()
+        try:
+            size = self.cache_file.stat().st_size
+        except OSError:
+            size = 0
+
+        return {
+            'path': str(self.cache_file),
+            'size': size,
+            'entries': len(data['repos']),
+            'hits': data.get('hits', 0) + _pending_hits.get(str(self.cache_file), 0),
+            'misses': data.get('misses', 0),
+            'ttl': self.ttl,
+            'max_repos': self.max_repos,
+        }
+
+    def clear(self) -> bool:
+        """Delete the cache file.
+
+        Returns:
+            True if a cache file was removed
+        """
+        _pending_hits.pop(str(self.cache_file), None)
+        _pending_used.pop(str(self.cache_file), None)
+        try:
+            self.cache_file.unlink()
+            return True
+        except OSError:
+            return False
@@ -0,0 +1,96 @@
+"""Buffered terminal output for statusLine renders.
+
+Besides its two lines, a render sends side-channel escapes to the terminal:
+the window title (OSC 0) and, under Ghostty, a progress bar (OSC 9;4).
+Segments used to write and flush these to stdout while rendering. They now
+only record the sequence; the renderer gathers them and the caller writes
+escapes and lines with one write() (see build_output()).
+
+Escapes are also de-duplicated across renders. The last sequence sent for
+each session is kept in ~/.cache/aiterm/terminal-state.json and an unchanged
+sequence is skipped, except every STATE_REFRESH seconds so that a title the
+shell overwrote is restored and Ghostty does not time out the progress bar.
+TerminalState is the statusLine's EscapeState (aiterm.utils.escape_state),
+which ``ait switch`` uses for its own sequences.
+"""
+
+from pathlib import Path
+from typing import Optional, Tuple
+
+from aiterm.statusline.cache import get_cache_dir
+from aiterm.utils.escape_state import EscapeState
+
+# Seconds after which an unchanged escape is sent again
+STATE_REFRESH = 10.0
+
+# Sessions remembered in the state file (least recently updated dropped)
+MAX_STATE_SESSIONS = 64
+
+# Order in which side-channel escapes are written
+SIDE_CHANNEL_ORDER = ('title', 'progress')
+
+
+def osc_title(title: str) -> str:
+    """Build the window title escape (ESC ] 0 ; text BEL).
+
+    Args:
+        title: Window title
+
+    Returns:
+        Escape sequence
+    """
+    return f"\033]0;{title}\007"
+
+
+def osc_progress(status: int, percent: int) -> str:
+    """Build a Ghostty progress bar escape (OSC 9;4;ST;NN).
+
+    Args:
+        status: 0 (normal), 1 (success), 2 (error), 3 (indeterminate)
+        percent: Progress 0-100
+
+    Returns:
+        Escape sequence
+    """
+    return f"\033]9;4;{status};{percent}\033\\"
+
+
+class TerminalState(EscapeState):
+    """Last side-channel escapes sent to each session's terminal."""
+
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        refresh: float = STATE_REFRESH,
+        order: Optional[Tuple[str, ...]] = SIDE_CHANNEL_ORDER,
+    ):
+        """Initialize state.
+
+        Args:
+            path: State file (default: ~/.cache/aiterm/terminal-state.json)
+            refresh: Seconds after which unchanged escapes are sent again
+            order: Kinds to send, in order (None: every kind, in the
+                order given to diff())
+        """
+        super().__init__(
+            path or get_cache_dir() / 'terminal-state.json',
+            refresh,
+            order,
+            max_keys=MAX_STATE_SESSIONS,
+        )
+
+
+def build_output(side_channel: str, lines: str) -> bytes:
+    """Build the bytes for one statusLine write.
+
+    Args:
+        side_channel: Escapes to send ahead of the lines
+        lines: Rendered statusLine
+
+    Returns:
+        Escapes followed by the lines, UTF-8 encoded
+    """
+    if not side_channel:
+        return lines.encode('utf-8')
+    return b''.join((side_channel.encode('utf-8'), lines.encode('utf-8')))
+
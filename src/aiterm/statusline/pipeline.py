@@ -0,0 +1,282 @@
+"""Declarative statusLine layout and segment providers.
+
+Which segments appear, on which line and side, and in what order is read
+from the ``layout.*`` settings (ordered lists of provider names):
+
+- layout.line1 / layout.line1_right
+- layout.line2 / layout.line2_right
+
+Every name refers to a SegmentProvider in PROVIDERS. A provider declares:
+
+- cost: one of COST_CLASSES, from formatting payload fields only (free) to
+  forking processes or using the network (process)
+- inputs: payload fields passed to its render function
+- depends: providers whose segment state it reads (submitted first, so a
+  serial render shares e.g. the git snapshot instead of looking it up twice)
+- enabled: predicate over the config
+
+build_plan() turns the layout into a RenderPlan. Providers that are
+disabled, unknown, or above ``performance.max_cost`` are dropped from the
+plan, so the renderer never calls them - a fast profile can keep every
+subprocess and network segment off the hot path with a single setting.
+
+Other modules can add segments with register_provider().
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, NamedTuple, Optional, Tuple
+
+# Cost classes, cheapest first
+COST_FREE = 'free'          # Formats payload fields only
+COST_CACHED = 'cached'      # Reads small, usually cached files
+COST_IO = 'io'              # Reads project files, transcripts, databases
+COST_PROCESS = 'process'    # May fork processes or use the network
+COST_CLASSES = (COST_FREE, COST_CACHED, COST_IO, COST_PROCESS)
+
+# Line settings in display order: (left key, right key)
+LAYOUT_KEYS = (
+    ('layout.line1', 'layout.line1_right'),
+    ('layout.line2', 'layout.line2_right'),
+)
+
+DEFAULT_LAYOUT = {
+    'layout.line1': ['project', 'git'],
+    'layout.line1_right': ['worktrees'],
+    'layout.line2': ['model', 'thinking', 'agents', 'time', 'usage', 'lines', 'style'],
+    'layout.line2_right': [],
+}
+
+
+@dataclass(frozen=True)
+class SegmentProvider:
+    """A segment the layout can place."""
+
+    name: str
+    cost: str
+    render: Callable[..., Any]  # render(renderer, *inputs)
+    inputs: Tuple[str, ...] = ()
+    depends: Tuple[str, ...] = ()
+    enabled: Optional[Callable[[Any], bool]] = None  # enabled(config)
+    # Payload fields identifying the cached fallback (default: inputs)
+    key_inputs: Optional[Tuple[str, ...]] = None
+    # Prefix non-empty output with the theme separator
+    separated: bool = False
+
+    @property
+    def budgeted(self) -> bool:
+        """Whether the provider runs under a segment budget (does I/O)."""
+        return self.cost != COST_FREE
+
+    def is_enabled(self, config) -> bool:
+        """Check the provider's display settings.
+
+        Args:
+            config: StatusLineConfig instance
+
+        Returns:
+            True if the provider's output would be shown
+        """
+        return self.enabled is None or bool(self.enabled(config))
+
+    def args(self, fields: Dict[str, Any]) -> tuple:
+        """Pick the render arguments from the payload fields.
+
+        Args:
+            fields: Payload fields by name
+
+        Returns:
+            Arguments in INPUTS order
+        """
+        return tuple(fields.get(name) for name in self.inputs)
+
+    def key(self, fields: Dict[str, Any]) -> str:
+        """Get the fallback key for segment budgets.
+
+        Args:
+            fields: Payload fields by name
+
+        Returns:
+            Key like "git:/path/to/repo"
+        """
+        names = self.inputs if self.key_inputs is None else self.key_inputs
+        if not names:
+            return self.name
+        return ':'.join([self.name] + [str(fields.get(name)) for name in names])
+
+
+class RenderPlan(NamedTuple):
+    """Providers to run for one config, in layout order."""
+
+    lines: Tuple[Tuple[Tuple[str, ...], Tuple[str, ...]], ...]  # (left, right) per line
+    order: Tuple[str, ...]    # Every planned provider, dependencies first
+    skipped: Tuple[str, ...]  # Layout names left out (disabled, unknown, too costly)
+
+
+PROVIDERS: Dict[str, SegmentProvider] = {}
+
+
+def register_provider(provider: SegmentProvider) -> SegmentProvider:
+    """Add (or replace) a segment provider.
+
+    Args:
+        provider: Provider to register
+
+    Returns:
+        The provider
+
+    Raises:
+        ValueError: If the cost class is unknown
+    """
+    if provider.cost not in COST_CLASSES:
+        raise ValueError(f"Unknown cost class: {provider.cost}")
+    PROVIDERS[provider.name] = provider
+    return provider
+
+
+def cost_rank(cost: str) -> int:
+    """Get a cost class's position in COST_CLASSES (unknown: most costly)."""
+    try:
+        return COST_CLASSES.index(cost)
+    except ValueError:
+        return len(COST_CLASSES) - 1
+
+
+def build_plan(config) -> RenderPlan:
+    """Build the execution plan for a config.
+
+    Args:
+        config: StatusLineConfig instance
+
+    Returns:
+        RenderPlan
+    """
+    max_rank = cost_rank(config.get('performance.max_cost', COST_PROCESS))
+    lines = []
+    planned = []
+    skipped = []
+
+    def usable(name: str) -> bool:
+        provider = PROVIDERS.get(name)
+        return (
+            provider is not None
+            and cost_rank(provider.cost) <= max_rank
+            and provider.is_enabled(config)
+        )
+
+    for left_key, right_key in LAYOUT_KEYS:
+        sides = []
+        for key in (left_key, right_key):
+            names = config.get(key, DEFAULT_LAYOUT[key])
+            if not isinstance(names, (list, tuple)):
+                names = DEFAULT_LAYOUT[key]
+            side = []
+            for name in names:
+                if name in side:
+                    continue
+                if usable(name):
+                    side.append(name)
+                    planned.append(name)
+                elif name not in skipped:
+                    skipped.append(name)
+            sides.append(tuple(side))
+        lines.append(tuple(sides))
+
+    return RenderPlan(tuple(lines), _dependency_order(planned), tuple(skipped))
+
+
+def _dependency_order(names: list) -> Tuple[str, ...]:
+    """Order planned providers so planned dependencies come first."""
+    order: list = []
+    wanted = set(names)
+
+    def visit(name: str, path: tuple) -> None:
+        if name in order or name in path:
+            return
+        for dependency in PROVIDERS[name].depends:
+            if dependency in wanted:
+                visit(dependency, path + (name,))
+        order.append(name)
+
+    for name in names:
+        visit(name, ())
+    return tuple(order)
+
+
+# Built-in providers (render functions receive the StatusLineRenderer)
+
+def _segment(name: str) -> Callable[..., str]:
+    """Render function for a segment from the renderer's SegmentRegistry."""
+    def render(renderer, *args) -> str:
+        return renderer._segment_registry()[name].render(*args)
+    return render
+
+
+def _render_worktrees(renderer, cwd: str) -> str:
+    return renderer._build_right_segments(cwd, renderer._segment_registry()['git'])
+
+
+def _render_agents(renderer, session_id: str) -> str:
+    count = renderer._agent_detector_instance().get_running_count(session_id)
+    return f"\033[38;5;2m🤖{count}\033[0m" if count else ""
+
+
+def _render_style(renderer, style_name: str) -> str:
+    mode = renderer.config.get('display.show_output_style', 'auto')
+    if not style_name or (mode == 'auto' and style_name == 'default'):
+        return ""
+    from aiterm.statusline.themes import compile_theme
+    return f"{compile_theme(renderer.theme).style}[{style_name}]\033[0m"
+
+
+def _any_enabled(*keys: str) -> Callable[[Any], bool]:
+    """Enabled predicate: any of the boolean settings is on."""
+    return lambda config: any(config.get(key, True) for key in keys)
+
+
+for _provider in (
+    SegmentProvider(
+        'project', COST_CACHED, _segment('project'),
+        inputs=('cwd', 'project_dir'), key_inputs=('cwd',),
+    ),
+    SegmentProvider(
+        'git', COST_PROCESS, _segment('git'),
+        inputs=('cwd',), enabled=_any_enabled('display.show_git'),
+    ),
+    SegmentProvider(
+        'worktrees', COST_PROCESS, _render_worktrees,
+        inputs=('cwd',), depends=('git',), enabled=_any_enabled('git.show_worktrees'),
+    ),
+    SegmentProvider('model', COST_FREE, _segment('model'), inputs=('model_name',)),
+    SegmentProvider(
+        'thinking', COST_CACHED, _segment('thinking'),
+        enabled=_any_enabled('display.show_thinking_indicator'),
+    ),
+    SegmentProvider(
+        'agents', COST_CACHED, _render_agents,
+        inputs=('session_id',), enabled=_any_enabled('display.show_background_agents'),
+        separated=True,
+    ),
+    SegmentProvider(
+        'time', COST_IO, _segment('time'),
+        inputs=('session_id', 'transcript_path'), key_inputs=('session_id',),
+        enabled=_any_enabled('display.show_current_time', 'display.show_session_duration'),
+    ),
+    SegmentProvider(
+        'usage', COST_PROCESS, _segment('usage'),
+        enabled=_any_enabled('display.show_session_usage', 'display.show_weekly_usage'),
+        separated=True,
+    ),
+    SegmentProvider(
+        'lines', COST_FREE, _segment('lines'),
+        inputs=('lines_added', 'lines_removed'),
+        enabled=_any_enabled('display.show_lines_changed'), separated=True,
+    ),
+    SegmentProvider(
+        'style', COST_FREE, _render_style,
+        inputs=('style_name',),
+        enabled=lambda config: config.get('display.show_output_style', 'auto') != 'never',
+        separated=True,
+    ),
+):
+    register_provider(_provider)
+del _provider
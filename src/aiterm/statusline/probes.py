@@ -0,0 +1,298 @@
+"""Background refresh for slow ProjectSegment probes.
+
+Some project context needs a subprocess that is far too slow for a statusLine
+render: ``pip list --outdated`` and ``npm outdated`` hit the network, and
+asking a venv's python or node for its version forks an interpreter. These
+probes use stale-while-revalidate instead:
+
+- A render returns the last cached value immediately (None the first time).
+- If the value is older than its refresh interval, a detached
+  ``python -m aiterm.statusline.probes`` process recomputes it.
+- A lock file per (project, probe) ensures concurrent renders start at most
+  one refresh; abandoned locks expire after LOCK_TIMEOUT seconds.
+
+Results are stored under ~/.cache/aiterm/probes, one small JSON file per
+(project, probe).
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from aiterm.statusline.cache import atomic_write_json, get_cache_dir, read_json
+
+# Seconds after which a refresh lock is treated as abandoned
+LOCK_TIMEOUT = 120
+
+# Timeout for a single probe command (runs in the background)
+PROBE_TIMEOUT = 60
+
+
+def get_probe_dir() -> Path:
+    """Get the directory holding probe results and locks."""
+    return get_cache_dir() / 'probes'
+
+
+def _probe_path(project_dir: str, probe: str, suffix: str) -> Path:
+    """Get the result/lock path for one project's probe."""
+    digest = hashlib.sha1(project_dir.encode('utf-8')).hexdigest()[:16]
+    return get_probe_dir() / f"{probe}-{digest}{suffix}"
+
+
+# ─── Probe implementations (run in the refresh process) ──────────────────────
+
+
+def probe_python_version(project_dir: str, python_bin: str) -> Optional[str]:
+    """Get a venv's Python version.
+
+    Args:
+        project_dir: Project directory
+        python_bin: Path to the venv's python
+
+    Returns:
+        Version like "py3.11", or None
+    """
+    result = subprocess.run(
+        [python_bin, '--version'],
+        capture_output=True,
+        text=True,
+        timeout=PROBE_TIMEOUT,
+    )
+    if result.returncode != 0:
+        return None
+    # Parse "Python 3.11.5" -> "py3.11"
+    version = result.stdout.strip().split()[1]
+    return f"py{'.'.join(version.split('.')[:2])}"
+
+
+def probe_node_version(project_dir: str) -> Optional[str]:
+    """Get the active Node.js version for a project.
+
+    Args:
+        project_dir: Project directory (node may be selected per directory)
+
+    Returns:
+        Version like "v20.11.0", or None
+    """
+    result = subprocess.run(
+        ['node', '--version'],
+        capture_output=True,
+        text=True,
+        timeout=PROBE_TIMEOUT,
+        cwd=project_dir,
+    )
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip()
+
+
+def probe_outdated(project_dir: str, project_type: str) -> Optional[int]:
+    """Count outdated dependencies.
+
+    Args:
+        project_dir: Project directory
+        project_type: Type of project (python/node/r-package)
+
+    Returns:
+        Number of outdated packages, or None if unknown
+    """
+    if project_type == 'python':
+        result = subprocess.run(
+            ['pip', 'list', '--outdated', '--format=json'],
+            capture_output=True,
+            text=True,
+            timeout=PROBE_TIMEOUT,
+            cwd=project_dir,
+        )
+        if result.returncode == 0:
+            return len(json.loads(result.stdout))
+
+    elif project_type == 'node':
+        result = subprocess.run(
+            ['npm', 'outdated', '--json'],
+            capture_output=True,
+            text=True,
+            timeout=PROBE_TIMEOUT,
+            cwd=project_dir,
+        )
+        # npm outdated returns exit code 1 when there are outdated packages
+        if result.stdout:
+            return len(json.loads(result.stdout))
+
+    return None
+
+
+# Probe name -> implementation (called as fn(project_dir, *args))
+PROBES: Dict[str, Callable[..., Any]] = {
+    'python_version': probe_python_version,
+    'node_version': probe_node_version,
+    'outdated': probe_outdated,
+}
+
+# Probe name -> StatusLineConfig key holding its refresh interval
+PROBE_INTERVAL_KEYS = {
+    'python_version': 'project.python_version_interval',
+    'node_version': 'project.node_version_interval',
+    'outdated': 'project.dependency_check_interval',
+}
+
+
+def run_probe(probe: str, project_dir: str, *args: str) -> Any:
+    """Run a probe synchronously.
+
+    Args:
+        probe: Probe name (see PROBES)
+        project_dir: Project directory
+        *args: Extra probe arguments
+
+    Returns:
+        Probe result, or None if it failed
+    """
+    try:
+        return PROBES[probe](project_dir, *args)
+    except Exception:
+        return None
+
+
+# ─── Stale-while-revalidate cache ────────────────────────────────────────────
+
+
+def read_probe(project_dir: str, probe: str) -> Optional[dict]:
+    """Read a cached probe result.
+
+    Returns:
+        Dict with 'value' and 'updated' (epoch seconds), or None
+    """
+    entry = read_json(_probe_path(project_dir, probe, '.json'))
+    return entry if isinstance(entry, dict) else None
+
+
+def write_probe(project_dir: str, probe: str, value: Any) -> bool:
+    """Store a probe result."""
+    return atomic_write_json(
+        _probe_path(project_dir, probe, '.json'),
+        {'project_dir': project_dir, 'probe': probe, 'value': value, 'updated': time.time()},
+    )
+
+
+def acquire_lock(lock_path: Path) -> bool:
+    """Take a refresh lock (O_EXCL create), clearing abandoned ones.
+
+    Returns:
+        True if the lock was taken
+    """
+    for _ in range(2):
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o600)
+        except FileExistsError:
+            try:
+                if time.time() - lock_path.stat().st_mtime < LOCK_TIMEOUT:
+                    return False
+                lock_path.unlink()
+            except OSError:
+                pass
+            continue
+        except OSError:
+            return False
+        os.write(fd, str(os.getpid()).encode())
+        os.close(fd)
+        return True
+    return False
+
+
+def release_lock(lock_path: Path) -> None:
+    """Release a refresh lock."""
+    try:
+        lock_path.unlink()
+    except OSError:
+        pass
+
+
+def spawn_refresh(project_dir: str, probe: str, *args: str) -> bool:
+    """Start a detached refresh unless one is already running.
+
+    Args:
+        project_dir: Project directory
+        probe: Probe name (see PROBES)
+        *args: Extra probe arguments
+
+    Returns:
+        True if a refresh process was started
+    """
+    lock_path = _probe_path(project_dir, probe, '.lock')
+    try:
+        lock_path.parent.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return False
+    if not acquire_lock(lock_path):
+        return False
+
+    try:
+        subprocess.Popen(
+            [sys.executable, '-m', 'aiterm.statusline.probes', probe, project_dir, *args],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            close_fds=True,
+        )
+    except OSError:
+        release_lock(lock_path)
+        return False
+    return True
+
+
+def cached_probe(project_dir: str, probe: str, interval: int, *args: str) -> Any:
+    """Get a probe result without blocking (stale-while-revalidate).
+
+    Args:
+        project_dir: Project directory
+        probe: Probe name (see PROBES)
+        interval: Seconds before the cached value is refreshed
+        *args: Extra probe arguments
+
+    Returns:
+        Last cached value (None until the first refresh finishes)
+    """
+    entry = read_probe(project_dir, probe)
+    if entry is None or time.time() - entry.get('updated', 0) >= interval:
+        spawn_refresh(project_dir, probe, *args)
+    return entry.get('value') if entry else None
+
+
+def refresh(probe: str, project_dir: str, *args: str) -> Any:
+    """Recompute a probe, store it and release its lock.
+
+    Args:
+        probe: Probe name (see PROBES)
+        project_dir: Project directory
+        *args: Extra probe arguments
+
+    Returns:
+        New probe value
+    """
+    try:
+        value = run_probe(probe, project_dir, *args)
+        write_probe(project_dir, probe, value)
+        return value
+    finally:
+        release_lock(_probe_path(project_dir, probe, '.lock'))
+
+
+def main(argv: Optional[list] = None) -> int:
+    """Refresh process entry point: ``python -m aiterm.statusline.probes PROBE DIR [ARGS]``."""
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) < 2 or argv[0] not in PROBES:
+        sys.stderr.write(f"usage: probes {{{','.join(PROBES)}}} PROJECT_DIR [ARGS...]\n")
+        return 2
+    refresh(argv[0], argv[1], *argv[2:])
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
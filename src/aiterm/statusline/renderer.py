@@ -5,15 +5,24 @@ This module provides the main Renderer class that:
 - Parses and extracts relevant fields
 - Delegates to segment renderers
 - Outputs formatted 2-line Powerlevel10k-style statusLine
+
+Terminal side-channel escapes (window title, Ghostty progress bar) are not
+written while rendering: render() leaves the ones that changed since the
+last render in ``side_channel`` and render_output() returns them together
+with the lines, ready for a single write (see ``aiterm.statusline.output``).
 """
 
 import json
 import sys
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
+from aiterm.statusline.budget import SegmentRunner
 from aiterm.statusline.config import StatusLineConfig
-from aiterm.statusline.themes import Theme, get_theme
+from aiterm.statusline.output import TerminalState, build_output, osc_title
+from aiterm.statusline.pipeline import PROVIDERS, RenderPlan, build_plan
+from aiterm.statusline.themes import Theme, compile_theme, get_theme
+from aiterm.statusline.width import display_width
 
 
 # Spacing presets for gap between left and right segments
@@ -27,15 +36,29 @@ SPACING_PRESETS = {
 class StatusLineRenderer:
     """Main renderer for statusLine output."""
 
-    def __init__(self, config: Optional[StatusLineConfig] = None, theme: Optional[Theme] = None):
+    def __init__(
+        self,
+        config: Optional[StatusLineConfig] = None,
+        theme: Optional[Theme] = None,
+        daemon: bool = False,
+    ):
         """Initialize renderer.
 
         Args:
             config: StatusLineConfig instance (creates new if None)
             theme: Theme instance (loads from config if None)
+            daemon: Whether this renderer serves the render daemon
         """
         self.config = config or StatusLineConfig()
+        self.daemon = daemon
         self.theme = theme or get_theme(self.config.get('theme.name', 'purple-charcoal'))
+        self._segments = None
+        self._agent_detector = None
+        self._plan: Optional[RenderPlan] = None
+        self._plan_source = None
+        self._runner = None
+        # Escapes to send ahead of the lines from the last render()
+        self.side_channel = ""
 
     def _get_separator(self) -> str:
         """Get separator pattern based on config.
@@ -44,18 +67,28 @@ class StatusLineRenderer:
             Formatted separator with spacing (e.g., " │ " or "  │  ")
         """
         spacing_mode = self.config.get('display.separator_spacing', 'standard')
+        return compile_theme(self.theme).separator(spacing_mode)
+
+    def _segment_registry(self):
+        """Get the segments shared by every render of this renderer."""
+        if self._segments is None:
+            # Import here to avoid circular imports
+            from aiterm.statusline.segments import SegmentRegistry
+            self._segments = SegmentRegistry(self.config, self.theme)
+        return self._segments
+
+    def _agent_detector_instance(self):
+        """Get the background agent detector shared by every render."""
+        if self._agent_detector is None:
+            from aiterm.statusline.agents import AgentDetector
+            self._agent_detector = AgentDetector()
+        return self._agent_detector
 
-        # Map spacing mode to number of spaces
-        spacing_map = {
-            'minimal': 1,
-            'standard': 2,
-            'relaxed': 3
-        }
-
-        spaces = spacing_map.get(spacing_mode, 2)  # Default to 2 (standard)
-        space_str = ' ' * spaces
-
-        return f"{space_str}\033[{self.theme.separator_fg}m│\033[0m{space_str}"
+    def _segment_runner(self) -> SegmentRunner:
+        """Get the runner enforcing segment budgets for the current render."""
+        if self._runner is None:
+            self._runner = SegmentRunner.from_config(self.config, daemon=self.daemon)
+        return self._runner
 
     def render(self, json_input: Optional[str] = None) -> str:
         """Render statusLine from JSON input.
@@ -66,6 +99,9 @@ class StatusLineRenderer:
         Returns:
             Formatted statusLine output (2 lines)
         """
+        self.side_channel = ""
+        self._segment_registry().reset()
+
         # Read JSON from stdin if not provided
         if json_input is None:
             json_input = sys.stdin.read()
@@ -82,165 +118,168 @@ class StatusLineRenderer:
         model_data = data.get('model') or {}
         cost_data = data.get('cost') or {}
         output_style = data.get('output_style') or {}
-        context_window = data.get('context_window') or {}
 
         cwd = workspace.get('current_dir', '')
         project_dir = workspace.get('project_dir', cwd)
         model_name = model_data.get('display_name', 'Unknown')
-        style_name = output_style.get('name', 'default')
         session_id = data.get('session_id', 'default')
-        transcript_path = data.get('transcript_path')
-
-        # Extract cost/usage fields
-        lines_added = cost_data.get('total_lines_added', 0)
-        lines_removed = cost_data.get('total_lines_removed', 0)
-        total_duration_ms = cost_data.get('total_duration_ms', 0)
-
-        # Extract context window data
-        context_size = context_window.get('context_window_size', 0)
-        current_usage = context_window.get('current_usage') or {}
-        input_tokens = current_usage.get('input_tokens', 0)
-        output_tokens = current_usage.get('output_tokens', 0)
-
-        # Build line 1 (directory + git)
-        line1 = self._build_line1(cwd, project_dir)
-
-        # Build line 2 (model + time + stats)
-        line2 = self._build_line2(
-            model_name=model_name,
-            session_id=session_id,
-            lines_added=lines_added,
-            lines_removed=lines_removed,
-            style_name=style_name,
-            transcript_path=transcript_path
-        )
-
-        # Set window title
-        self._set_window_title(project_dir, model_name)
-
-        return f"{line1}\n{line2}"
-
-    def _build_line1(self, cwd: str, project_dir: str) -> str:
-        """Build line 1 (directory + git + optional right-side worktree).
-
-        Args:
-            cwd: Current working directory
-            project_dir: Project root directory
 
-        Returns:
-            Formatted line 1 with optional right-side segments
-        """
-        # Import here to avoid circular imports
-        from aiterm.statusline.segments import (
-            ProjectSegment,
-            GitSegment
-        )
+        # Provider inputs (see aiterm.statusline.pipeline)
+        fields = {
+            'cwd': cwd,
+            'project_dir': project_dir,
+            'model_name': model_name,
+            'style_name': output_style.get('name', 'default'),
+            'session_id': session_id,
+            'transcript_path': data.get('transcript_path'),
+            'lines_added': cost_data.get('total_lines_added', 0),
+            'lines_removed': cost_data.get('total_lines_removed', 0),
+        }
 
-        # Get project segment
-        project_segment = ProjectSegment(self.config, self.theme)
-        project_output = project_segment.render(cwd, project_dir)
+        # Segment budgets and the render deadline start here
+        self._runner = SegmentRunner.from_config(self.config, daemon=self.daemon)
 
-        # Get git segment
-        git_segment = GitSegment(self.config, self.theme)
-        git_output = git_segment.render(cwd)
+        # Start every planned provider; in parallel mode they run
+        # concurrently from here, disabled ones are never called
+        plan = self._get_plan()
+        pending = self._submit(plan, fields)
 
-        # Assemble left side
-        line1_left = f"╭─{project_output}"
+        # Assemble the lines in layout order
+        lines = [
+            self._assemble_line(index, left, right, pending, fields)
+            for index, (left, right) in enumerate(plan.lines)
+        ]
 
-        if git_output:
-            line1_left += git_output
-        else:
-            # Close directory segment
-            line1_left += "\033[0m\033[38;5;4m▓▒░\033[0m"
+        # Window title and progress bar, skipped while unchanged
+        self.side_channel = TerminalState().diff(session_id, {
+            'title': self._get_window_title(project_dir, model_name),
+            'progress': self._get_progress(),
+        })
 
-        # Build right side (worktree context)
-        line1_right = self._build_right_segments(cwd, git_segment)
+        # Remember segment outputs for renders that miss their budget
+        self._runner.save()
 
-        if line1_right:
-            # Calculate padding for alignment
-            return self._align_line(line1_left, line1_right)
-        else:
-            return line1_left
+        return "\n".join(lines)
 
-    def _build_line2(
-        self,
-        model_name: str,
-        session_id: str,
-        lines_added: int,
-        lines_removed: int,
-        style_name: str,
-        transcript_path: Optional[str] = None
-    ) -> str:
-        """Build line 2 (model + time + stats).
+    def render_output(self, json_input: Optional[str] = None) -> bytes:
+        """Render statusLine output for a single write to the terminal.
 
         Args:
-            model_name: Model display name
-            session_id: Session ID for duration tracking
-            lines_added: Total lines added
-            lines_removed: Total lines removed
-            style_name: Output style name
-            transcript_path: Optional path to session transcript
+            json_input: JSON string from Claude Code (reads from stdin if None)
 
         Returns:
-            Formatted line 2
+            Side-channel escapes followed by both lines, UTF-8 encoded
         """
-        # Import here to avoid circular imports
-        from aiterm.statusline.segments import (
-            ModelSegment,
-            TimeSegment,
-            ThinkingSegment,
-            LinesSegment,
-            UsageSegment
-        )
+        lines = self.render(json_input)
+        return build_output(self.side_channel, lines)
 
-        # Model segment
-        model_segment = ModelSegment(self.config, self.theme)
-        model_output = model_segment.render(model_name)
+    def finish_late_segments(self) -> int:
+        """Let segments that missed their budget in the last render finish.
 
-        # Thinking mode indicator
-        thinking_segment = ThinkingSegment(self.config, self.theme)
-        thinking_output = thinking_segment.render()
+        Only one-shot renders wait (see aiterm.statusline.budget); the
+        daemon's late segments finish in the background.
 
-        # Time segments
-        time_segment = TimeSegment(self.config, self.theme)
-        time_output = time_segment.render(session_id, transcript_path)
+        Returns:
+            Number of late segments that finished
+        """
+        if self.daemon or self._runner is None or not self._runner.late:
+            return 0
+        from aiterm.statusline.budget import DEFAULT_LATE_GRACE_MS
+        return self._runner.finish_late(
+            self.config.get('performance.late_grace_ms', DEFAULT_LATE_GRACE_MS)
+        )
 
-        # Lines changed
-        lines_segment = LinesSegment(self.config, self.theme)
-        lines_output = lines_segment.render(lines_added, lines_removed)
+    def _get_plan(self) -> RenderPlan:
+        """Get the execution plan, rebuilt when the config snapshot changes."""
+        snapshot = self.config.snapshot()
+        if self._plan is None or self._plan_source is not snapshot:
+            self._plan = build_plan(self.config)
+            self._plan_source = snapshot
+        return self._plan
 
-        # Build line 2
-        line2 = f"╰─ {model_output}"
+    def _submit(self, plan: RenderPlan, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """Start the plan's budgeted providers (dependencies first).
 
-        # Add thinking indicator (includes separator if enabled)
-        line2 += thinking_output
+        Args:
+            plan: Execution plan
+            fields: Payload fields by name
 
-        # Add background agents count
-        if self.config.get('display.show_background_agents', True):
-            from aiterm.statusline.agents import AgentDetector
-            detector = AgentDetector()
-            agent_count = detector.get_running_count(session_id)
-            if agent_count > 0:
-                line2 += f"{self._get_separator()}\033[38;5;2m🤖{agent_count}\033[0m"
+        Returns:
+            Provider name -> PendingSegment
+        """
+        runner = self._segment_runner()
+        pending = {}
+        for name in plan.order:
+            provider = PROVIDERS[name]
+            if provider.budgeted:
+                pending[name] = runner.submit(
+                    name, provider.render, self, *provider.args(fields), key=provider.key(fields)
+                )
+        return pending
+
+    def _provider_output(self, name: str, pending: Dict[str, Any], fields: Dict[str, Any]) -> str:
+        """Get one provider's output, prefixed with a separator if it asks for one.
 
-        # Add time
-        line2 += time_output
+        Args:
+            name: Provider name
+            pending: Started providers from _submit()
+            fields: Payload fields by name
 
-        # Add usage tracking
-        usage_segment = UsageSegment(self.config, self.theme)
-        usage_output = usage_segment.render()
-        if usage_output:
-            line2 += f"{self._get_separator()}{usage_output}"
+        Returns:
+            Formatted output or empty string
+        """
+        provider = PROVIDERS[name]
+        if name in pending:
+            output = self._segment_runner().result(pending[name])
+        else:
+            output = provider.render(self, *provider.args(fields))
+        if not output:
+            return ""
+        if provider.separated:
+            return f"{self._get_separator()}{output}"
+        return output
 
-        # Add lines if available
-        if lines_output:
-            line2 += f"{self._get_separator()}{lines_output}"
+    def _assemble_line(
+        self,
+        index: int,
+        left: Tuple[str, ...],
+        right: Tuple[str, ...],
+        pending: Dict[str, Any],
+        fields: Dict[str, Any],
+    ) -> str:
+        """Assemble one line from its providers' outputs.
 
-        # Add style if not default
-        if style_name and style_name != 'default':
-            line2 += f"{self._get_separator()}\033[{self.theme.style_fg}m[{style_name}]\033[0m"
+        Args:
+            index: Line number (0: first line)
+            left: Left-side providers in display order
+            right: Right-side providers in display order
+            pending: Started providers from _submit()
+            fields: Payload fields by name
 
-        return line2
+        Returns:
+            Formatted line with optional right-side segments
+        """
+        line_left = "╭─" if index == 0 else "╰─ "
+        dir_open = False
+
+        for name in left:
+            output = self._provider_output(name, pending, fields)
+            if not output:
+                continue
+            if dir_open and name != 'git':
+                # Close directory segment (git output continues it)
+                line_left += compile_theme(self.theme).dir_close
+            line_left += output
+            dir_open = name == 'project'
+
+        if dir_open:
+            line_left += compile_theme(self.theme).dir_close
+
+        line_right = "".join(self._provider_output(name, pending, fields) for name in right)
+        if line_right:
+            # Calculate padding for alignment
+            return self._align_line(line_left, line_right)
+        return line_left
 
     def _build_right_segments(self, cwd: str, git_segment) -> str:
         """Build right-aligned segments (worktree context).
@@ -280,15 +319,8 @@ class StatusLineRenderer:
             Formatted segment with reversed powerline arrows
         """
         # Reversed powerline style: ░▒▓ content ▓▒░
-        # Using dark gray colors (235 bg, 245 fg)
-        bg = '235'
-        fg = '245'
-
-        return (
-            f"\033[48;5;{bg}m\033[38;5;{fg}m"
-            f"░▒▓ {content} ▓▒░"
-            f"\033[0m"
-        )
+        fragments = compile_theme(self.theme)
+        return f"{fragments.right_open}{content}{fragments.right_close}"
 
     def _calculate_gap(self, terminal_width: int) -> int:
         """Calculate gap size between left and right segments.
@@ -341,8 +373,7 @@ class StatusLineRenderer:
         left_spaces = center - 1
         right_spaces = gap_size - center
 
-        # Dim gray color for separator (fg=240)
-        separator = f"\033[38;5;240m…\033[0m"
+        separator = compile_theme(self.theme).gap_separator
 
         return f"{' ' * left_spaces}{separator}{' ' * right_spaces}"
 
@@ -387,34 +418,44 @@ class StatusLineRenderer:
                 return left
 
     def _strip_ansi_length(self, text: str) -> int:
-        """Get visible character count (strip ANSI codes).
+        """Get visible width (strip ANSI codes, count wide characters as 2).
 
         Args:
             text: Text with ANSI escape codes
 
         Returns:
-            Length of visible characters only
+            Display width in terminal cells
         """
-        import re
-        ansi_escape = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
-        return len(ansi_escape.sub('', text))
+        return display_width(text)
 
-    def _set_window_title(self, project_dir: str, model_name: str) -> None:
-        """Set terminal window title.
+    def _get_window_title(self, project_dir: str, model_name: str) -> str:
+        """Build the terminal window title escape.
 
         Args:
             project_dir: Project directory path
             model_name: Model name
-        """
-        # Import here to avoid circular imports
-        from aiterm.statusline.segments import ProjectSegment
 
-        project_segment = ProjectSegment(self.config, self.theme)
+        Returns:
+            OSC 0 escape sequence
+        """
+        # Line 1's segment; icon detection reads the cached project fingerprint
+        project_segment = self._segment_registry()['project']
         project_name = Path(project_dir).name
         project_icon = project_segment._get_project_icon(project_dir)
 
-        # ANSI escape sequence for window title
-        # Format: ESC ] 0 ; text BEL
-        title = f"{project_icon} {project_name} ({model_name})"
-        sys.stdout.write(f"\033]0;{title}\007")
-        sys.stdout.flush()
+        return osc_title(f"{project_icon} {project_name} ({model_name})")
+
+    def _get_progress(self) -> Optional[str]:
+        """Get the Ghostty progress bar escape from this render's segments.
+
+        Returns:
+            OSC 9;4 escape sequence, or None if no segment set one
+        """
+        # Lines changed used to be written after usage, so it wins
+        registry = self._segment_registry()
+        for name in ('lines', 'usage'):
+            segment = registry.find(name)
+            progress = segment.progress if segment is not None else None
+            if progress:
+                return progress
+        return None
@@ -8,19 +8,32 @@ Each segment class handles rendering a specific part of the statusLine:
 - ThinkingSegment: Thinking mode indicator
 - LinesSegment: Lines added/removed
 - UsageSegment: Session and weekly usage tracking
+
+Segments are built once per renderer by SegmentRegistry and reused for
+every render (the daemon keeps them warm across requests). Each segment
+declares the payload fields its render() takes in INPUTS, holds only
+``__slots__`` attributes, and clears per-render state in reset().
 """
 
 import os
 import subprocess
-import sys
-from pathlib import Path
-from typing import Optional, Tuple
+import threading
 import time
-import json
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Optional, Tuple
 
+from aiterm.claude.settings_cache import get_global_settings_path, read_json_cached
+from aiterm.context.fingerprint import get_fingerprint
 from aiterm.statusline.config import StatusLineConfig
-from aiterm.statusline.themes import Theme, get_theme
+from aiterm.statusline.gitstatus import GitSnapshot, GitSnapshotCache
+from aiterm.statusline.output import osc_progress
+from aiterm.statusline.probes import PROBE_INTERVAL_KEYS, cached_probe, run_probe
+from aiterm.statusline.sessiontimes import get_store as get_session_store
+from aiterm.statusline.transcript import get_last_timestamp
+from aiterm.statusline.themes import RESET, Theme, compile_theme, get_theme
 from aiterm.statusline.usage import UsageTracker, get_usage_color
+from aiterm.statusline.width import display_width, fit_width
 
 
 def get_separator(config: StatusLineConfig, theme: Theme) -> str:
@@ -34,35 +47,16 @@ def get_separator(config: StatusLineConfig, theme: Theme) -> str:
         Formatted separator with spacing (e.g., " │ " or "  │  ")
     """
     spacing_mode = config.get('display.separator_spacing', 'standard')
+    return compile_theme(theme).separator(spacing_mode)
 
-    # Map spacing mode to number of spaces
-    spacing_map = {
-        'minimal': 1,
-        'standard': 2,
-        'relaxed': 3
-    }
-
-    spaces = spacing_map.get(spacing_mode, 2)  # Default to 2 (standard)
-    space_str = ' ' * spaces
 
-    return f"{space_str}\033[{theme.separator_fg}m│\033[0m{space_str}"
+class Segment(ABC):
+    """Base class for statusLine segments."""
 
+    __slots__ = ('config', 'theme')
 
-class ProjectSegment:
-    """Renders project type icon and directory."""
-
-    # Project type detection patterns
-    PROJECT_TYPES = {
-        'production': {'patterns': ['*/production/*', '*/prod/*'], 'icon': '🚨'},
-        'ai-session': {'patterns': ['*/claude-sessions/*', '*/gemini-sessions/*'], 'icon': '🤖'},
-        'r-package': {'check': lambda p: (p / 'DESCRIPTION').exists() and 'Package:' in (p / 'DESCRIPTION').read_text(), 'icon': '📦'},
-        'python': {'check': lambda p: (p / 'pyproject.toml').exists() or (p / 'setup.py').exists(), 'icon': '🐍'},
-        'node': {'check': lambda p: (p / 'package.json').exists(), 'icon': '📦'},
-        'quarto': {'check': lambda p: (p / '_quarto.yml').exists() or (p / '_quarto.yaml').exists(), 'icon': '📊'},
-        'mcp': {'patterns': ['*/mcp-server/*', '*mcp*'], 'icon': '🔌'},
-        'emacs': {'check': lambda p: any((p / f).exists() for f in ['init.el', 'Cask', '.dir-locals.el', 'early-init.el']), 'icon': '⚡'},
-        'dev-tools': {'check': lambda p: (p / '.git').exists() and ((p / 'commands').exists() or (p / 'scripts').exists()), 'icon': '🔧'},
-    }
+    # Payload fields passed to render(), in argument order
+    INPUTS: Tuple[str, ...] = ()
 
     def __init__(self, config: StatusLineConfig, theme: Optional[Theme] = None):
         """Initialize segment.
@@ -74,6 +68,34 @@ class ProjectSegment:
         self.config = config
         self.theme = theme or get_theme(config.get('theme.name', 'purple-charcoal'))
 
+    def reset(self) -> None:
+        """Clear state kept from the previous render."""
+
+    @abstractmethod
+    def render(self, *args) -> str:
+        """Render the segment (arguments as declared in INPUTS)."""
+
+
+class ProjectSegment(Segment):
+    """Renders project type icon and directory."""
+
+    __slots__ = ()
+
+    INPUTS = ('cwd', 'project_dir')
+
+    # Project type detection patterns (checks read a ProjectFingerprint)
+    PROJECT_TYPES = {
+        'production': {'patterns': ['*/production/*', '*/prod/*'], 'icon': '🚨'},
+        'ai-session': {'patterns': ['*/claude-sessions/*', '*/gemini-sessions/*'], 'icon': '🤖'},
+        'r-package': {'check': lambda fp: fp.is_r_package, 'icon': '📦'},
+        'python': {'check': lambda fp: fp.exists('pyproject.toml') or fp.exists('setup.py'), 'icon': '🐍'},
+        'node': {'check': lambda fp: fp.exists('package.json'), 'icon': '📦'},
+        'quarto': {'check': lambda fp: fp.exists('_quarto.yml') or fp.exists('_quarto.yaml'), 'icon': '📊'},
+        'mcp': {'patterns': ['*/mcp-server/*', '*mcp*'], 'icon': '🔌'},
+        'emacs': {'check': lambda fp: any(fp.exists(f) for f in ['init.el', 'Cask', '.dir-locals.el', 'early-init.el']), 'icon': '⚡'},
+        'dev-tools': {'check': lambda fp: fp.exists('.git') and (fp.exists('commands') or fp.exists('scripts')), 'icon': '🔧'},
+    }
+
     def render(self, cwd: str, project_dir: str) -> str:
         """Render project segment.
 
@@ -88,7 +110,9 @@ class ProjectSegment:
         project_icon = self._get_project_icon(project_dir)
         project_type = self._get_project_type(project_dir)
         dir_display = self._format_directory(cwd, project_dir)
-        r_version = self._get_r_version(project_dir)
+        r_version = None
+        if self.config.get('display.show_r_version', True):
+            r_version = self._get_r_version(project_dir)
 
         # Get project-specific context (Phase 4)
         python_env = self._get_python_env(project_dir)
@@ -102,7 +126,7 @@ class ProjectSegment:
         # Note: Worktree marker moved to right-side display in renderer.py
         # Left-side (wt) marker removed to avoid duplication
 
-        if r_version and self.config.get('display.show_r_version', True):
+        if r_version:
             content += f" \033[38;5;245m{r_version}\033[38;5;250m"
 
         # Add project-specific context
@@ -118,14 +142,8 @@ class ProjectSegment:
         if dep_warnings:
             content += f" \033[38;5;208m{dep_warnings}\033[38;5;250m"
 
-        # Get colors from theme
-        dir_bg = self.theme.dir_bg
-        dir_fg = self.theme.dir_fg
-
         # Build segment with powerline edges
-        segment = f"\033[{dir_bg};{dir_fg}m ░▒▓ {content} "
-
-        return segment
+        return f"{compile_theme(self.theme).dir_open}{content} "
 
     def _get_project_icon(self, project_dir: str) -> str:
         """Get icon for project type.
@@ -158,10 +176,11 @@ class ProjectSegment:
                             return config['icon']
 
         # Check file-based detection
+        fingerprint = get_fingerprint(project_dir)
         for project_type, config in self.PROJECT_TYPES.items():
             if 'check' in config:
                 try:
-                    if config['check'](path):
+                    if config['check'](fingerprint):
                         return config['icon']
                 except Exception:
                     # Ignore errors in check functions
@@ -178,26 +197,7 @@ class ProjectSegment:
         Returns:
             Project type string (python/node/r-package/default)
         """
-        path = Path(project_dir)
-
-        # Check for R package
-        if (path / 'DESCRIPTION').exists():
-            try:
-                content = (path / 'DESCRIPTION').read_text()
-                if 'Package:' in content:
-                    return 'r-package'
-            except Exception:
-                pass
-
-        # Check for Python project
-        if (path / 'pyproject.toml').exists() or (path / 'setup.py').exists():
-            return 'python'
-
-        # Check for Node.js project
-        if (path / 'package.json').exists():
-            return 'node'
-
-        return 'default'
+        return get_fingerprint(project_dir).project_type
 
     def _format_directory(self, cwd: str, project_dir: str) -> str:
         """Format directory for display.
@@ -248,19 +248,14 @@ class ProjectSegment:
         Returns:
             Version string like "v1.2.3" or None
         """
-        desc_file = Path(project_dir) / 'DESCRIPTION'
-
-        if not desc_file.exists():
+        content = get_fingerprint(project_dir).read_text('DESCRIPTION')
+        if content is None:
             return None
 
-        try:
-            content = desc_file.read_text()
-            for line in content.split('\n'):
-                if line.startswith('Version:'):
-                    version = line.replace('Version:', '').strip()
-                    return f"v{version}"
-        except Exception:
-            pass
+        for line in content.split('\n'):
+            if line.startswith('Version:'):
+                version = line.replace('Version:', '').strip()
+                return f"v{version}"
 
         return None
 
@@ -277,33 +272,16 @@ class ProjectSegment:
             return None
 
         project_path = Path(project_dir)
+        fingerprint = get_fingerprint(project_dir)
 
         # Check for virtual environment
-        venv_paths = [
-            project_path / 'venv',
-            project_path / '.venv',
-            project_path / 'env',
-        ]
-
-        for venv_path in venv_paths:
-            if venv_path.exists():
-                # Try to get Python version
-                try:
-                    python_bin = venv_path / 'bin' / 'python'
-                    if python_bin.exists():
-                        result = subprocess.run(
-                            [str(python_bin), '--version'],
-                            capture_output=True,
-                            text=True,
-                            timeout=2
-                        )
-                        if result.returncode == 0:
-                            # Parse "Python 3.11.5" -> "py3.11"
-                            version = result.stdout.strip().split()[1]
-                            major_minor = '.'.join(version.split('.')[:2])
-                            return f"venv: py{major_minor}"
-                except Exception:
-                    pass
+        for venv_name in ('venv', '.venv', 'env'):
+            if fingerprint.exists(venv_name):
+                python_bin = project_path / venv_name / 'bin' / 'python'
+                if python_bin.exists():
+                    version = self._probe('python_version', project_dir, str(python_bin))
+                    if version:
+                        return f"venv: {version}"
                 return "venv"
 
         # Check for conda environment
@@ -312,13 +290,9 @@ class ProjectSegment:
             return f"conda: {conda_env}"
 
         # Check for pyenv
-        pyenv_version_file = project_path / '.python-version'
-        if pyenv_version_file.exists():
-            try:
-                version = pyenv_version_file.read_text().strip()
-                return f"pyenv: {version}"
-            except Exception:
-                pass
+        pyenv_version = fingerprint.read_text('.python-version')
+        if pyenv_version is not None:
+            return f"pyenv: {pyenv_version.strip()}"
 
         return None
 
@@ -334,33 +308,16 @@ class ProjectSegment:
         if not self.config.get('project.detect_node_version', False):
             return None
 
-        project_path = Path(project_dir)
-
         # Check .nvmrc file
-        nvmrc = project_path / '.nvmrc'
-        if nvmrc.exists():
-            try:
-                version = nvmrc.read_text().strip()
-                if not version.startswith('v'):
-                    version = f"v{version}"
-                return version
-            except Exception:
-                pass
+        nvmrc = get_fingerprint(project_dir).read_text('.nvmrc')
+        if nvmrc is not None:
+            version = nvmrc.strip()
+            if not version.startswith('v'):
+                version = f"v{version}"
+            return version
 
         # Get current node version
-        try:
-            result = subprocess.run(
-                ['node', '--version'],
-                capture_output=True,
-                text=True,
-                timeout=2
-            )
-            if result.returncode == 0:
-                return result.stdout.strip()
-        except Exception:
-            pass
-
-        return None
+        return self._probe('node_version', project_dir)
 
     def _get_r_package_health(self, project_dir: str) -> Optional[str]:
         """Check R package health (tests, check results).
@@ -375,22 +332,21 @@ class ProjectSegment:
             return None
 
         project_path = Path(project_dir)
+        fingerprint = get_fingerprint(project_dir)
 
         # Only check if this is an R package
-        desc_file = project_path / 'DESCRIPTION'
-        if not desc_file.exists():
+        if not fingerprint.exists('DESCRIPTION'):
             return None
 
         # Lightweight checks (not full R CMD check)
         warnings = []
 
         # Check if tests exist
-        tests_dir = project_path / 'tests'
-        if not tests_dir.exists():
+        if not fingerprint.exists('tests'):
             warnings.append("no tests")
 
         # Check for R CMD check results
-        check_results = list(project_path.glob('*.Rcheck'))
+        check_results = [project_path / name for name in fingerprint.dirs_with_suffix('.Rcheck')]
         if check_results:
             # Check most recent
             latest_check = max(check_results, key=lambda p: p.stat().st_mtime)
@@ -427,57 +383,35 @@ class ProjectSegment:
         if not self.config.get('project.show_dependency_warnings', False):
             return None
 
-        project_path = Path(project_dir)
+        if project_type not in ('python', 'node', 'r-package'):
+            return None
 
-        # Python projects
-        if project_type == 'python':
-            try:
-                result = subprocess.run(
-                    ['pip', 'list', '--outdated', '--format=json'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                    cwd=project_dir
-                )
-                if result.returncode == 0:
-                    import json
-                    outdated = json.loads(result.stdout)
-                    if len(outdated) > 0:
-                        return f"⚠ {len(outdated)} outdated"
-            except Exception:
-                pass
-
-        # Node.js projects
-        elif project_type == 'node':
-            try:
-                result = subprocess.run(
-                    ['npm', 'outdated', '--json'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                    cwd=project_dir
-                )
-                # npm outdated returns exit code 1 when there are outdated packages
-                if result.stdout:
-                    import json
-                    try:
-                        outdated = json.loads(result.stdout)
-                        count = len(outdated)
-                        if count > 0:
-                            return f"⚠ {count} outdated"
-                    except json.JSONDecodeError:
-                        pass
-            except Exception:
-                pass
-
-        # R packages
-        elif project_type == 'r-package':
-            # R dependency checking is expensive, skip for now
-            # Could cache results or run in background
-            pass
+        count = self._probe('outdated', project_dir, project_type)
+        if count:
+            return f"⚠ {count} outdated"
 
         return None
 
+    def _probe(self, probe: str, project_dir: str, *args: str):
+        """Get a slow probe result (see aiterm.statusline.probes).
+
+        With project.background_probes enabled (default), returns the last
+        cached value immediately and refreshes it in a detached process.
+
+        Args:
+            probe: Probe name
+            project_dir: Project directory
+            *args: Extra probe arguments
+
+        Returns:
+            Probe value or None
+        """
+        if not self.config.get('project.background_probes', True):
+            return run_probe(probe, project_dir, *args)
+
+        interval = self.config.get(PROBE_INTERVAL_KEYS[probe], 3600)
+        return cached_probe(project_dir, probe, interval, *args)
+
     def _is_worktree(self, project_dir: str) -> bool:
         """Check if current directory is in a worktree (not main working directory).
 
@@ -487,26 +421,25 @@ class ProjectSegment:
         Returns:
             True if in a worktree, False if in main working directory
         """
-        try:
-            # Get git directory
-            result = subprocess.run(
-                ['git', '-C', project_dir, 'rev-parse', '--git-dir'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                git_dir = result.stdout.strip()
-                # Worktrees have .git/worktrees/<name> as git-dir
-                # Main working directory has .git as git-dir
-                return '/worktrees/' in git_dir
-        except Exception:
-            pass
-        return False
+        fingerprint = get_fingerprint(project_dir)
+        if fingerprint.has_dir('.git'):
+            return False
+        if fingerprint.has_file('.git'):
+            # Linked worktrees have a .git file pointing into .git/worktrees/
+            return '/worktrees/' in (fingerprint.read_text('.git') or '')
 
+        # Subdirectory of a repository
+        snapshot = GitSnapshotCache.from_config(self.config).get(project_dir)
+        return snapshot.is_worktree if snapshot else False
 
-class GitSegment:
+
+class GitSegment(Segment):
     """Renders git branch and status."""
 
+    __slots__ = ('_snapshots', '_snapshot_lock')
+
+    INPUTS = ('cwd',)
+
     def __init__(self, config: StatusLineConfig, theme: Optional[Theme] = None):
         """Initialize segment.
 
@@ -514,8 +447,15 @@ class GitSegment:
             config: StatusLineConfig instance
             theme: Theme object (loads from config if None)
         """
-        self.config = config
-        self.theme = theme or get_theme(config.get('theme.name', 'purple-charcoal'))
+        super().__init__(config, theme)
+        self._snapshots: Dict[str, Optional[GitSnapshot]] = {}
+        # Git and worktree output may be built concurrently (parallel_segments)
+        self._snapshot_lock = threading.Lock()
+
+    def reset(self) -> None:
+        """Forget git snapshots looked up by the previous render."""
+        with self._snapshot_lock:
+            self._snapshots = {}
 
     def render(self, cwd: str) -> str:
         """Render git segment.
@@ -537,8 +477,8 @@ class GitSegment:
         branch, has_changes, ahead, behind, untracked = git_info
 
         # Determine background color from theme
-        vcs_bg = self.theme.vcs_clean_bg if not has_changes and untracked == 0 else self.theme.vcs_modified_bg
-        vcs_fg = self.theme.vcs_fg
+        fragments = compile_theme(self.theme)
+        vcs_open = fragments.vcs_clean_open if not has_changes and untracked == 0 else fragments.vcs_modified_open
 
         # Build git string
         git_str = f" {branch}"
@@ -573,98 +513,46 @@ class GitSegment:
                 git_str += f" 🌳{worktree_count}"
 
         # Build segment with powerline separator
-        sep_left = ""
-        segment = f"\033[38;5;54;{vcs_bg}m{sep_left}\033[{vcs_bg};{vcs_fg}m{git_str} \033[0m\033[38;5;60m▓▒░\033[0m"
+        return f"{vcs_open}{git_str}{fragments.vcs_close}"
 
-        return segment
+    def _get_snapshot(self, cwd: str) -> Optional[GitSnapshot]:
+        """Get the git snapshot for a directory (looked up once per segment).
 
-    def _get_git_info(self, cwd: str) -> Optional[Tuple[str, bool, int, int, int]]:
-        """Get git repository information.
+        All git-related helpers read from this snapshot, so a render forks
+        git at most twice regardless of which git features are enabled, and
+        not at all when the on-disk snapshot cache is still valid.
 
         Args:
             cwd: Current working directory
 
         Returns:
-            Tuple of (branch, has_changes, ahead, behind, untracked_count) or None
+            GitSnapshot or None if not in a git repo
         """
-        try:
-            # Check if in git repo
-            subprocess.run(
-                ['git', '-C', cwd, 'rev-parse', '--git-dir'],
-                capture_output=True,
-                check=True
-            )
+        with self._snapshot_lock:
+            if cwd not in self._snapshots:
+                self._snapshots[cwd] = GitSnapshotCache.from_config(self.config).get(cwd)
+            return self._snapshots[cwd]
 
-            # Get branch name
-            result = subprocess.run(
-                ['git', '-C', cwd, 'branch', '--show-current'],
-                capture_output=True,
-                text=True
-            )
-            branch = result.stdout.strip()
-
-            if not branch:
-                # Try tag or detached
-                result = subprocess.run(
-                    ['git', '-C', cwd, 'describe', '--tags', '--exact-match'],
-                    capture_output=True,
-                    text=True
-                )
-                branch = result.stdout.strip() or "detached"
-
-            # Truncate long branch names with smart truncation
-            max_len = self.config.get('git.truncate_branch_length', 32)
-            if len(branch) > max_len:
-                branch = self._truncate_branch(branch, max_len)
-
-            # Check for changes
-            has_changes = False
-            result = subprocess.run(
-                ['git', '-C', cwd, 'diff', '--quiet'],
-                capture_output=True
-            )
-            if result.returncode != 0:
-                has_changes = True
-
-            result = subprocess.run(
-                ['git', '-C', cwd, 'diff', '--cached', '--quiet'],
-                capture_output=True
-            )
-            if result.returncode != 0:
-                has_changes = True
-
-            # Get untracked count
-            result = subprocess.run(
-                ['git', '-C', cwd, 'ls-files', '--others', '--exclude-standard'],
-                capture_output=True,
-                text=True
-            )
-            untracked = len([l for l in result.stdout.strip().split('\n') if l])
-
-            # Get ahead/behind
-            ahead = 0
-            behind = 0
+    def _get_git_info(self, cwd: str) -> Optional[Tuple[str, bool, int, int, int]]:
+        """Get git repository information.
 
-            result = subprocess.run(
-                ['git', '-C', cwd, 'rev-list', '--count', '@{u}..HEAD'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                ahead = int(result.stdout.strip() or 0)
+        Args:
+            cwd: Current working directory
 
-            result = subprocess.run(
-                ['git', '-C', cwd, 'rev-list', '--count', 'HEAD..@{u}'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                behind = int(result.stdout.strip() or 0)
+        Returns:
+            Tuple of (branch, has_changes, ahead, behind, untracked_count) or None
+        """
+        snapshot = self._get_snapshot(cwd)
+        if snapshot is None:
+            return None
 
-            return (branch, has_changes, ahead, behind, untracked)
+        # Truncate long branch names with smart truncation
+        branch = snapshot.branch
+        max_len = self.config.get('git.truncate_branch_length', 32)
+        if display_width(branch) > max_len:
+            branch = self._truncate_branch(branch, max_len)
 
-        except Exception:
-            return None
+        return (branch, snapshot.has_changes, snapshot.ahead, snapshot.behind, snapshot.untracked)
 
     def _get_stash_count(self, cwd: str) -> int:
         """Get number of stashed changes.
@@ -675,18 +563,8 @@ class GitSegment:
         Returns:
             Number of stash entries
         """
-        try:
-            result = subprocess.run(
-                ['git', '-C', cwd, 'stash', 'list'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                lines = [l for l in result.stdout.strip().split('\n') if l]
-                return len(lines)
-        except Exception:
-            pass
-        return 0
+        snapshot = self._get_snapshot(cwd)
+        return snapshot.stash_count if snapshot else 0
 
     def _get_remote_tracking(self, cwd: str) -> Optional[str]:
         """Get remote tracking branch.
@@ -697,24 +575,17 @@ class GitSegment:
         Returns:
             Remote tracking branch name (e.g., "origin/main") or None
         """
-        try:
-            # Get upstream branch
-            result = subprocess.run(
-                ['git', '-C', cwd, 'rev-parse', '--abbrev-ref', '--symbolic-full-name', '@{u}'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                remote = result.stdout.strip()
-                # Shorten if too long
-                if len(remote) > 20:
-                    parts = remote.split('/')
-                    if len(parts) >= 2:
-                        return f"{parts[0]}/…"
-                return remote
-        except Exception:
-            pass
-        return None
+        snapshot = self._get_snapshot(cwd)
+        if not snapshot or not snapshot.upstream:
+            return None
+
+        remote = snapshot.upstream
+        # Shorten if too long
+        if display_width(remote) > 20:
+            parts = remote.split('/')
+            if len(parts) >= 2:
+                return f"{parts[0]}/…"
+        return remote
 
     def _get_recent_activity(self, cwd: str) -> bool:
         """Check if there are commits in the last 24 hours.
@@ -728,13 +599,12 @@ class GitSegment:
         try:
             # Get commits from last 24 hours
             result = subprocess.run(
-                ['git', '-C', cwd, 'log', '--since', '24 hours ago', '--oneline'],
+                ['git', '-C', cwd, 'log', '--since', '24 hours ago', '--oneline', '-1'],
                 capture_output=True,
                 text=True
             )
             if result.returncode == 0:
-                lines = [l for l in result.stdout.strip().split('\n') if l]
-                return len(lines) > 0
+                return bool(result.stdout.strip())
         except Exception:
             pass
         return False
@@ -748,20 +618,8 @@ class GitSegment:
         Returns:
             Total number of worktrees (including main)
         """
-        try:
-            result = subprocess.run(
-                ['git', '-C', cwd, 'worktree', 'list'],
-                capture_output=True,
-                text=True,
-                timeout=1
-            )
-            if result.returncode == 0:
-                # Count lines (each line = 1 worktree)
-                lines = [l for l in result.stdout.strip().split('\n') if l]
-                return len(lines)
-        except Exception:
-            pass
-        return 0
+        snapshot = self._get_snapshot(cwd)
+        return snapshot.worktree_count if snapshot else 0
 
     def _is_worktree(self, cwd: str) -> bool:
         """Check if current directory is in a worktree (not main working directory).
@@ -772,21 +630,8 @@ class GitSegment:
         Returns:
             True if in a worktree, False if in main working directory
         """
-        try:
-            # Get git directory
-            result = subprocess.run(
-                ['git', '-C', cwd, 'rev-parse', '--git-dir'],
-                capture_output=True,
-                text=True
-            )
-            if result.returncode == 0:
-                git_dir = result.stdout.strip()
-                # Worktrees have .git/worktrees/<name> as git-dir
-                # Main working directory has .git as git-dir
-                return '/worktrees/' in git_dir
-        except Exception:
-            pass
-        return False
+        snapshot = self._get_snapshot(cwd)
+        return snapshot.is_worktree if snapshot else False
 
     def _get_worktree_name(self, cwd: str) -> Optional[str]:
         """Get name of current worktree (or None if main).
@@ -797,31 +642,17 @@ class GitSegment:
         Returns:
             Worktree name if in a worktree, None if in main working directory
         """
-        try:
-            result = subprocess.run(
-                ['git', '-C', cwd, 'rev-parse', '--git-dir'],
-                capture_output=True,
-                text=True,
-                timeout=1
-            )
-            if result.returncode == 0:
-                git_dir = result.stdout.strip()
-                # Worktrees: .git/worktrees/<name>
-                if '/worktrees/' in git_dir:
-                    # Extract name from path
-                    from pathlib import Path
-                    return Path(git_dir).name
-                return None  # Main working directory
-        except Exception:
-            pass
-        return None
+        snapshot = self._get_snapshot(cwd)
+        return snapshot.worktree_name if snapshot else None
 
     def _truncate_branch(self, branch: str, max_len: int) -> str:
         """Truncate branch name while preserving start and end.
 
+        Lengths are display widths, so wide characters count as two.
+
         Args:
             branch: Branch name to truncate
-            max_len: Maximum length
+            max_len: Maximum width
 
         Returns:
             Truncated branch name with "..." in middle
@@ -830,32 +661,26 @@ class GitSegment:
             >>> _truncate_branch('feature/authentication-system-oauth2', 32)
             'feature/...stem-oauth2'
         """
-        if len(branch) <= max_len:
+        if display_width(branch) <= max_len:
             return branch
 
-        # Keep first 10 chars + "..." + last (max_len - 13) chars
+        # Keep first 10 cells + "..." + last (max_len - 13) cells
         keep_start = 10
         keep_end = max_len - keep_start - 3
 
         if keep_end < 5:
             # If max_len too small, just use ellipsis at end
-            return branch[:max_len-3] + "..."
+            return fit_width(branch, max_len - 3) + "..."
 
-        return f"{branch[:keep_start]}...{branch[-keep_end:]}"
+        return f"{fit_width(branch, keep_start)}...{fit_width(branch, keep_end, from_end=True)}"
 
 
-class ModelSegment:
+class ModelSegment(Segment):
     """Renders Claude model name."""
 
-    def __init__(self, config: StatusLineConfig, theme: Optional[Theme] = None):
-        """Initialize segment.
+    __slots__ = ()
 
-        Args:
-            config: StatusLineConfig instance
-            theme: Theme object (loads from config if None)
-        """
-        self.config = config
-        self.theme = theme or get_theme(config.get('theme.name', 'purple-charcoal'))
+    INPUTS = ('model_name',)
 
     def render(self, model_name: str) -> str:
         """Render model segment.
@@ -870,30 +695,25 @@ class ModelSegment:
         model_short = model_name.replace('Claude ', '')
 
         # Get color from theme based on model type
+        fragments = compile_theme(self.theme)
         if 'Sonnet' in model_name:
-            color = self.theme.model_sonnet
+            color = fragments.model_sonnet
         elif 'Opus' in model_name:
-            color = self.theme.model_opus
+            color = fragments.model_opus
         elif 'Haiku' in model_name:
-            color = self.theme.model_haiku
+            color = fragments.model_haiku
         else:
-            color = self.theme.model_opus  # Default
+            color = fragments.model_opus  # Default
 
-        return f"\033[{color}m{model_short}\033[0m"
+        return f"{color}{model_short}{RESET}"
 
 
-class TimeSegment:
+class TimeSegment(Segment):
     """Renders current time and session duration."""
 
-    def __init__(self, config: StatusLineConfig, theme: Optional[Theme] = None):
-        """Initialize segment.
+    __slots__ = ()
 
-        Args:
-            config: StatusLineConfig instance
-            theme: Theme object (loads from config if None)
-        """
-        self.config = config
-        self.theme = theme or get_theme(config.get('theme.name', 'purple-charcoal'))
+    INPUTS = ('session_id', 'transcript_path')
 
     def render(self, session_id: str, transcript_path: Optional[str] = None) -> str:
         """Render time segment.
@@ -906,11 +726,12 @@ class TimeSegment:
             Formatted time string
         """
         output = ""
+        fragments = compile_theme(self.theme)
 
         # Current time
         if self.config.get('display.show_current_time', True):
             current_time = time.strftime("%H:%M")
-            output += f"{get_separator(self.config, self.theme)}\033[{self.theme.time_fg}m{current_time}\033[0m"
+            output += f"{get_separator(self.config, self.theme)}{fragments.time}{current_time}{RESET}"
 
             # Add time-of-day indicator
             time_of_day = self._get_time_of_day_indicator()
@@ -919,8 +740,8 @@ class TimeSegment:
 
         # Session duration
         if self.config.get('display.show_session_duration', True):
-            duration = self._get_session_duration(session_id)
-            output += f"{get_separator(self.config, self.theme)}\033[{self.theme.duration_fg}m⏱ {duration}\033[0m"
+            duration = self._get_session_duration(session_id, transcript_path)
+            output += f"{get_separator(self.config, self.theme)}{fragments.duration}⏱ {duration}{RESET}"
 
             # Add productivity indicator
             productivity = self._get_productivity_indicator(transcript_path)
@@ -929,25 +750,22 @@ class TimeSegment:
 
         return output
 
-    def _get_session_duration(self, session_id: str) -> str:
+    def _get_session_duration(self, session_id: str, transcript_path: Optional[str] = None) -> str:
         """Get formatted session duration.
 
         Args:
             session_id: Session ID
+            transcript_path: Session transcript (seeds the start of new sessions)
 
         Returns:
             Formatted duration like "5m", "2h15m"
         """
-        session_file = Path(f"/tmp/claude-session-{session_id or 'default'}")
-        now = int(time.time())
-
-        if not session_file.exists():
-            session_file.write_text(str(now))
+        start = get_session_store().get_start(session_id or 'default', transcript_path)
+        if start is None:
             return "0m"
 
         try:
-            start = int(session_file.read_text().strip())
-            elapsed = now - start
+            elapsed = int(time.time() - start)
 
             if elapsed < 60:
                 return "<1m"
@@ -973,45 +791,25 @@ class TimeSegment:
         if not self.config.get('time.show_productivity_indicator', False):
             return None
 
-        if not transcript_path or not Path(transcript_path).exists():
+        if not transcript_path:
             return None
 
-        try:
-            # Read transcript to get last message timestamp
-            with open(transcript_path, 'r') as f:
-                content = f.read()
-
-            # Parse JSON transcript
-            import json
-            data = json.loads(content)
-
-            # Get last message timestamp
-            messages = data.get('messages', [])
-            if not messages:
-                return None
-
-            last_msg = messages[-1]
-            last_time = last_msg.get('timestamp', 0)
-
-            # Return None if timestamp is missing or invalid
-            if not last_time:
-                return None
-
-            # Calculate idle time
-            now = int(time.time())
-            idle_seconds = now - last_time
-
-            # Return indicator based on idle time
-            if idle_seconds < 300:  # < 5 min
-                return "🟢"  # Active
-            elif idle_seconds < 900:  # 5-15 min
-                return "🟡"  # Idle
-            else:  # > 15 min
-                return "🔴"  # Long idle
-
-        except Exception:
+        # Tail read: cost does not grow with the transcript
+        last_time = get_last_timestamp(transcript_path)
+        if last_time is None:
             return None
 
+        # Calculate idle time
+        idle_seconds = time.time() - last_time
+
+        # Return indicator based on idle time
+        if idle_seconds < 300:  # < 5 min
+            return "🟢"  # Active
+        elif idle_seconds < 900:  # 5-15 min
+            return "🟡"  # Idle
+        else:  # > 15 min
+            return "🔴"  # Long idle
+
     def _get_time_of_day_indicator(self) -> Optional[str]:
         """Get time-of-day context icon.
 
@@ -1033,18 +831,10 @@ class TimeSegment:
             return "🌃"  # Night
 
 
-class ThinkingSegment:
+class ThinkingSegment(Segment):
     """Renders thinking mode indicator."""
 
-    def __init__(self, config: StatusLineConfig, theme: Optional[Theme] = None):
-        """Initialize segment.
-
-        Args:
-            config: StatusLineConfig instance
-            theme: Theme object (loads from config if None)
-        """
-        self.config = config
-        self.theme = theme or get_theme(config.get('theme.name', 'purple-charcoal'))
+    __slots__ = ()
 
     def render(self) -> str:
         """Render thinking indicator.
@@ -1055,30 +845,24 @@ class ThinkingSegment:
         if not self.config.get('display.show_thinking_indicator', True):
             return ""
 
-        # Read Claude Code settings
-        settings_file = Path.home() / '.claude' / 'settings.json'
-
-        if not settings_file.exists():
+        # Read Claude Code settings (parsed once while unchanged)
+        settings = read_json_cached(get_global_settings_path())
+        if not isinstance(settings, dict):
             return ""
 
-        try:
-            with open(settings_file) as f:
-                settings = json.load(f)
-
-            thinking_enabled = settings.get('alwaysThinkingEnabled', False)
-
-            if thinking_enabled:
-                return f"{get_separator(self.config, self.theme)}\033[{self.theme.thinking_fg}m🧠\033[0m"
-
-        except Exception:
-            pass
+        if settings.get('alwaysThinkingEnabled', False):
+            return f"{get_separator(self.config, self.theme)}{compile_theme(self.theme).thinking}"
 
         return ""
 
 
-class LinesSegment:
+class LinesSegment(Segment):
     """Renders lines added/removed."""
 
+    __slots__ = ('progress',)
+
+    INPUTS = ('lines_added', 'lines_removed')
+
     def __init__(self, config: StatusLineConfig, theme: Optional[Theme] = None):
         """Initialize segment.
 
@@ -1086,8 +870,13 @@ class LinesSegment:
             config: StatusLineConfig instance
             theme: Theme object (loads from config if None)
         """
-        self.config = config
-        self.theme = theme or get_theme(config.get('theme.name', 'purple-charcoal'))
+        super().__init__(config, theme)
+        # Ghostty progress escape from the last render (sent by the renderer)
+        self.progress: Optional[str] = None
+
+    def reset(self) -> None:
+        """Forget the previous render's progress escape."""
+        self.progress = None
 
     def render(self, lines_added: int, lines_removed: int) -> str:
         """Render lines changed segment.
@@ -1099,6 +888,7 @@ class LinesSegment:
         Returns:
             Formatted lines string or empty
         """
+        self.progress = None
         if not self.config.get('display.show_lines_changed', True):
             return ""
 
@@ -1106,10 +896,11 @@ class LinesSegment:
             return ""
 
         # Format display
-        output = f"\033[{self.theme.lines_added_fg}m+{lines_added}\033[0m"
+        fragments = compile_theme(self.theme)
+        output = f"{fragments.lines_added}+{lines_added}{RESET}"
 
         if lines_removed > 0:
-            output += f"\033[{self.theme.lines_removed_fg}m/-{lines_removed}\033[0m"
+            output += f"{fragments.lines_removed}/-{lines_removed}{RESET}"
 
         # Ghostty 1.2.x Native Progress Bar (OSC 9;4)
         from aiterm.terminal import detect_terminal, TerminalType
@@ -1122,19 +913,20 @@ class LinesSegment:
                 # ST: 0 (normal), 1 (success), 2 (error), 3 (indeterminate)
                 # NN: progress 0-100
                 status = 1 if lines_added >= lines_removed else 2
-                sys.stdout.write(f"\033]9;4;{status};{percent}\033\\")
-                sys.stdout.flush()
+                self.progress = osc_progress(status, percent)
 
         return output
 
 
-class UsageSegment:
+class UsageSegment(Segment):
     """Renders usage tracking (session and weekly).
 
     Note: Currently returns empty string as Claude Code usage API is not yet available.
     This segment is ready to display usage data once the API is implemented.
     """
 
+    __slots__ = ('tracker', 'progress')
+
     def __init__(self, config: StatusLineConfig, theme: Optional[Theme] = None):
         """Initialize segment.
 
@@ -1142,9 +934,15 @@ class UsageSegment:
             config: StatusLineConfig instance
             theme: Theme object (loads from config if None)
         """
-        self.config = config
-        self.theme = theme or get_theme(config.get('theme.name', 'purple-charcoal'))
-        self.tracker = UsageTracker()
+        super().__init__(config, theme)
+        # Built once: reused renders keep the resolved API key
+        self.tracker = UsageTracker(block=not config.get('usage.stale_while_refresh', True))
+        # Ghostty progress escape from the last render (sent by the renderer)
+        self.progress: Optional[str] = None
+
+    def reset(self) -> None:
+        """Forget the previous render's progress escape."""
+        self.progress = None
 
     def render(self) -> str:
         """Render usage tracking segment.
@@ -1152,6 +950,8 @@ class UsageSegment:
         Returns:
             Formatted usage string or empty if disabled/unavailable
         """
+        self.progress = None
+
         # Check if usage display is enabled
         show_session = self.config.get('display.show_session_usage', True)
         show_weekly = self.config.get('display.show_weekly_usage', True)
@@ -1196,7 +996,70 @@ class UsageSegment:
             if max_usage > 0:
                 threshold = self.config.get('usage.warning_threshold', 80)
                 status = 2 if max_usage >= threshold else 0
-                sys.stdout.write(f"\033]9;4;{status};{max_usage}\033\\")
-                sys.stdout.flush()
+                self.progress = osc_progress(status, max_usage)
 
         return f"{get_separator(self.config, self.theme)}\033[38;5;2m📊{usage_str}\033[0m"
+
+
+# Segment name -> class (names match the renderer's budget names)
+SEGMENT_CLASSES: Dict[str, type] = {
+    'project': ProjectSegment,
+    'git': GitSegment,
+    'model': ModelSegment,
+    'time': TimeSegment,
+    'thinking': ThinkingSegment,
+    'lines': LinesSegment,
+    'usage': UsageSegment,
+}
+
+
+class SegmentRegistry:
+    """Segments built once and shared by every render of one renderer."""
+
+    __slots__ = ('config', 'theme', '_segments')
+
+    def __init__(self, config: StatusLineConfig, theme: Theme):
+        """Initialize registry (segments are built on first use).
+
+        Args:
+            config: StatusLineConfig shared by all segments
+            theme: Theme shared by all segments
+        """
+        self.config = config
+        self.theme = theme
+        self._segments: Dict[str, Segment] = {}
+
+    def get(self, name: str) -> Segment:
+        """Get a segment, building it on first use.
+
+        Args:
+            name: Segment name (see SEGMENT_CLASSES)
+
+        Returns:
+            Segment instance
+
+        Raises:
+            KeyError: If the segment name is unknown
+        """
+        segment = self._segments.get(name)
+        if segment is None:
+            segment = self._segments[name] = SEGMENT_CLASSES[name](self.config, self.theme)
+        return segment
+
+    __getitem__ = get
+
+    def find(self, name: str) -> Optional[Segment]:
+        """Get a segment only if it has been built.
+
+        Args:
+            name: Segment name
+
+        Returns:
+            Segment instance or None
+        """
+        return self._segments.get(name)
+
+    def reset(self) -> None:
+        """Clear per-render state before a new render."""
+        for segment in self._segments.values():
+            segment.reset()
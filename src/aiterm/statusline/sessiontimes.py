@@ -0,0 +1,191 @@
+"""Session start times for the statusLine duration display.
+
+TimeSegment used to keep one ``/tmp/claude-session-<id>`` file per session
+and never removed them. Start times now live in a single SQLite table
+(~/.cache/aiterm/session-times.db) keyed by session id:
+
+- A lookup is one primary-key query.
+- A new session is seeded from the first timestamped record of its
+  transcript when there is one (so a statusLine installed mid-session still
+  shows the real duration), else from an old /tmp file (which is then
+  removed), else from now.
+- Each row remembers when the session was last seen (updated at most every
+  SEEN_RESOLUTION seconds), and rows unseen for MAX_SESSION_AGE are
+  deleted whenever a new session is added, together with leftover /tmp
+  files of that age.
+"""
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from aiterm.statusline.cache import get_cache_dir
+from aiterm.statusline.transcript import get_first_timestamp
+
+# Sessions unseen for this many seconds are forgotten
+MAX_SESSION_AGE = 7 * 86400
+
+# Seconds between updates of a session's last-seen time
+SEEN_RESOLUTION = 3600
+
+# Per-session files written by earlier versions
+LEGACY_DIR = Path('/tmp')
+LEGACY_PREFIX = 'claude-session-'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    start REAL NOT NULL,
+    seen REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+# Open stores by database path (segments run in worker threads)
+_stores: Dict[Path, 'SessionTimes'] = {}
+_stores_lock = threading.Lock()
+
+
+def get_store() -> 'SessionTimes':
+    """Get the shared store for the current cache directory.
+
+    Returns:
+        SessionTimes
+    """
+    path = get_cache_dir() / 'session-times.db'
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = SessionTimes(path)
+        return store
+
+
+class SessionTimes:
+    """SQLite store of session start times."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """Initialize store (the database is opened on first use).
+
+        Args:
+            path: Database file (default: ~/.cache/aiterm/session-times.db)
+        """
+        self.path = path or get_cache_dir() / 'session-times.db'
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(
+                str(self.path), timeout=1.0, isolation_level=None, check_same_thread=False
+            )
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.execute(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_start(self, session_id: str, transcript_path: Optional[str] = None) -> Optional[float]:
+        """Get a session's start time, recording it on first sight.
+
+        Args:
+            session_id: Claude Code session ID
+            transcript_path: Session transcript (seeds the start time)
+
+        Returns:
+            Start time in epoch seconds, or None if the store is unavailable
+        """
+        with self._lock:
+            return self._get_start(session_id, transcript_path)
+
+    def _get_start(self, session_id: str, transcript_path: Optional[str]) -> Optional[float]:
+        now = time.time()
+        try:
+            conn = self._connect()
+            row = conn.execute(
+                'SELECT start, seen FROM sessions WHERE session_id = ?', (session_id,)
+            ).fetchone()
+            if row is not None:
+                start, seen = row
+                if now - seen >= SEEN_RESOLUTION:
+                    conn.execute('UPDATE sessions SET seen = ? WHERE session_id = ?', (now, session_id))
+                return start
+
+            start = self._seed(session_id, transcript_path, now)
+            conn.execute(
+                'INSERT OR IGNORE INTO sessions (session_id, start, seen) VALUES (?, ?, ?)',
+                (session_id, start, now),
+            )
+            self._expire(now)
+            # A concurrent render may have inserted first
+            return conn.execute(
+                'SELECT start FROM sessions WHERE session_id = ?', (session_id,)
+            ).fetchone()[0]
+        except (sqlite3.Error, OSError):
+            return None
+
+    def _seed(self, session_id: str, transcript_path: Optional[str], now: float) -> float:
+        """Find the best start time for a session seen for the first time."""
+        legacy = LEGACY_DIR / f"{LEGACY_PREFIX}{session_id}"
+        legacy_start = None
+        try:
+            legacy_start = float(legacy.read_text().strip())
+            legacy.unlink()
+        except (OSError, ValueError):
+            pass
+
+        if transcript_path:
+            start = get_first_timestamp(transcript_path)
+            if start is not None and start <= now:
+                return start
+        return legacy_start if legacy_start is not None else now
+
+    def _expire(self, now: float) -> None:
+        """Delete sessions and legacy files unseen for MAX_SESSION_AGE."""
+        cutoff = now - MAX_SESSION_AGE
+        self._connect().execute('DELETE FROM sessions WHERE seen < ?', (cutoff,))
+        try:
+            for legacy in LEGACY_DIR.glob(f"{LEGACY_PREFIX}*"):
+                try:
+                    if legacy.stat().st_mtime < cutoff:
+                        legacy.unlink()
+                except OSError:
+                    pass
+        except OSError:
+            pass
+
+    def forget(self, session_id: str) -> bool:
+        """Remove a session.
+
+        Args:
+            session_id: Claude Code session ID
+
+        Returns:
+            True if the session was stored
+        """
+        try:
+            with self._lock:
+                cursor = self._connect().execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+        except (sqlite3.Error, OSError):
+            return False
+        return cursor.rowcount > 0
+
+    def count(self) -> int:
+        """Get the number of stored sessions.
+
+        Returns:
+            Session count (0 if the store is unavailable)
+        """
+        try:
+            with self._lock:
+                return self._connect().execute('SELECT COUNT(*) FROM sessions').fetchone()[0]
+        except (sqlite3.Error, OSError):
+            return 0
@@ -6,10 +6,16 @@ This module defines color themes for the statusLine, including:
 - forest-greens
 
 Each theme specifies ANSI color codes for different segments.
+
+Segments do not build escape sequences from these codes on every render.
+``compile_theme()`` turns a Theme into a frozen ThemeFragments table of
+ready-made escape strings (separators for every spacing mode, segment
+openers and closers, model colors), cached per theme, so a warm daemon
+renders with plain string concatenation.
 """
 
-from dataclasses import dataclass
-from typing import Dict
+from dataclasses import dataclass, fields
+from typing import Dict, Tuple
 
 
 @dataclass
@@ -84,6 +90,140 @@ class Theme:
         return getattr(self, key, '')
 
 
+# =============================================================================
+# Compiled Fragments
+# =============================================================================
+
+
+RESET = "\033[0m"
+
+# display.separator_spacing -> spaces around the separator
+SEPARATOR_SPACING = {
+    'minimal': 1,
+    'standard': 2,
+    'relaxed': 3
+}
+
+
+@dataclass(frozen=True)
+class ThemeFragments:
+    """Ready-made escape fragments for one theme.
+
+    Attributes:
+        separators: (spacing mode, separator) pairs (see SEPARATOR_SPACING)
+        dir_open: Directory segment opener (colors + left powerline edge)
+        dir_close: Closes the directory segment when there is no git segment
+        vcs_clean_open: Git segment opener for a clean tree
+        vcs_modified_open: Git segment opener for a modified tree
+        vcs_close: Git segment closer (reset + right powerline edge)
+        model_sonnet: Sonnet model color
+        model_opus: Opus model color (also used for unknown models)
+        model_haiku: Haiku model color
+        time: Current time color
+        duration: Session duration color
+        lines_added: Lines added color
+        lines_removed: Lines removed color
+        thinking: Complete thinking indicator (without separator)
+        style: Output style color
+        right_open: Right-side segment opener (reversed powerline)
+        right_close: Right-side segment closer
+        gap_separator: Centered separator in the left/right gap
+    """
+
+    separators: Tuple[Tuple[str, str], ...]
+    dir_open: str
+    dir_close: str
+    vcs_clean_open: str
+    vcs_modified_open: str
+    vcs_close: str
+    model_sonnet: str
+    model_opus: str
+    model_haiku: str
+    time: str
+    duration: str
+    lines_added: str
+    lines_removed: str
+    thinking: str
+    style: str
+    right_open: str
+    right_close: str
+    gap_separator: str
+
+    def separator(self, spacing_mode: str) -> str:
+        """Get the separator for a spacing mode (standard if unknown).
+
+        Args:
+            spacing_mode: display.separator_spacing value
+
+        Returns:
+            Separator with spacing (e.g., "  │  ")
+        """
+        for mode, separator in self.separators:
+            if mode == spacing_mode:
+                return separator
+        return self.separator('standard')
+
+
+def _vcs_open(bg: str, fg: str) -> str:
+    # Powerline left separator is empty, but the color change is kept
+    return f"\033[38;5;54;{bg}m\033[{bg};{fg}m"
+
+
+def _build_fragments(theme: Theme) -> ThemeFragments:
+    """Build the fragment table for a theme."""
+    separators = tuple(
+        (mode, f"{' ' * spaces}\033[{theme.separator_fg}m│{RESET}{' ' * spaces}")
+        for mode, spaces in SEPARATOR_SPACING.items()
+    )
+    return ThemeFragments(
+        separators=separators,
+        dir_open=f"\033[{theme.dir_bg};{theme.dir_fg}m ░▒▓ ",
+        dir_close=f"{RESET}\033[38;5;4m▓▒░{RESET}",
+        vcs_clean_open=_vcs_open(theme.vcs_clean_bg, theme.vcs_fg),
+        vcs_modified_open=_vcs_open(theme.vcs_modified_bg, theme.vcs_fg),
+        vcs_close=f" {RESET}\033[38;5;60m▓▒░{RESET}",
+        model_sonnet=f"\033[{theme.model_sonnet}m",
+        model_opus=f"\033[{theme.model_opus}m",
+        model_haiku=f"\033[{theme.model_haiku}m",
+        time=f"\033[{theme.time_fg}m",
+        duration=f"\033[{theme.duration_fg}m",
+        lines_added=f"\033[{theme.lines_added_fg}m",
+        lines_removed=f"\033[{theme.lines_removed_fg}m",
+        thinking=f"\033[{theme.thinking_fg}m🧠{RESET}",
+        style=f"\033[{theme.style_fg}m",
+        # Dark gray reversed segment (235 bg, 245 fg)
+        right_open="\033[48;5;235m\033[38;5;245m░▒▓ ",
+        right_close=f" ▓▒░{RESET}",
+        # Dim gray (240)
+        gap_separator=f"\033[38;5;240m…{RESET}",
+    )
+
+
+_THEME_FIELDS = fields(Theme)
+
+# (theme name, color values) -> compiled fragments
+_fragments: Dict[tuple, ThemeFragments] = {}
+
+
+def compile_theme(theme: Theme) -> ThemeFragments:
+    """Get the compiled fragment table for a theme.
+
+    Tables are cached by theme name and color values, so edited or custom
+    Theme objects get their own table.
+
+    Args:
+        theme: Theme object
+
+    Returns:
+        ThemeFragments
+    """
+    key = tuple(getattr(theme, field.name) for field in _THEME_FIELDS)
+    fragments = _fragments.get(key)
+    if fragments is None:
+        fragments = _fragments[key] = _build_fragments(theme)
+    return fragments
+
+
 # =============================================================================
 # Theme Definitions
 # =============================================================================
@@ -0,0 +1,253 @@
+"""Constant-cost transcript reader for the statusLine.
+
+Claude Code transcripts are JSONL files that grow for the whole session and
+routinely reach several megabytes. The statusLine only needs the timestamp
+of the most recent record, so this module reads the file backwards from the
+end in fixed-size chunks and stops at the last complete record that has a
+timestamp.
+
+Results are cached per path with the file's (inode, size, mtime). An
+unchanged file is not read at all; a file that only grew is scanned from the
+last line boundary seen, so appending never triggers a full re-read.
+
+The legacy single-JSON format ({"messages": [...]}) is still supported.
+
+get_first_timestamp() reads forwards from the start instead; the session
+timing store uses it once per session to seed the session start time.
+"""
+
+import json
+import os
+from datetime import datetime
+from typing import Dict, Iterator, NamedTuple, Optional, Tuple
+
+# Bytes read per backwards step
+CHUNK_SIZE = 64 * 1024
+
+# Stop scanning after this many bytes without a timestamped record
+MAX_TAIL_BYTES = 1024 * 1024
+
+# Legacy single-JSON transcripts larger than this are not parsed
+MAX_LEGACY_BYTES = 16 * 1024 * 1024
+
+# Transcripts remembered per process (the render daemon sees several sessions)
+MAX_CACHED_PATHS = 16
+
+
+class _CacheEntry(NamedTuple):
+    """Last scan result for one transcript."""
+
+    ino: int
+    size: int
+    mtime_ns: int
+    offset: int  # Position just past the last newline scanned
+    timestamp: Optional[float]
+
+
+_cache: Dict[str, _CacheEntry] = {}
+
+
+def parse_timestamp(value) -> Optional[float]:
+    """Convert a transcript timestamp to epoch seconds.
+
+    Args:
+        value: Epoch seconds/milliseconds or an ISO 8601 string
+
+    Returns:
+        Epoch seconds, or None if missing or invalid
+    """
+    if isinstance(value, bool) or not value:
+        return None
+
+    if isinstance(value, (int, float)):
+        # Millisecond timestamps
+        return value / 1000 if value > 1e11 else float(value)
+
+    if isinstance(value, str):
+        try:
+            return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+        except ValueError:
+            return None
+
+    return None
+
+
+def _lines_backwards(f, start: int, end: int) -> Iterator[bytes]:
+    """Yield lines between two offsets, last line first.
+
+    The first line is only yielded when it starts exactly at ``start``
+    (``start`` must be a line boundary). Scanning stops after
+    MAX_TAIL_BYTES.
+
+    Args:
+        f: Binary file object
+        start: Offset of a line boundary to stop at
+        end: Offset to scan back from
+    """
+    pos = end
+    limit = max(start, end - MAX_TAIL_BYTES)
+    partial = b''
+
+    while pos > limit:
+        size = min(CHUNK_SIZE, pos - limit)
+        pos -= size
+        f.seek(pos)
+        lines = (f.read(size) + partial).split(b'\n')
+        partial = lines[0]
+        for line in reversed(lines[1:]):
+            if line.strip():
+                yield line
+
+    if pos == start and partial.strip():
+        yield partial
+
+
+def _parse_record(line: bytes) -> Optional[dict]:
+    """Parse one JSONL record (None if incomplete or not an object)."""
+    try:
+        record = json.loads(line)
+    except ValueError:
+        return None
+    return record if isinstance(record, dict) else None
+
+
+def _legacy_timestamp(data: dict) -> Optional[float]:
+    """Get the last message timestamp from a legacy transcript."""
+    messages = data.get('messages')
+    if not isinstance(messages, list) or not messages:
+        return None
+    last_msg = messages[-1]
+    if not isinstance(last_msg, dict):
+        return None
+    return parse_timestamp(last_msg.get('timestamp'))
+
+
+def _scan(f, start: int, end: int) -> Tuple[bool, Optional[float], bool]:
+    """Find the newest timestamp in a file region.
+
+    Returns:
+        (found, timestamp, parsed_any) - ``found`` is True when a record
+        settled the answer (timestamp may still be None for legacy files)
+    """
+    parsed_any = False
+    for line in _lines_backwards(f, start, end):
+        record = _parse_record(line)
+        if record is None:
+            continue
+        parsed_any = True
+
+        if isinstance(record.get('messages'), list):
+            return True, _legacy_timestamp(record), parsed_any
+
+        timestamp = parse_timestamp(record.get('timestamp'))
+        if timestamp is not None:
+            return True, timestamp, parsed_any
+
+    return False, None, parsed_any
+
+
+def _line_boundary(f, start: int, end: int) -> int:
+    """Get the offset just past the last newline in a region."""
+    base = max(start, end - CHUNK_SIZE)
+    f.seek(base)
+    index = f.read(end - base).rfind(b'\n')
+    return base + index + 1 if index >= 0 else start
+
+
+def _read_legacy(f, size: int) -> Optional[float]:
+    """Parse a whole (pretty-printed) legacy transcript.
+
+    Files whose first line is a complete JSON object are JSONL and are
+    never parsed whole.
+    """
+    if size > MAX_LEGACY_BYTES:
+        return None
+    f.seek(0)
+    first_line, newline, _ = f.read(CHUNK_SIZE).partition(b'\n')
+    if newline and _parse_record(first_line) is not None:
+        return None
+    f.seek(0)
+    try:
+        data = json.loads(f.read())
+    except ValueError:
+        return None
+    return _legacy_timestamp(data) if isinstance(data, dict) else None
+
+
+def get_last_timestamp(transcript_path: str) -> Optional[float]:
+    """Get the timestamp of the most recent transcript record.
+
+    Args:
+        transcript_path: Path to a JSONL (or legacy JSON) transcript
+
+    Returns:
+        Epoch seconds, or None if the file is missing or has no timestamps
+    """
+    try:
+        st = os.stat(transcript_path)
+    except OSError:
+        return None
+
+    entry = _cache.get(transcript_path)
+    if entry and (entry.ino, entry.size, entry.mtime_ns) == (st.st_ino, st.st_size, st.st_mtime_ns):
+        return entry.timestamp
+
+    # Appended since last scan: only the new lines need reading
+    grew = entry is not None and entry.ino == st.st_ino and st.st_size >= entry.size
+    start = entry.offset if grew else 0
+
+    try:
+        with open(transcript_path, 'rb') as f:
+            found, timestamp, parsed_any = _scan(f, start, st.st_size)
+            if not found and grew and parsed_any:
+                # New records carry no timestamp; the previous one stands
+                timestamp = entry.timestamp
+            elif not found:
+                if start:
+                    found, timestamp, parsed_any = _scan(f, 0, st.st_size)
+                if not found and not parsed_any:
+                    timestamp = _read_legacy(f, st.st_size)
+            offset = _line_boundary(f, start, st.st_size)
+    except OSError:
+        return None
+
+    if transcript_path not in _cache and len(_cache) >= MAX_CACHED_PATHS:
+        _cache.pop(next(iter(_cache)))
+    _cache[transcript_path] = _CacheEntry(st.st_ino, st.st_size, st.st_mtime_ns, offset, timestamp)
+
+    return timestamp
+
+
+def get_first_timestamp(transcript_path: str) -> Optional[float]:
+    """Get the timestamp of the oldest transcript record.
+
+    Only the first MAX_TAIL_BYTES of the file are read.
+
+    Args:
+        transcript_path: Path to a JSONL transcript
+
+    Returns:
+        Epoch seconds, or None if the file is missing or has no timestamps
+    """
+    try:
+        with open(transcript_path, 'rb') as f:
+            read = 0
+            while read < MAX_TAIL_BYTES:
+                line = f.readline(MAX_TAIL_BYTES - read)
+                if not line:
+                    break
+                read += len(line)
+                record = _parse_record(line)
+                if record is None:
+                    continue
+                timestamp = parse_timestamp(record.get('timestamp'))
+                if timestamp is not None:
+                    return timestamp
+    except OSError:
+        pass
+    return None
+
+
+def clear_cache() -> None:
+    """Forget all cached transcript scans."""
+    _cache.clear()
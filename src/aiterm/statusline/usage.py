@@ -7,16 +7,45 @@ Future integration points:
 - Option A: Parse `claude --usage` command output
 - Option B: Read from Claude Code internal files/database
 - Option C: Use usage fields from JSON input (if added by Claude Code)
+
+Usage responses are cached in ~/.cache/aiterm/usage.json for 60 seconds and
+shared by all statusLine processes. When the cache goes stale, one process
+refreshes it under a file lock (usage.json.lock) while the others either
+wait for that refresh or, with ``usage.stale_while_refresh``, return the
+stale data at once. The cache is replaced atomically, and the API key
+lookup (which may run ``security`` on macOS) happens only when a refresh is
+actually needed and is remembered for API_KEY_TTL seconds.
+
+A failed refresh returns the last cached response, so a network blip does
+not blank the usage segment. When no API key is found, a NO_KEY_SENTINEL
+entry is cached for NO_KEY_TTL seconds, so users without a key do not repeat
+the lookup on every render.
 """
 
 from typing import Optional, Tuple
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 import subprocess
+import time
 import urllib.request
 import json
 from pathlib import Path
 
+from aiterm.claude.settings_cache import get_global_settings_path, read_json_cached
+from aiterm.statusline.cache import atomic_write_json, get_cache_dir, read_json
+
+# Seconds a resolved API key is reused (OAuth tokens rotate)
+API_KEY_TTL = 300
+
+# (expires, key) from the last lookup
+_api_key_memo: Optional[Tuple[float, Optional[str]]] = None
+
+# Cached in place of a response when no API key was found
+NO_KEY_SENTINEL = '_aiterm_no_api_key'
+
+# Seconds a missing API key is remembered in the shared cache
+NO_KEY_TTL = 300
+
 
 @dataclass
 class UsageData:
@@ -75,14 +104,44 @@ class UsageTracker:
 
     API_USAGE_URL = "https://api.anthropic.com/api/oauth/usage"
 
-    def __init__(self):
-        """Initialize usage tracker."""
-        self._api_key = self._get_api_key()
-        self._cache_file = Path.home() / '.cache' / 'aiterm' / 'usage.json'
-        self._cache_ttl = 60  # Cache for 60 seconds
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        api_key: Optional[str] = None,
+        cache_file: Optional[Path] = None,
+        cache_ttl: int = 60,
+        block: bool = True
+    ):
+        """Initialize usage tracker.
+
+        Args:
+            url: Usage endpoint (default: API_USAGE_URL)
+            api_key: API key or OAuth token (default: looked up on first refresh)
+            cache_file: Shared cache file (default: ~/.cache/aiterm/usage.json)
+            cache_ttl: Seconds a cached response is fresh
+            block: Wait for another process's refresh instead of returning
+                stale data
+        """
+        self.url = url or self.API_USAGE_URL
+        self._explicit_key = api_key
+        self._cache_file = cache_file or get_cache_dir() / 'usage.json'
+        self._cache_ttl = cache_ttl
+        self.block = block
+
+    @property
+    def _api_key(self) -> Optional[str]:
+        """API key or OAuth token (memoized across trackers)."""
+        global _api_key_memo
+        if self._explicit_key:
+            return self._explicit_key
+
+        now = time.monotonic()
+        if _api_key_memo is None or _api_key_memo[0] <= now:
+            _api_key_memo = (now + API_KEY_TTL, self._get_api_key())
+        return _api_key_memo[1]
 
     def _get_api_key(self) -> Optional[str]:
-        """Get Anthropic API key or OAuth token.
+        """Look up Anthropic API key or OAuth token (not memoized).
 
         Checks in order:
         1. macOS Keychain (Claude Code OAuth token)
@@ -116,10 +175,8 @@ class UsageTracker:
 
         # Check aiterm config
         try:
-            config_file = Path.home() / '.config' / 'aiterm' / 'statusline.json'
-            if config_file.exists():
-                with open(config_file) as f:
-                    config = json.load(f)
+            config = read_json_cached(Path.home() / '.config' / 'aiterm' / 'statusline.json')
+            if isinstance(config, dict):
                 api_key = config.get('anthropic', {}).get('api_key')
                 if api_key:
                     return api_key
@@ -132,65 +189,117 @@ class UsageTracker:
             return api_key
 
         # Check Claude Code settings (unlikely to exist)
-        try:
-            settings_file = Path.home() / '.claude' / 'settings.json'
-            if settings_file.exists():
-                with open(settings_file) as f:
-                    settings = json.load(f)
-                return settings.get('apiKey')
-        except Exception:
-            pass
+        settings = read_json_cached(get_global_settings_path())
+        if isinstance(settings, dict):
+            return settings.get('apiKey')
 
         return None
 
-    def _fetch_api_usage(self) -> Optional[dict]:
-        """Fetch usage data from Anthropic API.
+    def _read_cache(self) -> Tuple[Optional[dict], bool]:
+        """Read the shared cache.
 
         Returns:
-            Usage dict or None if fetch fails
+            Tuple of (cached data or None, is_fresh); data may be the
+            NO_KEY_SENTINEL entry
         """
-        if not self._api_key:
+        try:
+            cache_age = time.time() - self._cache_file.stat().st_mtime
+        except OSError:
+            return None, False
+        data = read_json(self._cache_file)
+        if not isinstance(data, dict):
+            return None, False
+        ttl = NO_KEY_TTL if data.get(NO_KEY_SENTINEL) else self._cache_ttl
+        return data, cache_age < ttl
+
+    @staticmethod
+    def _usage(data: Optional[dict]) -> Optional[dict]:
+        """Get the usage response from cache data (None for the sentinel)."""
+        if data is None or data.get(NO_KEY_SENTINEL):
             return None
+        return data
 
-        # Check cache first
-        if self._cache_file.exists():
-            try:
-                cache_age = datetime.now().timestamp() - self._cache_file.stat().st_mtime
-                if cache_age < self._cache_ttl:
-                    with open(self._cache_file) as f:
-                        return json.load(f)
-            except Exception:
-                pass
+    def _fetch_api_usage(self) -> Optional[dict]:
+        """Fetch usage data from Anthropic API (cached, single-flight).
+
+        Returns:
+            Usage dict (stale if the refresh failed, or in non-blocking mode
+            while another process refreshes) or None if unavailable
+        """
+        cached, fresh = self._read_cache()
+        if fresh:
+            return self._usage(cached)
+
+        lock = None
+        try:
+            import fcntl
+            self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+            lock = open(self._cache_file.with_name(self._cache_file.name + '.lock'), 'w')
+            if self.block:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            else:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    lock.close()
+                    return self._usage(cached)  # Another process is refreshing
+        except (ImportError, OSError):
+            pass  # Refresh without the lock
+
+        try:
+            # Another process may have refreshed while we waited
+            cached, fresh = self._read_cache()
+            if fresh:
+                return self._usage(cached)
+
+            if not self._api_key:
+                # Remember the missing key (keeping any earlier response)
+                if self._usage(cached) is None:
+                    atomic_write_json(self._cache_file, {NO_KEY_SENTINEL: True})
+                return self._usage(cached)
+
+            data = self._request_usage()
+            if data is None:
+                return self._usage(cached)  # Keep showing the last response
+            atomic_write_json(self._cache_file, data)
+            return data
+        finally:
+            if lock is not None:
+                lock.close()
+
+    def _request_usage(self) -> Optional[dict]:
+        """Call the usage endpoint.
+
+        Returns:
+            Usage dict or None if the request fails
+        """
+        api_key = self._api_key
+        if not api_key:
+            return None
 
-        # Fetch from API
         try:
             # Determine if using OAuth token or API key
-            if self._api_key and self._api_key.startswith('sk-ant-oat'):
+            if api_key.startswith('sk-ant-oat'):
                 # OAuth token - use Bearer auth
                 headers = {
-                    'Authorization': f'Bearer {self._api_key}'
+                    'Authorization': f'Bearer {api_key}'
                 }
             else:
                 # API key - use x-api-key header
                 headers = {
-                    'x-api-key': self._api_key,
+                    'x-api-key': api_key,
                     'anthropic-version': '2023-06-01'
                 }
 
             req = urllib.request.Request(
-                self.API_USAGE_URL,
+                self.url,
                 headers=headers
             )
 
             with urllib.request.urlopen(req, timeout=2) as response:
                 data = json.loads(response.read())
 
-            # Cache the result
-            self._cache_file.parent.mkdir(parents=True, exist_ok=True)
-            with open(self._cache_file, 'w') as f:
-                json.dump(data, f)
-
-            return data
+            return data if isinstance(data, dict) else None
 
         except Exception:
             return None
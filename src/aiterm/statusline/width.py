@@ -0,0 +1,148 @@
+"""Display width of statusLine text.
+
+Right-aligning segments needs the number of terminal cells a string takes,
+not its length: ANSI escapes take no cells, and emoji such as the project
+icons (🐍, 🌳, 🤖) or CJK characters take two. Counting them as one made
+``_align_line`` pad too little or drop the right side.
+
+Widths follow wcwidth: East Asian Wide/Fullwidth characters and emoji
+presentation characters are two cells, combining marks and format
+characters (zero-width joiner, variation selectors) are zero, everything
+else is one. Ambiguous-width characters such as the powerline blocks
+(░▒▓) count as one, which is what terminals use outside CJK locales.
+
+Segment strings repeat from render to render (and in the daemon, across
+renders), so widths are cached per string.
+"""
+
+import re
+import unicodedata
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+
+# CSI sequences (colors, cursor) and two-byte escapes
+ANSI_ESCAPE = re.compile(r'\x1B(?:[@-Z\\-_]|\[[0-?]*[ -/]*[@-~])')
+
+# Strings whose width is remembered (oldest dropped first)
+MAX_CACHED_WIDTHS = 1024
+
+# Two-cell ranges (inclusive), sorted: East Asian Wide/Fullwidth and
+# emoji with default emoji presentation
+_WIDE_RANGES = (
+    (0x1100, 0x115F), (0x231A, 0x231B), (0x2329, 0x232A), (0x23E9, 0x23EC),
+    (0x23F0, 0x23F0), (0x23F3, 0x23F3), (0x25FD, 0x25FE), (0x2614, 0x2615),
+    (0x2648, 0x2653), (0x267F, 0x267F), (0x2693, 0x2693), (0x26A1, 0x26A1),
+    (0x26AA, 0x26AB), (0x26BD, 0x26BE), (0x26C4, 0x26C5), (0x26CE, 0x26CE),
+    (0x26D4, 0x26D4), (0x26EA, 0x26EA), (0x26F2, 0x26F3), (0x26F5, 0x26F5),
+    (0x26FA, 0x26FA), (0x26FD, 0x26FD), (0x2705, 0x2705), (0x270A, 0x270B),
+    (0x2728, 0x2728), (0x274C, 0x274C), (0x274E, 0x274E), (0x2753, 0x2755),
+    (0x2757, 0x2757), (0x2795, 0x2797), (0x27B0, 0x27B0), (0x27BF, 0x27BF),
+    (0x2B1B, 0x2B1C), (0x2B50, 0x2B50), (0x2B55, 0x2B55), (0x2E80, 0x303E),
+    (0x3041, 0x33FF), (0x3400, 0x4DBF), (0x4E00, 0x9FFF), (0xA000, 0xA4CF),
+    (0xA960, 0xA97F), (0xAC00, 0xD7A3), (0xF900, 0xFAFF), (0xFE10, 0xFE19),
+    (0xFE30, 0xFE6F), (0xFF00, 0xFF60), (0xFFE0, 0xFFE6), (0x16FE0, 0x16FE4),
+    (0x17000, 0x18CFF), (0x1B000, 0x1B2FF), (0x1F004, 0x1F004), (0x1F0CF, 0x1F0CF),
+    (0x1F18E, 0x1F18E), (0x1F191, 0x1F19A), (0x1F200, 0x1F202), (0x1F210, 0x1F23B),
+    (0x1F240, 0x1F248), (0x1F250, 0x1F251), (0x1F260, 0x1F265), (0x1F300, 0x1F320),
+    (0x1F32D, 0x1F335), (0x1F337, 0x1F37C), (0x1F37E, 0x1F393), (0x1F3A0, 0x1F3CA),
+    (0x1F3CF, 0x1F3D3), (0x1F3E0, 0x1F3F0), (0x1F3F4, 0x1F3F4), (0x1F3F8, 0x1F43E),
+    (0x1F440, 0x1F440), (0x1F442, 0x1F4FC), (0x1F4FF, 0x1F53D), (0x1F54B, 0x1F54E),
+    (0x1F550, 0x1F567), (0x1F57A, 0x1F57A), (0x1F595, 0x1F596), (0x1F5A4, 0x1F5A4),
+    (0x1F5FB, 0x1F64F), (0x1F680, 0x1F6C5), (0x1F6CC, 0x1F6CC), (0x1F6D0, 0x1F6D2),
+    (0x1F6D5, 0x1F6D7), (0x1F6DC, 0x1F6DF), (0x1F6EB, 0x1F6EC), (0x1F6F4, 0x1F6FC),
+    (0x1F7E0, 0x1F7EB), (0x1F7F0, 0x1F7F0), (0x1F90C, 0x1F93A), (0x1F93C, 0x1F945),
+    (0x1F947, 0x1F9FF), (0x1FA70, 0x1FAFF), (0x20000, 0x2FFFD), (0x30000, 0x3FFFD),
+)
+
+# Range starts and ends as compact arrays for bisection
+_WIDE_STARTS = array('I', (start for start, _ in _WIDE_RANGES))
+_WIDE_ENDS = array('I', (end for _, end in _WIDE_RANGES))
+
+# Categories taking no cells: combining marks and format characters (ZWJ, ...)
+_ZERO_WIDTH_CATEGORIES = frozenset(('Mn', 'Me', 'Cf'))
+
+
+def strip_ansi(text: str) -> str:
+    """Remove ANSI escape sequences.
+
+    Args:
+        text: Text with ANSI escape codes
+
+    Returns:
+        Visible text only
+    """
+    return ANSI_ESCAPE.sub('', text)
+
+
+def char_width(char: str) -> int:
+    """Get the number of cells a character takes.
+
+    Args:
+        char: Single character
+
+    Returns:
+        0, 1 or 2
+    """
+    code = ord(char)
+    if code < 0x7F:
+        return 1 if code >= 0x20 else 0
+    if code < 0xA0:
+        return 0
+
+    i = bisect_right(_WIDE_STARTS, code) - 1
+    if i >= 0 and code <= _WIDE_ENDS[i]:
+        return 2
+    if unicodedata.category(char) in _ZERO_WIDTH_CATEGORIES:
+        return 0
+    return 1
+
+
+@lru_cache(maxsize=MAX_CACHED_WIDTHS)
+def display_width(text: str) -> int:
+    """Get the number of terminal cells text takes (ANSI codes ignored).
+
+    Args:
+        text: Text, possibly with ANSI escape codes
+
+    Returns:
+        Display width in cells
+    """
+    if '\x1b' in text:
+        text = ANSI_ESCAPE.sub('', text)
+    if text.isascii():
+        return len(text)
+    return sum(char_width(char) for char in text)
+
+
+def fit_width(text: str, width: int, from_end: bool = False) -> str:
+    """Cut plain text to at most width cells.
+
+    Wide characters are never split; a wide character that does not fit is
+    dropped, so the result may be one cell short.
+
+    Args:
+        text: Plain text (no ANSI codes)
+        width: Maximum display width
+        from_end: Keep the end of the text instead of the start
+
+    Returns:
+        Longest prefix (or suffix) fitting in width cells
+    """
+    if width <= 0:
+        return ""
+    if text.isascii():
+        return text[-width:] if from_end else text[:width]
+
+    chars = reversed(text) if from_end else iter(text)
+    used = 0
+    count = 0
+    for char in chars:
+        used += char_width(char)
+        if used > width:
+            break
+        count += 1
+
+    if from_end:
+        return text[len(text) - count:]
+    return text[:count]
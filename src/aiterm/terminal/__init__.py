@@ -49,13 +49,16 @@ def detect_terminal() -> TerminalType:
     return TerminalType.UNKNOWN
 
 
-def apply_context(context: ContextInfo) -> bool:
+def apply_context(context: ContextInfo, force: bool = False) -> bool:
     """Apply a context to the current terminal.
 
     Automatically detects the terminal type and applies context appropriately.
+    Only escape sequences that changed since the last switch in this
+    terminal are sent (see aiterm.terminal.state).
 
     Args:
         context: The context info to apply.
+        force: Send every sequence even if the terminal should have it.
 
     Returns:
         True if context was applied, False if terminal not supported.
@@ -65,13 +68,13 @@ def apply_context(context: ContextInfo) -> bool:
     if terminal == TerminalType.ITERM2:
         from aiterm.terminal import iterm2
 
-        iterm2.apply_context(context)
+        iterm2.apply_context(context, force=force)
         return True
 
     elif terminal == TerminalType.GHOSTTY:
         from aiterm.terminal import ghostty
 
-        ghostty.apply_context(context)
+        ghostty.apply_context(context, force=force)
         return True
 
     # Other terminals: just set title via standard escape sequence
@@ -81,11 +84,9 @@ def apply_context(context: ContextInfo) -> bool:
         TerminalType.WEZTERM,
         TerminalType.APPLE_TERMINAL,
     ):
-        import sys
+        from aiterm.terminal.state import apply_sequences
 
-        title = context.title
-        sys.stdout.write(f"\033]2;{title}\007")
-        sys.stdout.flush()
+        apply_sequences({"title": f"\033]2;{context.title}\007"}, force=force)
         return True
 
     return False
@@ -19,7 +19,6 @@ import json
 import os
 import shutil
 import subprocess
-import sys
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
@@ -380,23 +379,26 @@ def list_themes() -> list[str]:
     return BUILTIN_THEMES.copy()
 
 
-def set_title(title: str) -> bool:
+def set_title(title: str, force: bool = False) -> bool:
     """Set the terminal window title.
 
-    Uses standard OSC 2 escape sequence (works in most terminals).
+    Uses standard OSC 2 escape sequence (works in most terminals). The
+    title is skipped if the terminal already has it (see
+    aiterm.terminal.state).
 
     Args:
         title: The title to set.
+        force: Send the title even if it is unchanged.
 
     Returns:
-        True if title was set.
+        True if title was set, False if already set or not in Ghostty.
     """
     if not is_ghostty():
         return False
 
-    sys.stdout.write(f"\033]2;{title}\007")
-    sys.stdout.flush()
-    return True
+    from aiterm.terminal.state import apply_sequences
+
+    return bool(apply_sequences({"title": f"\033]2;{title}\007"}, force=force))
 
 
 def reload_config() -> bool:
@@ -418,7 +420,7 @@ def reload_config() -> bool:
     return True
 
 
-def apply_context(context: ContextInfo) -> None:
+def apply_context(context: ContextInfo, force: bool = False) -> None:
     """Apply a context to Ghostty (title only, no profile switching).
 
     Ghostty doesn't support runtime profile switching like iTerm2.
@@ -426,6 +428,7 @@ def apply_context(context: ContextInfo) -> None:
 
     Args:
         context: The context info to apply.
+        force: Send the title even if it is unchanged.
     """
     # Build title with context info
     title_parts = []
@@ -437,7 +440,7 @@ def apply_context(context: ContextInfo) -> None:
         title_parts.append(f"({context.branch})")
 
     title = " ".join(title_parts) if title_parts else context.title
-    set_title(title)
+    set_title(title, force=force)
 
 
 def show_config() -> str:
@@ -2,15 +2,31 @@
 
 Provides profile switching, title setting, and user variables via escape sequences.
 Ported from zsh/iterm2-integration.zsh.
+
+Every write goes through aiterm.terminal.state.apply_sequences(), so only
+sequences that differ from what the terminal last received are sent.
 """
 
 import base64
 import os
-import sys
-from dataclasses import dataclass
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import Dict, Optional
 
 from aiterm.context.detector import ContextInfo
+from aiterm.terminal.state import apply_sequences
+
+
+def _profile_sequence(profile: str) -> str:
+    return f"\033]1337;SetProfile={profile}\007"
+
+
+def _title_sequence(title: str) -> str:
+    return f"\033]2;{title}\007"  # OSC 2 - Window title
+
+
+def _user_var_sequence(name: str, value: str) -> str:
+    encoded = base64.b64encode(value.encode()).decode()
+    return f"\033]1337;SetUserVar={name}={encoded}\007"
 
 
 @dataclass
@@ -19,6 +35,22 @@ class ITerm2State:
 
     current_profile: str = ""
     current_title: str = ""
+    user_vars: Dict[str, str] = field(default_factory=dict)
+
+    def sequences(self) -> Dict[str, str]:
+        """Get the escape sequences that establish this state.
+
+        Returns:
+            Sequence by kind ("profile", "title", "var:<name>"), profile first
+        """
+        sequences: Dict[str, str] = {}
+        if self.current_profile:
+            sequences["profile"] = _profile_sequence(self.current_profile)
+        if self.current_title:
+            sequences["title"] = _title_sequence(self.current_title)
+        for name, value in self.user_vars.items():
+            sequences[f"var:{name}"] = _user_var_sequence(name, value)
+        return sequences
 
 
 # Global state (simulates zsh typeset -g)
@@ -30,10 +62,24 @@ def is_iterm2() -> bool:
     return os.environ.get("TERM_PROGRAM") == "iTerm.app"
 
 
-def _write_escape(sequence: str) -> None:
-    """Write an escape sequence to stdout."""
-    sys.stdout.write(sequence)
-    sys.stdout.flush()
+def _apply(state: ITerm2State, force: bool = False) -> bool:
+    """Send what differs between a state and the terminal's, in one write.
+
+    Args:
+        state: Wanted state (empty fields are left alone)
+        force: Send everything regardless of recorded state
+
+    Returns:
+        True if anything was written
+    """
+    written = apply_sequences(state.sequences(), previous=_state.sequences(), force=force)
+
+    if state.current_profile:
+        _state.current_profile = state.current_profile
+    if state.current_title:
+        _state.current_title = state.current_title
+    _state.user_vars.update(state.user_vars)
+    return bool(written)
 
 
 def switch_profile(profile: str) -> bool:
@@ -48,12 +94,7 @@ def switch_profile(profile: str) -> bool:
     if not is_iterm2():
         return False
 
-    if _state.current_profile == profile:
-        return False
-
-    _state.current_profile = profile
-    _write_escape(f"\033]1337;SetProfile={profile}\007")
-    return True
+    return _apply(ITerm2State(current_profile=profile))
 
 
 def set_title(title: str) -> bool:
@@ -68,12 +109,7 @@ def set_title(title: str) -> bool:
     if not is_iterm2():
         return False
 
-    if _state.current_title == title:
-        return False
-
-    _state.current_title = title
-    _write_escape(f"\033]2;{title}\007")  # OSC 2 - Window title
-    return True
+    return _apply(ITerm2State(current_title=title))
 
 
 def set_user_var(name: str, value: str) -> None:
@@ -86,38 +122,61 @@ def set_user_var(name: str, value: str) -> None:
     if not is_iterm2():
         return
 
-    encoded = base64.b64encode(value.encode()).decode()
-    _write_escape(f"\033]1337;SetUserVar={name}={encoded}\007")
+    _apply(ITerm2State(user_vars={name: value}))
+
+
+def _status_vars(icon: str, name: str, branch: str, profile: str) -> Dict[str, str]:
+    """Get the status bar user variables for a context."""
+    return {
+        "ctxIcon": icon,
+        "ctxName": name,
+        "ctxBranch": branch or "",
+        "ctxProfile": profile,
+    }
 
 
 def set_status_vars(icon: str, name: str, branch: str, profile: str) -> None:
     """Set all context variables for the iTerm2 status bar.
 
+    Only changed variables are sent, in one write.
+
     Args:
         icon: Context icon emoji.
         name: Project/context name.
         branch: Git branch name.
         profile: iTerm2 profile name.
     """
-    set_user_var("ctxIcon", icon)
-    set_user_var("ctxName", name)
-    set_user_var("ctxBranch", branch or "")
-    set_user_var("ctxProfile", profile)
+    if not is_iterm2():
+        return
+
+    _apply(ITerm2State(user_vars=_status_vars(icon, name, branch, profile)))
 
 
-def apply_context(context: ContextInfo) -> None:
+def apply_context(context: ContextInfo, force: bool = False) -> None:
     """Apply a context to iTerm2 (profile, title, and status bar).
 
+    Profile, title and user variables are diffed against the last applied
+    state together and the changed ones are sent in a single write.
+
     Args:
         context: The context info to apply.
+        force: Send everything even if the terminal should already have it.
     """
-    switch_profile(context.profile)
-    set_title(context.title)
-    set_status_vars(
-        context.icon,
-        context.name,
-        context.branch or "",
-        context.profile,
+    if not is_iterm2():
+        return
+
+    _apply(
+        ITerm2State(
+            current_profile=context.profile,
+            current_title=context.title,
+            user_vars=_status_vars(
+                context.icon,
+                context.name,
+                context.branch or "",
+                context.profile,
+            ),
+        ),
+        force=force,
     )
 
 
@@ -0,0 +1,100 @@
+"""Incremental terminal updates for context switches.
+
+``ait switch`` runs from a shell hook on every directory change and used to
+rewrite the profile, the title and every iTerm2 user variable each time,
+making the terminal repaint even when nothing changed.
+
+The escape sequences last applied to each terminal are now kept in
+~/.cache/aiterm/terminal-context.json (an EscapeState, as the statusLine
+uses for its title and progress escapes). apply_sequences() compares the wanted sequences with that
+record and writes only the changed ones, all in one write. Unchanged
+sequences are sent again after CONTEXT_REFRESH seconds so that a title
+overwritten by the shell or another program is restored eventually.
+
+A terminal is identified by terminal_key(): its tty and session id (plus
+ITERM_SESSION_ID when set), so a recycled tty in a new tab starts afresh.
+When stdout is not a terminal nothing is persisted and sequences are only
+compared with what the current process already sent.
+"""
+
+import os
+import sys
+from typing import Dict, Optional
+
+from aiterm.utils.cache import get_cache_dir
+from aiterm.utils.escape_state import EscapeState
+
+# Seconds after which an unchanged sequence is sent again
+CONTEXT_REFRESH = 60.0
+
+
+def terminal_key() -> Optional[str]:
+    """Identify the terminal stdout is connected to.
+
+    Returns:
+        Key like "/dev/ttys003:4242", or None if stdout is not a terminal
+    """
+    try:
+        fd = sys.stdout.fileno()
+        if not os.isatty(fd):
+            return None
+        key = f"{os.ttyname(fd)}:{os.getsid(0)}"
+    except (AttributeError, OSError, ValueError):
+        return None
+
+    iterm_session = os.environ.get("ITERM_SESSION_ID")
+    if iterm_session:
+        key = f"{key}:{iterm_session}"
+    return key
+
+
+def _get_state() -> EscapeState:
+    """Get the persisted record of applied sequences."""
+    return EscapeState(get_cache_dir() / "terminal-context.json", CONTEXT_REFRESH)
+
+
+def write_sequences(sequences: str) -> None:
+    """Write escape sequences to stdout in one write.
+
+    Args:
+        sequences: Concatenated escape sequences
+    """
+    if not sequences:
+        return
+    sys.stdout.write(sequences)
+    sys.stdout.flush()
+
+
+def apply_sequences(
+    sequences: Dict[str, str],
+    previous: Optional[Dict[str, str]] = None,
+    force: bool = False,
+) -> str:
+    """Write the sequences that differ from what the terminal last received.
+
+    Args:
+        sequences: Escape sequence by kind (e.g. "profile", "title",
+            "var:ctxName"), in write order
+        previous: Sequences already sent by this process, used when the
+            terminal cannot be identified
+        force: Send every sequence regardless of recorded state
+
+    Returns:
+        The sequences written (empty if nothing changed)
+    """
+    key = terminal_key()
+
+    if key is None:
+        previous = {} if force or previous is None else previous
+        changed = "".join(
+            sequence for kind, sequence in sequences.items()
+            if sequence and previous.get(kind) != sequence
+        )
+    else:
+        state = _get_state()
+        if force:
+            state.forget(key)
+        changed = state.diff(key, sequences)
+
+    write_sequences(changed)
+    return changed
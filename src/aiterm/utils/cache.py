@@ -0,0 +1,76 @@
+"""On-disk cache helpers.
+
+Short-lived processes (statusLine renders, shell hooks, ``ait`` commands)
+keep anything worth caching between runs on disk, under ~/.cache/aiterm.
+Files are written atomically so concurrent readers never see a half-written
+file.
+
+Set AITERM_CACHE_DIR to use another directory (the benchmark suite does this
+so its fixtures never touch the user's caches).
+"""
+
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Optional
+
+# Environment variable overriding the cache directory
+CACHE_DIR_ENV = 'AITERM_CACHE_DIR'
+
+
+def get_cache_dir() -> Path:
+    """Get the aiterm cache directory.
+
+    Returns:
+        Path to $AITERM_CACHE_DIR or ~/.cache/aiterm (may not exist yet)
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override)
+    return Path.home() / '.cache' / 'aiterm'
+
+
+def read_json(path: Path) -> Optional[Any]:
+    """Read a JSON cache file.
+
+    Args:
+        path: Cache file path
+
+    Returns:
+        Parsed JSON, or None if missing or corrupt
+    """
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def atomic_write_json(path: Path, data: Any) -> bool:
+    """Write a JSON cache file atomically (temp file + rename).
+
+    Args:
+        path: Cache file path
+        data: JSON-serializable data
+
+    Returns:
+        True if written, False on error
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix='.tmp')
+    except OSError:
+        return False
+
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+        return True
+    except (OSError, TypeError, ValueError):
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        return False
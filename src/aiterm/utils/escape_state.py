@@ -0,0 +1,109 @@
+"""Persisted record of escape sequences sent to terminals.
+
+Both the statusLine (window title, progress bar) and ``ait switch``
+(profile, title, user variables) send escape sequences that the terminal
+keeps until they are replaced. Sending an unchanged sequence again only
+makes the terminal repaint, so EscapeState remembers the last sequence of
+each kind per key (a session or a terminal) in a JSON file and diff()
+returns just the changed ones. Unchanged sequences are due again after
+``refresh`` seconds, so state overwritten by another program is restored
+eventually.
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from aiterm.utils.cache import atomic_write_json, read_json
+
+# Keys remembered in a state file (least recently updated dropped)
+MAX_STATE_KEYS = 64
+
+
+class EscapeState:
+    """Last escape sequences sent, by key and kind."""
+
+    def __init__(
+        self,
+        path: Path,
+        refresh: float,
+        order: Optional[Tuple[str, ...]] = None,
+        max_keys: int = MAX_STATE_KEYS,
+    ):
+        """Initialize state.
+
+        Args:
+            path: State file
+            refresh: Seconds after which unchanged sequences are sent again
+            order: Kinds to send, in order (None: every kind, in the
+                order given to diff())
+            max_keys: Keys kept in the state file
+        """
+        self.path = path
+        self.refresh = refresh
+        self.order = order
+        self.max_keys = max_keys
+
+    def diff(self, key: str, escapes: Dict[str, str], now: Optional[float] = None) -> str:
+        """Select the sequences that need sending and record them as sent.
+
+        Args:
+            key: Session or terminal the sequences go to
+            escapes: Escape sequences by kind
+            now: Current time (default: time.time())
+
+        Returns:
+            Changed (or due) sequences concatenated in the state's order
+        """
+        if not escapes:
+            return ""
+        now = time.time() if now is None else now
+
+        state = read_json(self.path)
+        if not isinstance(state, dict):
+            state = {}
+        sent = state.get(key)
+        if not isinstance(sent, dict):
+            sent = {}
+
+        changed = []
+        for kind in (escapes if self.order is None else self.order):
+            sequence = escapes.get(kind)
+            if not sequence:
+                continue
+            previous = sent.get(kind)
+            if (isinstance(previous, list) and len(previous) == 2
+                    and previous[0] == sequence and now - previous[1] < self.refresh):
+                continue
+            sent[kind] = [sequence, now]
+            changed.append(sequence)
+
+        if changed:
+            state[key] = sent
+            self._save(state)
+        return "".join(changed)
+
+    def _save(self, state: dict) -> None:
+        """Write state, keeping the max_keys most recently updated keys."""
+        if len(state) > self.max_keys:
+            def last_sent(item) -> float:
+                times = [entry[1] for entry in item[1].values()
+                         if isinstance(entry, list) and len(entry) == 2]
+                return max(times, default=0.0)
+
+            recent = sorted(state.items(), key=last_sent, reverse=True)
+            state = dict(recent[:self.max_keys])
+        atomic_write_json(self.path, state)
+
+    def forget(self, key: Optional[str] = None) -> None:
+        """Forget what was sent so the next diff() returns every sequence.
+
+        Args:
+            key: Key to forget (default: all keys)
+        """
+        if key is None:
+            atomic_write_json(self.path, {})
+            return
+        state = read_json(self.path)
+        if isinstance(state, dict) and state.pop(key, None) is not None:
+            atomic_write_json(self.path, state)
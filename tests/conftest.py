@@ -0,0 +1,23 @@
+"""Shared pytest fixtures.
+
+Every test gets its own cache directory, so statusLine caches (git status,
+segment outputs, compiled config, session times, terminal state, detected
+contexts) never leak between tests or into the developer's
+~/.cache/aiterm.
+"""
+
+import pytest
+
+from aiterm.statusline.cache import CACHE_DIR_ENV
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path_factory, monkeypatch):
+    """Point AITERM_CACHE_DIR at a per-test directory.
+
+    The directory is outside tmp_path, so creating cache files does not
+    change the mtime of directories a test scans.
+    """
+    cache_dir = tmp_path_factory.mktemp("aiterm-cache")
+    monkeypatch.setenv(CACHE_DIR_ENV, str(cache_dir))
+    return cache_dir
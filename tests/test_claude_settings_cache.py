@@ -0,0 +1,172 @@
+"""Tests for the process-wide settings cache."""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from aiterm.claude import settings_cache
+from aiterm.claude.settings import load_settings
+from aiterm.claude.settings_cache import invalidate, read_json_cached
+
+
+def write_settled(path: Path, data: dict) -> None:
+    """Write JSON with an mtime outside the racy window."""
+    path.write_text(json.dumps(data))
+    settled = time.time() - 10
+    os.utime(path, (settled, settled))
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    settings_cache.stop_watching()
+    yield
+    settings_cache.stop_watching()
+
+
+class TestReadJsonCached:
+    """Tests for read_json_cached()."""
+
+    def test_parsed_once_while_unchanged(self, tmp_path: Path) -> None:
+        """Should parse the file once while its stamp is unchanged."""
+        path = tmp_path / "settings.json"
+        write_settled(path, {"alwaysThinkingEnabled": True})
+
+        with patch("aiterm.claude.settings_cache.json.loads", wraps=json.loads) as loads:
+            first = read_json_cached(path)
+            second = read_json_cached(path)
+
+        assert first == {"alwaysThinkingEnabled": True}
+        assert second is first
+        assert loads.call_count == 1
+
+    def test_change_detected(self, tmp_path: Path) -> None:
+        """Should re-read when size or mtime changes."""
+        path = tmp_path / "settings.json"
+        write_settled(path, {"a": 1})
+        read_json_cached(path)
+
+        write_settled(path, {"a": 22})
+
+        assert read_json_cached(path) == {"a": 22}
+
+    def test_recent_write_not_cached(self, tmp_path: Path) -> None:
+        """Should not trust a stamp inside the racy window."""
+        path = tmp_path / "settings.json"
+        path.write_text(json.dumps({"a": 1}))
+        read_json_cached(path)
+
+        # Same size, same mtime: only a re-read can see this edit
+        stat = path.stat()
+        path.write_text(json.dumps({"a": 2}))
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        assert read_json_cached(path) == {"a": 2}
+
+    def test_missing_and_invalid(self, tmp_path: Path) -> None:
+        """Should return None for missing or invalid files."""
+        assert read_json_cached(tmp_path / "missing.json") is None
+
+        path = tmp_path / "bad.json"
+        write_settled(path, {})
+        path.write_text("{not json")
+        os.utime(path, (time.time() - 10, time.time() - 10))
+        assert read_json_cached(path) is None
+
+    def test_invalidate(self, tmp_path: Path) -> None:
+        """Should forget entries on invalidate()."""
+        path = tmp_path / "settings.json"
+        write_settled(path, {"a": 1})
+        first = read_json_cached(path)
+
+        invalidate(path)
+
+        assert read_json_cached(path) is not first
+
+    def test_load_settings_returns_private_copy(self, tmp_path: Path) -> None:
+        """Should not let load_settings() callers modify the cache."""
+        path = tmp_path / "settings.json"
+        write_settled(path, {"permissions": {"allow": ["Bash(ls:*)"]}})
+
+        settings = load_settings(path)
+        settings.permissions["allow"].append("Bash(rm:*)")
+
+        assert read_json_cached(path) == {"permissions": {"allow": ["Bash(ls:*)"]}}
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="inotify is Linux-only")
+class TestInotifyWatch:
+    """Tests for inotify invalidation."""
+
+    def test_watched_entry_skips_stat(self, tmp_path: Path) -> None:
+        """Should serve watched entries without a stat()."""
+        assert settings_cache.watch() is True
+        path = tmp_path / "settings.json"
+        write_settled(path, {"a": 1})
+        read_json_cached(path)
+
+        with patch("aiterm.claude.settings_cache.os.stat", side_effect=AssertionError("stat")):
+            assert read_json_cached(path) == {"a": 1}
+
+    def test_write_invalidates(self, tmp_path: Path) -> None:
+        """Should pick up an edit through inotify."""
+        settings_cache.watch()
+        path = tmp_path / "settings.json"
+        write_settled(path, {"a": 1})
+        read_json_cached(path)
+
+        write_settled(path, {"a": 2})
+
+        deadline = time.monotonic() + 2
+        while str(path) in settings_cache._cache and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert read_json_cached(path) == {"a": 2}
+
+    def test_symlinked_file_stat_checked(self, tmp_path: Path) -> None:
+        """Should notice edits to a symlink's target outside the watched directory."""
+        settings_cache.watch()
+        dotfiles = tmp_path / "dotfiles"
+        dotfiles.mkdir()
+        target = dotfiles / "settings.json"
+        write_settled(target, {"a": 1})
+        claude_dir = tmp_path / "claude"
+        claude_dir.mkdir()
+        path = claude_dir / "settings.json"
+        path.symlink_to(target)
+        assert read_json_cached(path) == {"a": 1}
+
+        target.write_text(json.dumps({"a": 2, "b": 1}))
+        settled = time.time() - 5
+        os.utime(target, (settled, settled))
+
+        assert read_json_cached(path) == {"a": 2, "b": 1}
+
+    def test_failed_watch_retried(self, tmp_path: Path) -> None:
+        """Should watch a directory that appears after a failed attempt."""
+        settings_cache.watch()
+        directory = tmp_path / "later"
+        path = directory / "settings.json"
+        assert read_json_cached(path) is None
+        assert settings_cache._cache[str(path)].watched is False
+
+        directory.mkdir()
+        write_settled(path, {"a": 1})
+
+        assert read_json_cached(path) == {"a": 1}
+        assert settings_cache._cache[str(path)].watched is True
+
+    def test_stop_watching_falls_back_to_stat(self, tmp_path: Path) -> None:
+        """Should stat-check again after the watcher stops."""
+        settings_cache.watch()
+        path = tmp_path / "settings.json"
+        write_settled(path, {"a": 1})
+        read_json_cached(path)
+
+        settings_cache.stop_watching()
+        write_settled(path, {"a": 22})
+
+        assert read_json_cached(path) == {"a": 22}
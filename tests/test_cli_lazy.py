@@ -0,0 +1,129 @@
+"""Tests for lazy sub-command loading in the ait CLI.
+
+Tests cover:
+- Module import caps for hot paths (ait --version, ait statusline render)
+- Root help and completion without importing sub-command modules
+- Lazy registry staying in sync with the sub-app modules
+"""
+
+import importlib
+import json
+import subprocess
+import sys
+
+import pytest
+from typer.testing import CliRunner
+
+from aiterm.cli.main import LAZY_SUBCOMMANDS, app
+
+runner = CliRunner()
+
+# Upper bounds on sys.modules after running a command (was ~520 with eager imports)
+VERSION_MODULE_CAP = 300
+RENDER_MODULE_CAP = 350
+
+# Modules that only specific sub-commands need
+HEAVY_MODULES = (
+    "aiterm.cli.ghostty",
+    "aiterm.cli.opencode",
+    "aiterm.cli.release",
+    "aiterm.cli.workflows",
+    "aiterm.cli.sessions",
+    "aiterm.cli.craft",
+    "aiterm.cli.learn",
+    "questionary",
+    "yaml",
+)
+
+PROBE = """
+import json, sys
+sys.argv = ["ait"] + json.loads(sys.argv[1])
+from aiterm.cli.main import app
+try:
+    app()
+except SystemExit:
+    pass
+sys.stderr.write("\\n" + json.dumps(sorted(sys.modules)))
+"""
+
+
+def imported_modules(args, stdin=""):
+    """Run ait in a fresh interpreter and return the loaded module names."""
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE, json.dumps(args)],
+        input=stdin,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    return json.loads(result.stderr.strip().splitlines()[-1])
+
+
+class TestImportCaps:
+    """Regression tests for CLI startup cost."""
+
+    def test_version(self):
+        """ait --version imports no sub-command modules."""
+        modules = imported_modules(["--version"])
+
+        assert len(modules) < VERSION_MODULE_CAP
+        assert not [m for m in modules if m.startswith("aiterm.cli.") and m not in (
+            "aiterm.cli.main", "aiterm.cli.lazy",
+        )]
+
+    def test_statusline_render(self):
+        """ait statusline render imports only the statusline CLI."""
+        payload = json.dumps({
+            "workspace": {"current_dir": "/tmp", "project_dir": "/tmp"},
+            "model": {"display_name": "Claude Sonnet 4.5"},
+            "output_style": {"name": "default"},
+            "session_id": "lazy-test",
+        })
+        modules = imported_modules(["statusline", "render"], stdin=payload)
+
+        assert len(modules) < RENDER_MODULE_CAP
+        assert "aiterm.cli.statusline" in modules
+        for heavy in HEAVY_MODULES:
+            assert heavy not in modules
+
+    def test_root_help(self):
+        """ait --help lists commands without importing them."""
+        modules = imported_modules(["--help"])
+
+        for heavy in HEAVY_MODULES:
+            assert heavy not in modules
+
+
+class TestLazyGroup:
+    """Test behaviour of the lazy root group."""
+
+    def test_help_lists_lazy_commands(self):
+        """Root help shows lazy sub-commands but hides the recipes alias."""
+        result = runner.invoke(app, ["--help"])
+
+        assert result.exit_code == 0
+        assert "statusline" in result.output
+        assert "workflows" in result.output
+        assert "recipes" not in result.output
+
+    def test_subcommand_help(self):
+        """Sub-command help loads the real sub-app."""
+        result = runner.invoke(app, ["recipes", "--help"])
+
+        assert result.exit_code == 0
+        assert "apply" in result.output
+
+    def test_typo_suggestion(self):
+        """Typos are matched against lazy command names."""
+        result = runner.invoke(app, ["statsline"])
+
+        assert result.exit_code != 0
+        assert "statusline" in result.output
+
+    @pytest.mark.parametrize("name", sorted(LAZY_SUBCOMMANDS))
+    def test_registry_matches_module(self, name):
+        """Registered help text matches the sub-app it stands in for."""
+        spec = LAZY_SUBCOMMANDS[name]
+        module = importlib.import_module(spec.module)
+
+        assert spec.help == module.app.info.help
@@ -1,7 +1,18 @@
-"""Tests for context detection."""
+"""Tests for context detection.
 
+Tests cover:
+- Project type and name detection
+- Git branch and dirty state
+- The on-disk detection cache and its stat invalidation
+"""
+
+import json
+import os
+import subprocess
 import tempfile
+import time
 from pathlib import Path
+from unittest.mock import patch
 
 import pytest
 
@@ -10,9 +21,25 @@ from aiterm.context.detector import (
     ContextType,
     detect_context,
     detect_context_type,
+    get_git_info,
 )
 
 
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path_factory, monkeypatch):
+    """Isolate the detection and git caches."""
+    path = tmp_path_factory.mktemp("cache")
+    monkeypatch.setenv("AITERM_CACHE_DIR", str(path))
+    return path
+
+
+def settle(*paths: Path) -> None:
+    """Backdate mtimes so results are outside the racy window."""
+    past = time.time() - 10
+    for path in paths:
+        os.utime(path, (past, past))
+
+
 class TestContextDetection:
     """Tests for detect_context function."""
 
@@ -143,3 +170,86 @@ class TestDetectContextType:
         result = detect_context_type(tmp_path)
         assert result == ContextType.PYTHON
         assert isinstance(result, ContextType)
+
+
+class TestGitInfo:
+    """Tests for get_git_info."""
+
+    @pytest.fixture
+    def repo(self, tmp_path: Path, monkeypatch) -> Path:
+        for var in ("GIT_AUTHOR_NAME", "GIT_COMMITTER_NAME"):
+            monkeypatch.setenv(var, "Test")
+        for var in ("GIT_AUTHOR_EMAIL", "GIT_COMMITTER_EMAIL"):
+            monkeypatch.setenv(var, "test@example.com")
+        for args in (["init", "-q", "-b", "main"], ["commit", "-q", "--allow-empty", "-m", "init"]):
+            subprocess.run(["git", "-C", str(tmp_path), *args], check=True, capture_output=True)
+        return tmp_path
+
+    def test_not_a_repo(self, tmp_path: Path) -> None:
+        assert get_git_info(tmp_path) == (None, False)
+
+    def test_clean_and_dirty(self, repo: Path) -> None:
+        assert get_git_info(repo) == ("main", False)
+
+        (repo / "new.txt").write_text("n")
+        subprocess.run(["git", "-C", str(repo), "add", "new.txt"], check=True)
+        assert get_git_info(repo) == ("main", True)
+
+    def test_long_branch_truncated(self, repo: Path) -> None:
+        subprocess.run(
+            ["git", "-C", str(repo), "checkout", "-q", "-b", "feature/very-long-branch-name"],
+            check=True,
+        )
+        assert get_git_info(repo) == ("feature/…nch-name", False)
+
+    def test_no_porcelain_listing(self, repo: Path) -> None:
+        """Dirtiness never lists the whole tree with git status."""
+        with patch("aiterm.statusline.gitstatus.subprocess.run", wraps=subprocess.run) as run:
+            get_git_info(repo)
+
+        for call in run.call_args_list:
+            assert "status" not in call.args[0]
+
+
+class TestDetectionCache:
+    """Tests for the on-disk detection cache."""
+
+    def test_hit_skips_scan(self, tmp_path: Path) -> None:
+        """A settled directory is not scanned again."""
+        (tmp_path / "pyproject.toml").write_text('name = "cached"\n')
+        settle(tmp_path / "pyproject.toml", tmp_path)
+        detect_context(tmp_path)
+
+        with patch("aiterm.context.detector.get_fingerprint") as fingerprint:
+            context = detect_context(tmp_path)
+
+        fingerprint.assert_not_called()
+        assert context.type == ContextType.PYTHON
+        assert context.name == "cached"
+
+    def test_new_marker_invalidates(self, tmp_path: Path) -> None:
+        """Adding a marker file changes the directory stamp."""
+        settle(tmp_path)
+        assert detect_context(tmp_path).type == ContextType.DEFAULT
+
+        (tmp_path / "DESCRIPTION").write_text("Package: newpkg\n")
+        assert detect_context(tmp_path).type == ContextType.R_PACKAGE
+
+    def test_marker_edit_invalidates(self, tmp_path: Path) -> None:
+        """Editing the marker the name came from is noticed."""
+        marker = tmp_path / "pyproject.toml"
+        marker.write_text('name = "before"\n')
+        settle(marker, tmp_path)
+        detect_context(tmp_path)
+
+        marker.write_text('name = "after-edit"\n')
+        settle(marker, tmp_path)
+        assert detect_context(tmp_path).name == "after-edit"
+
+    def test_racy_result_not_stored(self, tmp_path: Path, cache_dir: Path) -> None:
+        """Results for just-modified directories are not cached."""
+        (tmp_path / "pyproject.toml").write_text('name = "fresh"\n')
+        detect_context(tmp_path)
+
+        cache_file = cache_dir / "contexts.json"
+        assert not cache_file.exists() or str(tmp_path.resolve()) not in json.loads(cache_file.read_text())
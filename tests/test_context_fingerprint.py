@@ -0,0 +1,167 @@
+"""Tests for project fingerprints (single directory scan + mtime cache).
+
+Tests cover:
+- Classifying entries as files and directories
+- Reusing a fingerprint until the directory mtime changes
+- Marker file reads cached by file mtime/size
+- ProjectSegment and detect_context sharing one scan
+"""
+
+import os
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from aiterm.context import fingerprint as fingerprint_module
+from aiterm.context.detector import ContextType, detect_context
+from aiterm.context.fingerprint import get_fingerprint, read_text_cached, scan_directory
+from aiterm.statusline.config import StatusLineConfig
+from aiterm.statusline.segments import ProjectSegment
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    fingerprint_module.clear_cache()
+    yield
+    fingerprint_module.clear_cache()
+
+
+def age(path: Path, seconds: int = 60) -> None:
+    """Move a path's mtime into the past (outside the racy window)."""
+    past = time.time() - seconds
+    os.utime(path, (past, past))
+
+
+@pytest.fixture
+def count_scans():
+    """Count os.scandir calls made by the fingerprint module."""
+    with patch.object(fingerprint_module.os, 'scandir', wraps=os.scandir) as mock_scandir:
+        yield mock_scandir
+
+
+class TestScanDirectory:
+    """Test building fingerprints."""
+
+    def test_files_and_dirs(self, tmp_path):
+        (tmp_path / "DESCRIPTION").write_text("Package: x\n")
+        (tmp_path / "tests").mkdir()
+        (tmp_path / "x.Rcheck").mkdir()
+
+        fp = scan_directory(str(tmp_path))
+
+        assert fp.has_file("DESCRIPTION")
+        assert fp.has_dir("tests")
+        assert not fp.has_dir("DESCRIPTION")
+        assert fp.exists("tests") and fp.exists("DESCRIPTION")
+        assert fp.dirs_with_suffix(".Rcheck") == ["x.Rcheck"]
+
+    def test_missing_directory(self, tmp_path):
+        fp = get_fingerprint(tmp_path / "missing")
+
+        assert fp.files == frozenset() and fp.dirs == frozenset()
+        assert fp.project_type == 'default'
+
+    @pytest.mark.parametrize("marker,expected", [
+        ("pyproject.toml", "python"),
+        ("setup.py", "python"),
+        ("package.json", "node"),
+    ])
+    def test_project_type(self, tmp_path, marker, expected):
+        (tmp_path / marker).write_text("")
+        assert get_fingerprint(tmp_path).project_type == expected
+
+    def test_r_package_needs_package_field(self, tmp_path):
+        (tmp_path / "DESCRIPTION").write_text("Title: not a package\n")
+        assert get_fingerprint(tmp_path).project_type == 'default'
+
+
+class TestFingerprintCache:
+    """Test mtime-keyed caching."""
+
+    def test_unchanged_directory_scanned_once(self, tmp_path, count_scans):
+        (tmp_path / "pyproject.toml").write_text("")
+        age(tmp_path)
+
+        first = get_fingerprint(tmp_path)
+        second = get_fingerprint(tmp_path)
+
+        assert first is second
+        assert count_scans.call_count == 1
+
+    def test_new_entry_invalidates(self, tmp_path):
+        age(tmp_path)
+        assert not get_fingerprint(tmp_path).exists("package.json")
+
+        (tmp_path / "package.json").write_text("{}")
+        assert get_fingerprint(tmp_path).exists("package.json")
+
+    def test_recently_modified_directory_rescanned(self, tmp_path, count_scans):
+        """Changes inside the racy window are never served from cache."""
+        get_fingerprint(tmp_path)
+        get_fingerprint(tmp_path)
+
+        assert count_scans.call_count == 2
+
+    def test_in_place_edit_seen(self, tmp_path):
+        """Editing a marker file (dir mtime unchanged) is picked up."""
+        desc = tmp_path / "DESCRIPTION"
+        desc.write_text("Package: x\nVersion: 1.0.0\n")
+        age(desc)
+        age(tmp_path)
+        assert "1.0.0" in get_fingerprint(tmp_path).read_text("DESCRIPTION")
+
+        desc.write_text("Package: x\nVersion: 1.0.1\n")
+        age(tmp_path)
+        assert "1.0.1" in get_fingerprint(tmp_path).read_text("DESCRIPTION")
+
+    def test_read_text_only_for_files(self, tmp_path):
+        (tmp_path / "DESCRIPTION").mkdir()
+        assert get_fingerprint(tmp_path).read_text("DESCRIPTION") is None
+
+    def test_read_text_size_limit(self, tmp_path):
+        big = tmp_path / "big"
+        big.write_text("x" * (fingerprint_module.MAX_READ_BYTES + 1))
+        assert read_text_cached(str(big)) is None
+
+
+class TestSharedScan:
+    """Test consumers reading from one fingerprint."""
+
+    def test_project_segment_single_scan(self, tmp_path, count_scans):
+        """Icon, type, R version and health share one scandir."""
+        (tmp_path / "DESCRIPTION").write_text("Package: x\nVersion: 1.2.3\n")
+        (tmp_path / "tests").mkdir()
+        age(tmp_path)
+
+        config = StatusLineConfig()
+        segment = ProjectSegment(config)
+        project_dir = str(tmp_path)
+
+        assert segment._get_project_icon(project_dir) == "📦"
+        assert segment._get_project_type(project_dir) == "r-package"
+        assert segment._get_r_version(project_dir) == "v1.2.3"
+        assert count_scans.call_count == 1
+
+    def test_detect_context_uses_fingerprint(self, tmp_path):
+        (tmp_path / "pyproject.toml").write_text('name = "fp-project"\n')
+
+        context = detect_context(tmp_path)
+
+        assert context.type == ContextType.PYTHON
+        assert context.name == "fp-project"
+        assert get_fingerprint(tmp_path.resolve()).has_file("pyproject.toml")
+
+    def test_worktree_from_git_file(self, tmp_path):
+        """A .git file pointing into worktrees/ marks a linked worktree."""
+        (tmp_path / ".git").write_text("gitdir: /repo/.git/worktrees/feature\n")
+
+        segment = ProjectSegment(StatusLineConfig())
+        assert segment._is_worktree(str(tmp_path)) is True
+
+    def test_main_checkout_not_worktree(self, tmp_path):
+        (tmp_path / ".git").mkdir()
+
+        segment = ProjectSegment(StatusLineConfig())
+        assert segment._is_worktree(str(tmp_path)) is False
@@ -0,0 +1,277 @@
+"""Tests for the indexed session store.
+
+Tests cover:
+- Importing active and archived manifests
+- Incremental syncs (directory watermarks, in-place edits, removals)
+- Filtered, paginated queries and archive date counts
+- The ``ait sessions`` commands reading through the index, with totals
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from aiterm.claude.session_index import SessionIndex
+
+
+@pytest.fixture
+def root(tmp_path):
+    """Sessions directory with active/ and history/."""
+    path = tmp_path / "sessions"
+    (path / "active").mkdir(parents=True)
+    (path / "history").mkdir()
+    return path
+
+
+@pytest.fixture
+def index(root, tmp_path):
+    index = SessionIndex(root, tmp_path / "cache" / "sessions.db")
+    yield index
+    index.close()
+
+
+def write_manifest(directory, session_id, project="proj", path="/work/proj", minutes_ago=0, **extra):
+    """Write a hook manifest."""
+    directory.mkdir(parents=True, exist_ok=True)
+    data = {
+        "session_id": session_id,
+        "project": project,
+        "path": path,
+        "started": (datetime.now() - timedelta(minutes=minutes_ago)).isoformat(),
+        "pid": 1,
+        **extra,
+    }
+    manifest = directory / f"{session_id}.json"
+    manifest.write_text(json.dumps(data))
+    return manifest
+
+
+def settle(*paths):
+    """Backdate mtimes so watermarks are kept."""
+    past = time.time() - 60
+    for path in paths:
+        os.utime(path, (past, past))
+
+
+class TestSync:
+    """Tests for importing manifests."""
+
+    def test_active_and_archived(self, index, root):
+        write_manifest(root / "active", "a1")
+        write_manifest(root / "history" / "2025-01-02", "h1", status="completed")
+
+        assert index.sync()
+
+        assert [m["session_id"] for m in index.query()] == ["a1"]
+        assert [m["session_id"] for m in index.query(archived=True)] == ["h1"]
+
+    def test_unchanged_history_not_listed(self, index, root):
+        """A history date directory with an unchanged mtime is skipped."""
+        day = root / "history" / "2025-01-02"
+        settle(write_manifest(day, "h1"), day)
+        index.sync()
+
+        with patch.object(SessionIndex, "_scan", wraps=index._scan) as scan:
+            index.sync()
+
+        assert [call.args[1] for call in scan.call_args_list] == ["active"]
+
+    def test_unchanged_manifest_not_parsed(self, index, root):
+        settle(write_manifest(root / "active", "a1"))
+        index.sync()
+
+        with patch.object(SessionIndex, "_import") as parse:
+            index.sync()
+
+        parse.assert_not_called()
+
+    def test_in_place_edit(self, index, root):
+        """Rewritten active manifests are re-imported."""
+        manifest = write_manifest(root / "active", "a1")
+        settle(manifest)
+        index.sync()
+
+        data = json.loads(manifest.read_text())
+        data["task"] = "new task"
+        manifest.write_text(json.dumps(data))
+        index.sync()
+
+        assert index.query()[0]["task"] == "new task"
+
+    def test_archive_moves_session(self, index, root):
+        """A manifest moved to history leaves active/."""
+        manifest = write_manifest(root / "active", "a1")
+        index.sync()
+
+        day = root / "history" / "2025-01-02"
+        day.mkdir()
+        manifest.rename(day / manifest.name)
+        index.sync()
+
+        assert index.query() == []
+        assert index.query(archived=True, date="2025-01-02")[0]["session_id"] == "a1"
+
+    def test_removed_date_dir(self, index, root):
+        day = root / "history" / "2025-01-02"
+        manifest = write_manifest(day, "h1")
+        index.sync()
+
+        manifest.unlink()
+        day.rmdir()
+        index.sync()
+
+        assert index.query(archived=True) == []
+        assert index.dates() == []
+
+    def test_invalid_manifest(self, index, root):
+        """Invalid manifests are counted per date but never returned."""
+        day = root / "history" / "2025-01-02"
+        write_manifest(day, "h1")
+        (day / "broken.json").write_text("{not json")
+        index.sync()
+
+        assert index.dates() == [("2025-01-02", 2)]
+        assert index.count(archived=True) == 1
+
+    def test_bad_end_time_not_indexed(self, index, root):
+        """Manifests LiveSession.from_dict rejects never take a page slot."""
+        write_manifest(root / "active", "good", minutes_ago=1)
+        write_manifest(root / "active", "bad", ended="not a date")
+        index.sync()
+
+        assert [m["session_id"] for m in index.query(limit=1)] == ["good"]
+        assert index.count() == 1
+
+    def test_root_change_resets(self, index, root, tmp_path):
+        write_manifest(root / "active", "a1")
+        index.sync()
+
+        other = tmp_path / "other"
+        write_manifest(other / "active", "b1")
+        moved = SessionIndex(other, index.path)
+        moved.sync()
+
+        assert [m["session_id"] for m in moved.query()] == ["b1"]
+        moved.close()
+
+    def test_unavailable(self, root, tmp_path):
+        """sync() reports a database it cannot open."""
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+        index = SessionIndex(root, blocker / "sessions.db")
+
+        assert index.sync() is False
+        assert index.query() == []
+
+
+class TestQuery:
+    """Tests for filtered, paginated queries."""
+
+    @pytest.fixture(autouse=True)
+    def sessions(self, index, root):
+        for i in range(5):
+            write_manifest(root / "active", f"a{i}", project="Alpha" if i % 2 else "beta",
+                           path=f"/work/{i}", minutes_ago=i)
+        for day in ("2025-01-01", "2025-01-03", "2025-01-02"):
+            write_manifest(root / "history" / day, f"h-{day}", status="completed")
+        index.sync()
+
+    def test_most_recent_first(self, index):
+        assert [m["session_id"] for m in index.query()] == ["a0", "a1", "a2", "a3", "a4"]
+
+    def test_pagination(self, index):
+        assert [m["session_id"] for m in index.query(limit=2, offset=2)] == ["a2", "a3"]
+        assert index.query(limit=2, offset=10) == []
+
+    def test_project_filter_case_insensitive(self, index):
+        assert [m["session_id"] for m in index.query(project="alp")] == ["a1", "a3"]
+        assert index.count(project="BETA") == 3
+
+    def test_path_filter(self, index):
+        assert [m["session_id"] for m in index.query(path="/work/4")] == ["a4"]
+
+    def test_status_filter(self, index):
+        assert index.count(archived=True, status="completed") == 3
+
+    def test_dates_newest_first(self, index):
+        assert index.dates(limit=2) == [("2025-01-03", 1), ("2025-01-02", 1)]
+
+
+class TestSessionsCommands:
+    """Tests for ``ait sessions`` reading through the index."""
+
+    @pytest.fixture
+    def home(self, tmp_path, monkeypatch):
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.delenv("AITERM_CACHE_DIR", raising=False)
+        return tmp_path / ".claude" / "sessions"
+
+    def test_load_live_sessions_paginated(self, home):
+        from aiterm.cli.sessions import load_live_sessions
+
+        for i in range(3):
+            write_manifest(home / "active", f"s{i}", minutes_ago=i)
+
+        assert [s.session_id for s in load_live_sessions(limit=2, offset=1)] == ["s1", "s2"]
+        assert (home.parent.parent / ".cache" / "aiterm" / "sessions.db").exists()
+
+    def test_live_next_page_hint(self, home):
+        from aiterm.cli.sessions import app
+
+        for i in range(3):
+            write_manifest(home / "active", f"s{i}", minutes_ago=i)
+
+        result = CliRunner().invoke(app, ["live", "--limit", "2"])
+
+        assert result.exit_code == 0
+        assert "--page 2" in result.output
+
+    def test_live_footer_shows_total(self, home):
+        from aiterm.cli.sessions import app
+
+        for i in range(3):
+            write_manifest(home / "active", f"s{i}", minutes_ago=i)
+
+        first = CliRunner().invoke(app, ["live", "--limit", "2"])
+        last = CliRunner().invoke(app, ["live", "--limit", "2", "--page", "2"])
+
+        assert "2 of 3 active session(s)" in first.output
+        assert "1 of 3 active session(s)" in last.output
+
+    def test_live_footer_scan_fallback(self, home):
+        from aiterm.cli.sessions import app
+
+        for i in range(3):
+            write_manifest(home / "active", f"s{i}", minutes_ago=i)
+
+        with patch("aiterm.claude.session_index.SessionIndex.sync", return_value=False):
+            result = CliRunner().invoke(app, ["live", "--limit", "2"])
+
+        assert "2 of 3 active session(s)" in result.output
+
+    def test_history_dates(self, home):
+        from aiterm.cli.sessions import app
+
+        write_manifest(home / "history" / "2025-01-02", "h1")
+        write_manifest(home / "history" / "2025-01-02", "h2")
+
+        result = CliRunner().invoke(app, ["history"])
+
+        assert "2025-01-02  (2 sessions)" in result.output
+
+    def test_scan_fallback(self, home):
+        """Without the index, manifests are parsed directly."""
+        from aiterm.cli.sessions import load_archived_sessions
+
+        write_manifest(home / "history" / "2025-01-02", "h1", project="Alpha")
+        write_manifest(home / "history" / "2025-01-02", "h2", project="beta")
+
+        with patch("aiterm.claude.session_index.SessionIndex.sync", return_value=False):
+            sessions = load_archived_sessions("2025-01-02", project="alpha")
+
+        assert [s.session_id for s in sessions] == ["h1"]
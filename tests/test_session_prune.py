@@ -0,0 +1,185 @@
+"""Tests for pruning stale hook-registered sessions.
+
+Tests cover:
+- Bulk PID liveness probes and PID reuse detection
+- Atomic archive moves
+- ``ait sessions prune`` (including --watch)
+"""
+
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+from typer.testing import CliRunner
+
+from aiterm.claude.liveness import (
+    PID_START_SLACK,
+    _parse_etime,
+    _probe_ps,
+    is_session_process,
+    probe_processes,
+)
+from aiterm.cli.sessions import app, archive_manifests, find_stale_sessions
+
+DEAD_PID = 2 ** 22 + 12345  # Above the default pid_max
+
+
+def write_manifest(directory: Path, session_id: str, pid: int, started: datetime) -> Path:
+    """Write an active session manifest."""
+    directory.mkdir(parents=True, exist_ok=True)
+    manifest = directory / f"{session_id}.json"
+    manifest.write_text(json.dumps({
+        "session_id": session_id,
+        "project": session_id,
+        "path": f"/work/{session_id}",
+        "started": started.isoformat(),
+        "pid": pid,
+    }))
+    return manifest
+
+
+@pytest.fixture
+def home(tmp_path, monkeypatch):
+    """Sessions directory under a temporary home."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.setenv("AITERM_CACHE_DIR", str(tmp_path / "cache"))
+    return tmp_path / ".claude" / "sessions"
+
+
+class TestProbeProcesses:
+    """Tests for bulk liveness probes."""
+
+    def test_running_and_dead(self):
+        live = probe_processes([os.getpid(), DEAD_PID, 0, -1])
+
+        assert set(live) == {os.getpid()}
+        assert live[os.getpid()] <= time.time()
+
+    @pytest.mark.skipif(not os.path.exists("/proc/stat"), reason="needs /proc")
+    def test_proc_does_not_fork(self):
+        with patch("aiterm.claude.liveness.subprocess.run") as run:
+            probe_processes([os.getpid(), DEAD_PID])
+
+        run.assert_not_called()
+
+    def test_ps_fallback_single_call(self):
+        """Without /proc all PIDs share one ps call."""
+        with patch("aiterm.claude.liveness.subprocess.run", wraps=__import__("subprocess").run) as run:
+            live = _probe_ps([os.getpid(), os.getppid(), DEAD_PID])
+
+        assert run.call_count == 1
+        assert set(live) == {os.getpid(), os.getppid()}
+
+    def test_parse_etime(self):
+        assert _parse_etime("05:06") == 306
+        assert _parse_etime("01:02:03") == 3723
+        assert _parse_etime("2-00:00:01") == 2 * 86400 + 1
+        assert _parse_etime("bogus") is None
+
+
+class TestIsSessionProcess:
+    """Tests for PID reuse detection."""
+
+    def test_older_process_is_session(self):
+        assert is_session_process(42, 1000.0, {42: 990.0})
+
+    def test_newer_process_is_reused_pid(self):
+        assert not is_session_process(42, 1000.0, {42: 1000.0 + PID_START_SLACK + 1})
+
+    def test_unknown_start_trusted(self):
+        assert is_session_process(42, 1000.0, {42: None})
+
+    def test_dead(self):
+        assert not is_session_process(42, 1000.0, {})
+
+
+class TestArchiveManifests:
+    """Tests for archive moves."""
+
+    def test_moves_and_marks(self, tmp_path):
+        active = tmp_path / "active"
+        manifests = [write_manifest(active, f"s{i}", DEAD_PID, datetime.now()) for i in range(3)]
+        history = tmp_path / "history" / "2025-01-02"
+
+        archived, failed = archive_manifests(manifests, history)
+
+        assert len(archived) == 3 and failed == []
+        assert list(active.iterdir()) == []
+        data = json.loads((history / "s0.json").read_text())
+        assert data["status"] == "pruned"
+        assert data["ended"]
+
+    def test_invalid_manifest_left_in_place(self, tmp_path):
+        active = tmp_path / "active"
+        active.mkdir()
+        broken = active / "broken.json"
+        broken.write_text("{not json")
+
+        archived, failed = archive_manifests([broken], tmp_path / "history" / "d")
+
+        assert archived == []
+        assert failed[0][0] == broken
+        assert sorted(p.name for p in active.iterdir()) == ["broken.json"]
+
+    def test_repeated_move_replaces(self, tmp_path):
+        """An interrupted move (history copy written, active kept) is redone."""
+        active = tmp_path / "active"
+        history = tmp_path / "history" / "d"
+        manifest = write_manifest(active, "s1", DEAD_PID, datetime.now())
+        history.mkdir(parents=True)
+        (history / "s1.json").write_text("partial")
+
+        archived, _ = archive_manifests([manifest], history)
+
+        assert archived == [manifest]
+        assert json.loads((history / "s1.json").read_text())["session_id"] == "s1"
+
+
+class TestPruneCommand:
+    """Tests for ``ait sessions prune``."""
+
+    def test_find_stale(self, home):
+        active = home / "active"
+        past = datetime.now() - timedelta(hours=1)
+        write_manifest(active, "alive", os.getpid(), datetime.now() + timedelta(days=1))
+        write_manifest(active, "dead", DEAD_PID, past)
+        write_manifest(active, "reused", os.getpid(), past)
+
+        stale, alive = find_stale_sessions(active)
+
+        assert sorted(session.session_id for session, _ in stale) == ["dead", "reused"]
+        assert alive == 1
+
+    def test_prune_archives(self, home):
+        write_manifest(home / "active", "dead", DEAD_PID, datetime.now())
+
+        result = CliRunner().invoke(app, ["prune"])
+
+        assert result.exit_code == 0
+        assert "Archived 1 stale session" in result.output
+        assert not (home / "active" / "dead.json").exists()
+        assert len(list((home / "history").glob("*/dead.json"))) == 1
+
+    def test_dry_run(self, home):
+        write_manifest(home / "active", "dead", DEAD_PID, datetime.now())
+
+        result = CliRunner().invoke(app, ["prune", "--dry-run"])
+
+        assert "Use without --dry-run" in result.output
+        assert (home / "active" / "dead.json").exists()
+
+    def test_watch(self, home):
+        """--watch prunes on every tick until interrupted."""
+        write_manifest(home / "active", "dead", DEAD_PID, datetime.now())
+
+        with patch("time.sleep", side_effect=KeyboardInterrupt) as sleep:
+            result = CliRunner().invoke(app, ["prune", "--watch", "--interval", "30"])
+
+        assert result.exit_code == 0
+        sleep.assert_called_once_with(30.0)
+        assert "Archived 1 stale session" in result.output
+        assert "Stopped" in result.output
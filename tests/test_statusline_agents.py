@@ -4,14 +4,23 @@ Tests the background agent detection functionality including:
 - PID file detection
 - Process validation
 - Multi-strategy detection
+- Hook-maintained agent registry
 - Display formatting
 """
 
+import json
 import os
+import time
 import pytest
 from pathlib import Path
 from unittest.mock import patch, MagicMock
-from aiterm.statusline.agents import AgentDetector, format_agent_display
+from typer.testing import CliRunner
+from aiterm.cli.main import app
+from aiterm.statusline import agents
+from aiterm.statusline.agents import AgentDetector, AgentRegistry, format_agent_display
+from aiterm.statusline.cache import CACHE_DIR_ENV
+
+cli_runner = CliRunner()
 
 
 class TestAgentDetector:
@@ -157,3 +166,136 @@ class TestFormatAgentDisplay:
         """Should handle large agent counts."""
         assert format_agent_display(99, compact=True) == "🤖99"
         assert format_agent_display(99, compact=False) == "99 agents"
+
+
+class TestAgentRegistry:
+    """Test the hook-maintained agent registry."""
+
+    @pytest.fixture
+    def registry(self, tmp_path):
+        agents._counts.clear()
+        yield AgentRegistry(tmp_path / "agents.json")
+        agents._counts.clear()
+
+    def test_register_and_count(self, registry):
+        registry.register("s1", "a1", pid=os.getpid(), name="general-purpose")
+        registry.register("s1", "a2")
+        registry.register("s2", "a1")
+
+        assert registry.running_count("s1") == 2
+        assert registry.running_count("s2") == 1
+        assert registry.running_count("unknown") is None
+
+    def test_unregister(self, registry):
+        registry.register("s1", "a1")
+        registry.register("s1", "a2")
+
+        assert registry.unregister("s1", "a2") is True
+        assert registry.unregister("s1", "a2") is False
+        assert registry.unregister("s1") is True  # Oldest
+        assert registry.agents("s1") == {"s1": {}}
+
+    def test_dead_pid_not_counted_and_pruned(self, registry):
+        registry.register("s1", "dead", pid=999999)
+        assert registry.running_count("s1") == 0
+
+        registry.register("s1", "live", pid=os.getpid())
+        assert set(registry.agents("s1")["s1"]) == {"live"}
+        assert set(registry._load()["s1"]) == {"live"}
+
+    def test_stale_entry_without_pid_expires(self, registry):
+        registry.register("s1", "a1")
+        with patch("aiterm.statusline.agents.time.time", return_value=time.time() + agents.MAX_AGENT_AGE + 1):
+            assert registry.running_count("s1") == 0
+
+    def test_unowned_entry_expires_within_idle_window(self, registry):
+        registry.register("s1", "a1")
+        later = time.time() + agents.UNOWNED_AGENT_AGE + 1
+        with patch("aiterm.statusline.agents.time.time", return_value=later):
+            assert registry.running_count("s1") == 0
+
+    def test_entry_dies_with_owner(self, registry):
+        registry.register("s1", "live-owner", owner=os.getpid())
+        registry.register("s1", "dead-owner", owner=999999)
+
+        later = time.time() + agents.UNOWNED_AGENT_AGE + 1
+        with patch("aiterm.statusline.agents.time.time", return_value=later):
+            assert set(registry.agents("s1")["s1"]) == {"live-owner"}
+
+    def test_find_hook_owner_skips_shells(self):
+        parents = {os.getpid(): (300, "sh"), 300: (200, "-zsh"), 200: (100, "claude")}
+        with patch("aiterm.statusline.agents._parent_process", side_effect=parents.get):
+            assert agents.find_hook_owner() == 100
+
+    def test_find_hook_owner_unknown(self):
+        with patch("aiterm.statusline.agents._parent_process", return_value=None):
+            assert agents.find_hook_owner() is None
+
+    def test_count_cached_until_registry_changes(self, registry):
+        registry.register("s1", "a1", pid=os.getpid())
+        assert registry.running_count("s1") == 1
+
+        with patch("aiterm.statusline.agents.is_pid_alive", return_value=False) as alive:
+            assert registry.running_count("s1") == 1  # Within TTL
+            alive.assert_not_called()
+
+            registry.register("s1", "a2", pid=os.getpid())
+            assert registry.running_count("s1") == 0  # Registry changed
+
+    def test_no_subprocess_per_agent(self, registry):
+        for i in range(5):
+            registry.register("s1", f"a{i}", pid=os.getpid())
+
+        with patch("subprocess.run", side_effect=AssertionError("forked")):
+            assert AgentDetector(registry).get_running_count("s1") == 5
+
+    def test_detector_falls_back_to_pid_files(self, registry, tmp_path):
+        agent_dir = tmp_path / ".claude" / "agents" / "s1"
+        agent_dir.mkdir(parents=True)
+        (agent_dir / "agent-1.pid").write_text(str(os.getpid()))
+
+        with patch.object(Path, "home", return_value=tmp_path):
+            assert AgentDetector(registry).get_running_count("s1") == 1
+
+    def test_clear_session(self, registry):
+        registry.register("s1", "a1")
+        registry.register("s1", "a2")
+
+        assert registry.clear_session("s1") == 2
+        assert registry.running_count("s1") is None
+
+
+class TestAgentsHookCommand:
+    """Test `ait statusline agents hook`."""
+
+    def run_hook(self, event):
+        return cli_runner.invoke(app, ["statusline", "agents", "hook"], input=json.dumps(event))
+
+    def test_start_and_stop_events(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+        agents._counts.clear()
+
+        result = self.run_hook({"hook_event_name": "SubagentStart", "session_id": "s1",
+                                "agent_id": "a1", "agent_type": "Explore"})
+        assert result.exit_code == 0, result.output
+        assert AgentRegistry().agents("s1")["s1"]["a1"]["name"] == "Explore"
+
+        self.run_hook({"hook_event_name": "SubagentStop", "session_id": "s1", "agent_id": "a1"})
+        assert AgentRegistry().running_count("s1") is None
+
+    def test_start_records_owner(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+        agents._counts.clear()
+
+        with patch("aiterm.statusline.agents.find_hook_owner", return_value=os.getpid()):
+            self.run_hook({"hook_event_name": "SubagentStart", "session_id": "s1", "agent_id": "a1"})
+
+        assert AgentRegistry().agents("s1")["s1"]["a1"]["owner"] == os.getpid()
+
+    def test_invalid_input_ignored(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+
+        result = cli_runner.invoke(app, ["statusline", "agents", "hook"], input="not json")
+
+        assert result.exit_code == 0
+        assert not (tmp_path / "agents.json").exists()
@@ -0,0 +1,169 @@
+"""Tests for the statusLine render benchmark suite.
+
+Tests cover:
+- Percentile and summary statistics
+- Synthetic fixtures (repositories and transcripts)
+- Result structure, JSON output and baseline comparison
+- The `ait statusline bench` command
+"""
+
+import json
+import os
+import subprocess
+
+from typer.testing import CliRunner
+
+from aiterm.cli.main import app
+from aiterm.statusline import bench
+from aiterm.statusline.cache import CACHE_DIR_ENV, get_cache_dir
+
+runner = CliRunner()
+
+SMALL = dict(
+    iterations=2,
+    transcript_sizes_mb=(0.05,),
+    untracked_files=30,
+    worktrees=2,
+    stashes=2,
+)
+
+
+class TestStatistics:
+    """Test latency summaries."""
+
+    def test_percentile_nearest_rank(self):
+        samples = [float(i) for i in range(1, 101)]
+
+        assert bench.percentile(samples, 50) == 50.0
+        assert bench.percentile(samples, 95) == 95.0
+        assert bench.percentile(samples, 99) == 99.0
+        assert bench.percentile(samples, 100) == 100.0
+
+    def test_percentile_small_and_empty(self):
+        assert bench.percentile([3.0, 1.0, 2.0], 50) == 2.0
+        assert bench.percentile([7.0], 99) == 7.0
+        assert bench.percentile([], 50) == 0.0
+
+    def test_summarize(self):
+        stats = bench.summarize([1.0, 2.0, 3.0, 4.0])
+
+        assert stats['n'] == 4
+        assert stats['mean'] == 2.5
+        assert stats['min'] == 1.0 and stats['max'] == 4.0
+        assert stats['p50'] == 2.0
+        assert stats['p99'] == 4.0
+
+
+class TestFixtures:
+    """Test synthetic fixtures."""
+
+    def test_build_repos(self, tmp_path):
+        repos = bench.build_repos(tmp_path, untracked_files=30, worktrees=2, stashes=3)
+
+        assert set(repos) == {'repo-clean', 'repo-dirty', 'repo-untracked', 'repo-worktrees', 'repo-stashes'}
+
+        status = subprocess.run(
+            ['git', '-C', str(repos['repo-dirty']), 'status', '--porcelain'],
+            capture_output=True, text=True,
+        ).stdout
+        assert 'staged.py' in status
+
+        stashes = subprocess.run(
+            ['git', '-C', str(repos['repo-stashes']), 'stash', 'list'],
+            capture_output=True, text=True,
+        ).stdout
+        assert len(stashes.splitlines()) == 3
+
+        worktrees = subprocess.run(
+            ['git', '-C', str(repos['repo-worktrees']), 'worktree', 'list'],
+            capture_output=True, text=True,
+        ).stdout
+        assert len(worktrees.splitlines()) == 3
+
+    def test_zero_sizes_skip_repos(self, tmp_path):
+        repos = bench.build_repos(tmp_path, untracked_files=0, worktrees=0, stashes=0)
+        assert set(repos) == {'repo-clean', 'repo-dirty'}
+
+    def test_build_transcript(self, tmp_path):
+        path = bench.build_transcript(tmp_path / "t.jsonl", 100_000)
+
+        assert path.stat().st_size >= 100_000
+        last = json.loads(path.read_text().splitlines()[-1])
+        assert 'timestamp' in last
+
+
+class TestRunBenchmarks:
+    """Test full benchmark runs."""
+
+    def test_result_structure(self):
+        results = bench.run_benchmarks(**SMALL)
+
+        assert results['iterations'] == 2
+        assert set(results['scenarios']) == {
+            'repo-clean', 'repo-dirty', 'repo-untracked', 'repo-worktrees',
+            'repo-stashes', 'transcript-0.05mb',
+        }
+        for segments in results['scenarios'].values():
+            assert set(segments) == set(bench.SEGMENTS) | set(bench.END_TO_END)
+            for stats in segments.values():
+                assert stats['n'] == 2
+                assert 0 <= stats['p50'] <= stats['p95'] <= stats['p99'] <= stats['max']
+
+        json.dumps(results)  # Must be serializable
+
+    def test_caches_isolated(self, tmp_path, monkeypatch):
+        """Fixtures use their own cache dir and the override is restored."""
+        monkeypatch.delenv(CACHE_DIR_ENV, raising=False)
+        user_cache = get_cache_dir()
+
+        bench.run_benchmarks(root=tmp_path, **SMALL)
+
+        assert (tmp_path / "cache" / "git-status.json").exists()
+        assert CACHE_DIR_ENV not in os.environ
+        assert get_cache_dir() == user_cache
+
+    def test_cold_runs(self):
+        results = bench.run_benchmarks(cold=True, **dict(SMALL, untracked_files=0, worktrees=0, stashes=0))
+        assert results['cold'] is True
+
+    def test_compare(self):
+        current = {'scenarios': {'a': {'GitSegment': {'p50': 2.0}, 'end_to_end': {'p50': 5.0}}}}
+        baseline = {'scenarios': {'a': {'GitSegment': {'p50': 4.0}}, 'b': {}}}
+
+        diff = bench.compare(current, baseline)
+
+        assert diff == {'a': {'GitSegment': {'baseline': 4.0, 'current': 2.0, 'ratio': 0.5}}}
+
+
+class TestBenchCommand:
+    """Test `ait statusline bench`."""
+
+    ARGS = [
+        'statusline', 'bench', '-n', '1', '--transcript-sizes', '0.05',
+        '--untracked', '0', '--worktrees', '0', '--stashes', '0',
+    ]
+
+    def test_writes_json(self, tmp_path):
+        output = tmp_path / "bench.json"
+
+        result = runner.invoke(app, self.ARGS + ['--output', str(output)])
+
+        assert result.exit_code == 0, result.output
+        assert "end_to_end" in result.output
+        data = json.loads(output.read_text())
+        assert 'transcript-0.05mb' in data['scenarios']
+
+    def test_compare_with_baseline(self, tmp_path):
+        output = tmp_path / "bench.json"
+        runner.invoke(app, self.ARGS + ['--output', str(output)])
+
+        result = runner.invoke(app, self.ARGS + ['--compare', str(output)])
+
+        assert result.exit_code == 0, result.output
+        assert "vs baseline" in result.output
+
+    def test_invalid_sizes(self):
+        result = runner.invoke(app, ['statusline', 'bench', '--transcript-sizes', 'big'])
+
+        assert result.exit_code == 1
+        assert "Invalid --transcript-sizes" in result.output
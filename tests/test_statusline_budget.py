@@ -0,0 +1,390 @@
+"""Tests for statusLine segment time budgets.
+
+Tests cover:
+- Segments finishing within budget (output remembered)
+- Late segments replaced by their last output and recorded as misses
+- The overall render deadline
+- Segments still running from an earlier render
+- Renderer degrading instead of stalling on a hung segment
+- Budgets only in the daemon by default; late segments finishing after a
+  one-shot render's write or, in the daemon, after the render
+- Concurrent evaluation (performance.parallel_segments)
+"""
+
+import json
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from aiterm.statusline import budget
+from aiterm.statusline.budget import SegmentRunner
+from aiterm.statusline.cache import CACHE_DIR_ENV
+from aiterm.statusline.config import StatusLineConfig
+from aiterm.statusline.renderer import StatusLineRenderer
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return tmp_path / "segments.json"
+
+
+@pytest.fixture
+def release():
+    """Event that unblocks hung segments at teardown."""
+    event = threading.Event()
+    yield event
+    event.set()
+    for thread in list(budget._running.values()):
+        thread.join(5)
+
+
+def hang(event):
+    def segment(*args):
+        event.wait(10)
+        return "late"
+    return segment
+
+
+class TestSegmentRunner:
+    """Test budgeted segment execution."""
+
+    def test_fast_segment_output_saved(self, cache_file):
+        runner = SegmentRunner(cache_file=cache_file)
+
+        assert runner.run('git', lambda cwd: f"git:{cwd}", '/repo', key='git:/repo') == "git:/repo"
+        assert runner.save() is True
+
+        state = json.loads(cache_file.read_text())
+        assert state['outputs'] == {'git:/repo': "git:/repo"}
+        assert runner.misses == {}
+
+    def test_unchanged_output_not_rewritten(self, cache_file):
+        first = SegmentRunner(cache_file=cache_file)
+        first.run('git', lambda: "main")
+        first.save()
+
+        second = SegmentRunner(cache_file=cache_file)
+        second.run('git', lambda: "main")
+        assert second.save() is False
+
+    def test_late_segment_uses_last_output(self, cache_file, release):
+        first = SegmentRunner(cache_file=cache_file)
+        first.run('git', lambda: "cached", key='git:/repo')
+        first.save()
+
+        runner = SegmentRunner(segment_budget_ms=20, cache_file=cache_file)
+        start = time.monotonic()
+        output = runner.run('git', hang(release), key='git:/repo')
+
+        assert output == "cached"
+        assert time.monotonic() - start < 1
+        assert runner.misses == {'git': 'timeout'}
+
+        runner.save()
+        miss = json.loads(cache_file.read_text())['misses']['git']
+        assert miss['count'] == 1 and miss['reason'] == 'timeout'
+
+    def test_late_segment_without_fallback_omitted(self, cache_file, release):
+        SegmentRunner(cache_file=cache_file).run('git', lambda: "cached")
+
+        runner = SegmentRunner(segment_budget_ms=20, use_fallback=False, cache_file=cache_file)
+        assert runner.run('git', hang(release)) == ""
+
+    def test_render_deadline(self, cache_file, release):
+        """Once the deadline passes, remaining segments are not started."""
+        runner = SegmentRunner(segment_budget_ms=1000, render_deadline_ms=30, cache_file=cache_file)
+        called = []
+
+        runner.run('git', hang(release))
+        assert runner.run('time', lambda: called.append(1) or "t") == ""
+
+        assert called == []
+        assert runner.misses == {'git': 'timeout', 'time': 'deadline'}
+
+    def test_still_running_segment_not_restarted(self, cache_file, release):
+        SegmentRunner(segment_budget_ms=10, cache_file=cache_file).run('git', hang(release))
+
+        called = []
+        runner = SegmentRunner(cache_file=cache_file)
+        runner.run('git', lambda: called.append(1) or "new")
+
+        assert called == []
+        assert runner.misses == {'git': 'busy'}
+
+        release.set()
+        for thread in list(budget._running.values()):
+            thread.join(5)
+        assert runner.run('git', lambda: "new") == "new"
+
+    def test_errors_propagate(self, cache_file):
+        runner = SegmentRunner(cache_file=cache_file)
+        with pytest.raises(ValueError):
+            runner.run('git', lambda: int("x"))
+
+    def test_disabled_runs_inline(self, cache_file):
+        runner = SegmentRunner(enabled=False, cache_file=cache_file)
+
+        assert runner.run('git', lambda: threading.current_thread()) is threading.current_thread()
+        assert runner.save() is False
+
+    def test_outputs_bounded(self, cache_file):
+        runner = SegmentRunner(cache_file=cache_file)
+        for i in range(budget.MAX_CACHED_OUTPUTS + 5):
+            runner.run('git', lambda: "x", key=f"git:{i}")
+
+        outputs = runner._load_state()['outputs']
+        assert len(outputs) == budget.MAX_CACHED_OUTPUTS
+        assert 'git:0' not in outputs
+
+    def test_stats_and_clear(self, cache_file, release):
+        runner = SegmentRunner(segment_budget_ms=10, cache_file=cache_file)
+        runner.run('usage', hang(release))
+        runner.save()
+
+        stats = runner.stats()
+        assert stats['misses'] == 1
+        assert stats['by_segment']['usage']['reason'] == 'timeout'
+
+        assert runner.clear() is True
+        assert not cache_file.exists()
+
+    def test_finish_late_remembers_output(self, cache_file, release):
+        """A late segment that finishes in the grace period becomes the fallback."""
+        runner = SegmentRunner(segment_budget_ms=10, cache_file=cache_file)
+        assert runner.run('git', hang(release), key='git:/repo') == ""
+        assert len(runner.late) == 1
+
+        release.set()
+        assert runner.finish_late(grace_ms=5000) == 1
+
+        assert runner.late == []
+        outputs = json.loads(cache_file.read_text())['outputs']
+        assert outputs == {'git:/repo': "late"}
+
+    def test_late_output_remembered_after_render(self, cache_file, release):
+        """Without finish_late (the daemon), a late result reaches the next runner."""
+        runner = SegmentRunner(segment_budget_ms=10, cache_file=cache_file)
+        assert runner.run('git', hang(release), key='git:/repo') == ""
+        runner.save()
+
+        release.set()
+        runner.late[0].thread.join(5)
+
+        following = SegmentRunner(segment_budget_ms=10, cache_file=cache_file)
+        still_hung = threading.Event()
+        try:
+            assert following.run('git', hang(still_hung), key='git:/repo') == "late"
+        finally:
+            still_hung.set()
+        assert following.save() is True
+        assert json.loads(cache_file.read_text())['outputs'] == {'git:/repo': "late"}
+
+    def test_finish_late_bounded(self, cache_file, release):
+        runner = SegmentRunner(segment_budget_ms=10, cache_file=cache_file)
+        runner.run('git', hang(release))
+
+        start = time.monotonic()
+        assert runner.finish_late(grace_ms=50) == 0
+        assert time.monotonic() - start < 1
+
+
+class TestBudgetDefaults:
+    """Test where budgets apply."""
+
+    @pytest.fixture
+    def config(self, tmp_path):
+        config = StatusLineConfig()
+        config.config_path = tmp_path / "statusline.json"
+        return config
+
+    def test_one_shot_unbudgeted_by_default(self, config):
+        assert SegmentRunner.from_config(config).enabled is False
+        assert SegmentRunner.from_config(config, daemon=True).enabled is True
+
+    def test_one_shot_opt_in(self, config):
+        config.override('performance.one_shot_budgets', True)
+        assert SegmentRunner.from_config(config).enabled is True
+
+        config.override('performance.segment_budgets', False)
+        assert SegmentRunner.from_config(config, daemon=True).enabled is False
+
+
+class TestRendererBudgets:
+    """Test StatusLineRenderer with a hung segment."""
+
+    @pytest.fixture
+    def payload(self, tmp_path):
+        return json.dumps({
+            "workspace": {"current_dir": str(tmp_path), "project_dir": str(tmp_path)},
+            "model": {"display_name": "Claude Sonnet 4.5"},
+            "session_id": "budget-test",
+        })
+
+    def test_hung_git_segment_degrades(self, tmp_path, monkeypatch, payload, release):
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+        config = StatusLineConfig()
+        config.override('performance.one_shot_budgets', True)
+        config.override('performance.segment_budget_ms', 50)
+        config.override('performance.render_deadline_ms', 200)
+
+        with patch('aiterm.statusline.segments.GitSegment.render', return_value="\033[0m GIT-OK"):
+            assert "GIT-OK" in StatusLineRenderer(config).render(payload)
+
+        with patch('aiterm.statusline.segments.GitSegment.render', side_effect=hang(release)):
+            start = time.monotonic()
+            output = StatusLineRenderer(config).render(payload)
+
+        assert time.monotonic() - start < 2
+        assert "GIT-OK" in output  # Last output from the previous render
+        assert "Sonnet" in output
+
+    def test_one_shot_late_segment_cached_for_next_render(self, tmp_path, monkeypatch, payload, release):
+        """A segment slower than its budget still shows on the next render."""
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+        config = StatusLineConfig()
+        config.override('performance.one_shot_budgets', True)
+        config.override('performance.segment_budget_ms', 50)
+
+        def slow_git(*args):
+            time.sleep(0.2)
+            return "\033[0m GIT-SLOW"
+
+        with patch('aiterm.statusline.segments.GitSegment.render', side_effect=slow_git):
+            renderer = StatusLineRenderer(config)
+            assert "GIT-SLOW" not in renderer.render(payload)
+            assert renderer.finish_late_segments() == 1
+
+        with patch('aiterm.statusline.segments.GitSegment.render', side_effect=hang(release)):
+            assert "GIT-SLOW" in StatusLineRenderer(config).render(payload)
+
+    def test_daemon_late_segment_cached_for_next_render(self, tmp_path, monkeypatch, payload, release):
+        """In the daemon, a segment finishing after its budget becomes the fallback."""
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+        config = StatusLineConfig()
+        config.override('performance.segment_budget_ms', 50)
+        renderer = StatusLineRenderer(config, daemon=True)
+
+        with patch('aiterm.statusline.segments.GitSegment.render', side_effect=sleepy(0.2, "\033[0m GIT-SLOW")):
+            assert "GIT-SLOW" not in renderer.render(payload)
+            assert renderer.finish_late_segments() == 0  # The daemon does not wait
+            for thread in list(budget._running.values()):
+                thread.join(5)
+
+        with patch('aiterm.statusline.segments.GitSegment.render', side_effect=hang(release)):
+            assert "GIT-SLOW" in renderer.render(payload)
+
+        state = json.loads((tmp_path / "cache" / "segments.json").read_text())
+        assert any("GIT-SLOW" in str(output) for output in state['outputs'].values())
+
+    def test_one_shot_default_waits_for_segment(self, tmp_path, monkeypatch, payload):
+        """Without one_shot_budgets, a slow segment is shown, just late."""
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+        config = StatusLineConfig()
+        config.override('performance.segment_budget_ms', 10)
+
+        with patch('aiterm.statusline.segments.GitSegment.render', side_effect=sleepy(0.1, "\033[0m GIT-SLOW")):
+            assert "GIT-SLOW" in StatusLineRenderer(config).render(payload)
+
+
+def sleepy(seconds, value):
+    def segment(*args):
+        time.sleep(seconds)
+        return value
+    return segment
+
+
+class TestParallelSegments:
+    """Test concurrent segment evaluation (performance.parallel_segments)."""
+
+    def test_parallel_overlaps(self, cache_file):
+        runner = SegmentRunner(parallel=True, segment_budget_ms=2000, render_deadline_ms=5000,
+                               cache_file=cache_file)
+
+        start = time.monotonic()
+        pending = [runner.submit(f"s{i}", sleepy(0.2, i)) for i in range(3)]
+        results = [runner.result(p) for p in pending]
+
+        assert results == [0, 1, 2]
+        assert time.monotonic() - start < 0.5
+
+    def test_serial_waits_at_submit(self, cache_file):
+        runner = SegmentRunner(segment_budget_ms=2000, render_deadline_ms=5000, cache_file=cache_file)
+
+        start = time.monotonic()
+        pending = runner.submit('slow', sleepy(0.1, "done"))
+
+        assert pending.done
+        assert time.monotonic() - start >= 0.1
+        assert runner.result(pending) == "done"
+
+    def test_parallel_without_budgets_waits(self, cache_file):
+        runner = SegmentRunner(enabled=False, parallel=True, segment_budget_ms=10, cache_file=cache_file)
+
+        pending = runner.submit('slow', sleepy(0.1, "done"))
+        assert runner.result(pending) == "done"
+        assert runner.misses == {}
+
+    def test_parallel_budget_from_start(self, cache_file, release):
+        runner = SegmentRunner(parallel=True, segment_budget_ms=50, cache_file=cache_file)
+
+        pending = runner.submit('git', hang(release))
+        time.sleep(0.1)
+
+        start = time.monotonic()
+        assert runner.result(pending) == ""
+        assert time.monotonic() - start < 0.05
+        assert runner.misses == {'git': 'timeout'}
+
+    def test_renderer_parallel_matches_serial(self, tmp_path, monkeypatch):
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+        payload = json.dumps({
+            "workspace": {"current_dir": str(tmp_path), "project_dir": str(tmp_path)},
+            "model": {"display_name": "Claude Sonnet 4.5"},
+            "session_id": "parallel-test",
+        })
+        config = StatusLineConfig()
+        config.override('performance.segment_budget_ms', 2000)
+        config.override('performance.render_deadline_ms', 5000)
+
+        with patch('aiterm.statusline.segments.ProjectSegment.render', side_effect=sleepy(0.2, "PROJECT")), \
+                patch('aiterm.statusline.segments.GitSegment.render', side_effect=sleepy(0.2, "GIT")):
+            config.override('performance.parallel_segments', False)
+            start = time.monotonic()
+            serial = StatusLineRenderer(config).render(payload)
+            serial_time = time.monotonic() - start
+
+            config.override('performance.parallel_segments', True)
+            start = time.monotonic()
+            parallel = StatusLineRenderer(config).render(payload)
+            parallel_time = time.monotonic() - start
+
+        assert parallel.split('\n')[0] == serial.split('\n')[0]
+        assert parallel.split('\n')[0].startswith("╭─PROJECTGIT")
+        assert serial_time >= 0.4
+        assert parallel_time < serial_time
+
+
+class TestGitSnapshotSingleFlight:
+    """Test concurrent git/worktree lookups sharing one snapshot."""
+
+    def test_snapshot_computed_once(self, tmp_path):
+        from aiterm.statusline.segments import GitSegment
+
+        segment = GitSegment(StatusLineConfig())
+        calls = []
+
+        def slow_get(self, cwd):
+            calls.append(cwd)
+            time.sleep(0.05)
+            return None
+
+        with patch('aiterm.statusline.segments.GitSnapshotCache.get', slow_get):
+            threads = [threading.Thread(target=segment._get_snapshot, args=(str(tmp_path),)) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert calls == [str(tmp_path)]
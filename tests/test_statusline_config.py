@@ -4,9 +4,14 @@ Test coverage for configuration loading, saving, validation, and manipulation.
 """
 
 import json
+import os
+import time
 import pytest
 from pathlib import Path
-from aiterm.statusline.config import StatusLineConfig
+from unittest.mock import patch
+from aiterm.statusline import config as config_module
+from aiterm.statusline.cache import CACHE_DIR_ENV
+from aiterm.statusline.config import StatusLineConfig, flatten
 
 
 class TestStatusLineConfig:
@@ -202,7 +207,7 @@ class TestStatusLineConfig:
 
         git_settings = config.list_settings(category='git')
 
-        assert len(git_settings) == 6  # 6 git settings (added git.show_worktrees)
+        assert len(git_settings) == 9  # 9 git settings (added git.cache_ttl, git.cache_max_repos, git.timeout_ms)
         assert all(s['category'] == 'git' for s in git_settings)
         assert any(s['key'] == 'git.show_ahead_behind' for s in git_settings)
 
@@ -212,7 +217,7 @@ class TestStatusLineConfig:
 
         display_settings = config.list_settings(category='display')
 
-        assert len(display_settings) == 17  # 17 display settings (13 original + 4 spacing)
+        assert len(display_settings) == 21  # 13 original + 4 spacing + 4 layout
         assert all(s['category'] == 'display' for s in display_settings)
 
     def test_deep_merge(self, config):
@@ -291,7 +296,7 @@ class TestStatusLineConfig:
 
     def test_categories_exist(self, config):
         """Test that all defined categories are valid."""
-        valid_categories = {'display', 'git', 'theme', 'usage', 'project', 'time'}
+        valid_categories = {'display', 'git', 'theme', 'usage', 'project', 'time', 'performance'}
         schema = config.get_schema()
 
         for key, meta in schema.items():
@@ -329,3 +334,92 @@ class TestStatusLineConfig:
         assert '  ' in content  # Has indentation
         data = json.loads(content)  # Valid JSON
         assert data['display']['show_git'] == False
+
+
+class TestCompiledSnapshot:
+    """Test the compiled, on-disk settings snapshot."""
+
+    @pytest.fixture
+    def config_file(self, tmp_path, monkeypatch):
+        """Point HOME and the cache at temp dirs; return the config path."""
+        monkeypatch.setenv('HOME', str(tmp_path / "home"))
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+        path = tmp_path / "home" / ".config" / "aiterm" / "statusline.json"
+        path.parent.mkdir(parents=True)
+        return path
+
+    def write_config(self, path, data, age=60):
+        """Write user config with an mtime outside the racy window."""
+        path.write_text(json.dumps(data))
+        past = time.time() - age
+        os.utime(path, (past, past))
+
+    def test_flatten(self):
+        assert flatten({'a': {'b': 1, 'c': {'d': [2]}}, 'e': 3}) == {'a.b': 1, 'a.c.d': [2], 'e': 3}
+
+    def test_get_uses_user_values_and_defaults(self, config_file):
+        self.write_config(config_file, {'theme': {'name': 'cool-blues'}})
+        config = StatusLineConfig()
+
+        assert config.get('theme.name') == 'cool-blues'
+        assert config.get('git.cache_ttl') == 5
+        assert config.get('missing.key', 'fallback') == 'fallback'
+
+    def test_snapshot_is_read_only(self, config_file):
+        snapshot = StatusLineConfig().snapshot()
+
+        with pytest.raises(TypeError):
+            snapshot['theme.name'] = 'x'
+
+    def test_second_process_skips_schema_and_merge(self, config_file):
+        self.write_config(config_file, {'theme': {'name': 'cool-blues'}})
+        StatusLineConfig().get('theme.name')
+        assert config_module.get_compiled_path().exists()
+
+        with patch.object(StatusLineConfig, '_load_schema', side_effect=AssertionError("schema built")), \
+                patch.object(StatusLineConfig, '_deep_merge', side_effect=AssertionError("merged")):
+            assert StatusLineConfig().get('theme.name') == 'cool-blues'
+
+    def test_config_change_recompiles(self, config_file):
+        self.write_config(config_file, {'theme': {'name': 'cool-blues'}})
+        StatusLineConfig().get('theme.name')
+
+        self.write_config(config_file, {'theme': {'name': 'forest-greens'}}, age=30)
+        assert StatusLineConfig().get('theme.name') == 'forest-greens'
+
+    def test_version_change_recompiles(self, config_file):
+        self.write_config(config_file, {'theme': {'name': 'cool-blues'}})
+        StatusLineConfig().get('theme.name')
+
+        with patch.object(config_module, '__version__', '999.0.0'), \
+                patch.object(StatusLineConfig, '_load_schema', wraps=StatusLineConfig()._load_schema) as schema:
+            assert StatusLineConfig().get('theme.name') == 'cool-blues'
+        schema.assert_called()
+
+    def test_recently_edited_config_not_trusted(self, config_file):
+        """A snapshot compiled right after an edit is rebuilt next time."""
+        config_file.write_text(json.dumps({'theme': {'name': 'cool-blues'}}))
+        StatusLineConfig().get('theme.name')
+
+        with patch.object(StatusLineConfig, '_load_schema', wraps=StatusLineConfig()._load_schema) as schema:
+            StatusLineConfig().get('theme.name')
+        schema.assert_called()
+
+    def test_set_refreshes_snapshot(self, config_file):
+        config = StatusLineConfig()
+        assert config.get('display.show_git') is True
+
+        config.set('display.show_git', False)
+        assert config.get('display.show_git') is False
+
+    def test_override_not_saved_or_compiled(self, config_file):
+        config = StatusLineConfig()
+        config.override('git.cache_ttl', 0)
+
+        assert config.get('git.cache_ttl') == 0
+        assert not config_file.exists()
+        assert StatusLineConfig().get('git.cache_ttl') == 5
+
+    def test_section_lookup(self, config_file):
+        display = StatusLineConfig().get('display')
+        assert isinstance(display, dict) and 'show_git' in display
@@ -0,0 +1,196 @@
+"""Tests for the statusLine render daemon and thin client.
+
+Tests cover:
+- Rendering through the daemon socket
+- Fallback when no daemon is running
+- Ping/status and config reload
+- Forwarded environment handling
+- ``ait statusline render`` on streams without a file descriptor
+"""
+
+import io
+import json
+import os
+import threading
+import pytest
+from pathlib import Path
+from typer.testing import CliRunner
+
+from aiterm.cli.main import app
+from aiterm.statusline import client, daemon
+from aiterm.statusline.daemon import RenderServer, RenderService
+
+
+@pytest.fixture
+def mock_payload():
+    """Create mock Claude Code JSON payload."""
+    return json.dumps({
+        "workspace": {"current_dir": "/tmp", "project_dir": "/tmp"},
+        "model": {"display_name": "Claude Sonnet 4.5"},
+        "output_style": {"name": "default"},
+        "session_id": "daemon-test",
+        "cost": {"total_lines_added": 7, "total_lines_removed": 2},
+    }).encode('utf-8')
+
+
+@pytest.fixture
+def running_server(tmp_path):
+    """Run a RenderServer on a temporary socket in a background thread."""
+    socket_path = str(tmp_path / "sl.sock")
+    server = RenderServer(socket_path)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield socket_path, server
+    server.shutdown()
+    server.server_close()
+    thread.join(timeout=2)
+
+
+class TestClient:
+    """Test the thin client."""
+
+    def test_request_render_no_daemon(self, tmp_path, mock_payload):
+        """Should return None when nothing listens on the socket."""
+        result = client.request_render(mock_payload, socket_path=str(tmp_path / "missing.sock"))
+        assert result is None
+
+    def test_request_render_stale_socket(self, tmp_path, mock_payload):
+        """Should return None for a stale socket file."""
+        stale = tmp_path / "stale.sock"
+        stale.write_text("")
+        result = client.request_render(mock_payload, socket_path=str(stale))
+        assert result is None
+
+    def test_socket_path_env_override(self, monkeypatch, tmp_path):
+        """AITERM_STATUSLINE_SOCKET overrides the default path."""
+        monkeypatch.setenv(client.SOCKET_ENV, str(tmp_path / "custom.sock"))
+        assert client.get_socket_path() == str(tmp_path / "custom.sock")
+
+    def test_render_in_process(self, mock_payload):
+        """Fallback renders both lines."""
+        output = client.render_in_process(mock_payload).decode('utf-8')
+        assert "╭─" in output
+        assert "╰─" in output
+
+    def test_format_error(self):
+        """Errors render as a minimal two-line statusLine."""
+        output = client.format_error(RuntimeError("boom"))
+        assert output.startswith("╭─")
+        assert "boom" in output
+
+
+class TestRenderCommand:
+    """Test ``ait statusline render``."""
+
+    def test_render_in_cli_runner(self, tmp_path, monkeypatch, mock_payload):
+        """Captured stdout has no file descriptor; output still arrives."""
+        monkeypatch.setenv(client.SOCKET_ENV, str(tmp_path / "missing.sock"))
+
+        result = CliRunner().invoke(app, ["statusline", "render"], input=mock_payload)
+
+        assert result.exit_code == 0, result.output
+        assert "╭─" in result.output
+        assert "Sonnet" in result.output
+
+    def test_write_stdout_text_stream(self, monkeypatch):
+        """Text-only streams get decoded output."""
+        stream = io.StringIO()
+        monkeypatch.setattr("sys.stdout", stream)
+
+        client.write_stdout("╭─ ok".encode('utf-8'))
+
+        assert stream.getvalue() == "╭─ ok"
+
+
+class TestDaemon:
+    """Test rendering through the daemon."""
+
+    def test_render_via_daemon(self, running_server, mock_payload):
+        """Daemon returns the rendered statusLine."""
+        socket_path, _ = running_server
+        data = client.request_render(mock_payload, socket_path=socket_path)
+
+        assert data is not None
+        output = data.decode('utf-8')
+        assert "╭─" in output
+        assert "╰─" in output
+        assert "Sonnet" in output
+
+    def test_render_matches_in_process(self, running_server, mock_payload):
+        """Daemon output ends with the same two lines as in-process rendering."""
+        socket_path, _ = running_server
+        data = client.request_render(mock_payload, socket_path=socket_path)
+        expected = client.render_in_process(mock_payload).decode('utf-8')
+
+        # Compare line 2 (line 1 carries the window-title escape prefix)
+        assert data.decode('utf-8').split('\n')[-1] == expected.split('\n')[-1]
+
+    def test_renderer_kept_warm(self, running_server, mock_payload):
+        """Consecutive requests reuse the same renderer."""
+        socket_path, server = running_server
+        client.request_render(mock_payload, socket_path=socket_path)
+        first = server.service._renderer
+        client.request_render(mock_payload, socket_path=socket_path)
+
+        assert server.service._renderer is first
+        assert server.service.requests == 2
+
+    def test_ping(self, running_server):
+        """Ping reports pid and request count."""
+        socket_path, _ = running_server
+        status = daemon.ping(socket_path)
+
+        assert status is not None
+        assert status['pid'] == os.getpid()
+        assert status['requests'] == 0
+
+    def test_invalid_request(self, running_server):
+        """Bad requests return an error status (client falls back)."""
+        socket_path, server = running_server
+        result = client.send_request({'op': 'bogus'}, socket_path=socket_path)
+
+        assert result is None
+        assert server.service.errors == 1
+
+    def test_refuses_second_daemon(self, running_server):
+        """Binding a live socket raises instead of stealing it."""
+        socket_path, _ = running_server
+        with pytest.raises(RuntimeError):
+            RenderServer(socket_path)
+
+    def test_socket_removed_on_close(self, tmp_path):
+        """Closing the server removes the socket file."""
+        socket_path = str(tmp_path / "close.sock")
+        server = RenderServer(socket_path)
+        assert Path(socket_path).exists()
+        server.server_close()
+        assert not Path(socket_path).exists()
+
+
+class TestRenderService:
+    """Test warm renderer state."""
+
+    def test_config_change_rebuilds_renderer(self, tmp_path):
+        """Renderer is rebuilt when the config file mtime changes."""
+        service = RenderService()
+        renderer = service.get_renderer()
+        renderer.config.config_path = tmp_path / "statusline.json"
+        service._config_stamp = None
+
+        # Missing file -> stamp None matches, renderer reused
+        assert service.get_renderer() is renderer
+
+        (tmp_path / "statusline.json").write_text("{}")
+        assert service.get_renderer() is not renderer
+
+    def test_forwarded_environ_restored(self, monkeypatch):
+        """Forwarded env applies during render and is restored after."""
+        monkeypatch.setenv('COLUMNS', '80')
+        monkeypatch.delenv('TERM_PROGRAM', raising=False)
+
+        with daemon._forwarded_environ({'COLUMNS': '200', 'TERM_PROGRAM': 'ghostty'}):
+            assert os.environ['COLUMNS'] == '200'
+            assert os.environ['TERM_PROGRAM'] == 'ghostty'
+
+        assert os.environ['COLUMNS'] == '80'
+        assert 'TERM_PROGRAM' not in os.environ
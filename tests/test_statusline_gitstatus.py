@@ -0,0 +1,568 @@
+"""Tests for the single-pass git status probe.
+
+Tests cover:
+- Porcelain v2 parsing (branch, upstream, ahead/behind, change counts)
+- Probing real repositories (clean, dirty, stash, worktree, detached)
+- GitSegment helpers sharing one snapshot
+- On-disk snapshot cache (invalidation, TTL, LRU eviction)
+- Quick branch/dirty probes and their cache entries
+- Timeouts for a git that hangs
+"""
+
+import json
+import subprocess
+import time
+import pytest
+from pathlib import Path
+from unittest.mock import patch
+
+from aiterm.statusline.config import StatusLineConfig
+from aiterm.statusline import gitstatus
+from aiterm.statusline.gitstatus import (
+    GitSnapshot,
+    GitSnapshotCache,
+    BranchStatus,
+    find_repo,
+    parse_porcelain_v2,
+    probe_branch_status,
+    probe_dirty,
+    probe_git,
+)
+from aiterm.statusline.segments import GitSegment
+
+
+def git(cwd: Path, *args: str) -> str:
+    """Run git in a test repository."""
+    result = subprocess.run(
+        ['git', '-C', str(cwd), *args],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    """Create a git repository with one commit."""
+    monkeypatch.setenv('GIT_AUTHOR_NAME', 'Test')
+    monkeypatch.setenv('GIT_AUTHOR_EMAIL', 'test@example.com')
+    monkeypatch.setenv('GIT_COMMITTER_NAME', 'Test')
+    monkeypatch.setenv('GIT_COMMITTER_EMAIL', 'test@example.com')
+
+    path = tmp_path / "repo"
+    path.mkdir()
+    git(path, 'init', '-q', '-b', 'main')
+    (path / "README.md").write_text("hello\n")
+    git(path, 'add', 'README.md')
+    git(path, 'commit', '-q', '-m', 'initial')
+    return path
+
+
+class TestParsePorcelainV2:
+    """Test porcelain v2 parsing."""
+
+    def test_branch_headers(self):
+        """Branch, upstream and ahead/behind come from headers."""
+        output = (
+            "# branch.oid abc123\n"
+            "# branch.head main\n"
+            "# branch.upstream origin/main\n"
+            "# branch.ab +2 -3\n"
+        )
+        info = parse_porcelain_v2(output)
+
+        assert info['branch'] == 'main'
+        assert info['upstream'] == 'origin/main'
+        assert info['ahead'] == 2
+        assert info['behind'] == 3
+        assert info['detached'] is False
+
+    def test_detached_head(self):
+        """Detached HEAD is flagged."""
+        info = parse_porcelain_v2("# branch.oid abc\n# branch.head (detached)\n")
+        assert info['detached'] is True
+        assert info['branch'] == ''
+
+    def test_change_counts(self):
+        """Staged, unstaged, untracked and conflicted entries are counted."""
+        output = (
+            "# branch.head main\n"
+            "1 M. N... 100644 100644 100644 a b staged.py\n"
+            "1 .M N... 100644 100644 100644 a b unstaged.py\n"
+            "1 MM N... 100644 100644 100644 a b both.py\n"
+            "2 R. N... 100644 100644 100644 a b R100 new.py\told.py\n"
+            "u UU N... 100644 100644 100644 100644 a b c conflict.py\n"
+            "? new1.txt\n"
+            "? dir/new2.txt\n"
+            "! ignored.log\n"
+        )
+        info = parse_porcelain_v2(output)
+
+        assert info['staged'] == 3
+        assert info['unstaged'] == 2
+        assert info['conflicted'] == 1
+        assert info['untracked'] == 2
+
+    def test_empty_output(self):
+        """Empty output yields zero counts."""
+        info = parse_porcelain_v2("")
+        assert info['staged'] == info['unstaged'] == info['untracked'] == 0
+
+
+class TestProbeGit:
+    """Test probing real repositories."""
+
+    def test_not_a_repo(self, tmp_path):
+        """Non-repo directories return None."""
+        assert probe_git(str(tmp_path)) is None
+
+    def test_clean_repo(self, repo):
+        """Clean repo has branch and no changes."""
+        snapshot = probe_git(str(repo))
+
+        assert isinstance(snapshot, GitSnapshot)
+        assert snapshot.branch == 'main'
+        assert snapshot.has_changes is False
+        assert snapshot.untracked == 0
+        assert snapshot.upstream is None
+        assert snapshot.worktree_count == 1
+        assert snapshot.is_worktree is False
+        assert snapshot.worktree_name is None
+
+    def test_dirty_repo(self, repo):
+        """Staged, unstaged and untracked changes are counted."""
+        (repo / "README.md").write_text("changed\n")
+        (repo / "staged.txt").write_text("x")
+        git(repo, 'add', 'staged.txt')
+        (repo / "sub").mkdir()
+        (repo / "sub" / "a.txt").write_text("a")
+        (repo / "sub" / "b.txt").write_text("b")
+
+        snapshot = probe_git(str(repo))
+
+        assert snapshot.has_changes is True
+        assert snapshot.staged == 1
+        assert snapshot.unstaged == 1
+        # Untracked files are counted individually, not per directory
+        assert snapshot.untracked == 2
+
+    def test_probe_from_subdirectory(self, repo):
+        """Probing a subdirectory reports the repo root."""
+        (repo / "src").mkdir()
+        snapshot = probe_git(str(repo / "src"))
+
+        assert Path(snapshot.toplevel).resolve() == repo.resolve()
+
+    def test_stash_count(self, repo):
+        """Stash entries are counted from the reflog."""
+        for i in range(2):
+            (repo / "README.md").write_text(f"stash {i}\n")
+            git(repo, 'stash', '-q')
+
+        assert probe_git(str(repo)).stash_count == 2
+
+    def test_worktrees(self, repo, tmp_path):
+        """Linked worktrees are counted and detected."""
+        wt_path = tmp_path / "feature-wt"
+        git(repo, 'worktree', 'add', '-q', '-b', 'feature', str(wt_path))
+
+        main = probe_git(str(repo))
+        linked = probe_git(str(wt_path))
+
+        assert main.worktree_count == 2
+        assert main.is_worktree is False
+        assert linked.is_worktree is True
+        assert linked.worktree_name == 'feature-wt'
+        assert linked.branch == 'feature'
+
+    def test_detached_at_tag(self, repo):
+        """Detached HEAD at a tag shows the tag."""
+        git(repo, 'tag', 'v1.0')
+        git(repo, 'checkout', '-q', 'v1.0')
+
+        snapshot = probe_git(str(repo))
+        assert snapshot.detached is True
+        assert snapshot.branch == 'v1.0'
+
+    def test_detached_without_tag(self, repo):
+        """Detached HEAD without a tag shows 'detached'."""
+        head = git(repo, 'rev-parse', 'HEAD').strip()
+        git(repo, 'checkout', '-q', head)
+
+        assert probe_git(str(repo)).branch == 'detached'
+
+    def test_ahead_behind(self, repo, tmp_path):
+        """Ahead/behind counts come from the upstream."""
+        clone = tmp_path / "clone"
+        git(tmp_path, 'clone', '-q', str(repo), str(clone))
+
+        (repo / "upstream.txt").write_text("u")
+        git(repo, 'add', 'upstream.txt')
+        git(repo, 'commit', '-q', '-m', 'upstream')
+        git(clone, 'fetch', '-q')
+
+        (clone / "local.txt").write_text("l")
+        git(clone, 'add', 'local.txt')
+        git(clone, 'commit', '-q', '-m', 'local')
+
+        snapshot = probe_git(str(clone))
+        assert snapshot.upstream == 'origin/main'
+        assert snapshot.ahead == 1
+        assert snapshot.behind == 1
+
+    def test_git_unavailable(self, tmp_path):
+        """Missing git binary returns None."""
+        with patch('subprocess.run', side_effect=FileNotFoundError("git")):
+            assert probe_git(str(tmp_path)) is None
+
+
+class TestGitSegmentSnapshot:
+    """Test GitSegment helpers sharing one snapshot."""
+
+    def test_single_probe_per_segment(self, repo):
+        """All helpers reuse one probe (at most two git calls)."""
+        segment = GitSegment(StatusLineConfig())
+
+        with patch('aiterm.statusline.gitstatus.subprocess.run', wraps=subprocess.run) as mock_run:
+            segment._get_git_info(str(repo))
+            segment._get_stash_count(str(repo))
+            segment._get_remote_tracking(str(repo))
+            segment._get_worktree_count(str(repo))
+            segment._get_worktree_name(str(repo))
+            segment._is_worktree(str(repo))
+
+        assert mock_run.call_count == 2
+
+    def test_git_info_tuple(self, repo):
+        """_get_git_info keeps its tuple shape."""
+        (repo / "new.txt").write_text("n")
+        segment = GitSegment(StatusLineConfig())
+
+        branch, has_changes, ahead, behind, untracked = segment._get_git_info(str(repo))
+        assert branch == 'main'
+        assert has_changes is False
+        assert (ahead, behind) == (0, 0)
+        assert untracked == 1
+
+    def test_not_a_repo(self, tmp_path):
+        """Helpers degrade gracefully outside a repo."""
+        segment = GitSegment(StatusLineConfig())
+
+        assert segment._get_git_info(str(tmp_path)) is None
+        assert segment._get_stash_count(str(tmp_path)) == 0
+        assert segment._get_worktree_count(str(tmp_path)) == 0
+        assert segment._get_remote_tracking(str(tmp_path)) is None
+
+
+class TestFindRepo:
+    """Test locating repositories without running git."""
+
+    def test_find_from_subdirectory(self, repo):
+        """Walks up to the working tree root."""
+        (repo / "a" / "b").mkdir(parents=True)
+        toplevel, git_dir, common_dir = find_repo(str(repo / "a" / "b"))
+
+        assert toplevel == str(repo)
+        assert git_dir == common_dir == str(repo / ".git")
+
+    def test_find_linked_worktree(self, repo, tmp_path):
+        """Resolves the .git file of a linked worktree."""
+        wt_path = tmp_path / "wt"
+        git(repo, 'worktree', 'add', '-q', '-b', 'wt', str(wt_path))
+
+        toplevel, git_dir, common_dir = find_repo(str(wt_path))
+        assert toplevel == str(wt_path)
+        assert Path(git_dir) == (repo / ".git" / "worktrees" / "wt")
+        assert Path(common_dir) == (repo / ".git")
+
+    def test_not_a_repo(self, tmp_path):
+        """Returns None outside a repository."""
+        assert find_repo(str(tmp_path)) is None
+
+
+class TestGitSnapshotCache:
+    """Test the on-disk snapshot cache."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return GitSnapshotCache(ttl=60, max_repos=2, cache_file=tmp_path / "git-status.json")
+
+    def test_hit_skips_git(self, cache, repo):
+        """Unchanged repos are served without running git."""
+        first = cache.get(str(repo))
+
+        with patch('aiterm.statusline.gitstatus.subprocess.run') as mock_run:
+            second = cache.get(str(repo))
+
+        mock_run.assert_not_called()
+        assert second == first
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_hit_does_not_write(self, cache, repo):
+        """Hits are counted in memory and saved with the next miss."""
+        cache.get(str(repo))
+
+        with patch('aiterm.statusline.gitstatus.atomic_write_json') as mock_write:
+            cache.get(str(repo))
+            cache.get(str(repo))
+
+        mock_write.assert_not_called()
+
+        (repo / "new.txt").write_text("n")
+        git(repo, 'add', 'new.txt')
+        cache.get(str(repo))
+
+        assert json.loads(cache.cache_file.read_text())['hits'] == 2
+
+    def test_index_change_invalidates(self, cache, repo):
+        """Staging a file invalidates the entry."""
+        cache.get(str(repo))
+        (repo / "new.txt").write_text("n")
+        git(repo, 'add', 'new.txt')
+
+        snapshot = cache.get(str(repo))
+        assert snapshot.staged == 1
+
+    def test_commit_invalidates(self, cache, repo):
+        """A new commit invalidates the entry."""
+        (repo / "new.txt").write_text("n")
+        git(repo, 'add', 'new.txt')
+        assert cache.get(str(repo)).staged == 1
+
+        git(repo, 'commit', '-q', '-m', 'second')
+        assert cache.get(str(repo)).staged == 0
+
+    def test_branch_switch_invalidates(self, cache, repo):
+        """Switching branches invalidates the entry."""
+        cache.get(str(repo))
+        git(repo, 'checkout', '-q', '-b', 'other')
+
+        assert cache.get(str(repo)).branch == 'other'
+
+    def test_stash_invalidates(self, cache, repo):
+        """Stashing invalidates the entry."""
+        cache.get(str(repo))
+        (repo / "README.md").write_text("stash me\n")
+        git(repo, 'stash', '-q')
+
+        assert cache.get(str(repo)).stash_count == 1
+
+    def test_ttl_expiry(self, tmp_path, repo):
+        """Entries older than the TTL are re-probed."""
+        cache = GitSnapshotCache(ttl=60, cache_file=tmp_path / "c.json")
+        cache.get(str(repo))
+
+        # Working tree edit (index unchanged) is only seen after expiry
+        (repo / "README.md").write_text("edited\n")
+        assert cache.get(str(repo)).unstaged == 0
+
+        with patch('aiterm.statusline.gitstatus.time.time', return_value=time.time() + 61):
+            assert cache.get(str(repo)).unstaged == 1
+
+    def test_ttl_zero_disables_cache(self, tmp_path, repo):
+        """TTL 0 always probes and writes nothing."""
+        cache = GitSnapshotCache(ttl=0, cache_file=tmp_path / "c.json")
+        cache.get(str(repo))
+
+        assert not (tmp_path / "c.json").exists()
+
+    def test_lru_eviction(self, cache, tmp_path, monkeypatch):
+        """Least recently used repos are evicted beyond max_repos."""
+        repos = []
+        for name in ("r1", "r2", "r3"):
+            path = tmp_path / name
+            path.mkdir()
+            git(path, 'init', '-q')
+            repos.append(path)
+
+        cache.get(str(repos[0]))
+        cache.get(str(repos[1]))
+        cache.get(str(repos[0]))  # r1 now most recently used
+        cache.get(str(repos[2]))
+
+        data = json.loads(cache.cache_file.read_text())
+        assert set(data['repos']) == {str(repos[0]), str(repos[2])}
+
+    def test_non_repo_not_cached(self, cache, tmp_path):
+        """Non-repo directories return None and add no entry."""
+        plain = tmp_path / "plain"
+        plain.mkdir()
+
+        assert cache.get(str(plain)) is None
+        assert cache.stats()['entries'] == 0
+
+    def test_corrupt_cache_file(self, cache, repo):
+        """A corrupt cache file is ignored and rewritten."""
+        cache.cache_file.write_text("{not json")
+
+        assert cache.get(str(repo)).branch == 'main'
+        assert cache.stats()['entries'] == 1
+
+    def test_clear(self, cache, repo):
+        """clear() removes the cache file."""
+        cache.get(str(repo))
+
+        assert cache.clear() is True
+        assert cache.clear() is False
+        assert cache.stats()['entries'] == 0
+
+    def test_from_config(self):
+        """Settings come from git.cache_* keys."""
+        config = StatusLineConfig()
+        cache = GitSnapshotCache.from_config(config)
+
+        assert cache.ttl == config.get('git.cache_ttl')
+        assert cache.max_repos == config.get('git.cache_max_repos')
+
+
+class TestProbeDirty:
+    """Test the first-change dirty probe."""
+
+    def test_clean(self, repo):
+        assert probe_dirty(str(repo)) is False
+
+    def test_unstaged(self, repo):
+        (repo / "README.md").write_text("edited\n")
+        assert probe_dirty(str(repo)) is True
+
+    def test_staged(self, repo):
+        (repo / "new.txt").write_text("n")
+        git(repo, 'add', 'new.txt')
+        assert probe_dirty(str(repo)) is True
+
+    def test_untracked(self, repo):
+        (repo / "sub").mkdir()
+        (repo / "sub" / "a.txt").write_text("a")
+        assert probe_dirty(str(repo)) is True
+
+    def test_ignored_not_dirty(self, repo):
+        (repo / ".gitignore").write_text("*.log\n")
+        git(repo, 'add', '.gitignore')
+        git(repo, 'commit', '-q', '-m', 'ignore')
+        (repo / "debug.log").write_text("x")
+        assert probe_dirty(str(repo)) is False
+
+    def test_no_commits(self, tmp_path):
+        """A repository without commits is checked against the empty tree."""
+        path = tmp_path / "empty"
+        path.mkdir()
+        git(path, 'init', '-q')
+        assert probe_dirty(str(path)) is False
+
+        (path / "a.txt").write_text("a")
+        git(path, 'add', 'a.txt')
+        assert probe_dirty(str(path)) is True
+
+    def test_not_a_repo(self, tmp_path):
+        assert probe_dirty(str(tmp_path)) is None
+
+
+class TestProbeBranchStatus:
+    """Test the quick branch probe."""
+
+    def test_branch_from_head(self, repo):
+        assert probe_branch_status(str(repo)) == BranchStatus('main', False)
+
+    def test_detached_at_tag(self, repo):
+        git(repo, 'tag', 'v1.0')
+        git(repo, 'checkout', '-q', '--detach')
+        assert probe_branch_status(str(repo)).branch == 'v1.0'
+
+    def test_detached_without_tag(self, repo):
+        git(repo, 'checkout', '-q', '--detach')
+        assert probe_branch_status(str(repo)).branch == 'detached'
+
+    def test_not_a_repo(self, tmp_path):
+        assert probe_branch_status(str(tmp_path)) is None
+
+
+class TestBranchStatusCache:
+    """Test GitSnapshotCache.get_branch_status()."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        return GitSnapshotCache(ttl=60, cache_file=tmp_path / "git-status.json")
+
+    def test_full_snapshot_reused(self, cache, repo):
+        """A valid statusLine snapshot answers without running git."""
+        (repo / "untracked.txt").write_text("u")
+        cache.get(str(repo))
+
+        with patch('aiterm.statusline.gitstatus.subprocess.run') as mock_run, \
+                patch('aiterm.statusline.gitstatus.subprocess.Popen') as mock_popen:
+            status = cache.get_branch_status(str(repo))
+
+        mock_run.assert_not_called()
+        mock_popen.assert_not_called()
+        assert status == BranchStatus('main', True)
+
+    def test_quick_entry_reused(self, cache, repo):
+        """Quick probes are stored and reused while the repo is unchanged."""
+        assert cache.get_branch_status(str(repo)) == BranchStatus('main', False)
+
+        with patch('aiterm.statusline.gitstatus.subprocess.run') as mock_run:
+            assert cache.get_branch_status(str(repo)) == BranchStatus('main', False)
+
+        mock_run.assert_not_called()
+        data = json.loads(cache.cache_file.read_text())
+        assert str(repo) in data['branches']
+        assert data['repos'] == {}
+
+    def test_index_change_invalidates(self, cache, repo):
+        """Staging a file invalidates the quick entry."""
+        cache.get_branch_status(str(repo))
+        (repo / "new.txt").write_text("n")
+        git(repo, 'add', 'new.txt')
+
+        assert cache.get_branch_status(str(repo)).dirty is True
+
+    def test_branch_switch_invalidates(self, cache, repo):
+        cache.get_branch_status(str(repo))
+        git(repo, 'checkout', '-q', '-b', 'other')
+
+        assert cache.get_branch_status(str(repo)).branch == 'other'
+
+    def test_non_repo(self, cache, tmp_path):
+        plain = tmp_path / "plain"
+        plain.mkdir()
+
+        assert cache.get_branch_status(str(plain)) is None
+
+
+class TestGitTimeout:
+    """Test that a hung git cannot block the caller."""
+
+    @pytest.fixture
+    def hung_git(self, tmp_path, monkeypatch):
+        """Put a git that never answers first on PATH."""
+        bin_dir = tmp_path / "bin"
+        bin_dir.mkdir()
+        script = bin_dir / "git"
+        script.write_text("#!/bin/sh\nexec sleep 30\n")
+        script.chmod(0o755)
+        monkeypatch.setenv('PATH', f"{bin_dir}:{Path('/usr/bin')}:{Path('/bin')}")
+
+    def test_probes_give_up(self, repo, hung_git):
+        start = time.monotonic()
+
+        assert probe_dirty(str(repo), timeout=0.2) is None
+        assert probe_git(str(repo), timeout=0.2) is None
+        assert gitstatus._has_untracked(str(repo), timeout=0.2) is None
+
+        assert time.monotonic() - start < 5
+
+    def test_branch_status_gives_up(self, repo, hung_git, tmp_path):
+        cache = GitSnapshotCache(ttl=60, cache_file=tmp_path / "git-status.json", timeout=0.2)
+
+        start = time.monotonic()
+        assert cache.get_branch_status(str(repo)) is None
+        assert time.monotonic() - start < 5
+
+    def test_timeout_from_config(self, tmp_path):
+        config = StatusLineConfig()
+        config.config_path = tmp_path / "statusline.json"
+        config.override('git.timeout_ms', 750)
+
+        assert GitSnapshotCache.from_config(config).timeout == 0.75
@@ -0,0 +1,197 @@
+"""Tests for buffered statusLine output.
+
+Tests cover:
+- Side-channel escape de-duplication across renders
+- The renderer gathering escapes instead of writing to stdout
+- Single-write output from the CLI entry point
+"""
+
+import io
+import json
+import os
+import sys
+
+import pytest
+
+from aiterm.statusline import client
+from aiterm.statusline.cache import CACHE_DIR_ENV
+from aiterm.statusline.output import (
+    MAX_STATE_SESSIONS,
+    TerminalState,
+    build_output,
+    osc_progress,
+    osc_title,
+)
+from aiterm.statusline.renderer import StatusLineRenderer
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    """Isolate the terminal state file."""
+    monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+    return tmp_path
+
+
+@pytest.fixture
+def payload():
+    """Create mock Claude Code JSON payload."""
+    return json.dumps({
+        "workspace": {"current_dir": "/tmp", "project_dir": "/tmp"},
+        "model": {"display_name": "Claude Sonnet 4.5"},
+        "output_style": {"name": "default"},
+        "session_id": "output-test",
+        "cost": {"total_lines_added": 7, "total_lines_removed": 2},
+    })
+
+
+class TestTerminalState:
+    """Test escape de-duplication."""
+
+    def test_unchanged_escape_skipped(self, cache_dir):
+        """An escape identical to the last one sent is skipped."""
+        state = TerminalState()
+        title = osc_title("aiterm")
+
+        assert state.diff('s1', {'title': title}, now=100.0) == title
+        assert state.diff('s1', {'title': title}, now=101.0) == ""
+
+    def test_changed_escape_sent(self, cache_dir):
+        """A different escape is sent."""
+        state = TerminalState()
+        state.diff('s1', {'title': osc_title("a")}, now=100.0)
+
+        assert state.diff('s1', {'title': osc_title("b")}, now=101.0) == osc_title("b")
+
+    def test_refresh_resends(self, cache_dir):
+        """Unchanged escapes are sent again after the refresh interval."""
+        state = TerminalState(refresh=10.0)
+        title = osc_title("aiterm")
+        state.diff('s1', {'title': title}, now=100.0)
+
+        assert state.diff('s1', {'title': title}, now=111.0) == title
+
+    def test_sessions_independent(self, cache_dir):
+        """Each session's terminal gets its own escapes."""
+        state = TerminalState()
+        title = osc_title("aiterm")
+        state.diff('s1', {'title': title}, now=100.0)
+
+        assert state.diff('s2', {'title': title}, now=101.0) == title
+
+    def test_order_and_missing(self, cache_dir):
+        """Title comes before progress; missing escapes are ignored."""
+        state = TerminalState()
+        escapes = {'progress': osc_progress(1, 50), 'title': osc_title("x")}
+
+        assert state.diff('s1', escapes, now=100.0) == osc_title("x") + osc_progress(1, 50)
+        assert state.diff('s2', {'title': osc_title("x"), 'progress': None}, now=100.0) == osc_title("x")
+
+    def test_persisted_across_instances(self, cache_dir):
+        """State lives on disk (each render is a new process)."""
+        title = osc_title("aiterm")
+        TerminalState().diff('s1', {'title': title}, now=100.0)
+
+        assert TerminalState().diff('s1', {'title': title}, now=101.0) == ""
+
+    def test_corrupt_state_ignored(self, cache_dir):
+        """A corrupt state file sends everything."""
+        (cache_dir / 'terminal-state.json').write_text("{not json")
+        title = osc_title("aiterm")
+
+        assert TerminalState().diff('s1', {'title': title}) == title
+
+    def test_sessions_bounded(self, cache_dir):
+        """Only the most recently updated sessions are kept."""
+        state = TerminalState()
+        for i in range(MAX_STATE_SESSIONS + 5):
+            state.diff(f"s{i}", {'title': osc_title("t")}, now=100.0 + i)
+
+        saved = json.loads((cache_dir / 'terminal-state.json').read_text())
+        assert len(saved) == MAX_STATE_SESSIONS
+        assert f"s{MAX_STATE_SESSIONS + 4}" in saved
+        assert "s0" not in saved
+
+    def test_forget(self, cache_dir):
+        """Forgetting a session sends its escapes again."""
+        state = TerminalState()
+        title = osc_title("aiterm")
+        state.diff('s1', {'title': title}, now=100.0)
+        state.forget('s1')
+
+        assert state.diff('s1', {'title': title}, now=101.0) == title
+
+
+class TestBuildOutput:
+    """Test output assembly."""
+
+    def test_escapes_before_lines(self):
+        """Escapes precede the lines in one buffer."""
+        assert build_output("\033]0;t\007", "╭─ a\n╰─ b") == "\033]0;t\007╭─ a\n╰─ b".encode('utf-8')
+
+    def test_no_escapes(self):
+        """Without escapes only the lines are encoded."""
+        assert build_output("", "╭─ a") == "╭─ a".encode('utf-8')
+
+
+class TestRendererSideChannel:
+    """Test that rendering never writes to stdout."""
+
+    def test_render_does_not_write_stdout(self, cache_dir, payload, monkeypatch):
+        """Escapes are gathered instead of written mid-render."""
+        buffer = io.StringIO()
+        monkeypatch.setattr(sys, 'stdout', buffer)
+
+        renderer = StatusLineRenderer()
+        output = renderer.render(payload)
+
+        assert buffer.getvalue() == ""
+        assert "\033]0;" not in output
+        assert renderer.side_channel.startswith("\033]0;")
+        assert "tmp (Claude Sonnet 4.5)" in renderer.side_channel
+
+    def test_title_sent_once(self, cache_dir, payload):
+        """The title is skipped on the next render while unchanged."""
+        first = StatusLineRenderer().render_output(payload)
+        second = StatusLineRenderer().render_output(payload)
+
+        assert first.startswith(b"\033]0;")
+        assert b"\033]0;" not in second
+        assert first.endswith(second)
+
+    def test_progress_gathered(self, cache_dir, payload, monkeypatch):
+        """Ghostty's progress bar joins the side channel."""
+        monkeypatch.setenv('TERM_PROGRAM', 'ghostty')
+
+        renderer = StatusLineRenderer()
+        renderer.config.override('display.show_lines_changed', True)
+        renderer.render(payload)
+
+        # 7 added, 2 removed -> 77% success
+        assert renderer.side_channel.endswith(osc_progress(1, 77))
+
+    def test_invalid_json_no_escapes(self, cache_dir):
+        """Error output carries no escapes from a previous render."""
+        renderer = StatusLineRenderer()
+        renderer.side_channel = "stale"
+
+        assert renderer.render("{bad").startswith("╭─")
+        assert renderer.side_channel == ""
+
+
+class TestSingleWrite:
+    """Test the CLI entry point's write path."""
+
+    def test_main_writes_once(self, cache_dir, payload, tmp_path, monkeypatch):
+        """Escapes and both lines reach stdout in one os.write."""
+        monkeypatch.setenv(client.SOCKET_ENV, str(tmp_path / "missing.sock"))
+        monkeypatch.setattr(sys, 'stdin', io.TextIOWrapper(io.BytesIO(payload.encode('utf-8'))))
+
+        writes = []
+        monkeypatch.setattr(os, 'write', lambda fd, data: writes.append(bytes(data)) or len(data))
+        monkeypatch.setattr(sys, 'stdout', type('Stdout', (), {'fileno': lambda self: 1, 'flush': lambda self: None})())
+
+        client.main()
+
+        assert len(writes) == 1
+        assert writes[0].startswith(b"\033]0;")
+        assert "╰─".encode('utf-8') in writes[0]
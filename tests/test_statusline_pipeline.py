@@ -0,0 +1,207 @@
+"""Tests for the declarative statusLine layout and segment providers.
+
+Tests cover:
+- Execution plans (layout order, disabled and costly providers dropped)
+- Dependency ordering
+- Rendering custom layouts and registered providers
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from aiterm.statusline.config import StatusLineConfig
+from aiterm.statusline.pipeline import (
+    COST_CACHED,
+    COST_FREE,
+    PROVIDERS,
+    SegmentProvider,
+    build_plan,
+    register_provider,
+)
+from aiterm.statusline.renderer import StatusLineRenderer
+
+
+@pytest.fixture
+def config(tmp_path, monkeypatch):
+    """StatusLineConfig with an isolated config file."""
+    monkeypatch.setenv('AITERM_CACHE_DIR', str(tmp_path / "cache"))
+    config = StatusLineConfig()
+    config.config_path = tmp_path / "statusline.json"
+    return config
+
+
+@pytest.fixture
+def payload():
+    """Create mock Claude Code JSON payload."""
+    return json.dumps({
+        "workspace": {"current_dir": "/tmp", "project_dir": "/tmp"},
+        "model": {"display_name": "Claude Sonnet 4.5"},
+        "output_style": {"name": "learning"},
+        "session_id": "pipeline-test",
+        "cost": {"total_lines_added": 4, "total_lines_removed": 1},
+    })
+
+
+@pytest.fixture
+def custom_provider():
+    """Register a provider for one test."""
+    registered = []
+
+    def register(provider):
+        registered.append(provider.name)
+        return register_provider(provider)
+
+    yield register
+    for name in registered:
+        PROVIDERS.pop(name, None)
+
+
+class TestBuildPlan:
+    """Test execution plans."""
+
+    def test_default_layout(self, config):
+        """Default plan matches the classic two-line layout."""
+        plan = build_plan(config)
+
+        assert plan.lines[0] == (('project', 'git'), ('worktrees',))
+        assert plan.lines[1][0][0] == 'model'
+
+    def test_disabled_provider_skipped(self, config):
+        """Providers whose output is disabled are left out."""
+        config.override('display.show_git', False)
+        config.override('display.show_session_usage', False)
+        config.override('display.show_weekly_usage', False)
+
+        plan = build_plan(config)
+
+        assert 'git' not in plan.order
+        assert 'usage' not in plan.order
+        assert {'git', 'usage'} <= set(plan.skipped)
+
+    def test_any_flag_enables(self, config):
+        """A provider with several flags runs while any is on."""
+        config.override('display.show_current_time', False)
+        assert 'time' in build_plan(config).order
+
+        config.override('display.show_session_duration', False)
+        assert 'time' not in build_plan(config).order
+
+    def test_max_cost(self, config):
+        """Providers above performance.max_cost are left out."""
+        config.override('performance.max_cost', COST_CACHED)
+
+        plan = build_plan(config)
+
+        assert 'git' not in plan.order
+        assert 'time' not in plan.order
+        assert 'usage' not in plan.order
+        assert 'project' in plan.order
+        assert 'model' in plan.order
+
+    def test_layout_order_and_unknown(self, config):
+        """Layout lists set order; unknown and repeated names are dropped."""
+        config.override('layout.line2', ['lines', 'bogus', 'model', 'lines'])
+
+        plan = build_plan(config)
+
+        assert plan.lines[1][0] == ('lines', 'model')
+        assert 'bogus' in plan.skipped
+
+    def test_invalid_layout_uses_default(self, config):
+        """A non-list layout value falls back to the default."""
+        config.override('layout.line1', 'project')
+
+        assert build_plan(config).lines[0][0] == ('project', 'git')
+
+    def test_dependencies_first(self, config):
+        """Dependencies are started before the providers reading them."""
+        config.override('layout.line1', ['project'])
+        config.override('layout.line1_right', ['worktrees'])
+        config.override('layout.line2', ['git'])
+
+        order = build_plan(config).order
+
+        assert order.index('git') < order.index('worktrees')
+
+
+class TestProviders:
+    """Test provider declarations."""
+
+    def test_unknown_cost_rejected(self):
+        """register_provider() checks the cost class."""
+        with pytest.raises(ValueError):
+            register_provider(SegmentProvider('x', 'cheap', lambda renderer: ""))
+
+    def test_key_uses_key_inputs(self):
+        """Fallback keys use key_inputs, else inputs."""
+        fields = {'cwd': '/repo', 'project_dir': '/repo', 'session_id': 's1', 'transcript_path': '/t'}
+
+        assert PROVIDERS['project'].key(fields) == 'project:/repo'
+        assert PROVIDERS['git'].key(fields) == 'git:/repo'
+        assert PROVIDERS['time'].key(fields) == 'time:s1'
+        assert PROVIDERS['usage'].key(fields) == 'usage'
+
+    def test_free_providers_not_budgeted(self):
+        """Free providers render inline."""
+        assert not PROVIDERS['model'].budgeted
+        assert PROVIDERS['git'].budgeted
+
+
+class TestRenderPlan:
+    """Test rendering through the plan."""
+
+    def test_disabled_provider_never_called(self, config, payload):
+        """A disabled segment's render is not called at all."""
+        config.override('display.show_git', False)
+
+        with patch('aiterm.statusline.segments.GitSegment.render', return_value=" GIT") as render:
+            output = StatusLineRenderer(config).render(payload)
+
+        render.assert_not_called()
+        assert "GIT" not in output
+
+    def test_custom_layout(self, config, payload):
+        """Segments follow the configured lines and sides."""
+        config.override('display.show_lines_changed', True)
+        config.override('layout.line1', ['model'])
+        config.override('layout.line1_right', [])
+        config.override('layout.line2', ['lines'])
+        config.override('layout.line2_right', ['style'])
+
+        line1, line2 = StatusLineRenderer(config).render(payload).split('\n')
+
+        assert "Sonnet" in line1
+        assert "+4" in line2
+        assert line2.rstrip().endswith("[learning]\033[0m")
+
+    def test_registered_provider(self, config, payload, custom_provider):
+        """Registered providers can be placed by name."""
+        custom_provider(SegmentProvider(
+            'greeting', COST_FREE, lambda renderer, model: f"hi {model}",
+            inputs=('model_name',), separated=True,
+        ))
+        config.override('layout.line2', ['model', 'greeting'])
+
+        output = StatusLineRenderer(config).render(payload)
+
+        assert "hi Claude Sonnet 4.5" in output.split('\n')[1]
+
+    def test_plan_rebuilt_on_config_change(self, config, payload):
+        """The cached plan follows config overrides."""
+        renderer = StatusLineRenderer(config)
+        assert 'git' in renderer._get_plan().order
+
+        config.override('display.show_git', False)
+
+        assert 'git' not in renderer._get_plan().order
+
+    def test_validate_reports_unknown_segments(self, config):
+        """validate() names unknown layout entries."""
+        config.config_path.write_text(json.dumps({'layout': {'line2': ['model', 'bogus']}}))
+
+        valid, errors = config.validate()
+
+        assert not valid
+        assert any('bogus' in error for error in errors)
@@ -0,0 +1,139 @@
+"""Tests for background refresh of slow ProjectSegment probes.
+
+Tests cover:
+- Stale-while-revalidate: cached values returned without running probes
+- Refresh scheduling by interval
+- Lock files preventing concurrent refreshes (and expiring when abandoned)
+- End-to-end refresh in a detached process
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from aiterm.statusline import probes
+from aiterm.statusline.config import StatusLineConfig
+from aiterm.statusline.segments import ProjectSegment
+
+
+@pytest.fixture
+def probe_home(tmp_path, monkeypatch):
+    """Point the cache (and the refresh process's HOME) at a temp dir."""
+    home = tmp_path / "home"
+    home.mkdir()
+    monkeypatch.setenv('HOME', str(home))
+    return home
+
+
+@pytest.fixture
+def project(tmp_path):
+    path = tmp_path / "project"
+    path.mkdir()
+    return str(path)
+
+
+class TestCachedProbe:
+    """Test stale-while-revalidate lookups."""
+
+    def test_miss_returns_none_and_spawns(self, probe_home, project):
+        """First lookup returns None immediately and starts a refresh."""
+        with patch('aiterm.statusline.probes.subprocess.Popen') as mock_popen:
+            assert probes.cached_probe(project, 'node_version', 600) is None
+
+        mock_popen.assert_called_once()
+        argv = mock_popen.call_args[0][0]
+        assert argv[1:4] == ['-m', 'aiterm.statusline.probes', 'node_version']
+        assert mock_popen.call_args[1]['start_new_session'] is True
+
+    def test_fresh_value_no_refresh(self, probe_home, project):
+        """A fresh cached value is returned without spawning."""
+        probes.write_probe(project, 'node_version', 'v20.0.0')
+
+        with patch('aiterm.statusline.probes.subprocess.Popen') as mock_popen:
+            assert probes.cached_probe(project, 'node_version', 600) == 'v20.0.0'
+
+        mock_popen.assert_not_called()
+
+    def test_stale_value_returned_and_refreshed(self, probe_home, project):
+        """A stale value is still returned while a refresh starts."""
+        probes.write_probe(project, 'node_version', 'v18.0.0')
+
+        with patch('aiterm.statusline.probes.time.time', return_value=time.time() + 601), \
+                patch('aiterm.statusline.probes.subprocess.Popen') as mock_popen:
+            assert probes.cached_probe(project, 'node_version', 600) == 'v18.0.0'
+
+        mock_popen.assert_called_once()
+
+    def test_concurrent_renders_spawn_once(self, probe_home, project):
+        """The lock file stops a refresh stampede."""
+        with patch('aiterm.statusline.probes.subprocess.Popen') as mock_popen:
+            for _ in range(5):
+                probes.cached_probe(project, 'outdated', 600, 'python')
+
+        assert mock_popen.call_count == 1
+
+    def test_abandoned_lock_expires(self, probe_home, project):
+        """Locks older than LOCK_TIMEOUT are taken over."""
+        with patch('aiterm.statusline.probes.subprocess.Popen'):
+            probes.spawn_refresh(project, 'node_version')
+
+        lock = probes._probe_path(project, 'node_version', '.lock')
+        old = time.time() - probes.LOCK_TIMEOUT - 1
+        os.utime(lock, (old, old))
+
+        with patch('aiterm.statusline.probes.subprocess.Popen') as mock_popen:
+            assert probes.spawn_refresh(project, 'node_version') is True
+        mock_popen.assert_called_once()
+
+    def test_spawn_failure_releases_lock(self, probe_home, project):
+        with patch('aiterm.statusline.probes.subprocess.Popen', side_effect=OSError):
+            assert probes.spawn_refresh(project, 'node_version') is False
+
+        assert not probes._probe_path(project, 'node_version', '.lock').exists()
+
+    def test_per_project_keys(self, probe_home, tmp_path):
+        """Results are stored per project and per probe."""
+        probes.write_probe(str(tmp_path / "a"), 'node_version', 'v1')
+        probes.write_probe(str(tmp_path / "b"), 'node_version', 'v2')
+
+        assert probes.read_probe(str(tmp_path / "a"), 'node_version')['value'] == 'v1'
+        assert probes.read_probe(str(tmp_path / "b"), 'node_version')['value'] == 'v2'
+        assert probes.read_probe(str(tmp_path / "a"), 'outdated') is None
+
+
+class TestRefresh:
+    """Test the refresh process."""
+
+    def test_refresh_stores_value_and_releases_lock(self, probe_home, project):
+        with patch('aiterm.statusline.probes.subprocess.Popen'):
+            probes.spawn_refresh(project, 'outdated', 'unknown')
+
+        assert probes.refresh('outdated', project, 'unknown') is None
+        assert probes.read_probe(project, 'outdated')['value'] is None
+        assert not probes._probe_path(project, 'outdated', '.lock').exists()
+
+    def test_main_rejects_unknown_probe(self):
+        assert probes.main(['bogus', '/tmp']) == 2
+
+    def test_detached_refresh_end_to_end(self, probe_home, project):
+        """A real detached process fills the cache for the next render."""
+        venv_bin = Path(project) / ".venv" / "bin"
+        venv_bin.mkdir(parents=True)
+        (venv_bin / "python").symlink_to(sys.executable)
+
+        config = StatusLineConfig()
+        segment = ProjectSegment(config)
+        python_bin = str(venv_bin / "python")
+        expected = f"py{sys.version_info.major}.{sys.version_info.minor}"
+
+        assert segment._probe('python_version', project, python_bin) is None
+
+        deadline = time.monotonic() + 30
+        while probes.read_probe(project, 'python_version') is None and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        assert segment._probe('python_version', project, python_bin) == expected
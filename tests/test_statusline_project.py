@@ -15,6 +15,19 @@ from aiterm.statusline.segments import ProjectSegment
 from aiterm.statusline.config import StatusLineConfig
 
 
+@pytest.fixture(autouse=True)
+def sync_probes(monkeypatch):
+    """Run slow probes inline (background refresh is covered in test_statusline_probes)."""
+    real_get = StatusLineConfig.get
+
+    def get(self, key, default=None):
+        if key == 'project.background_probes':
+            return False
+        return real_get(self, key, default)
+
+    monkeypatch.setattr(StatusLineConfig, 'get', get)
+
+
 class TestPythonEnvDetection:
     """Test Python environment detection."""
 
@@ -1,5 +1,6 @@
 """Tests for StatusLine renderer and segments."""
 
+import inspect
 import json
 import pytest
 from pathlib import Path
@@ -12,8 +13,12 @@ from aiterm.statusline.segments import (
     TimeSegment,
     ThinkingSegment,
     LinesSegment,
+    SEGMENT_CLASSES,
+    Segment,
+    SegmentRegistry,
 )
 from aiterm.statusline.config import StatusLineConfig
+from aiterm.statusline.themes import get_theme
 
 
 class TestStatusLineRenderer:
@@ -197,13 +202,13 @@ class TestTimeSegment:
 
         assert "⏱" in output  # Duration icon
 
-    def test_session_duration_format(self, segment):
+    def test_session_duration_format(self, segment, tmp_path, monkeypatch):
         """Test session duration formatting."""
-        # Clean up any existing session file
-        from pathlib import Path
-        session_file = Path("/tmp/claude-session-new-session-test")
-        if session_file.exists():
-            session_file.unlink()
+        # Fresh session store (no legacy /tmp files)
+        from aiterm.statusline import sessiontimes
+        from aiterm.statusline.cache import CACHE_DIR_ENV
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path))
+        monkeypatch.setattr(sessiontimes, "LEGACY_DIR", tmp_path)
 
         # New session
         duration = segment._get_session_duration("new-session-test")
@@ -1205,3 +1210,78 @@ class TestSpacingFeatures:
         visible_length = renderer._strip_ansi_length(left)
         # Should count emoji and text, not ANSI codes
         assert visible_length > 0
+
+
+class TestSegmentRegistry:
+    """Test segments shared across renders."""
+
+    @pytest.fixture
+    def mock_json(self):
+        """Create mock JSON input."""
+        return json.dumps({
+            "workspace": {"current_dir": "/tmp", "project_dir": "/tmp"},
+            "model": {"display_name": "Claude Sonnet 4.5"},
+            "session_id": "registry-test",
+            "cost": {"total_lines_added": 3, "total_lines_removed": 1},
+        })
+
+    def test_segment_built_once(self):
+        """Each segment is built on first use and then reused."""
+        config = StatusLineConfig()
+        registry = SegmentRegistry(config, get_theme('purple-charcoal'))
+
+        git = registry['git']
+        assert registry.get('git') is git
+        assert git.config is config
+        assert git.theme is registry.theme
+
+    def test_unknown_segment(self):
+        """Unknown names raise KeyError."""
+        registry = SegmentRegistry(StatusLineConfig(), get_theme('purple-charcoal'))
+        with pytest.raises(KeyError):
+            registry['bogus']
+
+    def test_renders_reuse_segments(self, mock_json):
+        """Consecutive renders use the same segment instances."""
+        renderer = StatusLineRenderer()
+        renderer.render(mock_json)
+        registry = renderer._segment_registry()
+        first = {name: registry[name] for name in SEGMENT_CLASSES}
+        tracker = registry['usage'].tracker
+
+        renderer.render(mock_json)
+
+        assert all(registry[name] is segment for name, segment in first.items())
+        assert registry['usage'].tracker is tracker
+
+    def test_segments_use_slots(self):
+        """Segments carry no per-instance __dict__."""
+        registry = SegmentRegistry(StatusLineConfig(), get_theme('purple-charcoal'))
+        for name in SEGMENT_CLASSES:
+            segment = registry[name]
+            assert not hasattr(segment, '__dict__')
+            with pytest.raises(AttributeError):
+                segment.unexpected = True
+
+    def test_segment_base_is_abstract(self):
+        """Segment subclasses must implement render()."""
+        with pytest.raises(TypeError):
+            Segment(StatusLineConfig())
+
+    def test_inputs_match_render(self):
+        """INPUTS names render()'s arguments in order."""
+        for cls in SEGMENT_CLASSES.values():
+            params = list(inspect.signature(cls.render).parameters)[1:]
+            assert tuple(params) == cls.INPUTS
+
+    def test_reset_clears_render_state(self, tmp_path):
+        """reset() drops git snapshots and progress escapes."""
+        registry = SegmentRegistry(StatusLineConfig(), get_theme('purple-charcoal'))
+        git = registry['git']
+        git._get_snapshot(str(tmp_path))
+        registry['lines'].progress = "\033]9;4;1;50\033\\"
+
+        registry.reset()
+
+        assert git._snapshots == {}
+        assert registry['lines'].progress is None
@@ -0,0 +1,149 @@
+"""Tests for the statusLine session start-time store.
+
+Tests cover:
+- Recording and looking up start times
+- Seeding from the transcript's first record
+- Importing legacy /tmp session files
+- Expiry of unseen sessions
+- TimeSegment integration
+"""
+
+import json
+import os
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from aiterm.statusline import sessiontimes
+from aiterm.statusline.cache import CACHE_DIR_ENV
+from aiterm.statusline.config import StatusLineConfig
+from aiterm.statusline.segments import TimeSegment
+from aiterm.statusline.sessiontimes import SessionTimes
+from aiterm.statusline.transcript import get_first_timestamp
+
+
+@pytest.fixture
+def legacy_dir(tmp_path, monkeypatch):
+    path = tmp_path / "tmp"
+    path.mkdir()
+    monkeypatch.setattr(sessiontimes, "LEGACY_DIR", path)
+    return path
+
+
+@pytest.fixture
+def store(tmp_path, legacy_dir):
+    store = SessionTimes(tmp_path / "session-times.db")
+    yield store
+    store.close()
+
+
+def write_transcript(path, timestamps):
+    lines = [json.dumps({"type": "summary"})]
+    lines += [json.dumps({"type": "user", "timestamp": ts}) for ts in timestamps]
+    path.write_text("\n".join(lines) + "\n")
+    return str(path)
+
+
+class TestSessionTimes:
+    """Test SessionTimes."""
+
+    def test_first_lookup_records_now(self, store):
+        before = time.time()
+        start = store.get_start("s1")
+
+        assert before <= start <= time.time()
+        assert store.get_start("s1") == start
+        assert store.count() == 1
+
+    def test_seeded_from_transcript(self, store, tmp_path):
+        transcript = write_transcript(tmp_path / "t.jsonl", ["2026-01-01T10:00:00Z", "2026-01-01T11:00:00Z"])
+
+        assert store.get_start("s1", transcript) == get_first_timestamp(transcript)
+
+    def test_legacy_file_imported_and_removed(self, store, legacy_dir):
+        legacy = legacy_dir / "claude-session-s1"
+        legacy.write_text("1700000000")
+
+        assert store.get_start("s1") == 1700000000
+        assert not legacy.exists()
+
+    def test_unseen_sessions_expire(self, store, legacy_dir):
+        store.get_start("old")
+        old_legacy = legacy_dir / "claude-session-gone"
+        old_legacy.write_text("1")
+        os.utime(old_legacy, (1, 1))
+
+        later = time.time() + sessiontimes.MAX_SESSION_AGE + 10
+        with patch("aiterm.statusline.sessiontimes.time.time", return_value=later):
+            store.get_start("new")
+
+        assert store.count() == 1
+        assert not old_legacy.exists()
+
+    def test_seen_refreshed_keeps_session(self, store):
+        start = store.get_start("s1")
+
+        # Seen again before expiry, then a new session triggers expiry
+        almost = time.time() + sessiontimes.MAX_SESSION_AGE - 10
+        with patch("aiterm.statusline.sessiontimes.time.time", return_value=almost):
+            store.get_start("s1")
+        with patch("aiterm.statusline.sessiontimes.time.time", return_value=almost + 20):
+            store.get_start("s2")
+
+        assert store.get_start("s1") == start
+
+    def test_forget(self, store):
+        store.get_start("s1")
+
+        assert store.forget("s1") is True
+        assert store.forget("s1") is False
+
+    def test_concurrent_first_lookups_agree(self, store):
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(store.get_start("s1"))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(set(results)) == 1
+
+    def test_unavailable_store(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("")
+
+        assert SessionTimes(blocker / "db.sqlite").get_start("s1") is None
+
+
+class TestFirstTimestamp:
+    """Test get_first_timestamp()."""
+
+    def test_first_timestamped_record(self, tmp_path):
+        transcript = write_transcript(tmp_path / "t.jsonl", [1700000000, 1700000500])
+        assert get_first_timestamp(transcript) == 1700000000
+
+    def test_missing_or_empty(self, tmp_path):
+        assert get_first_timestamp(str(tmp_path / "missing.jsonl")) is None
+        (tmp_path / "empty.jsonl").write_text("")
+        assert get_first_timestamp(str(tmp_path / "empty.jsonl")) is None
+
+
+class TestTimeSegmentDuration:
+    """Test TimeSegment session duration with the store."""
+
+    def test_duration_from_transcript_start(self, tmp_path, monkeypatch, legacy_dir):
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+        transcript = write_transcript(tmp_path / "t.jsonl", [time.time() - 2 * 3600 - 5 * 60])
+
+        duration = TimeSegment(StatusLineConfig())._get_session_duration("s1", transcript)
+
+        assert duration == "2h5m"
+
+    def test_no_tmp_files_written(self, tmp_path, monkeypatch, legacy_dir):
+        monkeypatch.setenv(CACHE_DIR_ENV, str(tmp_path / "cache"))
+
+        TimeSegment(StatusLineConfig()).render("s1")
+
+        assert list(legacy_dir.iterdir()) == []
@@ -1,10 +1,12 @@
 """Tests for StatusLine theme system."""
 
 import pytest
+from dataclasses import FrozenInstanceError, replace
 from pathlib import Path
 
 from aiterm.statusline.themes import (
     Theme,
+    compile_theme,
     get_theme,
     list_themes,
     ThemeManager,
@@ -312,3 +314,45 @@ class TestThemeColorConsistency:
                 # Should start with either 48;5; (background) or 38;5; (foreground)
                 assert value.startswith('48;5;') or value.startswith('38;5;'), \
                     f"{theme.name}.{key} has invalid ANSI code format: {value}"
+
+
+class TestCompiledFragments:
+    """Test precompiled ANSI fragment tables."""
+
+    def test_table_cached_per_theme(self):
+        """Test the same theme returns the same table."""
+        assert compile_theme(PURPLE_CHARCOAL) is compile_theme(get_theme('purple-charcoal'))
+        assert compile_theme(PURPLE_CHARCOAL) is not compile_theme(COOL_BLUES)
+
+    def test_changed_colors_get_new_table(self):
+        """Test an edited theme with the same name is compiled separately."""
+        edited = replace(PURPLE_CHARCOAL, dir_bg="48;5;17")
+
+        fragments = compile_theme(edited)
+
+        assert fragments is not compile_theme(PURPLE_CHARCOAL)
+        assert fragments.dir_open.startswith("\033[48;5;17;")
+
+    def test_fragments_frozen(self):
+        """Test fragment tables cannot be modified."""
+        with pytest.raises(FrozenInstanceError):
+            compile_theme(PURPLE_CHARCOAL).time = ""
+
+    def test_fragments_match_theme_colors(self):
+        """Test fragments are the escapes built from the theme colors."""
+        theme = FOREST_GREENS
+        fragments = compile_theme(theme)
+
+        assert fragments.dir_open == f"\033[{theme.dir_bg};{theme.dir_fg}m ░▒▓ "
+        assert fragments.model_sonnet == f"\033[{theme.model_sonnet}m"
+        assert fragments.thinking == f"\033[{theme.thinking_fg}m🧠\033[0m"
+
+    def test_separator_spacing_modes(self):
+        """Test separators are precompiled for every spacing mode."""
+        fragments = compile_theme(PURPLE_CHARCOAL)
+        bar = f"\033[{PURPLE_CHARCOAL.separator_fg}m│\033[0m"
+
+        assert fragments.separator('minimal') == f" {bar} "
+        assert fragments.separator('standard') == f"  {bar}  "
+        assert fragments.separator('relaxed') == f"   {bar}   "
+        assert fragments.separator('unknown') == fragments.separator('standard')
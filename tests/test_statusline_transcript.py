@@ -0,0 +1,199 @@
+"""Tests for the statusLine transcript tail reader.
+
+Tests cover:
+- Last timestamp from JSONL transcripts (ISO and epoch timestamps)
+- Incomplete and timestamp-less trailing records
+- Legacy single-JSON transcripts
+- Bounded reads on large files and the per-path cache
+"""
+
+import builtins
+import json
+import time
+
+import pytest
+
+from aiterm.statusline import transcript
+from aiterm.statusline.transcript import get_last_timestamp, parse_timestamp
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    transcript.clear_cache()
+    yield
+    transcript.clear_cache()
+
+
+def write_jsonl(path, records, trailer=""):
+    """Write JSONL records (plus optional raw trailing text)."""
+    path.write_text("".join(json.dumps(r) + "\n" for r in records) + trailer)
+
+
+@pytest.fixture
+def count_reads(monkeypatch):
+    """Count bytes read through transcript's open()."""
+    stats = {"opens": 0, "bytes": 0}
+    real_open = builtins.open
+
+    class CountingFile:
+        def __init__(self, f):
+            self._f = f
+
+        def read(self, *args):
+            data = self._f.read(*args)
+            stats["bytes"] += len(data)
+            return data
+
+        def __getattr__(self, name):
+            return getattr(self._f, name)
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            self._f.close()
+
+    def counting_open(*args, **kwargs):
+        stats["opens"] += 1
+        return CountingFile(real_open(*args, **kwargs))
+
+    monkeypatch.setattr(transcript, "open", counting_open, raising=False)
+    return stats
+
+
+class TestParseTimestamp:
+    """Test timestamp conversion."""
+
+    def test_iso_utc(self):
+        assert parse_timestamp("2025-01-01T00:00:00.000Z") == 1735689600.0
+
+    def test_epoch_seconds(self):
+        assert parse_timestamp(1735689600) == 1735689600.0
+
+    def test_epoch_milliseconds(self):
+        assert parse_timestamp(1735689600000) == 1735689600.0
+
+    @pytest.mark.parametrize("value", [None, 0, "", "yesterday", True, [1]])
+    def test_invalid(self, value):
+        assert parse_timestamp(value) is None
+
+
+class TestGetLastTimestamp:
+    """Test reading the newest record."""
+
+    def test_missing_file(self, tmp_path):
+        assert get_last_timestamp(str(tmp_path / "missing.jsonl")) is None
+
+    def test_jsonl_last_record(self, tmp_path):
+        """Returns the last record's timestamp."""
+        path = tmp_path / "t.jsonl"
+        write_jsonl(path, [
+            {"type": "user", "timestamp": "2025-01-01T00:00:00Z"},
+            {"type": "assistant", "timestamp": "2025-01-01T00:05:00Z"},
+        ])
+
+        assert get_last_timestamp(str(path)) == 1735689900.0
+
+    def test_skips_records_without_timestamp(self, tmp_path):
+        """Trailing records without a timestamp (summaries) are skipped."""
+        path = tmp_path / "t.jsonl"
+        write_jsonl(path, [
+            {"type": "user", "timestamp": 1735689600},
+            {"type": "summary", "summary": "done"},
+        ])
+
+        assert get_last_timestamp(str(path)) == 1735689600.0
+
+    def test_ignores_partial_trailing_line(self, tmp_path):
+        """A record still being written is ignored."""
+        path = tmp_path / "t.jsonl"
+        write_jsonl(path, [{"timestamp": 1735689600}], trailer='{"timestamp": 17356')
+
+        assert get_last_timestamp(str(path)) == 1735689600.0
+
+    def test_legacy_single_line(self, tmp_path):
+        """Legacy {"messages": [...]} files use the last message."""
+        path = tmp_path / "t.json"
+        path.write_text(json.dumps({"messages": [{"timestamp": 1}, {"timestamp": 1735689600}]}))
+
+        assert get_last_timestamp(str(path)) == 1735689600.0
+
+    def test_legacy_pretty_printed(self, tmp_path):
+        """Multi-line legacy files are parsed whole."""
+        path = tmp_path / "t.json"
+        path.write_text(json.dumps({"messages": [{"timestamp": 1735689600}]}, indent=2))
+
+        assert get_last_timestamp(str(path)) == 1735689600.0
+
+    def test_legacy_last_message_without_timestamp(self, tmp_path):
+        path = tmp_path / "t.json"
+        path.write_text(json.dumps({"messages": [{"timestamp": 1735689600}, {"content": "hi"}]}))
+
+        assert get_last_timestamp(str(path)) is None
+
+    def test_large_file_reads_tail_only(self, tmp_path, count_reads):
+        """Read cost is bounded by the tail, not the file size."""
+        path = tmp_path / "t.jsonl"
+        filler = {"type": "assistant", "timestamp": 1, "text": "x" * 1000}
+        write_jsonl(path, [filler] * 5000 + [{"timestamp": 1735689600}])
+        assert path.stat().st_size > 4 * 1024 * 1024
+
+        assert get_last_timestamp(str(path)) == 1735689600.0
+        assert count_reads["bytes"] <= 3 * transcript.CHUNK_SIZE
+
+
+class TestCache:
+    """Test the per-path scan cache."""
+
+    def test_unchanged_file_not_reopened(self, tmp_path, count_reads):
+        path = tmp_path / "t.jsonl"
+        write_jsonl(path, [{"timestamp": 1735689600}])
+
+        get_last_timestamp(str(path))
+        get_last_timestamp(str(path))
+
+        assert count_reads["opens"] == 1
+
+    def test_append_reads_new_lines(self, tmp_path, count_reads):
+        """Appended records are picked up by reading only the new bytes."""
+        path = tmp_path / "t.jsonl"
+        write_jsonl(path, [{"timestamp": 1, "text": "x" * 100000}])
+        get_last_timestamp(str(path))
+        count_reads["bytes"] = 0
+
+        with open(path, "a") as f:
+            f.write(json.dumps({"timestamp": 1735689600}) + "\n")
+
+        assert get_last_timestamp(str(path)) == 1735689600.0
+        assert count_reads["bytes"] < 1000
+
+    def test_append_without_timestamp_keeps_previous(self, tmp_path):
+        path = tmp_path / "t.jsonl"
+        write_jsonl(path, [{"timestamp": 1735689600}])
+        get_last_timestamp(str(path))
+
+        with open(path, "a") as f:
+            f.write(json.dumps({"type": "summary"}) + "\n")
+
+        assert get_last_timestamp(str(path)) == 1735689600.0
+
+    def test_partial_record_completed_later(self, tmp_path):
+        """A partial record is re-read once its line is complete."""
+        path = tmp_path / "t.jsonl"
+        write_jsonl(path, [{"timestamp": 1}], trailer='{"timestamp": ')
+        assert get_last_timestamp(str(path)) == 1.0
+
+        with open(path, "a") as f:
+            f.write("1735689600}\n")
+
+        assert get_last_timestamp(str(path)) == 1735689600.0
+
+    def test_rewritten_file_rescanned(self, tmp_path):
+        """A shrunk (rewritten) file is scanned from the start."""
+        path = tmp_path / "t.jsonl"
+        write_jsonl(path, [{"timestamp": 1, "text": "x" * 1000}])
+        get_last_timestamp(str(path))
+
+        now = int(time.time())
+        write_jsonl(path, [{"timestamp": now}])
+        assert get_last_timestamp(str(path)) == float(now)
@@ -0,0 +1,220 @@
+"""Tests for statusLine usage tracking.
+
+Tests cover:
+- Fetching from a local stand-in for the usage endpoint
+- The shared 60s cache (atomic writes, stale entries)
+- Single-flight refresh across concurrent trackers
+- Non-blocking mode returning stale data
+- Memoized API key lookup
+- Stale data on failed refreshes and the cached missing-key sentinel
+"""
+
+import fcntl
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from aiterm.statusline import usage
+from aiterm.statusline.usage import UsageTracker
+
+USAGE = {"five_hour": {"utilization": 12}, "seven_day": {"utilization": 34}}
+
+
+class UsageServer:
+    """Local HTTP stand-in for the usage endpoint."""
+
+    def __init__(self, delay: float = 0.0, status: int = 200):
+        self.delay = delay
+        self.status = status
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(self.headers)
+                time.sleep(server.delay)
+                body = json.dumps(USAGE).encode()
+                self.send_response(server.status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/api/oauth/usage"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, args=(0.05,), daemon=True)
+        self.thread.start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def server():
+    srv = UsageServer()
+    yield srv
+    srv.close()
+
+
+@pytest.fixture
+def cache_file(tmp_path):
+    return tmp_path / "usage.json"
+
+
+def tracker(server, cache_file, **kwargs):
+    kwargs.setdefault("api_key", "sk-ant-api-test")
+    return UsageTracker(url=server.url, cache_file=cache_file, **kwargs)
+
+
+class TestUsageCache:
+    """Test fetching and the shared cache."""
+
+    def test_fetch_and_cache(self, server, cache_file):
+        assert tracker(server, cache_file)._fetch_api_usage() == USAGE
+        assert json.loads(cache_file.read_text()) == USAGE
+
+        assert tracker(server, cache_file)._fetch_api_usage() == USAGE
+        assert len(server.requests) == 1
+
+    def test_stale_cache_refreshed(self, server, cache_file):
+        cache_file.write_text(json.dumps({"old": True}))
+        old = time.time() - 120
+        os.utime(cache_file, (old, old))
+
+        assert tracker(server, cache_file)._fetch_api_usage() == USAGE
+        assert len(server.requests) == 1
+
+    def test_failed_fetch_keeps_cache(self, cache_file):
+        srv = UsageServer(status=500)
+        try:
+            cache_file.write_text(json.dumps({"old": True}))
+            old = time.time() - 120
+            os.utime(cache_file, (old, old))
+
+            assert tracker(srv, cache_file)._fetch_api_usage() == {"old": True}
+            assert json.loads(cache_file.read_text()) == {"old": True}
+        finally:
+            srv.close()
+
+    def test_no_temp_files_left(self, server, cache_file):
+        tracker(server, cache_file)._fetch_api_usage()
+        assert sorted(p.name for p in cache_file.parent.iterdir()) == ["usage.json", "usage.json.lock"]
+
+    def test_auth_headers(self, server, cache_file):
+        tracker(server, cache_file, api_key="sk-ant-oat01-token")._fetch_api_usage()
+        assert server.requests[0]["Authorization"] == "Bearer sk-ant-oat01-token"
+
+        cache_file.unlink()
+        tracker(server, cache_file, api_key="sk-ant-api-key")._fetch_api_usage()
+        assert server.requests[1]["x-api-key"] == "sk-ant-api-key"
+
+
+class TestSingleFlight:
+    """Test concurrent refreshes."""
+
+    def test_concurrent_trackers_fetch_once(self, cache_file):
+        srv = UsageServer(delay=0.2)
+        try:
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(tracker(srv, cache_file)._fetch_api_usage()))
+                for _ in range(6)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+            assert results == [USAGE] * 6
+            assert len(srv.requests) == 1
+        finally:
+            srv.close()
+
+    def test_non_blocking_returns_stale(self, server, cache_file):
+        cache_file.write_text(json.dumps({"old": True}))
+        old = time.time() - 120
+        os.utime(cache_file, (old, old))
+
+        with open(cache_file.with_name("usage.json.lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)  # Another process refreshing
+            start = time.monotonic()
+            data = tracker(server, cache_file, block=False)._fetch_api_usage()
+
+        assert data == {"old": True}
+        assert time.monotonic() - start < 0.5
+        assert server.requests == []
+
+
+class TestApiKeyLookup:
+    """Test lazy, memoized API key lookup."""
+
+    @pytest.fixture(autouse=True)
+    def reset_memo(self):
+        usage._api_key_memo = None
+        yield
+        usage._api_key_memo = None
+
+    def test_not_looked_up_on_construction(self):
+        with patch.object(UsageTracker, "_get_api_key") as lookup:
+            UsageTracker()
+            lookup.assert_not_called()
+
+    def test_memoized_across_trackers(self, server, cache_file):
+        with patch.object(UsageTracker, "_get_api_key", return_value="sk-ant-api-test") as lookup:
+            for _ in range(3):
+                cache_file.unlink(missing_ok=True)
+                UsageTracker(url=server.url, cache_file=cache_file)._fetch_api_usage()
+
+        assert lookup.call_count == 1
+        assert len(server.requests) == 3
+
+    def test_memo_expires(self):
+        with patch.object(UsageTracker, "_get_api_key", return_value="key") as lookup:
+            assert UsageTracker()._api_key == "key"
+            with patch("aiterm.statusline.usage.time.monotonic", return_value=time.monotonic() + usage.API_KEY_TTL + 1):
+                assert UsageTracker()._api_key == "key"
+
+        assert lookup.call_count == 2
+
+    def test_missing_key_cached(self, cache_file):
+        """Without a key, the lookup is not repeated by the next process."""
+        with patch.object(UsageTracker, "_get_api_key", return_value=None) as lookup:
+            assert UsageTracker(cache_file=cache_file)._fetch_api_usage() is None
+            usage._api_key_memo = None  # A new statusLine process
+            assert UsageTracker(cache_file=cache_file)._fetch_api_usage() is None
+
+        assert lookup.call_count == 1
+        assert json.loads(cache_file.read_text()) == {usage.NO_KEY_SENTINEL: True}
+
+    def test_missing_key_sentinel_expires(self, cache_file, server):
+        cache_file.write_text(json.dumps({usage.NO_KEY_SENTINEL: True}))
+        old = time.time() - usage.NO_KEY_TTL - 1
+        os.utime(cache_file, (old, old))
+
+        with patch.object(UsageTracker, "_get_api_key", return_value="sk-ant-api-test"):
+            assert UsageTracker(url=server.url, cache_file=cache_file)._fetch_api_usage() == USAGE
+
+    def test_missing_key_keeps_stale_response(self, cache_file):
+        cache_file.write_text(json.dumps(USAGE))
+        old = time.time() - 120
+        os.utime(cache_file, (old, old))
+
+        with patch.object(UsageTracker, "_get_api_key", return_value=None):
+            assert UsageTracker(cache_file=cache_file)._fetch_api_usage() == USAGE
+        assert json.loads(cache_file.read_text()) == USAGE
+
+    def test_fresh_cache_skips_lookup(self, cache_file):
+        cache_file.write_text(json.dumps(USAGE))
+
+        with patch.object(UsageTracker, "_get_api_key") as lookup:
+            assert UsageTracker(cache_file=cache_file)._fetch_api_usage() == USAGE
+            lookup.assert_not_called()
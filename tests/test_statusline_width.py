@@ -0,0 +1,92 @@
+"""Tests for statusLine display width measurement.
+
+Tests cover:
+- ANSI stripping
+- Cell widths of ASCII, emoji, CJK and zero-width characters
+- Width-aware cutting
+- Alignment and branch truncation with wide characters
+"""
+
+from unittest.mock import patch
+
+from aiterm.statusline import width
+from aiterm.statusline.config import StatusLineConfig
+from aiterm.statusline.renderer import StatusLineRenderer
+from aiterm.statusline.segments import GitSegment
+from aiterm.statusline.width import char_width, display_width, fit_width, strip_ansi
+
+
+class TestDisplayWidth:
+    """Test display_width()."""
+
+    def test_ascii(self):
+        assert display_width("hello") == 5
+        assert display_width("") == 0
+
+    def test_ansi_ignored(self):
+        assert strip_ansi("\033[38;5;245mHi\033[0m") == "Hi"
+        assert display_width("\033[48;5;54;38;5;250mHi\033[0m") == 2
+
+    def test_project_icons_are_wide(self):
+        for icon in ("🌳", "🐍", "🤖", "🧠", "📦", "⚡"):
+            assert display_width(icon) == 2, icon
+
+    def test_cjk_wide(self):
+        assert display_width("日本語") == 6
+        assert display_width("ｆｕｌｌ") == 8
+
+    def test_ambiguous_narrow(self):
+        assert display_width("░▒▓ │ …") == 7
+
+    def test_zero_width(self):
+        assert char_width("\u0301") == 0   # Combining acute accent
+        assert char_width("\u200d") == 0   # Zero-width joiner
+        assert char_width("\ufe0f") == 0   # Variation selector
+        assert display_width("e\u0301") == 1
+
+    def test_cached(self):
+        width.display_width.cache_clear()
+        display_width("\033[0m🐍 aiterm")
+        display_width("\033[0m🐍 aiterm")
+
+        info = width.display_width.cache_info()
+        assert info.hits == 1 and info.misses == 1
+
+
+class TestFitWidth:
+    """Test fit_width()."""
+
+    def test_ascii(self):
+        assert fit_width("abcdef", 3) == "abc"
+        assert fit_width("abcdef", 3, from_end=True) == "def"
+        assert fit_width("abc", 0) == ""
+
+    def test_wide_not_split(self):
+        assert fit_width("日本語", 3) == "日"
+        assert fit_width("日本語", 4, from_end=True) == "本語"
+        assert fit_width("a🐍b", 2) == "a"
+
+
+class TestWideCharacterLayout:
+    """Test alignment and truncation with wide characters."""
+
+    def test_align_line_pads_for_emoji(self):
+        renderer = StatusLineRenderer(StatusLineConfig())
+        left = "\033[0m🐍 aiterm"
+        right = "\033[0m🤖 2"
+
+        with patch('shutil.get_terminal_size', return_value=type('S', (), {'columns': 40})()):
+            line = renderer._align_line(left, right)
+
+        assert display_width(line) <= 40
+        assert line.endswith(right)
+
+    def test_truncate_branch_by_width(self):
+        segment = GitSegment(StatusLineConfig())
+        branch = "feature/日本語のブランチ名をとても長くする"
+
+        result = segment._truncate_branch(branch, 24)
+
+        assert "..." in result
+        assert result.startswith("feature/")
+        assert display_width(result) <= 24
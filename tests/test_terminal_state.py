@@ -0,0 +1,195 @@
+"""Tests for incremental context switches.
+
+Tests cover:
+- Diffing escape sequences against the persisted per-terminal state
+- In-process diffing when the terminal cannot be identified
+- iTerm2 and Ghostty sending only changed sequences in one write
+"""
+
+import io
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+import pytest
+
+from aiterm.context.detector import ContextInfo, ContextType
+from aiterm.terminal import apply_context, ghostty, iterm2, state
+from aiterm.terminal.state import CONTEXT_REFRESH, apply_sequences, terminal_key
+
+
+@pytest.fixture
+def stdout(monkeypatch):
+    """Record what reaches stdout (one list entry per write)."""
+    writes = []
+    monkeypatch.setattr(state, "write_sequences", lambda sequences: sequences and writes.append(sequences))
+    return writes
+
+
+@pytest.fixture
+def terminal(tmp_path, monkeypatch):
+    """Pretend stdout is a known terminal with an isolated state file."""
+    monkeypatch.setenv("AITERM_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(state, "terminal_key", lambda: "/dev/ttys001:100")
+    iterm2.reset_state()
+    yield tmp_path
+    iterm2.reset_state()
+
+
+def make_context(branch: str = "main", name: str = "myproject") -> ContextInfo:
+    return ContextInfo(
+        type=ContextType.PYTHON,
+        name=name,
+        icon="🐍",
+        profile="Python-Dev",
+        branch=branch,
+    )
+
+
+class TestTerminalKey:
+    """Tests for terminal identification."""
+
+    def test_not_a_tty(self):
+        with patch("sys.stdout", io.StringIO()):
+            assert terminal_key() is None
+
+
+class TestApplySequences:
+    """Tests for the diff engine."""
+
+    def test_unchanged_skipped(self, terminal, stdout):
+        """A sequence the terminal already received is not sent again."""
+        assert apply_sequences({"title": "T1"}) == "T1"
+        assert apply_sequences({"title": "T1"}) == ""
+        assert stdout == ["T1"]
+
+    def test_only_changed_sent(self, terminal, stdout):
+        """Changed sequences are sent together, in the given order."""
+        apply_sequences({"profile": "P", "title": "T1", "var:x": "X"})
+
+        assert apply_sequences({"profile": "P", "title": "T2", "var:x": "Y"}) == "T2Y"
+        assert stdout[-1] == "T2Y"
+
+    def test_persisted_across_processes(self, terminal, stdout):
+        """State lives on disk, so the next ``ait switch`` sees it."""
+        apply_sequences({"title": "T1"})
+
+        assert (terminal / "terminal-context.json").exists()
+        assert state._get_state().diff("/dev/ttys001:100", {"title": "T1"}) == ""
+
+    def test_refresh_resends(self, terminal, stdout):
+        """Unchanged sequences are sent again after the refresh interval."""
+        apply_sequences({"title": "T1"})
+
+        with patch("aiterm.utils.escape_state.time.time", return_value=time.time() + CONTEXT_REFRESH + 1):
+            assert apply_sequences({"title": "T1"}) == "T1"
+
+    def test_force(self, terminal, stdout):
+        apply_sequences({"title": "T1"})
+
+        assert apply_sequences({"title": "T1"}, force=True) == "T1"
+        assert apply_sequences({"title": "T1"}) == ""
+
+    def test_does_not_import_statusline(self):
+        """The terminal layer keeps its state without statusLine modules."""
+        code = "import sys, aiterm.terminal.state; print(any(m.startswith('aiterm.statusline') for m in sys.modules))"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+        assert result.stdout.strip() == "False", result.stderr
+
+    def test_unknown_terminal_uses_previous(self, stdout, monkeypatch):
+        """Without a terminal key, only this process's sends are compared."""
+        monkeypatch.setattr(state, "terminal_key", lambda: None)
+
+        assert apply_sequences({"title": "T1", "var:x": "X"}, previous={"title": "T1"}) == "X"
+        assert apply_sequences({"title": "T1"}) == "T1"
+        assert apply_sequences({"title": "T1"}, previous={"title": "T1"}, force=True) == "T1"
+
+
+class TestITerm2Incremental:
+    """Tests for iTerm2 context switches."""
+
+    @pytest.fixture(autouse=True)
+    def iterm(self, monkeypatch):
+        monkeypatch.setenv("TERM_PROGRAM", "iTerm.app")
+
+    def test_state_sequences(self):
+        """Profile comes first, then title, then user variables."""
+        sequences = iterm2.ITerm2State("Dev", "Title", {"ctxName": "x"}).sequences()
+
+        assert list(sequences) == ["profile", "title", "var:ctxName"]
+        assert sequences["profile"] == "\033]1337;SetProfile=Dev\007"
+
+    def test_first_switch_single_write(self, terminal, stdout):
+        """Profile, title and user variables go out in one write."""
+        iterm2.apply_context(make_context())
+
+        assert len(stdout) == 1
+        assert "SetProfile=Python-Dev" in stdout[0]
+        assert "\033]2;🐍 myproject (main)\007" in stdout[0]
+        assert stdout[0].count("SetUserVar=") == 4
+
+    def test_same_context_writes_nothing(self, terminal, stdout):
+        iterm2.apply_context(make_context())
+        iterm2.reset_state()  # A new ``ait switch`` process
+
+        iterm2.apply_context(make_context())
+
+        assert len(stdout) == 1
+
+    def test_branch_change_sends_diff(self, terminal, stdout):
+        """Switching branches resends only the title and ctxBranch."""
+        iterm2.apply_context(make_context("main"))
+        iterm2.apply_context(make_context("feature"))
+
+        assert len(stdout) == 2
+        assert "SetProfile" not in stdout[1]
+        assert stdout[1].count("SetUserVar=") == 1
+        assert "SetUserVar=ctxBranch=" in stdout[1]
+        assert "(feature)" in stdout[1]
+
+    def test_state_tracks_user_vars(self, terminal, stdout):
+        iterm2.apply_context(make_context())
+
+        current = iterm2.get_current_state()
+        assert current.user_vars["ctxBranch"] == "main"
+        assert current.current_profile == "Python-Dev"
+
+    def test_set_status_vars_incremental(self, terminal, stdout):
+        iterm2.set_status_vars("🐍", "a", "main", "Python-Dev")
+        iterm2.set_status_vars("🐍", "b", "main", "Python-Dev")
+
+        assert stdout[1].count("SetUserVar=") == 1
+        assert "SetUserVar=ctxName=" in stdout[1]
+
+    def test_profile_switch_recorded(self, terminal, stdout):
+        """A manual profile switch makes the next context switch resend."""
+        iterm2.apply_context(make_context())
+        iterm2.switch_profile("Focus")
+
+        iterm2.apply_context(make_context())
+
+        assert "SetProfile=Python-Dev" in stdout[-1]
+
+
+class TestOtherTerminals:
+    """Tests for Ghostty and generic terminals."""
+
+    def test_ghostty_title_once(self, terminal, stdout, monkeypatch):
+        monkeypatch.setenv("TERM_PROGRAM", "ghostty")
+
+        ghostty.apply_context(make_context())
+        ghostty.apply_context(make_context())
+
+        assert len(stdout) == 1
+        assert ghostty.set_title("🐍 myproject (main)") is False
+        assert ghostty.set_title("🐍 myproject (main)", force=True) is True
+
+    def test_generic_title_once(self, terminal, stdout, monkeypatch):
+        monkeypatch.setenv("TERM_PROGRAM", "WezTerm")
+
+        assert apply_context(make_context()) is True
+        assert apply_context(make_context()) is True
+
+        assert stdout == ["\033]2;🐍 myproject (main)\007"]
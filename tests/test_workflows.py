@@ -1,6 +1,7 @@
 """Tests for workflow CLI commands including session-aware execution."""
 
 import json
+import time
 from datetime import datetime
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -23,6 +24,14 @@ from aiterm.cli.workflows import (
     list_custom_workflows,
     get_all_workflows,
     run_single_workflow,
+    build_step_graph,
+    get_max_parallel,
+    run_step_graph,
+    RunReport,
+    StepResult,
+    STEP_CANCELLED,
+    STEP_FAILED,
+    STEP_OK,
 )
 
 runner = CliRunner()
@@ -555,3 +564,219 @@ class TestRunSingleWorkflow:
             chain_context="my-chain",
         )
         assert result is True
+
+
+class TestStepGraph:
+    """Test building step dependency graphs."""
+
+    def test_linear_by_default(self):
+        """Steps without needs wait for the step before them."""
+        steps = build_step_graph([("wf", {"steps": [
+            {"task": "A", "command": "true"},
+            {"task": "B", "command": "true"},
+        ]})])
+
+        assert list(steps) == ["wf:1", "wf:2"]
+        assert steps["wf:1"].needs == []
+        assert steps["wf:2"].needs == ["wf:1"]
+
+    def test_declared_needs(self):
+        """Ids and needs form the graph, ordered after dependencies."""
+        steps = build_step_graph([("wf", {"steps": [
+            {"id": "build", "task": "Build", "needs": ["lint", "test"]},
+            {"id": "lint", "task": "Lint", "needs": []},
+            {"id": "test", "task": "Test", "needs": "lint"},
+        ]})])
+
+        assert list(steps) == ["wf:lint", "wf:test", "wf:build"]
+        assert steps["wf:test"].needs == ["wf:lint"]
+
+    def test_chained_workflows_independent(self):
+        """Workflows in a chain do not depend on each other."""
+        steps = build_step_graph([
+            ("lint", {"steps": [{"task": "Lint"}]}),
+            ("test", {"steps": [{"task": "Test"}]}),
+        ])
+
+        assert steps["test:1"].needs == []
+
+    @pytest.mark.parametrize("workflows, message", [
+        ([("wf", {"steps": [{"id": "a", "needs": ["missing"]}]})], "unknown"),
+        ([("wf", {"steps": [{"id": "a", "needs": "b"}, {"id": "b", "needs": "a"}]})], "cycle"),
+        ([("wf", {"steps": [{"id": "a"}, {"id": "a"}]})], "Duplicate"),
+        ([("wf", {"steps": []}), ("wf", {"steps": []})], "more than once"),
+    ])
+    def test_invalid_graph(self, workflows, message):
+        with pytest.raises(ValueError, match=message):
+            build_step_graph(workflows)
+
+    def test_max_parallel(self):
+        assert get_max_parallel([("a", {}), ("b", {"max_parallel": 3}), ("c", {"max_parallel": "x"})]) == 3
+        assert get_max_parallel([("a", {})]) == 1
+
+
+class TestRunStepGraph:
+    """Test parallel step execution."""
+
+    def graph(self, *steps, max_parallel=1):
+        return build_step_graph([("wf", {"steps": list(steps), "max_parallel": max_parallel})])
+
+    def test_independent_steps_overlap(self):
+        """Steps that do not need each other run at the same time."""
+        steps = self.graph(
+            {"id": "a", "command": "sleep 0.3", "needs": []},
+            {"id": "b", "command": "sleep 0.3", "needs": []},
+        )
+
+        report = run_step_graph(steps, jobs=2)
+
+        assert report.success
+        a, b = report.results["wf:a"], report.results["wf:b"]
+        assert b.started < a.finished
+        assert report.wall_time < a.duration + b.duration
+
+    def test_single_job_runs_in_order(self):
+        started = []
+        steps = self.graph(
+            {"id": "a", "command": "true", "needs": []},
+            {"id": "b", "command": "true", "needs": []},
+        )
+
+        report = run_step_graph(steps, jobs=1, on_start=lambda step: started.append(step.key))
+
+        assert started == ["wf:a", "wf:b"]
+        assert report.results["wf:a"].finished <= report.results["wf:b"].started
+
+    def test_needs_respected(self):
+        steps = self.graph(
+            {"id": "a", "command": "sleep 0.1", "needs": []},
+            {"id": "b", "command": "true", "needs": "a"},
+        )
+
+        report = run_step_graph(steps, jobs=4)
+
+        assert report.results["wf:a"].finished <= report.results["wf:b"].started
+
+    def test_output_streamed(self):
+        """Lines arrive while the command is still running."""
+        lines = []
+        steps = self.graph({"command": "echo first; sleep 0.4; echo second"})
+
+        report = run_step_graph(steps, on_output=lambda step, line: lines.append((line, time.monotonic())))
+
+        assert [line for line, _ in lines] == ["first", "second"]
+        assert lines[0][1] < report.results["wf:1"].finished - 0.2
+
+    def test_fail_fast(self):
+        """A failure terminates running steps and skips waiting ones."""
+        steps = self.graph(
+            {"id": "slow", "command": "sleep 10", "needs": []},
+            {"id": "bad", "command": "exit 3", "needs": []},
+            {"id": "after", "command": "true", "needs": "bad"},
+        )
+
+        report = run_step_graph(steps, jobs=2)
+
+        assert not report.success
+        assert report.failed == ["wf:bad"]
+        assert report.results["wf:bad"].returncode == 3
+        assert report.results["wf:slow"].status == STEP_CANCELLED
+        assert report.results["wf:after"].status == STEP_CANCELLED
+        assert report.wall_time < 5
+
+    def test_step_without_command(self):
+        report = run_step_graph(self.graph({"task": "Note"}))
+
+        assert report.results["wf:1"].status == STEP_OK
+
+
+class TestCriticalPath:
+    """Test critical-path timing."""
+
+    def test_longest_chain(self):
+        steps = build_step_graph([("wf", {"steps": [
+            {"id": "lint", "needs": []},
+            {"id": "test", "needs": []},
+            {"id": "build", "needs": ["lint", "test"]},
+        ]})])
+        report = RunReport(steps=steps, results={
+            "wf:lint": StepResult(STEP_OK, started=1.0, finished=2.0),
+            "wf:test": StepResult(STEP_OK, started=1.0, finished=5.0),
+            "wf:build": StepResult(STEP_OK, started=5.0, finished=7.0),
+        })
+
+        path, length = report.critical_path()
+
+        assert path == ["wf:test", "wf:build"]
+        assert length == pytest.approx(6.0)
+
+    def test_unstarted_steps_ignored(self):
+        steps = build_step_graph([("wf", {"steps": [{"task": "A"}, {"task": "B"}]})])
+        report = RunReport(steps=steps, results={
+            "wf:1": StepResult(STEP_FAILED, returncode=1, started=1.0, finished=1.5),
+            "wf:2": StepResult(STEP_CANCELLED),
+        })
+
+        assert report.critical_path() == (["wf:1"], pytest.approx(0.5))
+
+
+class TestParallelRunCommand:
+    """Test ``ait workflows run`` with dependencies and --jobs."""
+
+    @pytest.fixture
+    def workflows(self):
+        workflows = {
+            "fast": {"name": "Fast", "description": "Fast", "steps": [
+                {"task": "Say hi", "command": "echo hi"},
+            ]},
+            "dag": {"name": "DAG", "description": "DAG", "max_parallel": 2, "steps": [
+                {"id": "a", "task": "A", "command": "echo a", "needs": []},
+                {"id": "b", "task": "B", "command": "echo b", "needs": []},
+                {"id": "c", "task": "C", "command": "echo c", "needs": ["a", "b"]},
+            ]},
+            "broken": {"name": "Broken", "description": "Broken", "steps": [
+                {"task": "Fail", "command": "exit 2"},
+                {"task": "Never", "command": "echo never"},
+            ]},
+            "cyclic": {"name": "Cyclic", "description": "Cyclic", "steps": [
+                {"id": "a", "needs": "b"},
+                {"id": "b", "needs": "a"},
+            ]},
+        }
+        with patch("aiterm.cli.workflows.get_all_workflows", return_value=workflows), \
+                patch("aiterm.cli.workflows.get_current_live_session", return_value=None):
+            yield workflows
+
+    def test_dag_run(self, workflows):
+        result = runner.invoke(app, ["run", "dag"])
+
+        assert result.exit_code == 0
+        assert "Critical path" in result.output
+        assert "completed" in result.output
+
+    def test_dry_run_shows_needs(self, workflows):
+        result = runner.invoke(app, ["run", "dag", "--dry-run"])
+
+        assert result.exit_code == 0
+        assert "After: A, B" in result.output
+
+    def test_chain_with_jobs(self, workflows):
+        result = runner.invoke(app, ["run", "fast+dag", "-j", "3"])
+
+        assert result.exit_code == 0
+        assert "Up to 3 steps at once" in result.output
+        assert "2 workflows" in result.output
+
+    def test_failure_stops_chain(self, workflows):
+        result = runner.invoke(app, ["run", "broken+fast"])
+
+        assert result.exit_code == 1
+        assert "failed at 'broken'" in result.output
+        assert "never" not in result.output
+        assert "Say hi" not in result.output
+
+    def test_invalid_graph(self, workflows):
+        result = runner.invoke(app, ["run", "cyclic"])
+
+        assert result.exit_code == 1
+        assert "cycle" in result.output